@@ -5,7 +5,8 @@ import time
 import json
 import traceback
 import os
-from typing import Dict, List, Optional, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -13,8 +14,8 @@ from ..router import get_model_router, ActionConfig, ModelConfig
 from ..audit import FileProcessingLogger
 from ..services.llm_adapter import get_llm_adapter
 from ..services.prompt_service import PromptService
+from ..services.chunking import ContentChunker, chunk_token_budget, estimate_tokens, merge_extraction_results
 from ..config import settings
-from supabase import create_client
 
 @dataclass
 class ActionResult:
@@ -41,14 +42,16 @@ class ActionRunner:
     Executes LLM actions with automatic fallback support
     """
     
-    def __init__(self, logger: Optional[FileProcessingLogger] = None):
+    def __init__(self, logger: Optional[FileProcessingLogger] = None, supabase_client=None):
         self.router = get_model_router()
-        self.logger = logger or FileProcessingLogger()
+        self.logger = logger or FileProcessingLogger(supabase_client)
         self.llm_service = get_llm_adapter()
         
         # v4.0 Prompt Service
-        from ..routers.solutions import get_supabase
-        self.supabase = get_supabase()
+        if supabase_client is None:
+            from ..services.supabase_client import get_supabase_client
+            supabase_client = get_supabase_client()
+        self.supabase = supabase_client
         self.prompt_service = PromptService(self.supabase)
         
         # Cost estimates per model (USD per 1K tokens)
@@ -124,6 +127,266 @@ class ActionRunner:
                 latency_ms=int((time.time() - start_time) * 1000)
             )
     
+    def run_action_chunked(
+        self,
+        action_name: str,
+        input_data: Dict[str, Any],
+        context: Dict[str, Any],
+        log_id: Optional[str] = None
+    ) -> ActionResult:
+        """
+        Map-reduce variant of run_action for extraction actions: splits
+        input_data['content'] on structural boundaries into chunks that fit the
+        primary model budget, runs them concurrently and merges the partial
+        ExtractionResults. Small inputs go straight to run_action.
+        """
+        content = input_data.get("content")
+        action_config = self.router.get_action_config(action_name)
+        primary = action_config.primary
+        is_diagram = "diagram" in primary.prompt_file or "diagram" in context.get("file_path", "").lower()
+        if not isinstance(content, str) or is_diagram:
+            return self.run_action(action_name, input_data, context, log_id)
+
+        overhead = estimate_tokens(json.dumps({k: v for k, v in input_data.items() if k != "content"}, default=str), primary.model)
+        budget = chunk_token_budget(primary.model, primary.max_tokens, overhead)
+        chunks = ContentChunker.split(content, context.get("file_path", ""), budget, primary.model)
+
+        if len(chunks) <= 1:
+            return self.run_action(action_name, input_data, context, log_id)
+
+        print(f"[ACTION_RUNNER] Chunked {context.get('file_path')} into {len(chunks)} parts (budget {budget} tokens/chunk)")
+        start_time = time.time()
+
+        def run_chunk(index_chunk):
+            index, chunk = index_chunk
+            chunk_input = {**input_data, "content": chunk, "chunk": f"{index + 1}/{len(chunks)}"}
+            # Chunks do not write to the audit log individually; totals are written below
+            return self.run_action(action_name, chunk_input, context, None)
+
+        workers = max(1, min(settings.LLM_CHUNK_CONCURRENCY, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_chunk, enumerate(chunks)))
+
+        successes = [r for r in results if r.success]
+        latency_ms = int((time.time() - start_time) * 1000)
+        if not successes:
+            first_error = results[0]
+            return ActionResult(
+                success=False,
+                error_message=f"All {len(chunks)} chunks failed: {first_error.error_message}",
+                error_type=first_error.error_type or "chunk_error",
+                model_used=first_error.model_used,
+                latency_ms=latency_ms
+            )
+
+        failed = len(results) - len(successes)
+        if failed:
+            print(f"[ACTION_RUNNER] Warning: {failed}/{len(chunks)} chunks failed for {context.get('file_path')}")
+
+        merged = merge_extraction_results([r.data for r in successes])
+        merged.setdefault("meta", {})
+        if isinstance(merged["meta"], dict):
+            merged["meta"].update({"chunks": len(chunks), "chunks_failed": failed})
+
+        tokens_in = sum(r.tokens_in or 0 for r in successes)
+        tokens_out = sum(r.tokens_out or 0 for r in successes)
+        cost = sum(r.cost_estimate_usd or 0.0 for r in successes)
+        model_used = successes[0].model_used
+        fallback_used = any(r.fallback_used for r in successes)
+
+        if log_id:
+            self.logger.update_model_usage(log_id, primary.provider, model_used, fallback_used=fallback_used)
+            self.logger.update_tokens_and_cost(log_id, tokens_in, tokens_out, cost, latency_ms)
+
+        return ActionResult(
+            success=True,
+            data=merged,
+            model_used=model_used,
+            latency_ms=latency_ms,
+            tokens_in=tokens_in,
+            tokens_out=tokens_out,
+            total_tokens=tokens_in + tokens_out,
+            cost_estimate_usd=cost,
+            fallback_used=fallback_used
+        )
+
+    BATCH_INSTRUCTIONS = """
+
+### BATCH MODE
+The user message contains several files. Each file starts with a line
+`=== FILE <key>: <path> ===` and ends at the next such line.
+Apply the instructions above to EACH file independently and return ONE JSON object
+keyed by the file key, e.g. {"f0": {"nodes": [...], "edges": [...]}, "f1": {...}}.
+Every key must be present, even if its result is empty."""
+
+    def run_action_batch(
+        self,
+        action_name: str,
+        items: List[Dict[str, Any]],
+        log_ids: Optional[Dict[str, str]] = None,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, ActionResult]:
+        """
+        Packs several small inputs into one request (file-delimited input, keyed
+        JSON output) within LLM_BATCH_MAX_TOKENS of content and the model's
+        max_tokens of output (LLM_BATCH_OUTPUT_TOKENS_PER_ITEM per file), and
+        splits the answer back into per-item ActionResults. A truncated answer
+        splits the batch in half and retries both halves; items missing from the
+        answer or failing schema validation are retried one by one with run_action.
+
+        Args:
+            items: [{"key": str, "input_data": {...}, "context": {...}}]
+            log_ids: key -> audit log ID (optional)
+            should_stop: checked before every LLM request (e.g. job cancelled);
+                when it returns True the results gathered so far are returned
+        """
+        log_ids = log_ids or {}
+        results: Dict[str, ActionResult] = {}
+        action_config = self.router.get_action_config(action_name)
+        model_config = action_config.primary
+        max_items = min(
+            settings.LLM_BATCH_MAX_ITEMS,
+            max(1, model_config.max_tokens // max(1, settings.LLM_BATCH_OUTPUT_TOKENS_PER_ITEM))
+        )
+
+        # Greedy packing by token estimate
+        batches: List[List[Dict[str, Any]]] = []
+        current, current_tokens = [], 0
+        for item in items:
+            tokens = estimate_tokens(str(item["input_data"].get("content", "")), model_config.model)
+            if current and (current_tokens + tokens > settings.LLM_BATCH_MAX_TOKENS or len(current) >= max_items):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(item)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+
+        retry: List[Dict[str, Any]] = []
+        while batches:
+            batch = batches.pop(0)
+            if len(batch) == 1:
+                retry.extend(batch)
+                continue
+            if should_stop and should_stop():
+                print(f"[ACTION_RUNNER] Batch run for {action_name} stopped early")
+                return results
+            batch_results, truncated = self._execute_batch(model_config, batch, log_ids)
+            if truncated:
+                # Output ran into max_tokens: halve the batch instead of going item by item
+                half = len(batch) // 2
+                print(f"[ACTION_RUNNER] Batch of {len(batch)} truncated, splitting into {half} + {len(batch) - half}")
+                batches[:0] = [batch[:half], batch[half:]]
+                continue
+            for item in batch:
+                res = batch_results.get(item["key"])
+                if res is not None and res.success:
+                    results[item["key"]] = res
+                else:
+                    retry.append(item)
+
+        if retry:
+            print(f"[ACTION_RUNNER] Running {len(retry)} item(s) individually for {action_name}")
+        for item in retry:
+            if should_stop and should_stop():
+                print(f"[ACTION_RUNNER] Batch run for {action_name} stopped early")
+                break
+            results[item["key"]] = self.run_action(action_name, item["input_data"], item["context"], log_ids.get(item["key"]))
+
+        return results
+
+    def _execute_batch(
+        self,
+        model_config: ModelConfig,
+        batch: List[Dict[str, Any]],
+        log_ids: Dict[str, str]
+    ) -> Tuple[Dict[str, ActionResult], bool]:
+        """
+        Executes one packed request. Returns the items that came back valid and
+        whether the answer was cut off at max_tokens.
+        """
+        start_time = time.time()
+        keys = [item["key"] for item in batch]
+        try:
+            batch_context = {"file_path": "(multiple files, see batch below)"}
+            prompt_content = self.prompt_service.get_composed_prompt(
+                model_config.prompt_file,
+                {"content": "(see the FILE sections in the user message)"},
+                batch_context
+            ) + self.BATCH_INSTRUCTIONS
+
+            sections = []
+            for item in batch:
+                path = item["context"].get("file_path", item["key"])
+                sections.append(f"=== FILE {item['key']}: {path} ===\n{item['input_data'].get('content', '')}")
+            messages = [
+                {"role": "system", "content": prompt_content},
+                {"role": "user", "content": "\n\n".join(sections)}
+            ]
+
+            print(f"[ACTION_RUNNER] Batch of {len(batch)} files -> {model_config.model} (Provider: {model_config.provider})")
+            llm_result = self.llm_service.call_model(
+                model=model_config.model,
+                messages=messages,
+                temperature=model_config.temperature,
+                max_tokens=model_config.max_tokens,
+                provider=model_config.provider,
+                json_mode=True
+            )
+            latency_ms = int((time.time() - start_time) * 1000)
+            if not llm_result.get("success"):
+                print(f"[ACTION_RUNNER] Batch failed ({model_config.model}): {llm_result.get('error')}")
+                return {}, False
+            if llm_result.get("finish_reason") == "length":
+                return {}, True
+
+            parsed = json.loads(self._clean_json_response(llm_result.get("content", "")))
+            if not isinstance(parsed, dict):
+                print(f"[ACTION_RUNNER] Batch response is not a keyed object")
+                return {}, False
+        except json.JSONDecodeError as e:
+            # Unparseable JSON that used the whole output budget was cut off
+            truncated = llm_result.get("tokens_out", 0) >= model_config.max_tokens
+            print(f"[ACTION_RUNNER] Batch response is not valid JSON{' (truncated)' if truncated else ''}: {e}")
+            return {}, truncated
+        except Exception as e:
+            print(f"[ACTION_RUNNER] Batch error: {e}")
+            return {}, False
+
+        # Apportion usage by input size so per-file audit stays meaningful
+        tokens_in = llm_result.get("tokens_in", 0)
+        tokens_out = llm_result.get("tokens_out", 0)
+        sizes = {item["key"]: max(1, len(str(item["input_data"].get("content", "")))) for item in batch}
+        total_size = sum(sizes.values())
+
+        results: Dict[str, ActionResult] = {}
+        for key in keys:
+            data = parsed.get(key)
+            if data is None:
+                continue
+            validation_error, fixed_data = self._validate_json_schema(data, model_config.prompt_file)
+            if validation_error:
+                print(f"[ACTION_RUNNER] Batch item {key} failed validation: {validation_error}")
+                continue
+            share = sizes[key] / total_size
+            item_in, item_out = int(tokens_in * share), int(tokens_out * share)
+            cost = self._estimate_cost(model_config.model, item_in + item_out)
+            log_id = log_ids.get(key)
+            if log_id:
+                self.logger.update_model_usage(log_id, model_config.provider, model_config.model)
+                self.logger.update_tokens_and_cost(log_id, item_in, item_out, cost, latency_ms)
+            results[key] = ActionResult(
+                success=True,
+                data=fixed_data,
+                model_used=model_config.model,
+                latency_ms=latency_ms,
+                tokens_in=item_in,
+                tokens_out=item_out,
+                total_tokens=item_in + item_out,
+                cost_estimate_usd=cost
+            )
+        return results, False
+
     def _execute_single_model(
         self, 
         model_config: ModelConfig, 
@@ -167,13 +430,8 @@ class ActionRunner:
                     }
                 ]
             else:
-                # Standard Text format
-                safe_input = input_data.copy()
-                if "content" in safe_input and isinstance(safe_input["content"], str):
-                    if len(safe_input["content"]) > 100000:
-                        safe_input["content"] = safe_input["content"][:100000] + "... (truncated)"
-                
-                input_json = json.dumps(safe_input)
+                # Standard Text format (large inputs are split upstream by run_action_chunked)
+                input_json = json.dumps(input_data)
                 
                 messages = [
                     {"role": "system", "content": prompt_content},
@@ -9,7 +9,7 @@ import json
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
-from supabase import create_client, Client
+from supabase import Client
 
 from ..config import settings
 
@@ -36,6 +36,10 @@ class FileProcessingLog:
     latency_ms: Optional[int] = None
     cost_estimate_usd: Optional[float] = None
     
+    # Prompt compaction (SSIS/DSX)
+    prompt_tokens_original: Optional[int] = None
+    prompt_tokens_saved: Optional[int] = None
+    
     error_type: Optional[str] = None
     error_message: Optional[str] = None
     retry_count: int = 0
@@ -55,10 +59,10 @@ class FileProcessingLogger:
     """
     
     def __init__(self, supabase_client: Optional[Client] = None):
-        self.supabase = supabase_client or create_client(
-            settings.SUPABASE_URL, 
-            settings.SUPABASE_KEY
-        )
+        if supabase_client is None:
+            from ..services.supabase_client import get_supabase_client
+            supabase_client = get_supabase_client()
+        self.supabase = supabase_client
         self._current_logs: Dict[str, FileProcessingLog] = {}
     
     def start_file_processing(
@@ -150,6 +154,21 @@ class FileProcessingLogger:
         log_entry.latency_ms = latency_ms
         log_entry.updated_at = datetime.utcnow()
     
+    def update_compaction_stats(
+        self,
+        log_id: str,
+        original_tokens: int,
+        tokens_saved: int
+    ):
+        """Records how many prompt tokens the compaction stage saved"""
+        if log_id not in self._current_logs:
+            return
+        
+        log_entry = self._current_logs[log_id]
+        log_entry.prompt_tokens_original = original_tokens
+        log_entry.prompt_tokens_saved = tokens_saved
+        log_entry.updated_at = datetime.utcnow()
+    
     def update_processing_results(
         self,
         log_id: str,
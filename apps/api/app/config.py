@@ -14,6 +14,11 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
     SUPABASE_SERVICE_ROLE_KEY: str = "" # Add Service Role Key for Admin operations
+    SUPABASE_POOL_MAX_CONNECTIONS: int = 50 # Shared keep-alive pool per key (anon / service role)
+    SUPABASE_POOL_MAX_KEEPALIVE: int = 20
+    SUPABASE_POOL_KEEPALIVE_SEC: float = 60.0
+    SUPABASE_HTTP_TIMEOUT_SEC: float = 120.0
+    DATABASE_URL: str = "" # Direct Postgres DSN, only used to LISTEN for job events (optional)
     
     # OpenRouter / OpenAI
     OPENAI_API_KEY: str = ""
@@ -31,6 +36,73 @@ class Settings(BaseSettings):
     MAX_FILES_PER_JOB: int = 500
     DEBUG_MAX_ITEMS: int = 0 # 0 means no limit. Set to 10 for quick testing.
 
+    # Chunking (map-reduce extraction)
+    LLM_CHUNK_MAX_TOKENS: int = 6000 # Token budget per chunk (capped by the model context)
+    LLM_CHUNK_CONCURRENCY: int = 4 # Parallel chunk calls per file
+
+    # Batching of small files (several files per LLM request)
+    LLM_BATCH_ENABLED: bool = True
+    LLM_BATCH_SMALL_FILE_BYTES: int = 8192 # Files up to this size are batchable
+    LLM_BATCH_MAX_TOKENS: int = 6000 # Content token budget per batched request
+    LLM_BATCH_MAX_ITEMS: int = 8
+    LLM_BATCH_OUTPUT_TOKENS_PER_ITEM: int = 600 # Expected keyed-JSON output per file, budgeted against max_tokens
+
+    # Triage funnel (LLM_ONLY items)
+    TRIAGE_ENABLED: bool = True
+    TRIAGE_PASS_SCORE: int = 2 # Local score needed to pass without LLM triage
+    TRIAGE_PREVIEW_BYTES: int = 65536
+    TRIAGE_LLM_ENABLED: bool = False # Cheap-model batch triage for ambiguous files
+    TRIAGE_LLM_BATCH_SIZE: int = 20
+    TRIAGE_LLM_PREVIEW_CHARS: int = 1500
+
+    # Polled endpoints
+    STATS_CACHE_TTL_SEC: float = 2.0 # In-process cache for /solutions/{id}/stats
+    RPC_RETRY_SEC: float = 60.0 # After a failed aggregate RPC, serve the PostgREST fallback this long before retrying
+    ASSET_SEARCH_CACHE_TTL_SEC: float = 5.0 # Estimated counts / distinct types for the catalog page
+    ASSET_SEARCH_MAX_LIMIT: int = 500
+
+    # Solution chat: retrieved subgraph instead of the whole graph in the prompt
+    CHAT_RETRIEVAL_TOP_K: int = 8 # BM25 seed assets per question
+    CHAT_RETRIEVAL_HOPS: int = 2 # Neighborhood expansion around the seeds
+    CHAT_RETRIEVAL_HOP_DECAY: float = 0.5
+    CHAT_RETRIEVAL_MAX_NODES: int = 400 # Candidates considered before the token budget
+    CHAT_CONTEXT_MAX_TOKENS: int = 6000
+    CHAT_INDEX_TTL_SEC: float = 120.0 # Per-solution index reuse across questions
+
+    # Embeddings (code_embeddings, pgvector)
+    EMBEDDINGS_ON_JOB_END: bool = True # Post-processing stage: embed evidence snippets + asset descriptions
+    EMBEDDING_PROVIDER: str = "openai" # openai | hash (local deterministic stand-in, no API calls)
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    EMBEDDING_DIM: int = 1536 # Must match code_embeddings.embedding
+    EMBEDDING_BATCH_SIZE: int = 256 # Inputs per embeddings request / bulk insert
+    EMBEDDING_MAX_CHARS: int = 8000 # Snippets are truncated before embedding
+
+    # Evidence snippet store (evidence_snippet, one compressed row per distinct snippet)
+    SNIPPET_CODEC: str = "zstd" # zstd (falls back to zlib without the zstandard package) | zlib | plain
+    SNIPPET_ZSTD_LEVEL: int = 10
+    SNIPPET_ZLIB_LEVEL: int = 9
+    SNIPPET_CACHE_TTL_SEC: float = 300.0
+
+    # Governance exports (streamed, keyset-paginated)
+    EXPORT_PAGE_SIZE: int = 1000 # Rows per page; keep <= PostgREST max-rows
+    EXPORT_GZIP_LEVEL: int = 6
+    EXPORT_PARQUET_ROW_GROUP_SIZE: int = 50000
+    EXPORT_PARQUET_COMPRESSION: str = "zstd"
+    EXPORT_PARQUET_ON_JOB_END: bool = True # Lineage snapshot artifact after each completed job (needs pyarrow)
+
+    # Post-processing stage graph (audit, reasoning, reports, snapshots) after a job completes
+    POST_PROCESSING_BACKGROUND: bool = True # False = run the stages before execute_pipeline returns
+
+    # Job events (SSE /jobs/{id}/events, Postgres NOTIFY across processes)
+    JOB_EVENTS_CHANNEL: str = "job_events"
+    JOB_EVENTS_HEARTBEAT_SEC: float = 15.0
+    JOB_EVENTS_RECONNECT_SEC: float = 5.0
+    JOB_EVENTS_POLL_SEC: float = 2.0 # /jobs/{id}/events reads job_run at this pace when the LISTEN bridge is down
+    JOB_PROGRESS_WRITE_INTERVAL_SEC: float = 5.0 # Throttle for job_run progress writes (SSE gets every update)
+    JOB_EVENTS_NOTIFY_INTERVAL_SEC: float = 2.0 # Min gap between cross-process progress NOTIFYs per job (latest wins)
+    JOB_EVENTS_NOTIFY_RETRY_SEC: float = 60.0 # Back-off after a failed notify_job_event RPC
+    JOB_CANCEL_POLL_SEC: float = 10.0 # job_run status poll (backstop for missed cancel NOTIFYs)
+
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), ".env"),
         env_file_encoding='utf-8',
@@ -1,6 +1,9 @@
 import os
+import json
+import asyncio
 import traceback
 from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from .tasks import analyze_solution_task
@@ -25,6 +28,17 @@ app.include_router(solutions.router)
 app.include_router(admin.router)
 app.include_router(governance.router)
 
+@app.on_event("startup")
+def start_job_event_listener():
+    # Worker events (progress/status) arrive via Postgres NOTIFY when DATABASE_URL is set
+    from .services.events import get_event_bus
+    get_event_bus().start_listener()
+
+@app.on_event("shutdown")
+def close_supabase_clients():
+    from .services.supabase_client import close_clients
+    close_clients()
+
 class JobRequest(BaseModel):
     solution_id: str
     file_path: str
@@ -40,10 +54,9 @@ def health_check():
 @app.post("/jobs")
 def create_job(job: JobRequest):
     from .services.queue import SQLJobQueue
-    from supabase import create_client
-    from .config import settings
+    from .services.supabase_client import get_supabase_client
     
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    supabase = get_supabase_client()
     
     # 1. Create Job Run Record
     job_data = {
@@ -96,17 +109,17 @@ class ChatRequest(BaseModel):
 
 @app.post("/solutions/{solution_id}/chat")
 def chat_solution(solution_id: str, request: ChatRequest):
-    from .services.graph import get_graph_service
-    from .services.llm import LLMService
-    
-    # 1. Fetch Graph Context
-    graph_service = get_graph_service()
-    graph_data = graph_service.get_graph_data(solution_id)
-    
+    from .services.chat_retrieval import get_chat_retriever
+    from .services.llm import get_llm_service
+
+    # 1. Relevant subgraph for the question (cached per-solution index, token budget)
+    retrieved = get_chat_retriever().retrieve(solution_id, request.question)
+    print(f"[CHAT] {solution_id}: {len(retrieved.node_ids)}/{retrieved.total_nodes} assets, "
+          f"{retrieved.edge_count}/{retrieved.total_edges} relationships, ~{retrieved.tokens} tokens")
+
     # 2. Ask LLM
-    llm_service = LLMService()
-    answer = llm_service.chat_with_graph(graph_data, request.question)
-    
+    answer = get_llm_service().chat_with_context(retrieved.text, request.question)
+
     return {"answer": answer}
 
 @app.post("/solutions/{solution_id}/optimize")
@@ -151,11 +164,9 @@ async def chat_solution_options(solution_id: str):
 def delete_solution(solution_id: str):
     from .services.reset_service import NuclearResetService
     from .services.graph import get_graph_service
-    from supabase import create_client
-    from .config import settings
+    from .services.supabase_client import get_service_client
     
-    key_to_use = settings.SUPABASE_SERVICE_ROLE_KEY or settings.SUPABASE_KEY
-    supabase = create_client(settings.SUPABASE_URL, key_to_use)
+    supabase = get_service_client()
     reset_service = NuclearResetService(supabase)
     
     try:
@@ -186,10 +197,9 @@ class ReanalyzeRequest(BaseModel):
 @app.post("/solutions/{solution_id}/analyze")
 async def reanalyze_solution(solution_id: str, request: ReanalyzeRequest = ReanalyzeRequest(mode="update")):
     from .services.queue import SQLJobQueue
-    from supabase import create_client
-    from .config import settings
+    from .services.supabase_client import get_supabase_client
     
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    supabase = get_supabase_client()
     
     # Check if full cleanup requested
     if request.mode == "full":
@@ -231,7 +241,16 @@ async def reanalyze_solution(solution_id: str, request: ReanalyzeRequest = Reana
             
             supabase.table("edge_index").delete().eq("project_id", solution_id).execute()
             supabase.table("asset").delete().eq("project_id", solution_id).execute()
+            try:
+                # Counters only add up while persisting: recompute them once the rows are gone
+                supabase.rpc("rebuild_audit_stats", {"p_project_id": solution_id}).execute()
+            except Exception as stats_e:
+                print(f"project_audit_stats not rebuilt: {stats_e}")
             supabase.table("evidence").delete().eq("project_id", solution_id).execute()
+            try:
+                supabase.rpc("gc_evidence_snippets", {}).execute()
+            except Exception as gc_e:
+                print(f"evidence_snippet not collected: {gc_e}")
             
             # 3. Cleanup Job Runs
             supabase.table("job_run").delete().eq("project_id", solution_id).execute()
@@ -276,6 +295,71 @@ async def reanalyze_solution(solution_id: str, request: ReanalyzeRequest = Reana
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Server-Sent Events stream of job progress/status. Sends the current job_run
+    snapshot first, then pushed events until the job reaches a terminal state.
+    Without the LISTEN bridge (no DATABASE_URL / psycopg) worker events never reach
+    this process, so job_run is polled every JOB_EVENTS_POLL_SEC instead.
+    """
+    from .config import settings
+    from .services.events import get_event_bus, TERMINAL_EVENTS, snapshot_event
+    from .services.supabase_client import get_supabase_client
+
+    bus = get_event_bus()
+    # Subscribe before reading the snapshot so no event is lost in between
+    stream = bus.stream(job_id, heartbeat_sec=None if bus.listening else settings.JOB_EVENTS_POLL_SEC)
+
+    def read_snapshot():
+        res = get_supabase_client().table("job_run")\
+            .select("job_id, status, progress_pct, current_stage, error_message")\
+            .eq("job_id", job_id).limit(1).execute()
+        return res.data[0] if res.data else None
+
+    def sse(event_type: str, data) -> str:
+        return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    async def event_source():
+        loop = asyncio.get_running_loop()
+        try:
+            snapshot = None
+            try:
+                snapshot = await loop.run_in_executor(None, read_snapshot)
+            except Exception as e:
+                print(f"[EVENTS] Snapshot failed for job {job_id}: {e}")
+            yield sse("snapshot", snapshot)
+            if snapshot and (snapshot.get("status") or "").lower() in TERMINAL_EVENTS | {"error"}:
+                return
+
+            async for event in stream:
+                if event is None:
+                    if bus.listening:
+                        yield ": keep-alive\n\n"
+                        continue
+                    # Polling fallback: emit job_run changes as events
+                    try:
+                        current = await loop.run_in_executor(None, read_snapshot)
+                    except Exception as e:
+                        print(f"[EVENTS] Poll failed for job {job_id}: {e}")
+                        current = snapshot
+                    if not current or current == snapshot:
+                        yield ": keep-alive\n\n"
+                        continue
+                    snapshot = current
+                    event = snapshot_event(job_id, snapshot)
+                yield sse(event["type"], event)
+                if event["type"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            stream.close()
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/solutions/{solution_id}/cancel")
 async def cancel_solution_job(solution_id: str):
     from .routers.solutions import get_supabase
@@ -317,6 +401,10 @@ async def cancel_solution_job(solution_id: str):
     # 4. Update queue if exists
     supabase.table("job_queue").update({"status": "failed", "last_error": "User Cancelled"}).eq("job_id", job_id).execute()
     
+    # 5. Push cancellation to the worker (and SSE subscribers) instead of waiting for a poll
+    from .services.events import get_event_bus
+    get_event_bus().publish(job_id, "cancelled", {"status": "cancelled"})
+    
     return {"status": "cancelled", "job_id": job_id}
 
 class SubgraphRequest(BaseModel):
@@ -344,139 +432,54 @@ async def find_paths(req: PathRequest):
 # Admin endpoints moved to routers/admin.py
 
 @app.get("/solutions/{solution_id}/stats")
-async def get_solution_stats(solution_id: str):
-    from supabase import create_client
-    from .config import settings
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-    
-    # Total Assets
-    assets_count = supabase.table("asset").select("asset_id", count="exact").eq("project_id", solution_id).execute()
-    
-    # Assets by Type
-    # Supabase doesn't support GROUP BY easily in simple client, use RPC or just raw fetch (inefficient for large data but ok for MVP)
-    # Or multiple queries.
-    
-    # Let's count common types explicitly
-    files_count = supabase.table("asset").select("asset_id", count="exact").eq("project_id", solution_id).eq("asset_type", "FILE").execute()
-    tables_count = supabase.table("asset").select("asset_id", count="exact").eq("project_id", solution_id).eq("asset_type", "TABLE").execute()
-    pipelines_count = supabase.table("asset").select("asset_id", count="exact").eq("project_id", solution_id).eq("asset_type", "PIPELINE").execute()
-    
-    # Total Edges (Relationships)
-    edges_count = supabase.table("edge_index").select("edge_id", count="exact").eq("project_id", solution_id).execute()
-    
-    # Active Job Status (New)
-    job_status = None
-    # Check if there is a running or queued job
-    # Ensure we are selecting 'job_id' explicitly as 'id' is not in the schema for job_run
-    job_res = supabase.table("job_run")\
-        .select("job_id, plan_id, status, progress_pct, error_details, created_at, current_stage")\
-        .eq("project_id", solution_id)\
-        .in_("status", ["queued", "running", "planning_ready"])\
-        .order("created_at", desc=True)\
-        .limit(1)\
-        .execute()
-        
-    if job_res.data:
-        job_status = job_res.data[0]
-    else:
-        # Check for completed jobs to ensure we don't miss status if just finished?
-        # No, active job implies currently running/queued. 
-        # But if we want to show "Planning Ready" even if it's not strictly "running" (it's paused),
-        # we need to ensure 'planning_ready' is included (which I did).
-        pass
-    
-    # DEBUG: Print status for troubleshooting
-    if job_status:
-        print(f"DEBUG: Active Job for {solution_id}: {job_status['status']} (Plan: {job_status.get('plan_id')})")
-    else:
-        print(f"DEBUG: No active job for {solution_id}")
-
-    # Last Completed Job
-    last_run = None
-    last_run_res = supabase.table("job_run")\
-        .select("finished_at")\
-        .eq("project_id", solution_id)\
-        .eq("status", "completed")\
-        .order("finished_at", desc=True)\
-        .limit(1)\
-        .execute()
-    
-    if last_run_res.data:
-        last_run = last_run_res.data[0]["finished_at"]
+def get_solution_stats(solution_id: str):
+    # One RPC round trip (asset counts by type, edges, active job, last run, latest audit)
+    # behind a short TTL cache: the UI polls this while a job runs.
+    from .services.stats_service import get_stats_service
+    stats = get_stats_service().get_stats(solution_id)
 
-    # Latest Audit Report (v5.0 Integration)
-    audit_report = None
-    audit_res = supabase.table("audit_snapshot")\
-        .select("*")\
-        .eq("project_id", solution_id)\
-        .order("created_at", desc=True)\
-        .limit(1)\
-        .execute()
-    
-    if audit_res.data:
-        audit_report = audit_res.data[0]
-
-    return {
-        "total_assets": assets_count.count,
-        "total_edges": edges_count.count,
-        "files": files_count.count,
-        "tables": tables_count.count,
-        "pipelines": pipelines_count.count,
-        "active_job": job_status,
-        "last_run": last_run,
-        "audit_report": audit_report,
-        "metrics": audit_report["metrics"] if audit_report else None
-    }
+    active_job = stats.get("active_job")
+    if active_job:
+        print(f"DEBUG: Active Job for {solution_id}: {active_job['status']} (Plan: {active_job.get('plan_id')})")
+    return stats
 
 @app.get("/solutions/{solution_id}/assets")
-async def get_solution_assets(
+def get_solution_assets(
     solution_id: str, 
     type: str = None, 
     search: str = None, 
     limit: int = 50, 
-    offset: int = 0
+    offset: int = 0,
+    cursor: str = None
 ):
-    from supabase import create_client
-    from .config import settings
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-    
-    query = supabase.table("asset").select("*", count="exact").eq("project_id", solution_id)
-    
-    if type and type != "ALL":
-        # Use ilike for case-insensitive exact match
-        query = query.ilike("asset_type", type)
-        
-    if search:
-        query = query.ilike("name_display", f"%{search}%")
-        
-    query = query.range(offset, offset + limit - 1).order("name_display")
-        
-    res = query.execute()
-    return {"data": res.data, "count": res.count}
+    # Keyset-paginated, trigram-indexed search (search_assets RPC); pass next_cursor back as
+    # `cursor` for the next page. `count` is an estimate. `offset` only for old clients.
+    from .services.asset_search import get_asset_search_service
+    try:
+        return get_asset_search_service().search(solution_id, type, search, limit, cursor, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/solutions/{solution_id}/asset-types")
-async def get_solution_asset_types(solution_id: str):
-    from supabase import create_client
-    from .config import settings
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-    
-    # Fetch distinct asset types
-    # Since Supabase simple client doesn't support distinct well without RPC, 
-    # we fetch all types (selecting only asset_type) and do unique in memory 
-    # as types are few per solution.
-    res = supabase.table("asset").select("asset_type").eq("project_id", solution_id).execute()
-    
-    if not res.data:
-        return {"types": []}
-        
-    types = sorted(list(set(item["asset_type"] for item in res.data if item.get("asset_type"))))
-    return {"types": types}
+def get_solution_asset_types(solution_id: str):
+    # Distinct types via get_asset_types RPC (loose index scan), cached briefly
+    from .services.asset_search import get_asset_search_service
+    return {"types": get_asset_search_service().asset_types(solution_id)}
+
+@app.get("/solutions/{solution_id}/semantic-search")
+def semantic_search(solution_id: str, q: str, limit: int = 10, min_similarity: float = 0.0):
+    # Nearest evidence snippets / asset descriptions (match_code_embeddings, HNSW)
+    from .services.embeddings import EmbeddingPipeline
+    from .services.supabase_client import get_supabase_client
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q is required")
+    results = EmbeddingPipeline(get_supabase_client()).search(solution_id, q, max(1, min(limit, 100)), min_similarity)
+    return {"data": results}
 
 @app.get("/assets/{asset_id}/details")
-async def get_asset_details(asset_id: str):
-    from supabase import create_client
-    from .config import settings
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+async def get_asset_details(asset_id: str, snippets: bool = True):
+    from .services.supabase_client import get_supabase_client
+    supabase = get_supabase_client()
     
     # 1. Fetch Asset
     asset_res = supabase.table("asset").select("*").eq("asset_id", asset_id).single().execute()
@@ -516,11 +519,28 @@ async def get_asset_details(asset_id: str):
             .execute()
         
         # Structure evidences by edge_id
-        evidences = ev_res.data
+        evidences = ev_res.data or []
+
+        # Snippets live in evidence_snippet (compressed, one row per distinct snippet): one bulk fetch
+        if snippets:
+            from .services.snippet_store import get_snippet_store
+            get_snippet_store().attach(e.get("evidence") for e in evidences)
         
+    # 4. Heavy attributes (component config, column metadata) from asset_detail
+    from .services.catalog import CatalogService
+    detail = CatalogService(supabase).get_asset_detail(asset_id)
+
     return {
         "asset": asset,
+        "detail": detail,
         "outgoing_edges": outgoing.data,
         "incoming_edges": incoming.data,
         "evidences": evidences
-    }
\ No newline at end of file
+    }
+
+@app.get("/assets/{asset_id}/detail")
+def get_asset_detail(asset_id: str):
+    # Lazy counterpart of the slim graph payload: only the asset_detail blob
+    from .services.catalog import CatalogService
+    from .services.supabase_client import get_supabase_client
+    return {"asset_id": asset_id, "detail": CatalogService(get_supabase_client()).get_asset_detail(asset_id)}
\ No newline at end of file
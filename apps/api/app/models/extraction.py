@@ -1,5 +1,6 @@
+import hashlib
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 class Locator(BaseModel):
     file: str
@@ -9,12 +10,27 @@ class Locator(BaseModel):
     byte_start: Optional[int] = None
     byte_end: Optional[int] = None
 
+# Field order of the evidence content hash; must match evidence_content_hash() in migration 29
+EVIDENCE_HASH_FIELDS = ("file", "line_start", "line_end", "xpath", "byte_start", "byte_end")
+
+def evidence_hash(locator: Locator, snippet: str) -> str:
+    """sha256 over locator fields + snippet, joined with \\x1f (None -> empty)"""
+    parts = [getattr(locator, f) for f in EVIDENCE_HASH_FIELDS] + [snippet]
+    raw = "\x1f".join("" if p is None else str(p) for p in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
 class Evidence(BaseModel):
     evidence_id: str
     kind: str = Field(..., description="code|xml|log|config|regex_match")
     locator: Locator
     snippet: str
-    hash: Optional[str] = None
+    hash: Optional[str] = Field(None, description="Computed from locator + snippet (dedupe key)")
+
+    @model_validator(mode="after")
+    def _content_hash(self):
+        # Always derived from content: LLM-provided values ("sha256_del_snippet") are not hashes
+        self.hash = evidence_hash(self.locator, self.snippet)
+        return self
 
 class ExtractedNode(BaseModel):
     node_id: str
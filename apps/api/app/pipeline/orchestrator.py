@@ -6,12 +6,15 @@ import time
 import hashlib
 import json
 import traceback
+import threading
 import uuid
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass
-from supabase import create_client
+from functools import cached_property
+from ..services.supabase_client import get_supabase_client
+from ..services.events import get_event_bus
 
 from ..models.extraction import ExtractionResult, ExtractedNode, ExtractedEdge, Evidence, Locator
 from ..models.deep_dive import DeepDiveResult, Package, PackageComponent, TransformationIR, ColumnLineage
@@ -24,13 +27,17 @@ from ..services.catalog import CatalogService
 from ..services.planner import PlannerService
 from ..services.extractors.ssis import SSISParser
 from ..services.extractors.datastage import DataStageParser
-from ..services.extractors.registry import ExtractorRegistry
+from ..services.extractors.registry import get_extractor_registry
+from ..services.compaction import compact_ssis_xml, compact_dsx, compact_structure, compaction_stats
 from ..services.auditor import DiscoveryAuditor
 from ..services.refiner import DiscoveryRefiner
 from ..services.prompt_service import PromptService
 from ..services.reasoning_service import ReasoningService
 from ..services.report_service import ReportService
+from ..services.parquet_export import ParquetExportService, ParquetUnavailableError
+from ..services.embeddings import EmbeddingPipeline
 from ..config import settings
+from .stages import Stage, StageGraph, JobStageRecorder
 
 @dataclass
 class ProcessingResult:
@@ -76,22 +83,21 @@ class PipelineOrchestrator:
         print("!!! MEGA TRACE: PipelineOrchestrator INIT !!!")
         print("="*50)
         self.router = get_model_router()
-        self.logger = FileProcessingLogger(supabase_client)
-        self.action_runner = ActionRunner(self.logger)
-        self.storage = StorageService()
         
-        if supabase_client:
-            self.supabase = supabase_client
-        else:
-            self.supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        # One pooled client for every service of the job (connections reused across items)
+        self.supabase = supabase_client or get_supabase_client()
+        self.logger = FileProcessingLogger(self.supabase)
+        self.action_runner = ActionRunner(self.logger, self.supabase)
+        self.storage = StorageService(self.supabase)
+        
+        # Progress/cancellation are pushed through the event bus; DB writes and cancel polling are throttled
+        self.events = get_event_bus()
+        self._last_progress_write = 0.0
+        self._last_cancel_check = 0.0
             
         self.catalog = CatalogService(self.supabase)
         self.planner = PlannerService(self.supabase)
-        self.auditor = DiscoveryAuditor(self.supabase)
-        self.refiner = DiscoveryRefiner(self.auditor, self.action_runner)
-        self.prompt_service = PromptService(self.supabase)
-        self.reasoning = ReasoningService(self.supabase, self.catalog, self.prompt_service)
-        self.reports = ReportService(self.supabase)
+        # auditor / refiner / prompt_service / reasoning / reports: built on first use (post-processing)
         
         # Métricas
         self.metrics = PipelineMetrics()
@@ -99,6 +105,26 @@ class PipelineOrchestrator:
         self.metrics.model_usage = {}
         self.metrics.error_counts = {}
     
+    @cached_property
+    def auditor(self) -> DiscoveryAuditor:
+        return DiscoveryAuditor(self.supabase)
+
+    @cached_property
+    def refiner(self) -> DiscoveryRefiner:
+        return DiscoveryRefiner(self.auditor, self.action_runner)
+
+    @cached_property
+    def prompt_service(self) -> PromptService:
+        return PromptService(self.supabase)
+
+    @cached_property
+    def reasoning(self) -> ReasoningService:
+        return ReasoningService(self.supabase, self.catalog, self.prompt_service)
+
+    @cached_property
+    def reports(self) -> ReportService:
+        return ReportService(self.supabase)
+
     def execute_pipeline(self, job_id: str, artifact_path: str) -> bool:
         """
         Main Entry Point.
@@ -209,6 +235,49 @@ class PipelineOrchestrator:
         
         file_results = []
         
+        # One identity map for the whole job: assets referenced by many files resolve (and
+        # skip unchanged rewrites) without touching the DB again
+        if project_id:
+            self.catalog.begin_job(project_id)
+        try:
+            if not self._execute_plan_items(job_id, items, root_path, file_results):
+                return False
+        finally:
+            self.catalog.end_job()
+
+        # Finalize
+        print(f"[PIPELINE v3] Finalizing execution...")
+             
+        # Complete Job: every item is persisted, so the catalog is consistent from here on
+        self.supabase.table("job_run").update({
+            "status": "completed",
+            "progress_pct": 100,
+            "current_item_id": None
+        }).eq("job_id", job_id).execute()
+        self.events.publish(job_id, "completed", {"status": "completed", "progress_pct": 100})
+        
+        # --- POST-PROCESSING STAGE GRAPH ---
+        # Graph sync, accuracy audit (v5.0), reasoning synthesis (v6.2), reports (v6.3) and the
+        # Parquet snapshot run as a DAG of stages, concurrently where independent.
+        self._run_post_processing_stages(job_id, project_id, file_results)
+
+        print(f"[PIPELINE v3] Execution Completed.", flush=True)
+        print(f"[PIPELINE] Metrics: {self._get_metrics_summary()}")
+        return True
+
+    def _execute_plan_items(self, job_id: str, items: List[Dict], root_path: str, file_results: List[ProcessingResult]) -> bool:
+        """Main per-item loop of _execute_plan. Returns False if the job was cancelled"""
+        total_items = len(items)
+
+        # Small files are extracted several per LLM request before the main loop
+        prefetched = {}
+        if settings.LLM_BATCH_ENABLED:
+            try:
+                prefetched = self._prefetch_batched_extractions(job_id, items, root_path)
+            except Exception as batch_e:
+                print(f"[PIPELINE v3] Batched extraction failed, falling back to per-file: {batch_e}", flush=True)
+                traceback.print_exc()
+        
         for i, item in enumerate(items):
             progress = int(((i) / total_items) * 100)
             print(f"!!! LOOP TRACE: Processing {i+1}/{total_items} ({progress}%): {item['path']}", flush=True)
@@ -216,14 +285,10 @@ class PipelineOrchestrator:
             # Update Job Progress (Current Item)
             self._update_job_progress(job_id, f"processing: {os.path.basename(item['path'])}", progress)
             
-            # Check for Cancellation
-            try:
-                job_check = self.supabase.table("job_run").select("status").eq("job_id", job_id).single().execute()
-                if job_check.data and job_check.data.get("status") == "cancelled":
-                    print(f"[PIPELINE v3] Job {job_id} cancelled by user. Aborting...", flush=True)
-                    return False
-            except Exception as cancel_e:
-                print(f"[PIPELINE v3] Error checking cancellation status: {cancel_e}")
+            # Check for Cancellation (pushed event; throttled SELECT only without LISTEN bridge)
+            if self._is_cancelled(job_id):
+                print(f"[PIPELINE v3] Job {job_id} cancelled by user. Aborting...", flush=True)
+                return False
             
             # Read Content
             full_path = os.path.join(root_path, item["path"])
@@ -253,7 +318,7 @@ class PipelineOrchestrator:
                 continue
 
             # Execute based on Strategy
-            res = self._process_item_v3(job_id, item, content, full_path)
+            res = self._process_item_v3(job_id, item, content, full_path, prefetched.get(item["item_id"]))
             self._update_metrics(res)
             
             # --- v3/v4 PERSISTENCE & DEEP DIVE ---
@@ -279,53 +344,53 @@ class PipelineOrchestrator:
             
             # Accumulate result for Graph Sync and Reporting
             file_results.append(res)
+        return True
 
-        # Finalize
-        print(f"[PIPELINE v3] Finalizing execution...")
-        
-        # Update Graph
+    def _build_post_processing_stages(self, job_id: str, project_id: Optional[str], file_results: List[ProcessingResult]) -> List[Stage]:
+        stages = [Stage("accuracy_audit", lambda: self._run_post_processing_audit(job_id))]
         if settings.NEO4J_URI:
-             print(f"[PIPELINE v3] Syncing to Neo4j...")
-             # self._execute_stage(job_id, "update_graph", lambda: self._update_graph(job_id, file_results))
-             self._update_graph(job_id, file_results)
-             
-        # Complete Job
-        self.supabase.table("job_run").update({
-            "status": "completed",
-            "progress_pct": 100,
-            "current_item_id": None
-        }).eq("job_id", job_id).execute()
-        
-        # --- v5.0 ACCURACY AUDIT ---
-        print(f"[PIPELINE v5.0] Running Post-Processing Accuracy Audit...")
-        self._run_post_processing_audit(job_id)
+            stages.append(Stage("update_graph", lambda: self._update_graph(job_id, file_results)))
+        if project_id:
+            stages.append(Stage("reasoning_synthesis", lambda: self.reasoning.synthesize_global_conclusion(job_id, project_id)))
+            stages.append(Stage("reports", lambda: self.reports.generate_and_save_latest_artifacts(project_id)))
+            if settings.EXPORT_PARQUET_ON_JOB_END:
+                stages.append(Stage("parquet_snapshot", lambda: self._export_parquet_snapshot(project_id)))
+            if settings.EMBEDDINGS_ON_JOB_END:
+                stages.append(Stage("embeddings", lambda: EmbeddingPipeline(self.supabase).embed_project(project_id)))
+        return stages
 
-        # --- v6.2 REASONING SYNTHESIS ---
-        print(f"[PIPELINE v6.2] Running Reasoning Synthesis...", flush=True)
-        try:
-            import asyncio
-            # Since _execute_plan is sync, we use a controlled async run
-            if project_id:
-                asyncio.run(self.reasoning.synthesize_global_conclusion(job_id, project_id))
-        except Exception as re_e:
-            print(f"[PIPELINE v6.2] ERROR in Reasoning Synthesis: {re_e}", flush=True)
-            traceback.print_exc()
+    def _run_post_processing_stages(self, job_id: str, project_id: Optional[str], file_results: List[ProcessingResult]):
+        """Runs the post-processing DAG; in the background unless POST_PROCESSING_BACKGROUND is off"""
+        graph = StageGraph(
+            self._build_post_processing_stages(job_id, project_id, file_results),
+            recorder=JobStageRecorder(self.supabase, job_id)
+        )
 
-        # --- v6.3 AUTOMATED ARTIFACT GENERATION ---
-        print(f"[PIPELINE v6.3] Generating Automated Reports & Artifacts...", flush=True)
-        try:
-            import asyncio
-            if project_id:
-                asyncio.run(self.reports.generate_and_save_latest_artifacts(project_id))
-        except Exception as art_e:
-            print(f"[PIPELINE v6.3] ERROR in Artifact Generation: {art_e}", flush=True)
-            traceback.print_exc()
+        def run():
+            try:
+                results = graph.run()
+                summary = {name: f"{res.status} {res.duration_ms}ms" for name, res in results.items()}
+                print(f"[PIPELINE] Post-processing finished for job {job_id}: {summary}", flush=True)
+            except Exception as e:
+                print(f"[PIPELINE] ERROR in post-processing stages: {e}", flush=True)
+                traceback.print_exc()
 
-        print(f"[PIPELINE v3] Execution Completed.", flush=True)
-        print(f"[PIPELINE] Metrics: {self._get_metrics_summary()}")
-        return True
+        if settings.POST_PROCESSING_BACKGROUND:
+            print(f"[PIPELINE] Post-processing stages scheduled in background", flush=True)
+            threading.Thread(target=run, name=f"post-processing-{job_id[:8]}", daemon=True).start()
+        else:
+            run()
 
-    def _process_item_v3(self, job_id: str, item: Dict, content: str, full_path: str) -> ProcessingResult:
+    def _export_parquet_snapshot(self, project_id: str) -> Dict[str, Any]:
+        """Writes the catalog as Parquet files into the solution sandbox (lineage_parquet/)"""
+        try:
+            target_dir = self.reports.artifacts.get_category_dir(project_id, "lineage_parquet")
+            return ParquetExportService(self.supabase).write_snapshot(project_id, target_dir)
+        except ParquetUnavailableError as e:
+            print(f"[PIPELINE] Parquet snapshot skipped: {e}", flush=True)
+            return {"skipped": str(e)}
+
+    def _process_item_v3(self, job_id: str, item: Dict, content: str, full_path: str, prefetched: Optional[ActionResult] = None) -> ProcessingResult:
         start_time = time.time()
         strategy = item.get("strategy")
         print(f"!!! MEGA TRACE: _process_item_v3 - Strategy: {strategy} (Type: {type(strategy)})")
@@ -348,7 +413,8 @@ class PipelineOrchestrator:
                 # Determine Action Profile based on file type / item type
                 action_name = self._determine_action_profile(item)
                 
-                res = self._extract_with_llm(job_id, full_path, content, action_name)
+                # Already extracted in a batched request
+                res = prefetched if prefetched is not None else self._extract_with_llm(job_id, full_path, content, action_name)
                 
                 if res.success:
                      return self._create_success_result(item["path"], strategy_val, res, start_time)
@@ -380,6 +446,65 @@ class PipelineOrchestrator:
         else:
             return "extract.strict" # Fallback (dotted)
 
+    def _is_batchable(self, item: Dict) -> bool:
+        """Small text files handled by a plain LLM extraction (no package parsing / vision)"""
+        strategy = item.get("strategy")
+        strategy_val = strategy.value if hasattr(strategy, 'value') else strategy
+        if strategy_val not in ("LLM_ONLY", "PARSER_PLUS_LLM"):
+            return False
+        if item.get("file_type", "").upper() in ["DTSX", "DSX", "XML", "JPG", "JPEG", "PNG"]:
+            return False
+        if item.get("path", "").lower().endswith((".dtsx", ".xml", ".dsx")):
+            return False
+        return 0 < (item.get("size_bytes") or 0) <= settings.LLM_BATCH_SMALL_FILE_BYTES
+
+    def _prefetch_batched_extractions(self, job_id: str, items: List[Dict], root_path: str) -> Dict[str, ActionResult]:
+        """
+        Groups small batchable items by action profile and runs them through
+        ActionRunner.run_action_batch. Returns item_id -> ActionResult.
+        Stops between LLM requests once the job is cancelled; items left out
+        go to the main loop, which aborts on the same check.
+        """
+        groups: Dict[str, List[Dict]] = {}
+        for item in items:
+            if self._is_batchable(item):
+                groups.setdefault(self._determine_action_profile(item), []).append(item)
+
+        prefetched: Dict[str, ActionResult] = {}
+        for action_name, group in groups.items():
+            if len(group) < 2:
+                continue
+            if self._is_cancelled(job_id):
+                break
+            batch_items, log_ids = [], {}
+            for item in group:
+                full_path = os.path.join(root_path, item["path"])
+                try:
+                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+                        content = f.read()
+                except Exception as e:
+                    print(f"[PIPELINE v3] Batch prefetch could not read {full_path}: {e}")
+                    continue
+                log_action_name = action_name.replace(".", "_")
+                log_ids[item["item_id"]] = self.logger.start_file_processing(job_id, full_path, log_action_name, len(content))
+                batch_items.append({
+                    "key": item["item_id"],
+                    "input_data": {"content": content, "extension": Path(full_path).suffix},
+                    "context": {"job_id": job_id, "file_path": full_path}
+                })
+
+            print(f"[PIPELINE v3] Batched extraction: {len(batch_items)} small files for {action_name}", flush=True)
+            results = self.action_runner.run_action_batch(action_name, batch_items, log_ids,
+                                                          should_stop=lambda: self._is_cancelled(job_id))
+            strat_for_audit = "PARSER_PLUS_LLM" if action_name == "extract.schema" else "LLM_ONLY"
+            for item_id, result in results.items():
+                if result.success:
+                    self.logger.complete_file_processing(log_ids[item_id], "success", strat_for_audit)
+                else:
+                    self.logger.log_file_error(log_ids[item_id], "llm_error", result.error_message)
+                prefetched[item_id] = result
+        return prefetched
+
     def _should_perform_deep_dive(self, item: Dict) -> bool:
         """Determines if the item qualifies for v4.0 Deep Dive"""
         ft = item.get("file_type", "").upper()
@@ -421,8 +546,10 @@ class PipelineOrchestrator:
                         if node_dict.get("name"): name_map[node_dict["name"]] = u_id
                         if node_dict.get("node_id"): id_name_map[node_dict["node_id"]] = u_id
             
+            # DataStage exports are mostly layout; compact before applying the size cap
+            llm_content = compact_dsx(content) if item["path"].lower().endswith(".dsx") else content
             llm_input = {
-                "content": content[:settings.MAX_CONTENT_CHARS],
+                "content": llm_content[:settings.MAX_CONTENT_CHARS],
                 "file_path": item["path"],
                 "file_type": item["file_type"],
                 "macro_nodes": macro_nodes
@@ -454,7 +581,7 @@ class PipelineOrchestrator:
                     # BUT wait, the previous fix to _extract_with_llm was needed because THAT was where macro ran.
                     # Here for Deep Dive, we are fine.
                     
-                    registry = ExtractorRegistry()
+                    registry = get_extractor_registry()
                     deep_result = registry.get_extractor(item["path"]).extract_deep(item["path"], content)
                     
                     if deep_result:
@@ -524,10 +651,14 @@ class PipelineOrchestrator:
             if macro_nodes:
                 # Heuristic: the first node of type PACKAGE or FILE might be our parent asset
                 assets = [n for n in macro_nodes if n["node_type"] in ["PACKAGE", "FILE"]]
-                if assets:
-                    # Note: sync_extraction_result might have assigned a different UUID in DB
-                    # This link is best-effort unless we return the id_map from catalog
-                    pass 
+                identity = self.catalog.identity
+                if assets and identity is not None and not pkg_data.get("asset_id"):
+                    # Only link assets the job's identity map knows are persisted (FK safe)
+                    for n in assets:
+                        asset_id = identity.existing_asset_id(n.get("name"), n["node_type"])
+                        if asset_id:
+                            pkg_data["asset_id"] = asset_id
+                            break
 
             package = Package(**pkg_data)
             
@@ -675,27 +806,33 @@ class PipelineOrchestrator:
         
         # Capture raw content for deterministic extractors before it potentially gets summarized for LLM
         raw_content = content 
+        structure_summary = None
+        path_aliases = None
+        compaction = None
 
         if is_ssis:
             try:
                 print(f"[PIPELINE v3] Running Deep Package Inspection (SSIS Parser) for {file_path}")
                 structure = SSISParser.parse_structure(content)
                 
-                # To avoid token limits with Flash models, we prioritize the structure summary
-                # and only include raw content if it's reasonably sized.
-                struct_json = json.dumps(structure, indent=2)
-                if len(content) > 20000:
-                    content = f"XML STRUCTURE SUMMARY:\n{struct_json}\n\nRAW CONTENT (Truncated):\n{content[:5000]}... [REST TRUNCATED]"
-                else:
-                    content = f"XML STRUCTURE SUMMARY:\n{struct_json}\n\nRAW CONTENT:\n{content}"
+                # The summary travels with every chunk; the raw XML is split on
+                # executables by the chunked runner instead of being truncated.
+                # Compaction: minified summary, no designer/GUID noise, aliased column paths.
+                structure_summary = f"XML STRUCTURE SUMMARY:\n{compact_structure(structure)}"
+                content, path_aliases = compact_ssis_xml(raw_content)
+                compaction = compaction_stats(
+                    f"XML STRUCTURE SUMMARY:\n{json.dumps(structure, indent=2)}\n\nRAW CONTENT:\n{raw_content}",
+                    structure_summary + json.dumps(path_aliases) + content
+                )
             except Exception as e:
                 print(f"[PIPELINE] SSIS Parser failed for {file_path}: {e}")
+                content = raw_content
                 
             # --- v4.2 Deterministic Macro Extraction ---
             # Using the new extract_macro from SSISDeepExtractor
             try:
                 print(f"[PIPELINE v4] Using Deterministic Macro Extraction for {file_path}")
-                registry = ExtractorRegistry()
+                registry = get_extractor_registry()
                 # Use raw_content to ensure valid XML parsing
                 macro_result = registry.extract(file_path, raw_content)
                 
@@ -716,12 +853,22 @@ class PipelineOrchestrator:
             try:
                 print(f"[PIPELINE v4] Running DataStage Structural Parser for {file_path}")
                 structure = DataStageParser.parse_structure(content)
-                content = f"DATASTAGE STRUCTURE SUMMARY:\n{json.dumps(structure, indent=2)}\n\nRAW CONTENT:\n{content}"
+                structure_summary = f"DATASTAGE STRUCTURE SUMMARY:\n{compact_structure(structure)}"
+                content = compact_dsx(raw_content)
+                compaction = compaction_stats(
+                    f"DATASTAGE STRUCTURE SUMMARY:\n{json.dumps(structure, indent=2)}\n\nRAW CONTENT:\n{raw_content}",
+                    structure_summary + content
+                )
             except Exception as e:
                 print(f"[PIPELINE] DataStage Parser failed for {file_path}: {e}")
+                content = raw_content
 
-        # Strategy Selection
-        llm_input = {"content": content[:settings.MAX_CONTENT_CHARS], "extension": Path(file_path).suffix}
+        # Strategy Selection (large inputs are chunked on structural boundaries, not truncated)
+        llm_input = {"content": content, "extension": Path(file_path).suffix}
+        if structure_summary:
+            llm_input["structure_summary"] = structure_summary
+        if path_aliases:
+            llm_input["path_aliases"] = path_aliases
         context = {"job_id": job_id, "file_path": file_path}
         
         # Audit Start
@@ -729,11 +876,14 @@ class PipelineOrchestrator:
         if action_name == "extract.lineage.package":
             log_action_name = "extract_strict"
             
-        log_id = self.logger.start_file_processing(job_id, file_path, log_action_name, len(content))
+        log_id = self.logger.start_file_processing(job_id, file_path, log_action_name, len(raw_content))
+        if compaction:
+            print(f"[PIPELINE] Compaction {file_path}: {compaction['original_tokens']} -> {compaction['compacted_tokens']} tokens")
+            self.logger.update_compaction_stats(log_id, compaction["original_tokens"], compaction["tokens_saved"])
         
         
         print(f"!!! MEGA TRACE: Calling ActionRunner for {action_name} (File: {file_path})")
-        result = self.action_runner.run_action(action_name, llm_input, context, log_id)
+        result = self.action_runner.run_action_chunked(action_name, llm_input, context, log_id)
         print(f"!!! MEGA TRACE: ActionRunner Result: Success={result.success}, Model={result.model_used}")
         
         if result.success:
@@ -824,6 +974,13 @@ class PipelineOrchestrator:
         pass
 
     def _update_job_progress(self, job_id: str, stage: str, pct: int = None):
+        # The dashboard follows /jobs/{id}/events; job_run (read by /stats and the SSE polling
+        # fallback) only every JOB_PROGRESS_WRITE_INTERVAL_SEC per item
+        self.events.publish(job_id, "progress", {"current_stage": stage, "progress_pct": pct})
+        now = time.monotonic()
+        if pct is not None and now - self._last_progress_write < settings.JOB_PROGRESS_WRITE_INTERVAL_SEC:
+            return
+        self._last_progress_write = now
         try:
             data = {"current_stage": stage}
             if pct is not None:
@@ -831,6 +988,24 @@ class PipelineOrchestrator:
             self.supabase.table("job_run").update(data).eq("job_id", job_id).execute()
         except: pass
 
+    def _is_cancelled(self, job_id: str) -> bool:
+        if self.events.is_cancelled(job_id):
+            return True
+        # Backstop even while listening: a NOTIFY can be missed (listener reconnecting, API
+        # without notify_job_event, status written straight to job_run). Throttled, not once per item.
+        now = time.monotonic()
+        if now - self._last_cancel_check < settings.JOB_CANCEL_POLL_SEC:
+            return False
+        self._last_cancel_check = now
+        try:
+            job_check = self.supabase.table("job_run").select("status").eq("job_id", job_id).single().execute()
+            if job_check.data and job_check.data.get("status") == "cancelled":
+                self.events.publish(job_id, "cancelled", {"status": "cancelled"}, broadcast=False)
+                return True
+        except Exception as cancel_e:
+            print(f"[PIPELINE v3] Error checking cancellation status: {cancel_e}")
+        return False
+
     def _update_job_status(self, job_id: str, status: str, msg: str = None, dtl: str = None):
         data = {"status": status}
         if msg: 
@@ -844,6 +1019,8 @@ class PipelineOrchestrator:
             self.supabase.table("job_run").update(data).eq("job_id", job_id).execute()
         except Exception as e:
             print(f"[PIPELINE ERROR] Failed to update job status: {e}", flush=True)
+        event_type = "failed" if status.lower() in ("error", "failed") else status.lower()
+        self.events.publish(job_id, event_type, {"status": status, "error_message": msg})
 
     def _create_success_result(self, file_path, strategy, res, start_time):
         return ProcessingResult(True, file_path, strategy, "extraction", data=res.data, processing_time_ms=int((time.time()-start_time)*1000))
@@ -898,7 +1075,7 @@ class PipelineOrchestrator:
             print(f"[PIPELINE] Graph Sync Completed.")
         except Exception as e:
             print(f"[PIPELINE ERROR] Graph Sync Failed: {e}")
-            traceback.print_exc()
+            raise
 
     def _run_post_processing_audit(self, job_id: str):
         """
@@ -919,7 +1096,11 @@ class PipelineOrchestrator:
             
             # Save Persistent Snapshot
             self.auditor.save_snapshot(job_id, report['audit'])
+            return {
+                "coverage_score": report['audit']['metrics']['coverage_score'],
+                "ai_suggestions": len(report['ai_suggestions'])
+            }
             
         except Exception as e:
             print(f"[AUDITOR ERROR] Audit failed: {e}")
-            traceback.print_exc()
+            raise
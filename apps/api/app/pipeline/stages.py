@@ -0,0 +1,139 @@
+"""
+Job stage graph (post-processing DAG).
+
+Stages declare their dependencies; every stage starts as soon as the stages
+it depends on have completed, so independent stages run concurrently. Each
+stage runs in its own thread (async stages get their own event loop there),
+because several of them do blocking LLM/DB calls even when declared async.
+Timings and outcomes are recorded per stage in job_stage_run.
+"""
+import asyncio
+import inspect
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[[], Any]  # no arguments; may return a coroutine (run on the stage's own loop)
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # completed | failed | skipped
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_ms: int = 0
+    result: Any = None
+    error: Optional[str] = None
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+class JobStageRecorder:
+    """Persists stage outcomes to job_stage_run (best effort)"""
+
+    def __init__(self, supabase, job_id: str):
+        self.supabase = supabase
+        self.job_id = job_id
+
+    def record(self, res: StageResult):
+        row = {
+            "job_id": self.job_id,
+            "stage_name": res.name,
+            "status": res.status,
+            "started_at": (res.started_at or datetime.now(timezone.utc)).isoformat(),
+            "finished_at": res.finished_at.isoformat() if res.finished_at else None,
+            "duration_ms": res.duration_ms,
+            "metrics": res.metrics or None,
+            "error": {"message": res.error} if res.error else None,
+        }
+        try:
+            self.supabase.table("job_stage_run").insert(row).execute()
+        except Exception as e:
+            print(f"[STAGES] Could not record stage {res.name}: {e}")
+
+
+class StageGraph:
+    def __init__(self, stages: List[Stage], recorder: Optional[JobStageRecorder] = None):
+        self.stages = {s.name: s for s in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Duplicate stage names")
+        self.recorder = recorder
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            missing = [d for d in stage.depends_on if d not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+        # Cycle check (DFS)
+        state: Dict[str, int] = {}
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == 1:
+                raise ValueError(f"Stage dependency cycle: {' -> '.join(path + [name])}")
+            if state.get(name) == 2:
+                return
+            state[name] = 1
+            for dep in self.stages[name].depends_on:
+                visit(dep, path + [name])
+            state[name] = 2
+
+        for name in self.stages:
+            visit(name, [])
+
+    def run(self) -> Dict[str, StageResult]:
+        """Runs the whole graph (blocking). Call from a thread without a running event loop."""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self) -> Dict[str, StageResult]:
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: Stage) -> StageResult:
+            deps = [await tasks[d] for d in stage.depends_on]
+            failed = [d.name for d in deps if d.status != "completed"]
+            if failed:
+                res = StageResult(stage.name, "skipped", error=f"Dependencies not completed: {failed}")
+                self._record(res)
+                return res
+            return await self._execute(stage)
+
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+        results = await asyncio.gather(*tasks.values())
+        return {res.name: res for res in results}
+
+    async def _execute(self, stage: Stage) -> StageResult:
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        print(f"[STAGES] Starting stage: {stage.name}", flush=True)
+        try:
+            result = await asyncio.to_thread(self._call, stage.func)
+            status, error = "completed", None
+        except Exception as e:
+            traceback.print_exc()
+            result, status, error = None, "failed", str(e)
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        # Scalar values of a dict result are kept as stage metrics
+        metrics = {k: v for k, v in result.items() if isinstance(v, (int, float, str, bool))} if isinstance(result, dict) else {}
+        res = StageResult(stage.name, status, started_at, datetime.now(timezone.utc), duration_ms, result, error, metrics)
+        print(f"[STAGES] Stage {stage.name} {status} in {duration_ms}ms", flush=True)
+        self._record(res)
+        return res
+
+    @staticmethod
+    def _call(func: Callable[[], Any]) -> Any:
+        result = func()
+        if inspect.iscoroutine(result):
+            return asyncio.run(result)
+        return result
+
+    def _record(self, res: StageResult):
+        if self.recorder is not None:
+            self.recorder.record(res)
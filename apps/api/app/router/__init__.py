@@ -2,6 +2,8 @@
 Model Router - Sistema de routing de modelos por acción
 """
 import os
+import time
+import threading
 import yaml
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
@@ -30,20 +32,33 @@ class ModelRouter:
     Lee la configuración activa vía ConfigManager o cae a models.yml
     """
     
-    def __init__(self, config_path: str = None):
+    # Segundos entre comprobaciones de mtime (hot reload). 0 = comprobar en cada llamada.
+    RELOAD_CHECK_INTERVAL_SEC = float(os.getenv("MODEL_ROUTER_RELOAD_INTERVAL_SEC", "5"))
+
+    def __init__(self, config_path: str = None, config_root: str = None):
         from ..services.config_manager import ConfigManager
         
-        self.config_root = os.path.join(Path(__file__).parent.parent.parent, "config")
+        self.config_root = config_root or os.path.join(Path(__file__).parent.parent.parent, "config")
         self.config_manager = ConfigManager(self.config_root)
+        self.config_path = config_path
+        self.reload_interval = self.RELOAD_CHECK_INTERVAL_SEC
+        self._lock = threading.RLock()
+        self._action_cache: Dict[str, ActionConfig] = {}
+        self._version = None
+        self._last_check = 0.0
         
-        # Intentar cargar config activa
+        self._load_active_config()
+
+    def _load_active_config(self):
+        """Carga la configuración activa (economy / v3 / legacy) y limpia la memoización."""
+        routing_path = None
         try:
             # Check for Economy Mode override via ENV
             economy_mode = os.getenv("LLM_ECONOMY_MODE", "false").lower() == "true"
             
             if economy_mode:
                 routing_path = "routings/routing-economy-groq.yml"
-                self.config = self.config_manager.get_routing(routing_path)
+                config = self.config_manager.get_routing(routing_path)
                 # Ensure we use groq provider for economy mode
                 self.provider_name = "groq"
                 print(f"[ROUTER] ⚡ ECONOMY MODE ACTIVE: Overriding to {routing_path} (Provider: {self.provider_name})")
@@ -51,22 +66,46 @@ class ModelRouter:
                 active = self.config_manager.get_active_config()
                 if active and active.get("routing"):
                     routing_path = active.get("routing")
-                    self.config = self.config_manager.get_routing(routing_path)
+                    config = self.config_manager.get_routing(routing_path)
                     self.provider_name = self._extract_provider_name(active.get("provider"))
                     print(f"[ROUTER] Loaded v3 routing: {routing_path} (Provider: {self.provider_name})")
                 else:
                     raise Exception("No active v3 config")
-                    
+            self.config = config
             print(f"[ROUTER] Actions in YAML: {list(self.config.get('actions', {}).keys())}")
         except Exception as e:
             print(f"[ROUTER] Fallback to legacy models.yml: {e}")
+            routing_path = None
             self.provider_name = "openrouter" # Legacy default
-            if config_path is None:
-                config_path = os.path.join(self.config_root, "models.yml")
-            self.config_path = config_path
+            if self.config_path is None:
+                self.config_path = os.path.join(self.config_root, "models.yml")
             self.config = self._load_config()
             
         self._validate_config()
+        self._routing_path = routing_path
+        self._action_cache = {}
+        self._version = self._current_version()
+        self._last_check = time.monotonic()
+
+    def _current_version(self):
+        """Version stamp (mtimes) de active.yml + routing activo, o de models.yml en modo legacy."""
+        if self._routing_path is None and self.config_path:
+            manager = self.config_manager
+            return ("legacy", manager._mtime(manager.active_path), manager._mtime(Path(self.config_path)))
+        return self.config_manager.get_config_version(self._routing_path)
+
+    def _maybe_reload(self):
+        """Hot reload: como mucho un stat() cada RELOAD_CHECK_INTERVAL_SEC."""
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        with self._lock:
+            if now - self._last_check < self.reload_interval:
+                return
+            self._last_check = now
+            if self._current_version() != self._version:
+                print("[ROUTER] Config change detected (active.yml / routing). Reloading...")
+                self._load_active_config()
 
     def _extract_provider_name(self, provider_path: str) -> str:
         if not provider_path: return "openrouter"
@@ -93,6 +132,17 @@ class ModelRouter:
             self.config["actions"] = {}
 
     def get_action_config(self, action_name: str) -> ActionConfig:
+        self._maybe_reload()
+        cached = self._action_cache.get(action_name)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            action_config = self._resolve_action_config(action_name)
+            self._action_cache[action_name] = action_config
+            return action_config
+
+    def _resolve_action_config(self, action_name: str) -> ActionConfig:
         if action_name not in self.config["actions"]:
             # Fallback dinámico si la acción no está en el YAML pero queremos ejecutarla
             print(f"[ROUTER] Warning: Action '{action_name}' not in config. Using defaults.")
@@ -151,6 +201,7 @@ class ModelRouter:
     
     def get_available_actions(self) -> List[str]:
         """Obtiene lista de acciones disponibles"""
+        self._maybe_reload()
         return list(self.config["actions"].keys())
     
     def get_config_summary(self) -> Dict[str, Any]:
@@ -163,9 +214,9 @@ class ModelRouter:
         }
     
     def reload_config(self):
-        """Recarga la configuración desde el archivo"""
-        self.config = self._load_config()
-        self._validate_config()
+        """Recarga la configuración (economy / v3 / legacy) y descarta las acciones memoizadas"""
+        with self._lock:
+            self._load_active_config()
 
 # Singleton instance
 _router_instance = None
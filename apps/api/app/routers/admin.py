@@ -2,14 +2,17 @@ import os
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Dict, List, Optional, Any
-from supabase import create_client, Client
+from supabase import Client
 from ..config import settings
+from ..services.supabase_client import get_supabase_client
 from ..services.config_manager import ConfigManager
+from ..router import get_model_router
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 def get_supabase():
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    # Shared pooled client (keep-alive connections reused across requests)
+    return get_supabase_client()
 
 # --- Model Config (Existing) ---
 
@@ -32,6 +35,8 @@ async def activate_model_config(req: ActivateConfigRequest):
     manager = ConfigManager(config_dir)
     try:
         manager.activate_config(req.provider_path, req.routing_path)
+        # Efecto inmediato en este proceso; los workers lo detectan por mtime (hot reload)
+        get_model_router().reload_config()
         return {"status": "success", "message": f"Activated {req.routing_path}"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -118,6 +123,7 @@ async def save_config_file(req: SaveConfigRequest):
     manager = ConfigManager(config_dir)
     try:
         manager.write_config_file(req.path, req.content)
+        get_model_router().reload_config()
         return {"status": "success", "message": f"Saved {req.path}"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,48 +1,84 @@
+import os
+import tempfile
+from typing import Iterator, Optional
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import Response, StreamingResponse
+from fastapi.responses import Response, StreamingResponse, FileResponse
+from starlette.background import BackgroundTask
 from supabase import Client
-from ..services.governance_service import GovernanceExportService
+from ..services.governance_service import GovernanceExportService, gzip_stream
+from ..services.parquet_export import ParquetExportService, ParquetUnavailableError, PARQUET_TABLES
 from .admin import get_supabase
-import io
 
 router = APIRouter(prefix="/admin/governance", tags=["governance"])
 
+def _stream_export(chunks: Iterator[str], media_type: str, filename: str, gzip: bool) -> StreamingResponse:
+    """Streams an export page by page; with gzip=true the download is a .gz file"""
+    if gzip:
+        return StreamingResponse(
+            gzip_stream(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f"attachment; filename={filename}.gz"}
+        )
+    return StreamingResponse(
+        (chunk.encode("utf-8") for chunk in chunks),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 @router.get("/export/{project_id}/purview")
-def export_purview(project_id: str, supabase: Client = Depends(get_supabase)):
+def export_purview(project_id: str, gzip: bool = False, supabase: Client = Depends(get_supabase)):
     service = GovernanceExportService(supabase)
-    csv_content = service.export_for_purview(project_id)
-    return Response(
-        content=csv_content,
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename=purview_export_{project_id[:8]}.csv"}
-    )
+    return _stream_export(service.iter_purview_csv(project_id), "text/csv",
+                          f"purview_export_{project_id[:8]}.csv", gzip)
 
 @router.get("/export/{project_id}/unity-catalog")
-def export_unity_catalog(project_id: str, supabase: Client = Depends(get_supabase)):
+def export_unity_catalog(project_id: str, gzip: bool = False, supabase: Client = Depends(get_supabase)):
     service = GovernanceExportService(supabase)
-    csv_content = service.export_for_unity_catalog(project_id)
-    return Response(
-        content=csv_content,
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename=unity_catalog_export_{project_id[:8]}.csv"}
-    )
+    return _stream_export(service.iter_unity_catalog_csv(project_id), "text/csv",
+                          f"unity_catalog_export_{project_id[:8]}.csv", gzip)
 
 @router.get("/export/{project_id}/dbt")
-def export_dbt(project_id: str, supabase: Client = Depends(get_supabase)):
+def export_dbt(project_id: str, gzip: bool = False, supabase: Client = Depends(get_supabase)):
     service = GovernanceExportService(supabase)
-    yml_content = service.export_for_dbt(project_id)
-    return Response(
-        content=yml_content,
-        media_type="text/yaml",
-        headers={"Content-Disposition": f"attachment; filename=dbt_sources_{project_id[:8]}.yml"}
-    )
+    return _stream_export(service.iter_dbt_sources(project_id), "text/yaml",
+                          f"dbt_sources_{project_id[:8]}.yml", gzip)
 
 @router.get("/export/{project_id}/raw")
-def export_raw(project_id: str, supabase: Client = Depends(get_supabase)):
+def export_raw(project_id: str, gzip: bool = False, supabase: Client = Depends(get_supabase)):
     service = GovernanceExportService(supabase)
-    json_content = service.export_raw_json(project_id)
-    return Response(
-        content=json_content,
-        media_type="application/json",
-        headers={"Content-Disposition": f"attachment; filename=discoverai_export_{project_id[:8]}.json"}
+    return _stream_export(service.iter_raw_json(project_id), "application/json",
+                          f"discoverai_export_{project_id[:8]}.json", gzip)
+
+@router.get("/export/{project_id}/parquet")
+def export_parquet(project_id: str, table: Optional[str] = None, supabase: Client = Depends(get_supabase)):
+    """
+    Columnar snapshot of the catalog: one .parquet for `table`, otherwise a .zip
+    with asset, edge_index, column_lineage, package_component and transformation_ir.
+    """
+    if table is not None and table not in PARQUET_TABLES:
+        raise HTTPException(status_code=400, detail=f"Unknown table '{table}'. Expected one of: {', '.join(PARQUET_TABLES)}")
+
+    service = ParquetExportService(supabase)
+    suffix = ".parquet" if table else ".zip"
+    fd, tmp_path = tempfile.mkstemp(prefix="parquet_export_", suffix=suffix)
+    os.close(fd)
+    try:
+        if table:
+            service.write_table(project_id, table, tmp_path)
+            filename = f"{table}_{project_id[:8]}.parquet"
+        else:
+            service.write_snapshot_zip(project_id, tmp_path)
+            filename = f"lineage_snapshot_{project_id[:8]}.zip"
+    except ParquetUnavailableError as e:
+        os.remove(tmp_path)
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+    return FileResponse(
+        tmp_path,
+        media_type="application/vnd.apache.parquet" if table else "application/zip",
+        filename=filename,
+        background=BackgroundTask(os.remove, tmp_path)
     )
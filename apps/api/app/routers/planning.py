@@ -1,7 +1,8 @@
 import asyncio
 from fastapi import APIRouter, HTTPException, Depends
-from supabase import Client, create_client
+from supabase import Client
 from ..config import settings
+from ..services.supabase_client import get_supabase_client
 from ..services.planner import PlannerService
 from ..models.planning import (
     JobPlan, JobPlanStatus, CreatePlanRequest, UpdatePlanItemRequest
@@ -11,7 +12,8 @@ from ..services.queue import SQLJobQueue
 router = APIRouter()
 
 def get_supabase() -> Client:
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    # Shared pooled client (keep-alive connections reused across requests)
+    return get_supabase_client()
 
 @router.post("/solutions/{solution_id}/plans")
 async def create_plan(solution_id: str, request: CreatePlanRequest, supabase: Client = Depends(get_supabase)):
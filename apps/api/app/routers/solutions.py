@@ -1,7 +1,9 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict, Any
-from supabase import create_client, Client
+from supabase import Client
 from ..config import settings
+from ..services.supabase_client import get_supabase_client
 from ..services.report_service import ReportService
 from ..services.catalog import CatalogService
 from ..services.reset_service import NuclearResetService
@@ -10,7 +12,8 @@ from ..services.queue import SQLJobQueue
 router = APIRouter(prefix="/solutions", tags=["solutions"])
 
 def get_supabase():
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    # Shared pooled client (keep-alive connections reused across requests)
+    return get_supabase_client()
 
 def _clear_stuck_jobs(supabase: Client, solution_id: str):
     """Marks any 'queued', 'running', or 'planning_ready' jobs as 'failed' for this solution."""
@@ -39,7 +42,7 @@ async def get_solution_report_pdf(solution_id: str, supabase: Client = Depends(g
     report_service = ReportService(supabase)
     try:
         data = await report_service.get_solution_summary(solution_id)
-        buffer = report_service.generate_pdf_buffer(data)
+        buffer = await asyncio.to_thread(report_service.generate_pdf_buffer, data)
         
         # En una versión real usaríamos StreamingResponse con media_type="application/pdf"
         from fastapi.responses import Response
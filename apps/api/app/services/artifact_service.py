@@ -26,14 +26,18 @@ class ArtifactService:
             os.makedirs(path, exist_ok=True)
         return path
 
+    def get_category_dir(self, solution_id: str, category: str) -> str:
+        """Returns and ensures a category folder inside the solution's sandbox."""
+        category_dir = os.path.join(self.get_solution_dir(solution_id), category)
+        os.makedirs(category_dir, exist_ok=True)
+        return category_dir
+
     def save_artifact(self, solution_id: str, filename: str, content: bytes, category: str = "reports") -> str:
         """
         Saves a binary or text artifact to the solution's sandbox.
         Returns the relative path for metadata storage.
         """
-        sol_dir = self.get_solution_dir(solution_id)
-        category_dir = os.path.join(sol_dir, category)
-        os.makedirs(category_dir, exist_ok=True)
+        category_dir = self.get_category_dir(solution_id, category)
         
         target_path = os.path.join(category_dir, filename)
         
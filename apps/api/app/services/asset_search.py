@@ -0,0 +1,149 @@
+"""
+Asset browsing for the catalog page (GET /solutions/{id}/assets, /asset-types).
+
+search_assets (migration 25) pages with a keyset cursor over (name_display,
+asset_id) and matches name_display / canonical_name through trigram indexes;
+counts are planner estimates (estimate_asset_count) cached for a few seconds,
+and distinct types come from a loose index scan (get_asset_types). When the
+RPCs fail (not deployed yet, transient errors) it falls back to PostgREST
+queries and tries search_assets again after RPC_RETRY_SEC.
+"""
+import base64
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+from .cache import TTLCache
+from .supabase_client import get_supabase_client
+
+
+def encode_cursor(name: str, asset_id: str) -> str:
+    raw = json.dumps([name, asset_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Returns (name_display, asset_id); raises ValueError on malformed cursors"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, asset_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    return str(name), str(asset_id)
+
+
+class AssetSearchService:
+    def __init__(self, supabase_client=None, ttl_seconds: Optional[float] = None):
+        self._supabase = supabase_client
+        self.cache = TTLCache(ttl_seconds if ttl_seconds is not None else settings.ASSET_SEARCH_CACHE_TTL_SEC)
+        self._rpc_retry_at = 0.0
+
+    @property
+    def supabase(self):
+        if self._supabase is None:
+            self._supabase = get_supabase_client()
+        return self._supabase
+
+    @staticmethod
+    def _normalize(type: Optional[str], search: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        type = None if not type or type == "ALL" else type
+        search = (search or "").strip() or None
+        return type, search
+
+    def search(self, project_id: str, type: Optional[str] = None, search: Optional[str] = None,
+               limit: int = 50, cursor: Optional[str] = None, offset: int = 0) -> Dict[str, Any]:
+        """
+        One page of assets ordered by name. Returns {"data", "count", "count_estimated", "next_cursor"}.
+        `offset` is kept for old clients and only honoured without a cursor (legacy path).
+        """
+        type, search = self._normalize(type, search)
+        limit = max(1, min(limit, settings.ASSET_SEARCH_MAX_LIMIT))
+        after = decode_cursor(cursor) if cursor else None
+
+        rows = None
+        if time.monotonic() >= self._rpc_retry_at and not (offset and after is None):
+            rows = self._search_rpc(project_id, type, search, limit, after)
+        if rows is None:
+            return self._search_legacy(project_id, type, search, limit, after, offset)
+
+        next_cursor = encode_cursor(rows[-1]["name_display"], rows[-1]["asset_id"]) if len(rows) == limit else None
+        return {
+            "data": rows,
+            "count": self.estimate_count(project_id, type, search),
+            "count_estimated": True,
+            "next_cursor": next_cursor,
+        }
+
+    def _search_rpc(self, project_id: str, type: Optional[str], search: Optional[str], limit: int,
+                    after: Optional[Tuple[str, str]]) -> Optional[List[Dict[str, Any]]]:
+        try:
+            res = self.supabase.rpc("search_assets", {
+                "p_project_id": project_id,
+                "p_search": search,
+                "p_type": type,
+                "p_after_name": after[0] if after else None,
+                "p_after_id": after[1] if after else None,
+                "p_limit": limit,
+            }).execute()
+            return res.data or []
+        except Exception as e:
+            print(f"[ASSETS] search_assets RPC failed, PostgREST filters for {settings.RPC_RETRY_SEC:g}s: {e}")
+            self._rpc_retry_at = time.monotonic() + settings.RPC_RETRY_SEC
+            return None
+
+    def estimate_count(self, project_id: str, type: Optional[str] = None, search: Optional[str] = None) -> Optional[int]:
+        def load():
+            try:
+                res = self.supabase.rpc("estimate_asset_count", {
+                    "p_project_id": project_id, "p_search": search, "p_type": type
+                }).execute()
+                return int(res.data) if res.data is not None else None
+            except Exception as e:
+                print(f"[ASSETS] estimate_asset_count failed: {e}")
+                return None
+        return self.cache.get_or_set(("count", project_id, type, search), load)
+
+    def _search_legacy(self, project_id: str, type: Optional[str], search: Optional[str], limit: int,
+                       after: Optional[Tuple[str, str]], offset: int) -> Dict[str, Any]:
+        # count="estimated": exact under PostgREST's max-rows, planner estimate above it
+        query = self.supabase.table("asset").select("*", count="estimated").eq("project_id", project_id)
+        if type:
+            # Use ilike for case-insensitive exact match
+            query = query.ilike("asset_type", type)
+        if search:
+            query = query.ilike("name_display", f"%{search}%")
+        if after:
+            name, asset_id = after
+            quoted = json.dumps(name)
+            query = query.or_(f"name_display.gt.{quoted},and(name_display.eq.{quoted},asset_id.gt.{asset_id})")
+            query = query.order("name_display").order("asset_id").limit(limit)
+        else:
+            query = query.order("name_display").order("asset_id").range(offset, offset + limit - 1)
+        res = query.execute()
+        rows = res.data or []
+        next_cursor = encode_cursor(rows[-1]["name_display"], rows[-1]["asset_id"]) if len(rows) == limit else None
+        return {"data": rows, "count": res.count, "count_estimated": True, "next_cursor": next_cursor}
+
+    def asset_types(self, project_id: str) -> List[str]:
+        return self.cache.get_or_set(("types", project_id), lambda: self._load_types(project_id))
+
+    def _load_types(self, project_id: str) -> List[str]:
+        try:
+            res = self.supabase.rpc("get_asset_types", {"p_project_id": project_id}).execute()
+            return sorted(row["asset_type"] for row in (res.data or []) if row.get("asset_type"))
+        except Exception as e:
+            print(f"[ASSETS] get_asset_types RPC unavailable, scanning asset types: {e}")
+        # Legacy: only the asset_type column, distinct in memory
+        res = self.supabase.table("asset").select("asset_type").eq("project_id", project_id).execute()
+        return sorted(set(item["asset_type"] for item in (res.data or []) if item.get("asset_type")))
+
+
+_asset_search_service = None
+
+def get_asset_search_service() -> AssetSearchService:
+    """Singleton shared by the asset endpoints (one cache per process)"""
+    global _asset_search_service
+    if _asset_search_service is None:
+        _asset_search_service = AssetSearchService()
+    return _asset_search_service
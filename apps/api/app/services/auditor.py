@@ -3,6 +3,7 @@ from typing import Dict, List, Any, Optional
 import logging
 import uuid
 from datetime import datetime
+from .catalog import FUNCTIONAL_ASSET_TYPES
 
 logger = logging.getLogger(__name__)
 
@@ -10,19 +11,21 @@ class DiscoveryAuditor:
     def __init__(self, supabase: Client):
         self.supabase = supabase
 
+    FUNCTIONAL_TYPES = sorted(FUNCTIONAL_ASSET_TYPES)
+    ORPHAN_GAP_LIMIT = 10
+
     def run_audit(self, project_id: str) -> Dict[str, Any]:
         """
         Runs a full accuracy and coverage audit for a project.
+        Metrics are aggregated in the database (audit_project_metrics RPC), so
+        worker memory does not grow with the number of assets/lineage rows.
         """
         logger.info(f"[AUDITOR] Running audit for project {project_id}")
         
-        # 1. Fetch Data
-        assets = self.supabase.table("asset").select("*").eq("project_id", project_id).execute().data or []
-        edges = self.supabase.table("edge_index").select("*").eq("project_id", project_id).execute().data or []
-        col_lineage = self.supabase.table("column_lineage").select("*").eq("project_id", project_id).execute().data or []
-        packages = self.supabase.table("package").select("*").eq("project_id", project_id).execute().data or []
+        # 1. Fetch aggregated metrics
+        m = self.get_project_metrics(project_id)
         
-        if not assets and not packages:
+        if not m["total_assets"] and not m["package_count"]:
             return {
                 "project_id": project_id,
                 "timestamp": datetime.now().isoformat(),
@@ -38,46 +41,14 @@ class DiscoveryAuditor:
             }
 
         # 2. Calculate Metrics
-        total_assets = len(assets)
-        total_edges = len(edges) + len(col_lineage)
-        
-        # Confidence & Hypotheses
-        all_conf = [e.get("confidence", 1.0) for e in edges] + [l.get("confidence", 1.0) for l in col_lineage]
-        avg_conf = sum(all_conf) / len(all_conf) if all_conf else 1.0
-        
-        hypothesis_count = len([e for e in edges if e.get("is_hypothesis")])
-        hypothesis_ratio = (hypothesis_count / len(edges)) * 100 if edges else 0.0
-        
-        # Coverage Estimation
-        functional_types = ["TABLE", "VIEW", "PIPELINE", "SCRIPT", "PACKAGE", "STORED_PROCEDURE"]
-        functional_assets = [a for a in assets if a.get("asset_type", "").upper() in functional_types]
-        connected_assets = set()
-        for e in edges:
-            connected_assets.add(e["from_asset_id"])
-            connected_assets.add(e["to_asset_id"])
-        
-        # Add column lineage connections
-        for l in col_lineage:
-            if l.get("source_asset_id"): connected_assets.add(l["source_asset_id"])
-            if l.get("target_asset_id"): connected_assets.add(l["target_asset_id"])
-            
-        documented_count = len([a for a in functional_assets if a["asset_id"] in connected_assets])
-        
-        # If we have packages but no assets connected yet, check if package components exist
-        if not documented_count and packages:
-            # Check for package enrichment
-            documented_count = len(packages) # Basic fallback if packages exist
-            
-        raw_score = (documented_count / len(functional_assets)) * 100 if functional_assets else 0.0
-        coverage_score = min(raw_score, 100.0)
-        
-        if not functional_assets and packages: coverage_score = 100.0 # If only packages exist
+        metrics = self.compute_metrics(m)
+        coverage_score = metrics["coverage_score"]
+        avg_conf = metrics["avg_confidence"]
         
         # 3. Identify Gaps
         gaps = []
-        # Find orphan functional assets
-        orphans = [a for a in functional_assets if a["asset_id"] not in connected_assets]
-        for orphan in orphans[:10]: # Limit gaps to top 10
+        # Orphan functional assets (top N already selected by the RPC)
+        for orphan in m["orphans"][:self.ORPHAN_GAP_LIMIT]:
             gaps.append({
                 "type": "ORPHAN_ASSET",
                 "asset_name": orphan["name_display"],
@@ -87,13 +58,12 @@ class DiscoveryAuditor:
             })
             
         # Find low confidence clusters
-        low_conf_edges = [e for e in edges if e.get("confidence", 1.0) < 0.5]
-        if low_conf_edges:
+        if m["low_confidence_count"]:
             gaps.append({
                 "type": "LOW_CONFIDENCE_CLUSTER",
-                "count": len(low_conf_edges),
+                "count": m["low_confidence_count"],
                 "severity": "HIGH",
-                "description": f"Found {len(low_conf_edges)} relationships with confidence below 50%."
+                "description": f"Found {m['low_confidence_count']} relationships with confidence below 50%."
             })
 
         # 4. Generate Recommendations
@@ -104,23 +74,139 @@ class DiscoveryAuditor:
         if avg_conf < 0.7:
             recommendations.append("Consider upgrading to a High-IQ model (GPT-4o / Grok-1) to resolve ambiguities.")
             
-        if orphans:
-            recommendations.append(f"Define naming conventions in the Org Layer to help resolve {len(orphans)} orphan assets.")
+        if m["orphan_count"]:
+            recommendations.append(f"Define naming conventions in the Org Layer to help resolve {m['orphan_count']} orphan assets.")
 
         return {
             "project_id": project_id,
             "timestamp": datetime.now().isoformat(),
-            "metrics": {
-                "total_assets": total_assets,
-                "total_relationships": total_edges,
-                "coverage_score": round(coverage_score, 2),
-                "avg_confidence": round(avg_conf, 2),
-                "hypothesis_ratio": round(hypothesis_ratio, 2)
-            },
+            "metrics": metrics,
             "gaps": gaps,
             "recommendations": recommendations
         }
 
+    @staticmethod
+    def compute_metrics(m: Dict[str, Any]) -> Dict[str, Any]:
+        """Snapshot metrics from the audit counters (also used for live coverage during a job)"""
+        total_edges = m["edge_count"] + m["lineage_count"]
+        
+        # Confidence & Hypotheses
+        avg_conf = float(m["confidence_sum"]) / total_edges if total_edges else 1.0
+        hypothesis_ratio = (m["hypothesis_count"] / m["edge_count"]) * 100 if m["edge_count"] else 0.0
+        
+        # Coverage Estimation
+        functional_count = m["functional_count"]
+        documented_count = m["documented_count"]
+        
+        # If we have packages but no assets connected yet, check if package components exist
+        if not documented_count and m["package_count"]:
+            # Check for package enrichment
+            documented_count = m["package_count"] # Basic fallback if packages exist
+            
+        raw_score = (documented_count / functional_count) * 100 if functional_count else 0.0
+        coverage_score = min(raw_score, 100.0)
+        
+        if not functional_count and m["package_count"]: coverage_score = 100.0 # If only packages exist
+
+        return {
+            "total_assets": m["total_assets"],
+            "total_relationships": total_edges,
+            "coverage_score": round(coverage_score, 2),
+            "avg_confidence": round(avg_conf, 2),
+            "hypothesis_ratio": round(hypothesis_ratio, 2)
+        }
+
+    @staticmethod
+    def counters_from_stats_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Maps a project_audit_stats row to the counter names used by compute_metrics"""
+        return {
+            "total_assets": row.get("asset_count") or 0,
+            "package_count": row.get("package_count") or 0,
+            "edge_count": row.get("edge_count") or 0,
+            "lineage_count": row.get("lineage_count") or 0,
+            "confidence_sum": float(row.get("confidence_sum") or 0.0),
+            "hypothesis_count": row.get("hypothesis_count") or 0,
+            "low_confidence_count": row.get("low_confidence_count") or 0,
+            "functional_count": row.get("functional_count") or 0,
+            "documented_count": row.get("documented_count") or 0,
+        }
+
+    def get_project_metrics(self, project_id: str) -> Dict[str, Any]:
+        """
+        Counters used by the audit: totals, confidence sum, hypotheses, functional /
+        documented / orphan assets and the top-N orphans.
+        Reads the incremental accumulators (project_audit_stats, kept by CatalogService);
+        projects without a stats row are seeded once with rebuild_audit_stats. Falls back
+        to a full aggregation (RPC, then client-side) if those functions are not deployed.
+        """
+        try:
+            params = {"p_project_id": project_id, "p_orphan_limit": self.ORPHAN_GAP_LIMIT}
+            res = self.supabase.rpc("get_audit_stats", params).execute()
+            if not isinstance(res.data, dict):
+                self.supabase.rpc("rebuild_audit_stats", {"p_project_id": project_id}).execute()
+                res = self.supabase.rpc("get_audit_stats", params).execute()
+            if isinstance(res.data, dict):
+                return self._normalize_metrics(res.data)
+        except Exception as e:
+            logger.warning(f"[AUDITOR] Incremental audit stats unavailable, recomputing: {e}")
+        return self._aggregate_project_metrics(project_id)
+
+    @staticmethod
+    def _normalize_metrics(data: Dict[str, Any]) -> Dict[str, Any]:
+        m = dict(data)
+        m["confidence_sum"] = float(m.get("confidence_sum") or 0.0)
+        m["orphans"] = m.get("orphans") or []
+        return m
+
+    def _aggregate_project_metrics(self, project_id: str) -> Dict[str, Any]:
+        """Full recompute: one aggregation RPC, or client-side if it is not deployed"""
+        try:
+            res = self.supabase.rpc("audit_project_metrics", {
+                "p_project_id": project_id,
+                "p_orphan_limit": self.ORPHAN_GAP_LIMIT
+            }).execute()
+            if isinstance(res.data, dict):
+                return self._normalize_metrics(res.data)
+        except Exception as e:
+            logger.warning(f"[AUDITOR] audit_project_metrics RPC unavailable, aggregating client-side: {e}")
+        return self._compute_metrics_client_side(project_id)
+
+    def _compute_metrics_client_side(self, project_id: str) -> Dict[str, Any]:
+        """Legacy path: same counters computed from narrow row fetches"""
+        assets = self.supabase.table("asset").select("asset_id, asset_type, name_display").eq("project_id", project_id).execute().data or []
+        edges = self.supabase.table("edge_index").select("from_asset_id, to_asset_id, confidence, is_hypothesis").eq("project_id", project_id).execute().data or []
+        col_lineage = self.supabase.table("column_lineage").select("source_asset_id, target_asset_id, confidence").eq("project_id", project_id).execute().data or []
+        packages = self.supabase.table("package").select("package_id").eq("project_id", project_id).execute().data or []
+
+        def conf(row):
+            value = row.get("confidence")
+            return float(value) if value is not None else 1.0
+
+        connected_assets = set()
+        for e in edges:
+            connected_assets.add(e["from_asset_id"])
+            connected_assets.add(e["to_asset_id"])
+        for l in col_lineage:
+            if l.get("source_asset_id"): connected_assets.add(l["source_asset_id"])
+            if l.get("target_asset_id"): connected_assets.add(l["target_asset_id"])
+
+        functional_assets = [a for a in assets if (a.get("asset_type") or "").upper() in self.FUNCTIONAL_TYPES]
+        orphans = sorted((a for a in functional_assets if a["asset_id"] not in connected_assets), key=lambda a: a.get("name_display") or "")
+
+        return {
+            "total_assets": len(assets),
+            "package_count": len(packages),
+            "edge_count": len(edges),
+            "lineage_count": len(col_lineage),
+            "confidence_sum": sum(conf(e) for e in edges) + sum(conf(l) for l in col_lineage),
+            "hypothesis_count": len([e for e in edges if e.get("is_hypothesis")]),
+            "low_confidence_count": len([e for e in edges if conf(e) < 0.5]),
+            "functional_count": len(functional_assets),
+            "documented_count": len(functional_assets) - len(orphans),
+            "orphan_count": len(orphans),
+            "orphans": [{"name_display": o["name_display"], "asset_type": o["asset_type"]} for o in orphans[:self.ORPHAN_GAP_LIMIT]],
+        }
+
     def save_snapshot(self, job_id: str, report: Dict[str, Any]) -> str:
         """
         Persists an audit report to the audit_snapshot table.
@@ -150,24 +236,18 @@ class DiscoveryAuditor:
         deep nest levels (if available), and relationship density.
         """
         try:
-            # Basic stats
-            assets = self.supabase.table("asset").select("asset_id, asset_type").eq("project_id", project_id).execute().data or []
-            edges = self.supabase.table("edge_index").select("edge_id").eq("project_id", project_id).execute().data or []
-            
-            total_assets = len(assets)
-            total_edges = len(edges)
+            # Basic stats (same aggregated counters as the audit, no row downloads)
+            m = self.get_project_metrics(project_id)
+            total_assets = m["total_assets"]
+            total_edges = m["edge_count"]
             
             density = total_edges / total_assets if total_assets > 0 else 0
             
-            # Identify "Hot Spots" (Complexity nodes)
-            # e.g., Packages with many components
-            packages = self.supabase.table("package").select("package_id").eq("project_id", project_id).execute().data or []
-            
             score = 0
             if total_assets > 500: score += 30
             if total_assets > 1000: score += 20
             if density > 5: score += 20
-            if len(packages) > 50: score += 30
+            if m["package_count"] > 50: score += 30
             
             return {
                 "score": min(score, 100),
@@ -1,162 +1,273 @@
 from supabase import Client
 from ..models.extraction import ExtractionResult, ExtractedNode, ExtractedEdge, Evidence
 from ..models.deep_dive import DeepDiveResult, Package, PackageComponent, TransformationIR, ColumnLineage
-import uuid
+from .identity import AssetIdentityMap, asset_id_for, edge_id_for, evidence_id_for
+from .snippet_store import SnippetStore
+
+# Must match is_functional_asset_type() in migration 22 and DiscoveryAuditor.FUNCTIONAL_TYPES
+FUNCTIONAL_ASSET_TYPES = {"TABLE", "VIEW", "PIPELINE", "SCRIPT", "PACKAGE", "STORED_PROCEDURE"}
+
+# Rows per upsert_assets / upsert_edges call
+UPSERT_CHUNK_SIZE = 500
+
+# Bulky tag keys stored in asset_detail (migration 28) instead of asset.tags
+HEAVY_TAG_KEYS = ("original_config", "columns_metadata")
+
+def split_heavy_tags(tags: dict):
+    """Returns (slim tags for asset.tags, heavy attributes for asset_detail.detail)"""
+    tags = tags or {}
+    slim = {k: v for k, v in tags.items() if k not in HEAVY_TAG_KEYS}
+    detail = {k: tags[k] for k in HEAVY_TAG_KEYS if tags.get(k) not in (None, {}, [])}
+    return slim, detail
+
+def _conf(value) -> float:
+    return float(value) if value is not None else 1.0
+
+class AuditStatsDelta:
+    """
+    Running audit counters for one sync call, flushed to project_audit_stats
+    with a single bump_audit_stats RPC (see DiscoveryAuditor.get_project_metrics).
+    Deltas never see deletes: the reset paths (the only deletes) rebuild the row.
+    """
+    def __init__(self):
+        self.counters = {
+            "asset_count": 0, "functional_count": 0, "package_count": 0, "edge_count": 0,
+            "lineage_count": 0, "confidence_sum": 0.0, "hypothesis_count": 0, "low_confidence_count": 0
+        }
+        self.connected = set()
+
+    def asset_added(self, asset_type: str):
+        self.counters["asset_count"] += 1
+        if (asset_type or "").upper() in FUNCTIONAL_ASSET_TYPES:
+            self.counters["functional_count"] += 1
+
+    def edge_added(self, from_asset_id: str, to_asset_id: str, confidence, is_hypothesis: bool):
+        self.counters["edge_count"] += 1
+        self._edge_values(confidence, is_hypothesis, 1)
+        self.connected.update([from_asset_id, to_asset_id])
+
+    def edge_updated(self, old: dict, confidence, is_hypothesis: bool):
+        self._edge_values(old.get("confidence"), old.get("is_hypothesis"), -1)
+        self._edge_values(confidence, is_hypothesis, 1)
+
+    def _edge_values(self, confidence, is_hypothesis, sign: int):
+        self.counters["confidence_sum"] += sign * _conf(confidence)
+        if is_hypothesis:
+            self.counters["hypothesis_count"] += sign
+        if _conf(confidence) < 0.5:
+            self.counters["low_confidence_count"] += sign
+
+    def lineage_added(self, source_asset_id, target_asset_id, confidence):
+        self.counters["lineage_count"] += 1
+        self.counters["confidence_sum"] += _conf(confidence)
+        self.connected.update(a for a in (source_asset_id, target_asset_id) if a)
+
+    def is_empty(self) -> bool:
+        return not self.connected and not any(self.counters.values())
+
 
 class CatalogService:
     def __init__(self, supabase: Client):
         self.supabase = supabase
+        self.identity: AssetIdentityMap = None # Job-scoped (begin_job / end_job)
+        self._snippets = None
+
+    @property
+    def snippets(self) -> SnippetStore:
+        if self._snippets is None:
+            self._snippets = SnippetStore(self.supabase)
+        return self._snippets
+
+    def begin_job(self, project_id: str) -> AssetIdentityMap:
+        """Warm-loads the project's identity map, shared by every sync until end_job()"""
+        try:
+            self.identity = AssetIdentityMap(project_id).warm(self.supabase)
+        except Exception as e:
+            # Not fatal: syncs fall back to computing ids and writing every row
+            print(f"[CATALOG] Identity map warm-up failed for {project_id}: {e}")
+            self.identity = AssetIdentityMap(project_id)
+        return self.identity
+
+    def end_job(self):
+        if self.identity is not None:
+            print(f"[CATALOG] Identity map stats: {self.identity.stats}")
+        self.identity = None
+
+    def _identity_for(self, project_id) -> AssetIdentityMap:
+        if self.identity is not None and self.identity.covers(project_id):
+            return self.identity
+        return None
+
+    def _flush_audit_stats(self, project_id: str, delta: AuditStatsDelta):
+        if delta.is_empty():
+            return
+        try:
+            self.supabase.rpc("bump_audit_stats", {
+                "p_project_id": str(project_id),
+                "p_delta": delta.counters,
+                "p_connected_assets": sorted(delta.connected)
+            }).execute()
+        except Exception as e:
+            # Non-blocking: run_audit rebuilds the accumulators if they are missing
+            print(f"[CATALOG] Audit stats update failed for {project_id}: {e}")
+
+    def _upsert_assets(self, assets: dict, audit_delta: AuditStatsDelta, identity: AssetIdentityMap = None):
+        """
+        Blind upsert of {asset_id: row} (deterministic ids, migration 27). Existing assets get
+        system/tags refreshed; only rows actually inserted count towards the audit delta.
+        Rows identical to what this job already wrote are skipped. Heavy tags go to asset_detail.
+        """
+        if identity is not None:
+            assets = identity.changed_assets(assets)
+        rows, detail_rows = [], []
+        for row in assets.values():
+            slim, detail = split_heavy_tags(row.get("tags"))
+            rows.append({**row, "tags": slim})
+            if detail:
+                detail_rows.append({"asset_id": row["asset_id"], "project_id": str(row["project_id"]), "detail": detail})
+        for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            res = self.supabase.rpc("upsert_assets", {"p_assets": rows[i:i + UPSERT_CHUNK_SIZE]}).execute()
+            for written in res.data or []:
+                if written.get("inserted"):
+                    audit_delta.asset_added(written.get("asset_type"))
+        self._bulk_upsert("asset_detail", detail_rows)
+        if identity is not None:
+            identity.record_assets(assets)
+
+    def _insert_evidence(self, result: ExtractionResult, project_id: str, artifact_id: str = None) -> dict:
+        """
+        Writes the result's evidences with insert_evidence (migration 29) and returns
+        {local evidence_id: stored evidence_id}. Re-runs insert nothing: the stored id of
+        an existing (project, file, hash) comes back instead. Evidence rows keep the locator
+        and snippet_hash; the compressed snippets travel in the same RPC (migration 31).
+        """
+        file_path = result.meta.get("source_file")
+        snippet_hashes, snippet_rows = self.snippets.encode_many(ev.snippet for ev in result.evidences)
+        snippet_rows = {row["snippet_hash"]: row for row in snippet_rows}
+        rows = {}
+        local_ids = {}
+        for ev in result.evidences:
+            local_ids[ev.evidence_id] = ev.hash
+            rows.setdefault(ev.hash, {
+                "evidence_id": evidence_id_for(project_id, file_path, ev.hash),
+                "project_id": project_id,
+                "artifact_id": artifact_id,
+                "file_path": file_path,
+                "kind": ev.kind,
+                "locator": ev.locator.model_dump(),
+                "snippet_hash": snippet_hashes.get(ev.snippet),
+                "hash": ev.hash
+            })
+
+        stored = {h: row["evidence_id"] for h, row in rows.items()}
+        batch = list(rows.values())
+        for i in range(0, len(batch), UPSERT_CHUNK_SIZE):
+            chunk = batch[i:i + UPSERT_CHUNK_SIZE]
+            snippets = {row["snippet_hash"] for row in chunk if row["snippet_hash"]}
+            res = self.supabase.rpc("insert_evidence", {
+                "p_evidence": chunk,
+                "p_snippets": [snippet_rows[h] for h in sorted(snippets)]
+            }).execute()
+            for written in res.data or []:
+                stored[written["hash"]] = written["evidence_id"]
+        return {local_id: stored[h] for local_id, h in local_ids.items()}
+
+    def _bulk_upsert(self, table: str, rows: list):
+        """Chunked multi-row upsert on the table's primary key (one request per UPSERT_CHUNK_SIZE rows)"""
+        for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            self.supabase.table(table).upsert(rows[i:i + UPSERT_CHUNK_SIZE]).execute()
+
+    def _upsert_edges(self, edges: dict, audit_delta: AuditStatsDelta, identity: AssetIdentityMap = None):
+        """Blind upsert of {edge_id: row}; the RPC returns the replaced confidence/hypothesis for the delta"""
+        if identity is not None:
+            edges = identity.changed_edges(edges)
+        rows = list(edges.values())
+        for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            res = self.supabase.rpc("upsert_edges", {"p_edges": rows[i:i + UPSERT_CHUNK_SIZE]}).execute()
+            for written in res.data or []:
+                edge = edges.get(written.get("edge_id"))
+                if edge is None:
+                    continue
+                if written.get("inserted"):
+                    audit_delta.edge_added(edge["from_asset_id"], edge["to_asset_id"], edge["confidence"], edge["is_hypothesis"])
+                else:
+                    old = {"confidence": written.get("old_confidence"), "is_hypothesis": written.get("old_is_hypothesis")}
+                    audit_delta.edge_updated(old, edge["confidence"], edge["is_hypothesis"])
+        if identity is not None:
+            identity.record_edges(edges)
 
     def sync_extraction_result(self, result: ExtractionResult, project_id: str, artifact_id: str = None):
         """
         Writes nodes, edges, and evidences to the SQL Catalog.
         """
         
-        # 1. Assets (Nodes)
+        # 1. Assets (Nodes): ids derived from (project, name, type), one blind batch upsert
         node_id_map = {} # Map local node_id to UUID
-        
+        audit_delta = AuditStatsDelta()
+        identity = self._identity_for(project_id)
+        assets = {}
+
         for node in result.nodes:
-            # Check if asset exists by canonical name? 
-            # For now, generate a UUID or use a stable hash?
-            # MD says: "asset_id uuid pk". "Reutilizar asset_id como ID estable".
-            
-            # Simple deduplication strategy: project_id + name + type
-            # We will use upsert based on name/type if possible, but asset_id is PK.
-            # Supabase upsert requires ON CONFLICT.
-            # If we don't have a unique constraint on (project_id, name, type), upsert won't work easily without fetching.
-            
-            # Let's try to find existing asset
-            existing = self.supabase.table("asset")\
-                .select("asset_id")\
-                .eq("project_id", project_id)\
-                .eq("name_display", node.name)\
-                .eq("asset_type", node.node_type)\
-                .execute()
-                
-            if existing.data:
-                asset_id = existing.data[0]["asset_id"]
-                # Update existing asset (Upsert logic)
-                updated_tags = node.attributes.copy()
-                if node.parent_node_id:
-                    updated_tags["parent_node_id"] = node.parent_node_id
-                
-                self.supabase.table("asset").update({
-                    "tags": updated_tags,
-                    "updated_at": "now()",
-                    "system": node.system
-                }).eq("asset_id", asset_id).execute()
-            else:
-                asset_id = str(uuid.uuid4())
-                tags = node.attributes.copy()
-                if node.parent_node_id:
-                    tags["parent_node_id"] = node.parent_node_id
-                
-                asset_data = {
-                    "asset_id": asset_id,
-                    "project_id": project_id,
-                    "asset_type": node.node_type,
-                    "name_display": node.name,
-                    "canonical_name": node.name, # logic to canonicalize?
-                    "system": node.system,
-                    "tags": tags,
-                    "created_at": "now()",
-                    "updated_at": "now()"
-                }
-                self.supabase.table("asset").insert(asset_data).execute()
-                
+            asset_id = identity.asset_id(node.name, node.node_type) if identity else asset_id_for(project_id, node.name, node.node_type)
+            tags = node.attributes.copy()
+            if node.parent_node_id:
+                tags["parent_node_id"] = node.parent_node_id
+
+            assets[asset_id] = {
+                "asset_id": asset_id,
+                "project_id": project_id,
+                "asset_type": node.node_type,
+                "name_display": node.name,
+                "canonical_name": node.name, # logic to canonicalize?
+                "system": node.system,
+                "tags": tags
+            }
             node_id_map[node.node_id] = asset_id
-            
+
             # Asset Version? (Skip for MVP/Release A, stick to Asset)
-            
-        # 2. Evidences
-        evidence_id_map = {}
-        for ev in result.evidences:
-            # Check if evidence exists (hash + file + project)? 
-            # For now, simplistic check or just insert (assuming 'Update' might want history)
-            # But to avoid duplicates on re-run, we should check.
-            # Using hash if available
-            existing_ev = None
-            if ev.hash:
-                existing_ev = self.supabase.table("evidence")\
-                    .select("evidence_id")\
-                    .eq("project_id", project_id)\
-                    .eq("hash", ev.hash)\
-                    .eq("file_path", result.meta.get("source_file"))\
-                    .execute()
-            
-            if existing_ev and existing_ev.data:
-                ev_uuid = existing_ev.data[0]["evidence_id"]
-            else:
-                ev_uuid = str(uuid.uuid4())
-                evidence_data = {
-                    "evidence_id": ev_uuid,
-                    "project_id": project_id,
-                    "artifact_id": artifact_id,
-                    "file_path": result.meta.get("source_file"),
-                    "kind": ev.kind,
-                    "locator": ev.locator.model_dump(),
-                    "snippet": ev.snippet,
-                    "hash": ev.hash
-                }
-                self.supabase.table("evidence").insert(evidence_data).execute()
-            
-            evidence_id_map[ev.evidence_id] = ev_uuid
 
-        # 3. Edges
+        self._upsert_assets(assets, audit_delta, identity)
+
+        # 2. Evidences: content-hashed (project, file, hash) keys, bulk insert ON CONFLICT DO NOTHING
+        evidence_id_map = self._insert_evidence(result, project_id, artifact_id)
+
+        # 3. Edges: deterministic ids from (project, from, to, type), one blind batch upsert
+        edges = {}
+        evidence_links = set()
         for edge in result.edges:
             from_uuid = node_id_map.get(edge.from_node_id)
             to_uuid = node_id_map.get(edge.to_node_id)
             
             if not from_uuid or not to_uuid:
                 continue # Skip if nodes not found
-                
-            # Check existing edge
-            existing_edge = self.supabase.table("edge_index")\
-                .select("edge_id")\
-                .eq("project_id", project_id)\
-                .eq("from_asset_id", from_uuid)\
-                .eq("to_asset_id", to_uuid)\
-                .eq("edge_type", edge.edge_type)\
-                .execute()
-            
-            if existing_edge.data:
-                edge_uuid = existing_edge.data[0]["edge_id"]
-                # Update confidence/metadata
-                self.supabase.table("edge_index").update({
-                    "confidence": edge.confidence,
-                    "is_hypothesis": edge.is_hypothesis,
-                    "extractor_id": result.meta.get("extractor_id")
-                }).eq("edge_id", edge_uuid).execute()
-            else:
-                edge_uuid = str(uuid.uuid4())
-                edge_data = {
-                    "edge_id": edge_uuid,
-                    "project_id": project_id,
-                    "from_asset_id": from_uuid,
-                    "to_asset_id": to_uuid,
-                    "edge_type": edge.edge_type,
-                    "confidence": edge.confidence,
-                    "extractor_id": result.meta.get("extractor_id"),
-                    "is_hypothesis": edge.is_hypothesis
-                }
-                self.supabase.table("edge_index").insert(edge_data).execute()
-            
+
+            edge_uuid = identity.edge_id(from_uuid, to_uuid, edge.edge_type) if identity else \
+                edge_id_for(project_id, from_uuid, to_uuid, edge.edge_type)
+            edges[edge_uuid] = {
+                "edge_id": edge_uuid,
+                "project_id": project_id,
+                "from_asset_id": from_uuid,
+                "to_asset_id": to_uuid,
+                "edge_type": edge.edge_type,
+                "confidence": edge.confidence,
+                "extractor_id": result.meta.get("extractor_id"),
+                "is_hypothesis": edge.is_hypothesis
+            }
+
             # Edge Evidence Link
             for ref in edge.evidence_refs:
                 if ref in evidence_id_map:
-                    # Check link existence to avoid PK violation if (edge_id, evidence_id) is PK
-                    # Assuming edge_evidence has no ID or composite PK.
-                    # Best effort: delete and re-insert or ignore error.
-                    # Or check first.
-                    ev_uuid = evidence_id_map[ref]
-                    try:
-                        self.supabase.table("edge_evidence").insert({
-                            "edge_id": edge_uuid,
-                            "evidence_id": ev_uuid
-                        }).execute()
-                    except:
-                        pass # Ignore duplicate link error
+                    evidence_links.add((edge_uuid, evidence_id_map[ref]))
+
+        self._upsert_edges(edges, audit_delta, identity)
+        if evidence_links:
+            # (edge_id, evidence_id) is the PK: re-runs are no-ops
+            self.supabase.table("edge_evidence").upsert(
+                [{"edge_id": e, "evidence_id": ev} for e, ev in sorted(evidence_links)],
+                on_conflict="edge_id,evidence_id", ignore_duplicates=True
+            ).execute()
                     
+        self._flush_audit_stats(project_id, audit_delta)
         return node_id_map
 
     def sync_deep_dive_result(self, result: DeepDiveResult, project_id: str):
@@ -164,6 +275,8 @@ class CatalogService:
         Writes packages, components, transformations, and lineage to the SQL Catalog.
         Also bridges these detailed results to the main 'asset' and 'edge_index' tables
         to ensure they appear in the unified graph.
+        Each table is written with chunked bulk upserts, in FK order (package, components,
+        bridged assets, transformations, lineage, bridged edges).
         """
         # 1. Package
         pkg = result.package
@@ -176,11 +289,17 @@ class CatalogService:
         if pkg_data.get("asset_id"): pkg_data["asset_id"] = str(pkg_data["asset_id"])
 
         self.supabase.table("package").upsert(pkg_data).execute()
+        audit_delta = AuditStatsDelta()
+        audit_delta.counters["package_count"] += 1 # package_id is generated per deep dive
 
         # 2. Components -> Bridge to Asset Table
         # We want internal components to be visible as nodes in the graph
         comp_to_asset_id = {} # Map component_id -> asset_id (UUID)
+        component_assets = {}
+        component_rows = []
+        identity = self._identity_for(project_id)
         
+        # Extractors emit parents before children, so chunk order keeps parent_component_id valid
         for comp in result.components:
             comp_data = comp.model_dump()
             comp_data["created_at"] = comp_data["created_at"].isoformat()
@@ -188,59 +307,52 @@ class CatalogService:
             if comp_data.get("package_id"): comp_data["package_id"] = str(comp_data["package_id"])
             if comp_data.get("parent_component_id"): comp_data["parent_component_id"] = str(comp_data["parent_component_id"])
             
-            # Save to specific table
-            self.supabase.table("package_component").upsert(comp_data).execute()
+            component_rows.append(comp_data)
 
             # --- BRIDGE TO ASSET TABLE ---
             # Heuristic: Determine a good display name and type
             node_name = comp.name
             node_type = f"COMPONENT_{comp.type}" # e.g. COMPONENT_SOURCE, COMPONENT_TRANSFORM
             
-            # Check if this component already exists as an asset
-            # We use a stable ID if possible or lookup by name+project+pkg
-            existing_asset = self.supabase.table("asset")\
-                .select("asset_id")\
-                .eq("project_id", project_id)\
-                .eq("name_display", node_name)\
-                .eq("asset_type", node_type)\
-                .execute()
-            
-            if existing_asset.data:
-                asset_id = existing_asset.data[0]["asset_id"]
-            else:
-                asset_id = str(uuid.uuid4())
-                asset_record = {
-                    "asset_id": asset_id,
-                    "project_id": project_id,
-                    "asset_type": node_type,
-                    "name_display": node_name,
-                    "canonical_name": f"{pkg.name}:{node_name}",
-                    "system": pkg.source_system or "ssis",
-                    "tags": {
-                        "package_id": str(pkg.package_id),
-                        "component_id": str(comp.component_id),
-                        "parent_asset_id": str(pkg.asset_id) if pkg.asset_id else None,
-                        "original_config": comp.config
-                    },
-                    "created_at": "now()",
-                    "updated_at": "now()"
+            # Stable ID from (project, package:component, type): no lookup needed
+            canonical_name = f"{pkg.name}:{node_name}"
+            asset_id = identity.asset_id(canonical_name, node_type) if identity else asset_id_for(project_id, canonical_name, node_type)
+            component_assets[asset_id] = {
+                "asset_id": asset_id,
+                "project_id": str(project_id),
+                "asset_type": node_type,
+                "name_display": node_name,
+                "canonical_name": canonical_name,
+                "system": pkg.source_system or "ssis",
+                "tags": {
+                    "package_id": str(pkg.package_id),
+                    "component_id": str(comp.component_id),
+                    "parent_asset_id": str(pkg.asset_id) if pkg.asset_id else None,
+                    "original_config": comp.config
                 }
-                self.supabase.table("asset").insert(asset_record).execute()
+            }
             
             comp_to_asset_id[str(comp.component_id)] = asset_id
 
+        self._bulk_upsert("package_component", component_rows)
+        self._upsert_assets(component_assets, audit_delta, identity)
+
         # 3. Transformation IR
+        ir_rows = []
         for ir in result.transformations:
             ir_data = ir.model_dump()
             ir_data["created_at"] = ir_data["created_at"].isoformat()
             ir_data["ir_id"] = str(ir.ir_id)
             ir_data["project_id"] = str(ir.project_id)
             if ir.source_component_id: ir_data["source_component_id"] = str(ir.source_component_id)
-            
-            self.supabase.table("transformation_ir").upsert(ir_data).execute()
+            ir_rows.append(ir_data)
+
+        self._bulk_upsert("transformation_ir", ir_rows)
 
         # 4. Column Lineage -> Bridge to Edge Index
         # This creates the "mesh" of relationships
+        lineage_rows = []
+        lineage_edges = {}
         for lin in result.lineage:
             lin_data = lin.model_dump()
             lin_data["created_at"] = lin_data["created_at"].isoformat()
@@ -248,27 +360,26 @@ class CatalogService:
             lin_data["project_id"] = str(lin.project_id)
             lin_data["package_id"] = str(lin.package_id)
             if lin.ir_id: lin_data["ir_id"] = str(lin.ir_id)
-            if lin.source_asset_id: lin_data["source_asset_id"] = str(lin.source_asset_id)
-            if lin.target_asset_id: lin_data["target_asset_id"] = str(lin.target_asset_id)
-            
-            self.supabase.table("column_lineage").upsert(lin_data).execute()
 
-            # --- BRIDGE TO EDGE_INDEX ---
-            # Resolve from source/target asset IDs (which might be the Tables from Macro)
-            # or from the Components we just created.
+            # --- RESOLVE MAPPED ASSETS ---
+            # Source/target are either asset IDs (Tables from Macro) or Component IDs (data flow
+            # paths); components are swapped for the Asset ID bridged above (asset FK)
             from_asset = str(lin.source_asset_id) if lin.source_asset_id else None
             to_asset = str(lin.target_asset_id) if lin.target_asset_id else None
-            
-            # --- RESOLVE MAPPED ASSETS ---
-            # If the ID provided is a Component ID, we swap it for the Asset ID we just created
-            if from_asset in comp_to_asset_id:
-                from_asset = comp_to_asset_id[from_asset]
-            if to_asset in comp_to_asset_id:
-                to_asset = comp_to_asset_id[to_asset]
-            
+            from_asset = comp_to_asset_id.get(from_asset, from_asset)
+            to_asset = comp_to_asset_id.get(to_asset, to_asset)
+            lin_data["source_asset_id"] = from_asset
+            lin_data["target_asset_id"] = to_asset
+
+            lineage_rows.append(lin_data)
+            audit_delta.lineage_added(from_asset, to_asset, lin.confidence)
+
+            # --- BRIDGE TO EDGE_INDEX ---
             if from_asset and to_asset:
-                edge_id = str(uuid.uuid4())
-                edge_record = {
+                # Deterministic id: racing deep dives converge on the same edge instead of duplicating it
+                edge_id = identity.edge_id(from_asset, to_asset, "DETAILED_LINEAGE") if identity else \
+                    edge_id_for(project_id, from_asset, to_asset, "DETAILED_LINEAGE")
+                lineage_edges[edge_id] = {
                     "edge_id": edge_id,
                     "project_id": str(project_id),
                     "from_asset_id": from_asset,
@@ -278,17 +389,15 @@ class CatalogService:
                     "extractor_id": "DeepDiveBridge",
                     "is_hypothesis": False
                 }
-                # Check for existing before insert to avoid duplicates
-                check = self.supabase.table("edge_index")\
-                    .select("edge_id")\
-                    .eq("project_id", str(project_id))\
-                    .eq("from_asset_id", from_asset)\
-                    .eq("to_asset_id", to_asset)\
-                    .eq("edge_type", "DETAILED_LINEAGE")\
-                    .execute()
-                
-                if not check.data:
-                    self.supabase.table("edge_index").insert(edge_record).execute()
+
+        self._bulk_upsert("column_lineage", lineage_rows)
+        self._upsert_edges(lineage_edges, audit_delta, identity)
+        self._flush_audit_stats(project_id, audit_delta)
+
+    def get_asset_detail(self, asset_id: str) -> dict:
+        """Heavy attributes of one asset (asset_detail), loaded on demand"""
+        res = self.supabase.table("asset_detail").select("detail").eq("asset_id", asset_id).limit(1).execute()
+        return (res.data[0].get("detail") if res.data else None) or {}
 
     def get_solution_context(self, project_id: str) -> dict:
         """
@@ -0,0 +1,256 @@
+"""
+Retrieval of the relevant subgraph for /solutions/{id}/chat.
+
+Instead of dumping every node and edge into the prompt, the question is
+matched with BM25 against asset names, types, systems, columns and tags;
+the best hits are expanded N hops through the lineage edges and the result
+is rendered line by line until the token budget is spent. The BM25 index
+and adjacency are built once per solution and cached, so a question costs a
+few posting-list lookups plus a bounded BFS regardless of graph size.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+from .cache import TTLCache
+from .chunking import estimate_tokens
+
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+# Question words that carry no retrieval signal
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "how",
+    "i", "in", "is", "it", "me", "of", "on", "or", "show", "tell", "that", "the", "there", "this",
+    "to", "what", "when", "where", "which", "who", "why", "with", "que", "el", "la", "los", "las",
+    "de", "del", "en", "y", "es", "un", "una", "se", "por", "para", "cual", "cuales", "donde",
+}
+
+# Name matches count more than the other fields
+_NAME_BOOST = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms; identifiers are also split on camelCase / snake_case / dots"""
+    terms = []
+    for word in _WORD.findall(text or ""):
+        lower = word.lower()
+        if lower in _STOPWORDS:
+            continue
+        terms.append(lower)
+        parts = _CAMEL.findall(word)
+        if len(parts) > 1:
+            terms.extend(p.lower() for p in parts if p.lower() not in _STOPWORDS)
+    return terms
+
+
+def _tag_text(value: Any, depth: int = 0) -> List[str]:
+    """Flattens tag values (strings, lists, nested dicts) into text fragments"""
+    if depth > 2 or value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (int, float, bool)):
+        return []
+    if isinstance(value, dict):
+        out = []
+        for v in value.values():
+            out.extend(_tag_text(v, depth + 1))
+        return out
+    if isinstance(value, (list, tuple)):
+        out = []
+        for v in value[:50]:
+            out.extend(_tag_text(v.get("name") if isinstance(v, dict) else v, depth + 1))
+        return out
+    return []
+
+
+@dataclass
+class RetrievedContext:
+    text: str
+    node_ids: List[str] = field(default_factory=list)
+    seed_ids: List[str] = field(default_factory=list)
+    edge_count: int = 0
+    tokens: int = 0
+    total_nodes: int = 0
+    total_edges: int = 0
+
+
+class GraphIndex:
+    """BM25 index over graph nodes plus an undirected adjacency list (cytoscape-style graph data)"""
+
+    def __init__(self, graph: Dict[str, Any], k1: float = 1.2, b: float = 0.75):
+        self.k1, self.b = k1, b
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.postings: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        self.doc_len: Dict[str, int] = {}
+        self.adjacency: Dict[str, List[Tuple[str, Dict[str, Any]]]] = defaultdict(list)
+        self.edges: List[Dict[str, Any]] = []
+
+        for node in graph.get("nodes", []):
+            node_id = str(node.get("id"))
+            data = node.get("data") or {}
+            self.nodes[node_id] = data
+            terms = self._node_terms(data)
+            self.doc_len[node_id] = len(terms)
+            for term, tf in Counter(terms).items():
+                self.postings[term].append((node_id, tf))
+
+        for edge in graph.get("edges", []):
+            source, target = str(edge.get("source")), str(edge.get("target"))
+            if source not in self.nodes or target not in self.nodes:
+                continue
+            self.edges.append(edge)
+            self.adjacency[source].append((target, edge))
+            self.adjacency[target].append((source, edge))
+
+        self.avg_len = (sum(self.doc_len.values()) / len(self.doc_len)) if self.doc_len else 0.0
+
+    @staticmethod
+    def _node_terms(data: Dict[str, Any]) -> List[str]:
+        terms = tokenize(str(data.get("label") or "")) * _NAME_BOOST
+        fields = [data.get("type"), data.get("system"), data.get("schema"), data.get("summary")]
+        terms += tokenize(" ".join(str(f) for f in fields if f))
+        terms += tokenize(" ".join(_tag_text(data.get("columns"))))
+        terms += tokenize(" ".join(_tag_text(data.get("tags"))))
+        return terms
+
+    def search(self, question: str, top_k: int) -> List[Tuple[str, float]]:
+        """BM25 top-k node ids for the question"""
+        n = len(self.nodes)
+        if not n:
+            return []
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(question)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for node_id, tf in postings:
+                norm = 1 - self.b + self.b * (self.doc_len[node_id] / self.avg_len if self.avg_len else 1)
+                scores[node_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:top_k]
+
+    def hubs(self, top_k: int) -> List[Tuple[str, float]]:
+        """Most connected nodes (seeds for broad questions with no keyword match)"""
+        ranked = sorted(self.nodes, key=lambda nid: (-len(self.adjacency.get(nid, [])), nid))
+        return [(nid, 1.0) for nid in ranked[:top_k]]
+
+    def expand(self, seeds: List[Tuple[str, float]], hops: int, decay: float, max_nodes: int) -> List[Tuple[str, float]]:
+        """N-hop neighborhood of the seeds, ranked by seed score decayed per hop"""
+        best: Dict[str, float] = {}
+        frontier = []
+        for node_id, score in seeds:
+            best[node_id] = max(best.get(node_id, 0.0), score)
+            frontier.append(node_id)
+        for _ in range(hops):
+            next_frontier = []
+            for node_id in frontier:
+                propagated = best[node_id] * decay
+                for neighbor, _ in self.adjacency.get(node_id, []):
+                    if propagated > best.get(neighbor, 0.0):
+                        if neighbor not in best:
+                            next_frontier.append(neighbor)
+                        best[neighbor] = propagated
+            frontier = next_frontier
+            if not frontier or len(best) >= max_nodes:
+                break
+        ranked = sorted(best.items(), key=lambda kv: (-kv[1], kv[0]))
+        return ranked[:max_nodes]
+
+
+class GraphContextRetriever:
+    def __init__(self, graph_service=None, ttl_seconds: Optional[float] = None):
+        self._graph_service = graph_service
+        self.cache = TTLCache(ttl_seconds if ttl_seconds is not None else settings.CHAT_INDEX_TTL_SEC, max_entries=32)
+
+    @property
+    def graph_service(self):
+        if self._graph_service is None:
+            from .graph import get_graph_service
+            self._graph_service = get_graph_service()
+        return self._graph_service
+
+    def get_index(self, solution_id: str) -> GraphIndex:
+        return self.cache.get_or_set(solution_id, lambda: GraphIndex(self.graph_service.get_graph_data(solution_id)))
+
+    def invalidate(self, solution_id: Optional[str] = None):
+        self.cache.invalidate(solution_id)
+
+    def retrieve(self, solution_id: str, question: str, max_tokens: Optional[int] = None) -> RetrievedContext:
+        return self.build_context(self.get_index(solution_id), question, max_tokens)
+
+    @staticmethod
+    def build_context(index: GraphIndex, question: str, max_tokens: Optional[int] = None) -> RetrievedContext:
+        budget = max_tokens or settings.CHAT_CONTEXT_MAX_TOKENS
+        seeds = index.search(question, settings.CHAT_RETRIEVAL_TOP_K) or index.hubs(settings.CHAT_RETRIEVAL_TOP_K)
+        ranked = index.expand(seeds, settings.CHAT_RETRIEVAL_HOPS, settings.CHAT_RETRIEVAL_HOP_DECAY,
+                              settings.CHAT_RETRIEVAL_MAX_NODES)
+
+        header = (f"Solution graph: {len(index.nodes)} assets, {len(index.edges)} relationships. "
+                  f"Showing the subgraph most relevant to the question.")
+        used = estimate_tokens(header)
+        node_lines: List[str] = []
+        included: Dict[str, Dict[str, Any]] = {}
+        for node_id, _ in ranked:
+            line = GraphContextRetriever._node_line(index.nodes[node_id])
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                break
+            node_lines.append(line)
+            included[node_id] = index.nodes[node_id]
+            used += cost
+
+        # Relationships between included nodes, seeds' edges first (they were ranked first)
+        edge_lines: List[str] = []
+        seen = set()
+        for node_id in included:
+            for neighbor, edge in index.adjacency.get(node_id, []):
+                key = edge.get("id") or (edge.get("source"), edge.get("label"), edge.get("target"))
+                if neighbor not in included or key in seen:
+                    continue
+                seen.add(key)
+                line = (f"- {included[str(edge['source'])].get('label')} -[{edge.get('label', 'RELATED_TO')}]-> "
+                        f"{included[str(edge['target'])].get('label')}")
+                cost = estimate_tokens(line) + 1
+                if used + cost > budget:
+                    break
+                edge_lines.append(line)
+                used += cost
+
+        text = "\n".join([header, "", "NODES:"] + node_lines + ["", "RELATIONSHIPS:"] + (edge_lines or ["(none)"]))
+        return RetrievedContext(
+            text=text,
+            node_ids=list(included),
+            seed_ids=[node_id for node_id, _ in seeds if node_id in included],
+            edge_count=len(edge_lines),
+            tokens=used,
+            total_nodes=len(index.nodes),
+            total_edges=len(index.edges),
+        )
+
+    @staticmethod
+    def _node_line(data: Dict[str, Any]) -> str:
+        line = f"- {data.get('type', 'asset')}: {data.get('label')}"
+        if data.get("system") and data.get("system") != "unknown":
+            line += f" (system: {data['system']})"
+        summary = str(data.get("summary") or "").strip()
+        if summary:
+            line += f" — {summary[:200]}"
+        columns = [c for c in _tag_text(data.get("columns")) if c][:12]
+        if columns:
+            line += f" [columns: {', '.join(columns)}]"
+        return line
+
+
+_retriever = None
+
+def get_chat_retriever() -> GraphContextRetriever:
+    """Singleton (per-process index cache)"""
+    global _retriever
+    if _retriever is None:
+        _retriever = GraphContextRetriever()
+    return _retriever
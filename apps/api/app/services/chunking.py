@@ -0,0 +1,310 @@
+"""
+Token-aware chunking for LLM extraction (map-reduce).
+
+Splits large inputs on structural boundaries (SQL statements, SSIS executables,
+DataStage records) so every chunk fits the model budget, and merges the partial
+extraction payloads back into a single deduplicated result.
+"""
+import re
+import json
+from typing import Dict, List, Any, Optional, Tuple
+
+from ..config import settings
+
+# Context windows (tokens) of the models we route to. Unknown models use the default.
+MODEL_CONTEXT_TOKENS = {
+    "llama-3.3-70b-versatile": 128000,
+    "llama-3.1-8b-instant": 128000,
+    "google/gemini-2.5-flash-lite": 1000000,
+    "google/gemini-2.0-flash-exp": 1000000,
+    "google/gemini-1.5-flash": 1000000,
+    "deepseek/deepseek-chat": 64000,
+    "deepseek/deepseek-v3.2": 128000,
+    "qwen/qwen-2.5-coder": 32000,
+    "qwen/qwen-2.5-instruct": 32000,
+}
+DEFAULT_CONTEXT_TOKENS = 32000
+
+# Fallback ratio when tiktoken is not available
+CHARS_PER_TOKEN = 4
+
+# tiktoken ships OpenAI vocabularies only; Llama 3, Gemini, DeepSeek and Qwen use
+# ~100-150k BPE vocabularies, closest to cl100k
+DEFAULT_ENCODING = "cl100k_base"
+
+_encodings: Dict[str, Any] = {}
+
+def _encoding_name(model: Optional[str]) -> str:
+    if not model:
+        return DEFAULT_ENCODING
+    try:
+        import tiktoken
+        # "openai/gpt-4o-mini" -> gpt-4o-mini (o200k_base)
+        return tiktoken.encoding_name_for_model(model.split("/")[-1])
+    except Exception:
+        return DEFAULT_ENCODING
+
+def _get_encoding(model: Optional[str] = None):
+    """Lazily loads the tiktoken encoding for the model (optional dependency); None if unavailable."""
+    name = _encoding_name(model)
+    if name not in _encodings:
+        try:
+            import tiktoken
+            _encodings[name] = tiktoken.get_encoding(name)
+        except Exception:
+            _encodings[name] = None
+    return _encodings[name]
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Estimates the token count of a text with the model's tiktoken encoding
+    (o200k for GPT-4o family, cl100k otherwise), or ~4 chars per token
+    when tiktoken / the encoding file is not available.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        try:
+            return len(encoding.encode(text, disallowed_special=()))
+        except Exception:
+            pass
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def chunk_token_budget(model: Optional[str], max_output_tokens: int = 0, overhead_tokens: int = 0) -> int:
+    """
+    Token budget for the content of a single chunk: the configured chunk size,
+    capped by what fits in the model context next to prompt overhead and output.
+    """
+    context_tokens = MODEL_CONTEXT_TOKENS.get(model or "", DEFAULT_CONTEXT_TOKENS)
+    available = context_tokens - max_output_tokens - overhead_tokens
+    # Never shrink below a quarter of the chunk size, even with a very large overhead
+    floor = max(256, settings.LLM_CHUNK_MAX_TOKENS // 4)
+    return max(floor, min(settings.LLM_CHUNK_MAX_TOKENS - overhead_tokens, available))
+
+
+class ContentChunker:
+    """
+    Splits content on structural boundaries and packs the segments greedily
+    into chunks under a token budget. Oversized segments are split by lines.
+    """
+
+    SQL_BATCH_PATTERN = re.compile(r"^\s*GO\s*;?\s*$", re.IGNORECASE | re.MULTILINE)
+    SSIS_EXECUTABLE_PATTERN = re.compile(r"(?=<DTS:Executable[\s>])")
+    DSX_RECORD_PATTERN = re.compile(r"(?=^\s*BEGIN (?:DSJOB|DSRECORD)\b)", re.MULTILINE)
+
+    @classmethod
+    def split(cls, content: str, file_path: str, max_tokens: int, model: Optional[str] = None) -> List[str]:
+        if estimate_tokens(content, model) <= max_tokens:
+            return [content]
+
+        ext = file_path.lower().rsplit(".", 1)[-1] if "." in file_path else ""
+        if ext in ("sql", "ddl"):
+            segments = cls.split_sql_statements(content)
+        elif ext in ("dtsx", "xml"):
+            segments = cls.SSIS_EXECUTABLE_PATTERN.split(content)
+        elif ext == "dsx":
+            segments = cls.DSX_RECORD_PATTERN.split(content)
+        else:
+            segments = re.split(r"(?<=\n)\s*\n", content)
+
+        return cls.pack(segments, max_tokens, model)
+
+    @classmethod
+    def split_sql_statements(cls, content: str) -> List[str]:
+        """Splits on GO batches and on ';' outside strings/comments."""
+        statements = []
+        for batch in cls.SQL_BATCH_PATTERN.split(content):
+            current = []
+            in_string = False
+            in_line_comment = False
+            in_block_comment = False
+            i = 0
+            while i < len(batch):
+                ch = batch[i]
+                nxt = batch[i + 1] if i + 1 < len(batch) else ""
+                current.append(ch)
+                if in_line_comment:
+                    if ch == "\n":
+                        in_line_comment = False
+                elif in_block_comment:
+                    if ch == "*" and nxt == "/":
+                        current.append(nxt)
+                        i += 1
+                        in_block_comment = False
+                elif in_string:
+                    if ch == "'":
+                        in_string = False
+                elif ch == "'":
+                    in_string = True
+                elif ch == "-" and nxt == "-":
+                    in_line_comment = True
+                elif ch == "/" and nxt == "*":
+                    in_block_comment = True
+                elif ch == ";":
+                    statements.append("".join(current))
+                    current = []
+                i += 1
+            if "".join(current).strip():
+                statements.append("".join(current))
+        return [s for s in statements if s.strip()]
+
+    @classmethod
+    def pack(cls, segments: List[str], max_tokens: int, model: Optional[str] = None) -> List[str]:
+        chunks = []
+        current: List[str] = []
+        current_tokens = 0
+        for segment in segments:
+            if not segment:
+                continue
+            seg_tokens = estimate_tokens(segment, model)
+            if seg_tokens > max_tokens:
+                if current:
+                    chunks.append("".join(current))
+                    current, current_tokens = [], 0
+                chunks.extend(cls._split_by_lines(segment, max_tokens, model))
+                continue
+            if current and current_tokens + seg_tokens > max_tokens:
+                chunks.append("".join(current))
+                current, current_tokens = [], 0
+            current.append(segment)
+            current_tokens += seg_tokens
+        if current:
+            chunks.append("".join(current))
+        return [c for c in chunks if c.strip()]
+
+    @classmethod
+    def _split_by_lines(cls, segment: str, max_tokens: int, model: Optional[str] = None) -> List[str]:
+        chunks = []
+        current: List[str] = []
+        current_tokens = 0
+        for line in segment.splitlines(keepends=True):
+            line_tokens = estimate_tokens(line, model)
+            if line_tokens > max_tokens:
+                # Single huge line (minified XML, base64...): hard split by chars
+                step = max_tokens * CHARS_PER_TOKEN
+                pieces = [line[i:i + step] for i in range(0, len(line), step)]
+            else:
+                pieces = [line]
+            for piece in pieces:
+                piece_tokens = line_tokens if len(pieces) == 1 else estimate_tokens(piece, model)
+                if current and current_tokens + piece_tokens > max_tokens:
+                    chunks.append("".join(current))
+                    current, current_tokens = [], 0
+                current.append(piece)
+                current_tokens += piece_tokens
+        if current:
+            chunks.append("".join(current))
+        return chunks
+
+
+def _edge_key(edge: Dict[str, Any]) -> Tuple:
+    return (
+        edge.get("from_node_id") or edge.get("source_id") or edge.get("from"),
+        edge.get("to_node_id") or edge.get("target_id") or edge.get("to"),
+        (edge.get("edge_type") or edge.get("type") or "").upper(),
+    )
+
+# Node references an edge may carry (the LLM does not always use the schema names)
+_EDGE_NODE_FIELDS = ("from_node_id", "to_node_id", "source_id", "target_id", "from", "to")
+
+def _node_key(node: Dict[str, Any]) -> Tuple:
+    name = node.get("name")
+    if not name:
+        return ("id", node.get("node_id"))
+    return (str(name).lower(), (node.get("node_type") or "").lower())
+
+def _evidence_key(evidence: Dict[str, Any]) -> Tuple:
+    # Content only: ids are local to the chunk that produced them
+    locator = evidence.get("locator") or {}
+    snippet = evidence.get("snippet")
+    if not locator and not snippet:
+        return ("id", evidence.get("evidence_id"))
+    return (json.dumps(locator, sort_keys=True, default=str), snippet)
+
+def merge_extraction_results(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merges partial ExtractionResult payloads (dicts) produced per chunk.
+    The LLM numbers nodes and evidences per request ("n1", "ev1" in every
+    chunk), so their ids and the edges' node ids / evidence_refs are prefixed
+    with the chunk index. Nodes then dedupe by (name, node_type) (first wins,
+    missing fields are filled from later chunks), edges by (from, to, type)
+    with their evidence_refs combined, evidences by locator/snippet.
+    """
+    parts = [part for part in parts if isinstance(part, dict)]
+    prefix_ids = len(parts) > 1
+    merged: Dict[str, Any] = {"nodes": [], "edges": [], "evidences": [], "assumptions": []}
+    nodes_by_key: Dict[Tuple, Dict[str, Any]] = {}
+    edges_by_key: Dict[Tuple, Dict[str, Any]] = {}
+    evidence_by_key: Dict[Tuple, str] = {}
+    seen_assumptions = set()
+
+    for index, part in enumerate(parts):
+        if "meta" in part and "meta" not in merged:
+            merged["meta"] = part["meta"]
+
+        # Chunk-local node id -> id in the merged result (same asset in two chunks -> first copy)
+        node_ids: Dict[Any, Any] = {}
+        for node in part.get("nodes") or []:
+            if not isinstance(node, dict):
+                continue
+            node = dict(node)
+            local_id = node.get("node_id")
+            if prefix_ids and local_id is not None:
+                node["node_id"] = f"c{index}_{local_id}"
+            key = _node_key(node)
+            if key in nodes_by_key:
+                existing = nodes_by_key[key]
+                node_ids[local_id] = existing.get("node_id")
+                for k, v in node.items():
+                    if existing.get(k) in (None, "", [], {}) and v not in (None, "", [], {}):
+                        existing[k] = v
+                continue
+            nodes_by_key[key] = node
+            node_ids[local_id] = node.get("node_id")
+            merged["nodes"].append(node)
+
+        # Chunk-local evidence id -> id in the merged result (duplicates point at the first copy)
+        evidence_ids: Dict[Any, Any] = {}
+        for evidence in part.get("evidences") or []:
+            if not isinstance(evidence, dict):
+                continue
+            evidence = dict(evidence)
+            local_id = evidence.get("evidence_id")
+            if prefix_ids and local_id is not None:
+                evidence["evidence_id"] = f"c{index}_{local_id}"
+            key = _evidence_key(evidence)
+            if key in evidence_by_key:
+                evidence_ids[local_id] = evidence_by_key[key]
+                continue
+            evidence_by_key[key] = evidence_ids[local_id] = evidence["evidence_id"]
+            merged["evidences"].append(evidence)
+
+        for edge in part.get("edges") or []:
+            if not isinstance(edge, dict):
+                continue
+            edge = dict(edge)
+            for field in _EDGE_NODE_FIELDS:
+                if edge.get(field) is not None:
+                    local_id = edge[field]
+                    edge[field] = node_ids.get(local_id, f"c{index}_{local_id}" if prefix_ids else local_id)
+            refs = [evidence_ids.get(ref, f"c{index}_{ref}" if prefix_ids else ref) for ref in edge.get("evidence_refs") or []]
+            if "evidence_refs" in edge:
+                edge["evidence_refs"] = refs
+            key = _edge_key(edge)
+            if key in edges_by_key:
+                existing = edges_by_key[key]
+                existing_refs = existing.setdefault("evidence_refs", [])
+                existing_refs.extend(ref for ref in refs if ref not in existing_refs)
+                continue
+            edges_by_key[key] = edge
+            merged["edges"].append(edge)
+
+        for assumption in part.get("assumptions") or []:
+            key = assumption if isinstance(assumption, str) else json.dumps(assumption, sort_keys=True, default=str)
+            if key in seen_assumptions:
+                continue
+            seen_assumptions.add(key)
+            merged["assumptions"].append(assumption)
+
+    return merged
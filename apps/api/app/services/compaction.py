@@ -0,0 +1,187 @@
+"""
+Prompt compaction for package formats (SSIS .dtsx, DataStage .dsx).
+
+Package exports are dominated by designer layout, GUIDs, boilerplate property
+metadata and repeated column paths. These helpers strip that noise before the
+content is sent to an LLM; the deterministic parsers keep using the raw file.
+"""
+import re
+import json
+from typing import Dict, Any, List, Tuple
+
+from .chunking import estimate_tokens
+
+# --- SSIS -------------------------------------------------------------------
+
+# Designer layout blobs (CDATA with diagram geometry) and XML comments
+_SSIS_BLOCK_NOISE = [
+    re.compile(r"<DTS:DesignTimeProperties>.*?</DTS:DesignTimeProperties>", re.DOTALL),
+    re.compile(r"<!--.*?-->", re.DOTALL),
+    # Error outputs only carry ErrorCode/ErrorColumn boilerplate
+    re.compile(r"<output\b[^>]*\bisErrorOut=\"true\"[^>]*>.*?</output>", re.DOTALL),
+]
+
+# Attributes with no lineage value (audit metadata, designer hints, GUIDs)
+_SSIS_NOISE_ATTRIBUTES = [
+    "DTS:DTSID", "DTS:VersionGUID", "DTS:CreationDate", "DTS:CreatorComputerName",
+    "DTS:CreatorName", "DTS:LastModifiedProductVersion", "DTS:LocaleID", "DTS:TaskContact",
+    "DTS:VersionBuild", "DTS:PackageType", "DTS:ThreadHint", "DTS:ConnectRetryCount",
+    "DTS:ConnectRetryInterval", "description", "contactInfo", "typeConverter", "UITypeEditor",
+    "containsID", "specialFlags", "errorRowDisposition", "truncationRowDisposition",
+    "errorOrTruncationOperation", "usesDispositions", "version", "cachedName",
+    "cachedDataType", "cachedLength", "cachedPrecision", "cachedScale", "cachedCodepage",
+    "cachedSortKeyPosition", "isSortKeyPosition", "pipelineVersion", "expressionType",
+]
+_SSIS_ATTR_PATTERN = re.compile(
+    r"\s(?:%s)=\"[^\"]*\"" % "|".join(re.escape(a) for a in _SSIS_NOISE_ATTRIBUTES)
+)
+# Element start tags (not <?xml ...?> declarations); attribute values may contain '>'
+_START_TAG_PATTERN = re.compile(r"<[A-Za-z_][\w:.-]*(?:\s+[\w:.-]+\s*=\s*(?:\"[^\"]*\"|'[^']*'))*\s*/?>")
+# Any remaining attribute whose value is a bare GUID
+_GUID_ATTR_PATTERN = re.compile(r"\s[\w:]+=\"\{[0-9A-Fa-f-]{36}\}\"")
+# Repeated column paths: Package\Task\Component.Outputs[X].Columns[Y]
+_COLUMN_PATH_PATTERN = re.compile(r"(Package\\[^\"\[\]]+?\.(?:Inputs|Outputs|ExternalColumns)\[[^\]]*\])")
+
+
+def compact_ssis_xml(content: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Strips designer/GUID noise from a .dtsx and aliases repeated column paths.
+    Returns the compacted XML and the alias legend (@P1 -> path), which must be
+    sent alongside every chunk of the XML.
+    """
+    text = content
+    for pattern in _SSIS_BLOCK_NOISE:
+        text = pattern.sub("", text)
+    text = _START_TAG_PATTERN.sub(_strip_noise_attributes, text)
+    text, legend = _alias_repeated(text, _COLUMN_PATH_PATTERN, "@P")
+    return _collapse_xml_whitespace(text), legend
+
+
+def _strip_noise_attributes(match: re.Match) -> str:
+    tag = _SSIS_ATTR_PATTERN.sub("", match.group(0))
+    return _GUID_ATTR_PATTERN.sub("", tag)
+
+
+def _collapse_xml_whitespace(text: str) -> str:
+    """
+    Drops whitespace between tags only: text nodes and attribute values keep
+    their line breaks (a SQL '-- comment' must not swallow the next line).
+    """
+    return re.sub(r">\s+<", "><", text).strip()
+
+
+def _alias_repeated(text: str, pattern: re.Pattern, prefix: str, min_count: int = 2) -> Tuple[str, Dict[str, str]]:
+    """Replaces values that repeat at least min_count times with short aliases."""
+    counts: Dict[str, int] = {}
+    for match in pattern.findall(text):
+        counts[match] = counts.get(match, 0) + 1
+
+    legend: Dict[str, str] = {}
+    aliases: Dict[str, str] = {}
+    for value, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+        alias = f"{prefix}{len(aliases) + 1}"
+        # Only alias when it actually saves characters
+        if count >= min_count and len(value) > len(alias) + 1:
+            aliases[value] = alias
+            legend[alias] = value
+
+    if aliases:
+        text = pattern.sub(lambda m: aliases.get(m.group(1), m.group(1)), text)
+    return text, legend
+
+# --- DataStage ----------------------------------------------------------------
+
+_DSX_NOISE_KEYS = {
+    "StageXPos", "StageYPos", "StageXSize", "StageYSize", "ContainerViewSizing",
+    "ZoomValue", "SnapToGrid", "GridLines", "ShowShadow", "TextFont", "TextColor",
+    "AnnotationFont", "BackgroundColor", "BorderVisible", "LinkSearchFlag", "NextID",
+    "NextStageID", "DateModified", "TimeModified", "DateCreated", "TimeCreated",
+    "OLEType", "Readonly", "ValidationStatus", "SnapToGridX", "SnapToGridY",
+}
+_DSX_KEY_PATTERN = re.compile(r"^\s*(\w+)\s")
+
+
+def compact_dsx(content: str) -> str:
+    """Drops DataStage designer/layout properties and binary (=+=+=+=) blobs."""
+    lines = []
+    in_blob = False
+    for line in content.splitlines():
+        stripped = line.strip()
+        if in_blob:
+            if stripped.endswith("=+=+=+="):
+                in_blob = False
+            continue
+        if not stripped:
+            continue
+        key_match = _DSX_KEY_PATTERN.match(line)
+        if key_match and key_match.group(1) in _DSX_NOISE_KEYS:
+            continue
+        if "=+=+=+=" in stripped:
+            # Multi-line binary value: skip until the closing marker
+            if stripped.count("=+=+=+=") == 1:
+                in_blob = True
+            continue
+        lines.append(stripped)
+    return "\n".join(lines)
+
+# --- Structure summaries --------------------------------------------------------
+
+def compact_structure(structure: Dict[str, Any]) -> str:
+    """
+    Minified JSON of a parser structure summary: empty values dropped and
+    repeated column lists replaced by references into a 'column_sets' table.
+    """
+    column_sets: Dict[str, List[Any]] = {}
+    refs: Dict[str, str] = {}
+    seen: Dict[str, int] = {}
+
+    # First pass: count column lists
+    def count(node):
+        if isinstance(node, dict):
+            for k, v in node.items():
+                if k == "columns" and isinstance(v, list) and v:
+                    key = json.dumps(v, separators=(",", ":"), default=str)
+                    seen[key] = seen.get(key, 0) + 1
+                count(v)
+        elif isinstance(node, list):
+            for item in node:
+                count(item)
+
+    def prune(node):
+        if isinstance(node, dict):
+            out = {}
+            for k, v in node.items():
+                if k == "columns" and isinstance(v, list) and v:
+                    key = json.dumps(v, separators=(",", ":"), default=str)
+                    if seen.get(key, 0) > 1:
+                        if key not in refs:
+                            ref = f"C{len(refs) + 1}"
+                            refs[key] = ref
+                            column_sets[ref] = v
+                        out[k] = {"$ref": refs[key]}
+                        continue
+                v = prune(v)
+                if v in (None, "", [], {}):
+                    continue
+                out[k] = v
+            return out
+        if isinstance(node, list):
+            return [p for p in (prune(i) for i in node) if p not in (None, "", [], {})]
+        return node
+
+    count(structure)
+    compacted = prune(structure)
+    if column_sets and isinstance(compacted, dict):
+        compacted["column_sets"] = column_sets
+    return json.dumps(compacted, separators=(",", ":"), default=str)
+
+
+def compaction_stats(original: str, compacted: str, model: str = None) -> Dict[str, int]:
+    """Token counts before/after compaction, for the audit log."""
+    original_tokens = estimate_tokens(original, model)
+    compacted_tokens = estimate_tokens(compacted, model)
+    return {
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "tokens_saved": max(0, original_tokens - compacted_tokens),
+    }
@@ -1,7 +1,7 @@
 import os
 import yaml
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -14,31 +14,58 @@ class ConfigManager:
         self.config_root = Path(config_root)
         self.active_path = self.config_root / "active.yml"
         self._active_config = None
+        self._active_mtime = None
         self._provider_cache = {}
         self._routing_cache = {}
 
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        """Returns the file mtime in ns, or None if the file does not exist."""
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
     def get_active_config(self) -> Dict[str, Any]:
-        """Loads and returns the current active configuration."""
-        if not self.active_path.exists():
+        """Loads and returns the current active configuration (cached by mtime)."""
+        mtime = self._mtime(self.active_path)
+        if mtime is None:
             logger.warning(f"Active config not found at {self.active_path}. Using defaults.")
             return {}
 
+        if self._active_config is not None and self._active_mtime == mtime:
+            return self._active_config
+
         with open(self.active_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            return data.get("active", {})
+            data = yaml.safe_load(f) or {}
+            self._active_config = data.get("active", {}) or {}
+            self._active_mtime = mtime
+            return self._active_config
 
-    def get_routing(self, routing_rel_path: str) -> Dict[str, Any]:
-        """Loads a specific routing profile."""
-        if routing_rel_path in self._routing_cache:
-            return self._routing_cache[routing_rel_path]
+    def get_config_version(self, routing_rel_path: Optional[str] = None) -> Tuple:
+        """
+        Cheap version stamp of the files that drive routing: active.yml plus the
+        routing profile it points to (or the one given). Only stat() calls, no parsing.
+        """
+        if routing_rel_path is None:
+            routing_rel_path = self.get_active_config().get("routing")
+        routing_mtime = self._mtime(self.config_root / routing_rel_path) if routing_rel_path else None
+        return (self._mtime(self.active_path), routing_rel_path, routing_mtime)
 
+    def get_routing(self, routing_rel_path: str) -> Dict[str, Any]:
+        """Loads a specific routing profile (cached until the file changes)."""
         full_path = self.config_root / routing_rel_path
-        if not full_path.exists():
+        mtime = self._mtime(full_path)
+        cached = self._routing_cache.get(routing_rel_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        if mtime is None:
             raise FileNotFoundError(f"Routing config not found: {full_path}")
 
         with open(full_path, 'r', encoding='utf-8') as f:
             data = yaml.safe_load(f)
-            self._routing_cache[routing_rel_path] = data
+            self._routing_cache[routing_rel_path] = (mtime, data)
             return data
 
     def get_provider(self, provider_rel_path: str) -> Dict[str, Any]:
@@ -123,6 +150,7 @@ class ConfigManager:
             yaml.safe_dump(new_active, f)
             
         # Clear cache
+        self._active_config = None
         self._provider_cache = {}
         self._routing_cache = {}
     def _secure_path(self, rel_path: str) -> Path:
@@ -0,0 +1,218 @@
+"""
+Embedding pipeline for code_embeddings (migrations 13 / 26).
+
+After a job, evidence snippets and asset descriptions are embedded in batches
+of EMBEDDING_BATCH_SIZE inputs: each batch looks up which content hashes are
+already embedded for the model, sends only the missing texts in a single
+embeddings request and bulk-inserts the vectors. Similarity search goes
+through match_code_embeddings (HNSW index).
+"""
+import hashlib
+import math
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..config import settings
+from .snippet_store import SnippetStore
+
+_TOKEN = re.compile(r"[A-Za-z0-9_]+")
+_HASH_LOOKUP_CHUNK = 100
+
+
+class HashEmbedder:
+    """
+    Deterministic local stand-in (feature hashing of tokens and token bigrams, L2-normalized).
+    No API calls; similar texts share dimensions, so search results are meaningful enough for tests/dev.
+    """
+
+    def __init__(self, dim: Optional[int] = None):
+        self.dim = dim or settings.EMBEDDING_DIM
+        self.model = f"hash-{self.dim}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        tokens = [t.lower() for t in _TOKEN.findall(text or "")]
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dim
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+
+class OpenAIEmbedder:
+    """OpenAI embeddings; one request per call to embed_documents (the pipeline sizes the batches)"""
+
+    def __init__(self, model: Optional[str] = None):
+        from langchain_openai import OpenAIEmbeddings
+
+        self.model = model or settings.EMBEDDING_MODEL
+        self._client = OpenAIEmbeddings(
+            openai_api_key=settings.OPENAI_API_KEY,
+            model=self.model,
+            chunk_size=settings.EMBEDDING_BATCH_SIZE,
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._client.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._client.embed_query(text)
+
+
+def get_embedder():
+    if settings.EMBEDDING_PROVIDER == "hash":
+        return HashEmbedder()
+    return OpenAIEmbedder()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingPipeline:
+    def __init__(self, supabase, embedder=None, batch_size: Optional[int] = None):
+        self.supabase = supabase
+        self._embedder = embedder
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+
+    # --- Sources ---
+
+    def _iter_table(self, table: str, key: str, columns: str, project_id: str) -> Iterator[Dict[str, Any]]:
+        """Keyset pages over one project's rows (PostgREST max-rows safe)"""
+        last = None
+        while True:
+            query = self.supabase.table(table).select(columns).eq("project_id", project_id)
+            if last is not None:
+                query = query.gt(key, last)
+            rows = query.order(key).limit(self.batch_size).execute().data or []
+            if not rows:
+                return
+            yield from rows
+            last = rows[-1][key]
+
+    def iter_items(self, project_id: str) -> Iterator[Dict[str, Any]]:
+        """Texts to embed: evidence snippets, then asset descriptions"""
+        max_chars = settings.EMBEDDING_MAX_CHARS
+        rows = self._iter_table("evidence", "evidence_id", "evidence_id, file_path, snippet, snippet_hash", project_id)
+        for row in self._with_snippets(rows):
+            snippet = (row.get("snippet") or "").strip()
+            if snippet:
+                yield {"source_kind": "evidence", "evidence_id": row["evidence_id"],
+                       "file_path": row.get("file_path"), "snippet": snippet[:max_chars],
+                       "snippet_hash": row.get("snippet_hash")}
+        for row in self._iter_table("asset", "asset_id", "asset_id, asset_type, name_display, system, tags", project_id):
+            yield {"source_kind": "asset", "asset_id": row["asset_id"], "file_path": None,
+                   "snippet": self.asset_text(row)[:max_chars]}
+
+    def _with_snippets(self, rows: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Resolves snippet_hash through the snippet store, one bulk fetch per batch of rows"""
+        store = SnippetStore(self.supabase)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                store.attach(batch)
+                yield from batch
+                batch = []
+        store.attach(batch)
+        yield from batch
+
+    @staticmethod
+    def asset_text(row: Dict[str, Any]) -> str:
+        tags = row.get("tags") if isinstance(row.get("tags"), dict) else {}
+        text = f"{row.get('asset_type') or 'asset'} {row.get('name_display')}"
+        if row.get("system"):
+            text += f" (system: {row['system']})"
+        description = tags.get("description") or tags.get("summary")
+        if description:
+            text += f": {description}"
+        return text
+
+    # --- Embedding ---
+
+    def embed_project(self, project_id: str) -> Dict[str, int]:
+        stats = {"items": 0, "embedded": 0, "cached": 0, "batches": 0}
+        batch: List[Dict[str, Any]] = []
+        for item in self.iter_items(project_id):
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._embed_batch(project_id, batch, stats)
+                batch = []
+        if batch:
+            self._embed_batch(project_id, batch, stats)
+        print(f"[EMBEDDINGS] {project_id}: {stats}", flush=True)
+        return stats
+
+    def _embed_batch(self, project_id: str, items: List[Dict[str, Any]], stats: Dict[str, int]):
+        model = self.embedder.model
+        stats["items"] += len(items)
+
+        # Dedupe inside the batch and against what is already stored for this model
+        pending: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            pending.setdefault(content_hash(item["snippet"]), item)
+        existing = self._existing_hashes(project_id, model, list(pending))
+        todo: List[Tuple[str, Dict[str, Any]]] = [(h, it) for h, it in pending.items() if h not in existing]
+        stats["cached"] += len(items) - len(todo)
+        if not todo:
+            return
+
+        vectors = self.embedder.embed_documents([it["snippet"] for _, it in todo])
+        stats["batches"] += 1
+        rows = [{
+            "project_id": project_id,
+            "source_kind": item["source_kind"],
+            "evidence_id": item.get("evidence_id"),
+            "asset_id": item.get("asset_id"),
+            "file_path": item.get("file_path"),
+            # Evidence text lives in evidence_snippet (migration 31); asset descriptions stay inline
+            "snippet": None if item.get("snippet_hash") else item["snippet"],
+            "snippet_hash": item.get("snippet_hash"),
+            "content_hash": h,
+            "model": model,
+            "embedding": vector,
+        } for (h, item), vector in zip(todo, vectors) if vector]
+        if rows:
+            # Concurrent runs may insert the same hash first
+            self.supabase.table("code_embeddings").upsert(
+                rows, on_conflict="project_id,model,content_hash", ignore_duplicates=True
+            ).execute()
+        stats["embedded"] += len(rows)
+
+    def _existing_hashes(self, project_id: str, model: str, hashes: List[str]) -> set:
+        found = set()
+        # 64-char hashes: chunked so the filter stays well under URL length limits
+        for i in range(0, len(hashes), _HASH_LOOKUP_CHUNK):
+            res = self.supabase.table("code_embeddings").select("content_hash")\
+                .eq("project_id", project_id).eq("model", model)\
+                .in_("content_hash", hashes[i:i + _HASH_LOOKUP_CHUNK]).execute()
+            found.update(row["content_hash"] for row in (res.data or []))
+        return found
+
+    # --- Search ---
+
+    def search(self, project_id: str, query: str, limit: int = 10, min_similarity: float = 0.0) -> List[Dict[str, Any]]:
+        vector = self.embedder.embed_query(query)
+        res = self.supabase.rpc("match_code_embeddings", {
+            "p_project_id": project_id,
+            "p_query": vector,
+            "p_match_count": limit,
+            "p_min_similarity": min_similarity,
+        }).execute()
+        results = res.data or []
+        SnippetStore(self.supabase).attach(results)
+        return results
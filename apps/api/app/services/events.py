@@ -0,0 +1,215 @@
+"""
+Job event bus (progress, status, cancellation).
+
+In-process pub/sub that the orchestrator publishes to and /jobs/{id}/events
+streams from (SSE). Across processes (API <-> worker) events travel through
+Postgres NOTIFY: publish() calls the notify_job_event RPC (migration 20) and,
+when DATABASE_URL is set and psycopg is installed, a background LISTEN thread
+re-dispatches notifications into the local bus.
+"""
+import asyncio
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import settings
+
+# Events after which a job stream ends (planning_ready pauses until approval)
+TERMINAL_EVENTS = {"completed", "failed", "cancelled", "planning_ready"}
+
+# Identifies events published by this process (skip our own NOTIFY echoes)
+_ORIGIN = uuid.uuid4().hex
+
+
+def snapshot_event(job_id: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Event for a job_run row read by the SSE polling fallback (same shape as published events)"""
+    status = (row.get("status") or "").lower()
+    event_type = "failed" if status == "error" else status if status in TERMINAL_EVENTS else "progress"
+    return {"job_id": str(job_id), "type": event_type, "data": dict(row), "ts": time.time(), "origin": "job_run"}
+
+
+class JobEventBus:
+    def __init__(self, supabase_client=None):
+        self._supabase = supabase_client
+        self._subscribers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self._cancelled: set = set()
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self.listening = False
+        self._notify_retry_at = 0.0
+        self._last_notify: Dict[str, float] = {}
+
+    @property
+    def supabase(self):
+        if self._supabase is None:
+            from .supabase_client import get_service_client
+            self._supabase = get_service_client()
+        return self._supabase
+
+    # --- Publish / dispatch -------------------------------------------------
+
+    def publish(self, job_id: str, event_type: str, data: Optional[Dict[str, Any]] = None, broadcast: bool = True) -> Dict[str, Any]:
+        event = {
+            "job_id": str(job_id),
+            "type": event_type,
+            "data": data or {},
+            "ts": time.time(),
+            "origin": _ORIGIN,
+        }
+        self._dispatch(event)
+        if broadcast:
+            self._notify(event)
+        return event
+
+    def _dispatch(self, event: Dict[str, Any]):
+        job_id = event["job_id"]
+        with self._lock:
+            if event["type"] == "cancelled":
+                self._cancelled.add(job_id)
+            callbacks = list(self._subscribers.get(job_id, []))
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"[EVENTS] Subscriber error for job {job_id}: {e}")
+
+    def _notify(self, event: Dict[str, Any]):
+        now = time.monotonic()
+        if now < self._notify_retry_at:
+            return
+        job_id = event["job_id"]
+        with self._lock:
+            if event["type"] == "progress":
+                # Progress is a level, not a log: remote listeners only need the latest value
+                if now - self._last_notify.get(job_id, float("-inf")) < settings.JOB_EVENTS_NOTIFY_INTERVAL_SEC:
+                    return
+                self._last_notify[job_id] = now
+            else:
+                self._last_notify.pop(job_id, None)
+        try:
+            self.supabase.rpc("notify_job_event", {
+                "p_channel": settings.JOB_EVENTS_CHANNEL,
+                "p_payload": event
+            }).execute()
+        except Exception as e:
+            # Local subscribers already got the event; other processes poll job_run until the retry
+            print(f"[EVENTS] notify_job_event RPC failed, retrying in {settings.JOB_EVENTS_NOTIFY_RETRY_SEC:g}s: {e}")
+            self._notify_retry_at = now + settings.JOB_EVENTS_NOTIFY_RETRY_SEC
+
+    # --- Subscribe ----------------------------------------------------------
+
+    def subscribe(self, job_id: str, callback: Callable[[Dict[str, Any]], None]) -> Callable[[], None]:
+        """Registers a callback; returns the unsubscribe function"""
+        job_id = str(job_id)
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(job_id, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks:
+                    self._subscribers.pop(job_id, None)
+        return unsubscribe
+
+    def stream(self, job_id: str, heartbeat_sec: Optional[float] = None) -> "JobEventStream":
+        """Subscribes immediately (call from the event loop); iterate with async for, then close()"""
+        return JobEventStream(self, job_id, heartbeat_sec or settings.JOB_EVENTS_HEARTBEAT_SEC)
+
+    def is_cancelled(self, job_id: str) -> bool:
+        with self._lock:
+            return str(job_id) in self._cancelled
+
+    def forget(self, job_id: str):
+        """Drops per-job state once the job is finished"""
+        with self._lock:
+            self._cancelled.discard(str(job_id))
+            self._last_notify.pop(str(job_id), None)
+
+    # --- Cross-process LISTEN bridge ---------------------------------------
+
+    def start_listener(self) -> bool:
+        """Starts the LISTEN thread once. Returns False when not configured (DATABASE_URL / psycopg)."""
+        if self._listener is not None:
+            return self.listening
+        if not settings.DATABASE_URL:
+            return False
+        try:
+            import psycopg  # noqa: F401
+        except ImportError:
+            print("[EVENTS] psycopg not installed; cross-process events disabled (falling back to polling)")
+            return False
+        self._listener = threading.Thread(target=self._listen_loop, name="job-events-listener", daemon=True)
+        self._listener.start()
+        # `listening` flips to True in the thread once LISTEN has succeeded
+        return True
+
+    def _listen_loop(self):
+        import psycopg
+        channel = settings.JOB_EVENTS_CHANNEL
+        while True:
+            try:
+                with psycopg.connect(settings.DATABASE_URL, autocommit=True) as conn:
+                    conn.execute(f'LISTEN "{channel}"')
+                    print(f"[EVENTS] Listening on channel '{channel}'")
+                    self.listening = True
+                    for notify in conn.notifies():
+                        self.handle_notification(notify.payload)
+            except Exception as e:
+                self.listening = False
+                print(f"[EVENTS] Listener error, reconnecting: {e}")
+                time.sleep(settings.JOB_EVENTS_RECONNECT_SEC)
+
+    def handle_notification(self, payload: str):
+        try:
+            event = json.loads(payload)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(event, dict) or "job_id" not in event or event.get("origin") == _ORIGIN:
+            return
+        self._dispatch(event)
+
+
+class JobEventStream:
+    """
+    Async iterator of events for one job (None on heartbeat timeouts); stops after a terminal event.
+    Publishers run in worker threads, so events cross into the loop with call_soon_threadsafe.
+    """
+
+    def __init__(self, bus: JobEventBus, job_id: str, heartbeat_sec: float):
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._heartbeat = heartbeat_sec
+        self._done = False
+        self._unsubscribe = bus.subscribe(job_id, lambda event: self._loop.call_soon_threadsafe(self._queue.put_nowait, event))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Optional[Dict[str, Any]]:
+        if self._done:
+            raise StopAsyncIteration
+        try:
+            event = await asyncio.wait_for(self._queue.get(), timeout=self._heartbeat)
+        except asyncio.TimeoutError:
+            return None
+        if event["type"] in TERMINAL_EVENTS:
+            self._done = True
+        return event
+
+    def close(self):
+        self._done = True
+        self._unsubscribe()
+
+
+_event_bus = None
+
+def get_event_bus() -> JobEventBus:
+    """Singleton process-wide bus"""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = JobEventBus()
+    return _event_bus
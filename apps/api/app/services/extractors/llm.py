@@ -1,11 +1,11 @@
 import os
 from .base import BaseExtractor
 from ...models.extraction import ExtractionResult
-from ..llm import LLMService
+from ..llm import LLMService, get_llm_service
 
 class LLMExtractor(BaseExtractor):
-    def __init__(self):
-        self.llm_service = LLMService()
+    def __init__(self, llm_service: LLMService = None):
+        self.llm_service = llm_service or get_llm_service()
 
     def extract(self, file_path: str, content: str) -> ExtractionResult:
         extension = os.path.splitext(file_path)[1].lower()
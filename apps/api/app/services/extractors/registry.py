@@ -1,32 +1,97 @@
 import os
+import threading
+from typing import Callable, Dict, Optional
 from .base import BaseExtractor
-from .llm import LLMExtractor
-from .regex import RegexExtractor
-from .sql_glot import SqlGlotExtractor
-from .ssis_deep import SSISDeepExtractor
+
+# Extractor plugins: name -> factory, extension -> name. Extractors are built on first
+# use and reused; files without a registered extension go to the "llm" extractor.
+_FACTORIES: Dict[str, Callable[[], BaseExtractor]] = {}
+_EXTENSIONS: Dict[str, str] = {}
+DEFAULT_EXTRACTOR = "llm"
+
+
+def register_extractor(name: str, factory: Callable[[], BaseExtractor], extensions=()):
+    """Registers (or replaces) an extractor plugin for the given file extensions"""
+    _FACTORIES[name] = factory
+    for ext in extensions:
+        _EXTENSIONS[ext.lower() if ext.startswith(".") else f".{ext.lower()}"] = name
+
+
+def _llm_extractor():
+    from .llm import LLMExtractor
+    return LLMExtractor()
+
+def _sql_extractor():
+    from .sql_glot import SqlGlotExtractor
+    return SqlGlotExtractor()
+
+def _ssis_extractor():
+    from .ssis_deep import SSISDeepExtractor
+    return SSISDeepExtractor()
+
+def _regex_extractor():
+    from .regex import RegexExtractor
+    return RegexExtractor()
+
+register_extractor("llm", _llm_extractor)
+register_extractor("sql", _sql_extractor, [".sql"])
+register_extractor("ssis", _ssis_extractor, [".dtsx"])  # Use deep extractor for SSIS
+register_extractor("regex", _regex_extractor)
+# For other files (py, xml, etc), we still use LLM for now as it's more versatile
+# until we implement AST parsers for Python.
+
 
 class ExtractorRegistry:
     def __init__(self):
-        self.llm_extractor = LLMExtractor()
-        self.regex_extractor = RegexExtractor()
-        self.sql_extractor = SqlGlotExtractor()
-        self.ssis_extractor = SSISDeepExtractor()
-        
+        self._instances: Dict[str, BaseExtractor] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> BaseExtractor:
+        extractor = self._instances.get(name)
+        if extractor is None:
+            with self._lock:
+                extractor = self._instances.get(name)
+                if extractor is None:
+                    extractor = _FACTORIES[name]()
+                    self._instances[name] = extractor
+        return extractor
+
+    @property
+    def llm_extractor(self) -> BaseExtractor:
+        return self.get("llm")
+
+    @property
+    def regex_extractor(self) -> BaseExtractor:
+        return self.get("regex")
+
+    @property
+    def sql_extractor(self) -> BaseExtractor:
+        return self.get("sql")
+
+    @property
+    def ssis_extractor(self) -> BaseExtractor:
+        return self.get("ssis")
+
     def get_extractor(self, file_path: str) -> BaseExtractor:
         """
         Returns the appropriate extractor for the file.
         """
         ext = os.path.splitext(file_path)[1].lower()
-        
-        if ext == '.sql':
-            return self.sql_extractor
-        elif ext == '.dtsx':
-            return self.ssis_extractor  # Use deep extractor for SSIS
-            
-        # For other files (py, xml, etc), we still use LLM for now as it's more versatile 
-        # until we implement AST parsers for Python.
-        return self.llm_extractor
+        return self.get(_EXTENSIONS.get(ext, DEFAULT_EXTRACTOR))
 
     def extract(self, file_path: str, content: str):
         extractor = self.get_extractor(file_path)
         return extractor.extract(file_path, content)
+
+
+_registry: Optional[ExtractorRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_extractor_registry() -> ExtractorRegistry:
+    """Process-wide registry (extractors are built once, on first selection)"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ExtractorRegistry()
+    return _registry
@@ -307,10 +307,13 @@ class SSISDeepExtractor(BaseExtractor):
         
         # 1. Extract Components
         components_node = None
+        paths_node = None
         for child in pipeline_elem:
-            if self._local_tag(child.tag) == "components":
+            tag = self._local_tag(child.tag)
+            if tag == "components":
                 components_node = child
-                break
+            elif tag == "paths":
+                paths_node = child
         
         comp_id_map = {} # Map refId (internal SSIS ID) -> component_id (UUID)
 
@@ -1,106 +1,198 @@
 import csv
 import json
 import io
-from typing import List, Dict, Any, Optional
+import zlib
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Tuple
 from supabase import Client
 
+from ..config import settings
+
+# (section, table, primary key) of the raw JSON export, in output order
+RAW_EXPORT_TABLES: List[Tuple[str, str, str]] = [
+    ("assets", "asset", "asset_id"),
+    ("edges", "edge_index", "edge_id"),
+    ("packages", "package", "package_id"),
+    ("lineage", "column_lineage", "lineage_id"),
+]
+
+# dbt source name used for assets without a system
+DBT_DEFAULT_SOURCE = "external_source"
+
+
+def gzip_stream(chunks: Iterable[str], level: Optional[int] = None) -> Iterator[bytes]:
+    """Incrementally gzips a stream of text chunks (constant memory)"""
+    compressor = zlib.compressobj(settings.EXPORT_GZIP_LEVEL if level is None else level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 class GovernanceExportService:
-    def __init__(self, supabase: Client):
+    """
+    Governance exports as generators of text chunks (one chunk per page of rows).
+    Rows are read with keyset pagination (pk > last ORDER BY pk), so memory and
+    time to first byte do not depend on the catalog size. The export_* methods
+    join the stream for callers that still want the whole document.
+    """
+
+    def __init__(self, supabase: Client, page_size: Optional[int] = None):
         self.supabase = supabase
+        self.page_size = page_size or settings.EXPORT_PAGE_SIZE
+
+    def _iter_rows(self, table: str, key: str, project_id: str, columns: str = "*",
+                   filters: Optional[Dict[str, Any]] = None, scope_column: str = "project_id") -> Iterator[Dict[str, Any]]:
+        """
+        Yields every project row of `table`, one keyset page at a time.
+        scope_column lets child tables scope through an embedded parent (e.g. "package.project_id").
+        """
+        last = None
+        while True:
+            query = self.supabase.table(table).select(columns).eq(scope_column, project_id)
+            for column, value in (filters or {}).items():
+                query = query.is_(column, "null") if value is None else query.eq(column, value)
+            if last is not None:
+                query = query.gt(key, last)
+            rows = query.order(key).limit(self.page_size).execute().data or []
+            # Stop on an empty page only: a server max-rows below page_size must not end the export early
+            if not rows:
+                return
+            yield from rows
+            last = rows[-1][key]
+
+    def _iter_pages(self, rows: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        page = []
+        for row in rows:
+            page.append(row)
+            if len(page) >= self.page_size:
+                yield page
+                page = []
+        if page:
+            yield page
 
-    def _to_csv(self, rows: List[Dict[str, Any]], fieldnames: List[str]) -> str:
+    def _iter_csv(self, rows: Iterable[Dict[str, Any]], fieldnames: List[str]) -> Iterator[str]:
         output = io.StringIO()
         writer = csv.DictWriter(output, fieldnames=fieldnames)
         writer.writeheader()
-        for row in rows:
-            # Filter row to only include desired fields
-            filtered_row = {k: row.get(k, "") for k in fieldnames}
-            writer.writerow(filtered_row)
-        return output.getvalue()
+        yield output.getvalue()
+        for page in self._iter_pages(rows):
+            output.seek(0)
+            output.truncate()
+            for row in page:
+                # Filter row to only include desired fields
+                writer.writerow({k: row.get(k, "") for k in fieldnames})
+            yield output.getvalue()
 
-    def export_for_purview(self, project_id: str) -> str:
+    # --- Purview ------------------------------------------------------------
+
+    def iter_purview_csv(self, project_id: str) -> Iterator[str]:
         """
-        Generates a CSV string compatible with Microsoft Purview bulk upload.
+        Streams a CSV compatible with Microsoft Purview bulk upload.
         """
-        # Fetch assets
-        assets = self.supabase.table("asset").select("*").eq("project_id", project_id).execute().data
-        
         fieldnames = ["Qualified Name", "Display Name", "Description", "Asset Type"]
-        rows = []
-        for asset in assets:
-            rows.append({
+        rows = (
+            {
                 "Qualified Name": asset.get("canonical_name") or asset.get("name_display"),
                 "Display Name": asset.get("name_display"),
                 "Description": f"Extracted from DiscoverAI. System: {asset.get('system')}",
                 "Asset Type": asset.get("asset_type")
-            })
-            
-        return self._to_csv(rows, fieldnames)
+            }
+            for asset in self._iter_rows("asset", "asset_id", project_id,
+                                         "asset_id, canonical_name, name_display, system, asset_type")
+        )
+        return self._iter_csv(rows, fieldnames)
 
-    def export_for_unity_catalog(self, project_id: str) -> str:
+    def export_for_purview(self, project_id: str) -> str:
+        return "".join(self.iter_purview_csv(project_id))
+
+    # --- Unity Catalog ------------------------------------------------------
+
+    def iter_unity_catalog_csv(self, project_id: str) -> Iterator[str]:
         """
-        Generates a CSV representing lineage and assets for Unity Catalog manual import.
+        Streams a CSV representing lineage and assets for Unity Catalog manual import.
         """
-        # Fetch lineage
-        lineage = self.supabase.table("column_lineage")\
-            .select("*, source_asset:source_asset_id(name_display), target_asset:target_asset_id(name_display)")\
-            .eq("project_id", project_id).execute().data
-        
         fieldnames = ["Source Table", "Source Column", "Target Table", "Target Column", "Transformation"]
-        rows = []
-        for lin in lineage:
-            rows.append({
+        lineage = self._iter_rows(
+            "column_lineage", "lineage_id", project_id,
+            "lineage_id, source_column, target_column, transformation_rule, "
+            "source_asset:source_asset_id(name_display), target_asset:target_asset_id(name_display)"
+        )
+        rows = (
+            {
                 "Source Table": lin.get("source_asset", {}).get("name_display") if lin.get("source_asset") else "Unknown",
                 "Source Column": lin.get("source_column"),
                 "Target Table": lin.get("target_asset", {}).get("name_display") if lin.get("target_asset") else "Unknown",
                 "Target Column": lin.get("target_column"),
-                "Transformation": lin.get("logic")
-            })
-            
-        return self._to_csv(rows, fieldnames)
+                "Transformation": lin.get("transformation_rule")
+            }
+            for lin in lineage
+        )
+        return self._iter_csv(rows, fieldnames)
 
-    def export_for_dbt(self, project_id: str) -> str:
+    def export_for_unity_catalog(self, project_id: str) -> str:
+        return "".join(self.iter_unity_catalog_csv(project_id))
+
+    # --- dbt ----------------------------------------------------------------
+
+    def _dbt_systems(self, project_id: str) -> List[Optional[str]]:
+        """Distinct systems of table assets (None/empty = no system), in first-seen order"""
+        systems: Dict[Optional[str], None] = {}
+        for asset in self._iter_rows("asset", "asset_id", project_id, "asset_id, system", {"asset_type": "table"}):
+            systems.setdefault(asset.get("system"), None)
+        return list(systems)
+
+    def iter_dbt_sources(self, project_id: str) -> Iterator[str]:
         """
-        Generates a dbt sources.yml fragment based on extracted assets.
+        Streams a dbt sources.yml fragment based on extracted assets.
+        One pass collects the (few) distinct systems, then each source block is
+        paged separately so only one page of tables is held at a time.
         """
-        assets = self.supabase.table("asset").select("*").eq("project_id", project_id).execute().data
-        
-        # Group by system (or use a default source name)
-        sources = {}
-        for asset in assets:
-            if asset.get("asset_type") != "table":
-                continue
-            
-            system = asset.get("system") or "external_source"
-            if system not in sources:
-                sources[system] = []
-            
-            sources[system].append({
-                "name": asset.get("name_display"),
-                "description": f"Imported from DiscoverAI. Canonical: {asset.get('canonical_name')}"
-            })
-            
-        if not sources:
-            return "version: 2\nsources: []"
-            
-        output = ["version: 2", "sources:"]
-        for sys_name, tables in sources.items():
-            output.append(f"  - name: {sys_name}")
-            output.append("    tables:")
-            for table in tables:
-                output.append(f"      - name: {table['name']}")
-                output.append(f"        description: \"{table['description']}\"")
-                
-        return "\n".join(output)
+        systems = self._dbt_systems(project_id)
+        if not systems:
+            yield "version: 2\nsources: []"
+            return
 
-    def export_raw_json(self, project_id: str) -> str:
+        # Assets without system share the default source with a literal "external_source" system
+        blocks: Dict[str, List[Optional[str]]] = {}
+        for system in systems:
+            blocks.setdefault(system or DBT_DEFAULT_SOURCE, []).append(system)
+
+        yield "version: 2\nsources:"
+        for sys_name, members in blocks.items():
+            yield f"\n  - name: {sys_name}\n    tables:"
+            for system in members:
+                assets = self._iter_rows("asset", "asset_id", project_id, "asset_id, name_display, canonical_name",
+                                         {"asset_type": "table", "system": system})
+                for page in self._iter_pages(assets):
+                    lines = []
+                    for asset in page:
+                        lines.append(f"\n      - name: {asset.get('name_display')}")
+                        lines.append(f"\n        description: \"Imported from DiscoverAI. Canonical: {asset.get('canonical_name')}\"")
+                    yield "".join(lines)
+
+    def export_for_dbt(self, project_id: str) -> str:
+        return "".join(self.iter_dbt_sources(project_id))
+
+    # --- Raw JSON -----------------------------------------------------------
+
+    def iter_raw_json(self, project_id: str) -> Iterator[str]:
         """
-        Returns a full technical export of the project metadata in JSON format.
+        Streams the full technical export of the project metadata in JSON format
+        ({"assets": [...], "edges": [...], "packages": [...], "lineage": [...]}, one row per line).
         """
-        data = {
-            "assets": self.supabase.table("asset").select("*").eq("project_id", project_id).execute().data,
-            "edges": self.supabase.table("edge_index").select("*").eq("project_id", project_id).execute().data,
-            "packages": self.supabase.table("package").select("*").eq("project_id", project_id).execute().data,
-            "lineage": self.supabase.table("column_lineage").select("*").eq("project_id", project_id).execute().data
-        }
-        return json.dumps(data, indent=2, default=str)
+        yield "{"
+        for index, (section, table, key) in enumerate(RAW_EXPORT_TABLES):
+            yield f"{',' if index else ''}\n  {json.dumps(section)}: ["
+            first = True
+            for page in self._iter_pages(self._iter_rows(table, key, project_id)):
+                parts = []
+                for row in page:
+                    parts.append(("\n    " if first else ",\n    ") + json.dumps(row, default=str))
+                    first = False
+                yield "".join(parts)
+            yield "]" if first else "\n  ]"
+        yield "\n}\n"
+
+    def export_raw_json(self, project_id: str) -> str:
+        return "".join(self.iter_raw_json(project_id))
@@ -2,7 +2,11 @@ from abc import ABC, abstractmethod
 from ..config import settings
 import json
 import time
-from neo4j.exceptions import ServiceUnavailable, SessionExpired
+
+# Slim projections for graph payloads: heavy attributes stay in asset_detail (migration 28)
+ASSET_GRAPH_COLUMNS = "asset_id, asset_type, name_display, system, tags"
+EDGE_GRAPH_COLUMNS = "edge_id, from_asset_id, to_asset_id, edge_type, confidence, is_hypothesis"
+IN_FILTER_CHUNK = 200
 
 class GraphService(ABC):
     @abstractmethod
@@ -68,6 +72,7 @@ class Neo4jGraphService(GraphService):
         self.driver.close()
 
     def _run_query_with_retry(self, query, params=None, max_retries=3):
+        from neo4j.exceptions import ServiceUnavailable, SessionExpired
         for attempt in range(max_retries):
             try:
                 with self.driver.session() as session:
@@ -209,9 +214,8 @@ class Neo4jGraphService(GraphService):
 
 class SupabaseGraphService(GraphService):
     def __init__(self):
-        from supabase import create_client
-        key = settings.SUPABASE_SERVICE_ROLE_KEY or settings.SUPABASE_KEY
-        self.client = create_client(settings.SUPABASE_URL, key)
+        from .supabase_client import get_service_client
+        self.client = get_service_client()
         print("[SUPABASE GRAPH] Initialized")
 
     def upsert_node(self, label: str, properties: dict):
@@ -242,11 +246,11 @@ class SupabaseGraphService(GraphService):
         
         # DEFAULT: GLOBAL
         # 1. Fetch Assets (Nodes)
-        assets_res = self.client.table("asset").select("*").eq("project_id", solution_id).execute()
+        assets_res = self.client.table("asset").select(ASSET_GRAPH_COLUMNS).eq("project_id", solution_id).execute()
         assets = assets_res.data or []
         
         # 2. Fetch Edges
-        edges_res = self.client.table("edge_index").select("*").eq("project_id", solution_id).execute()
+        edges_res = self.client.table("edge_index").select(EDGE_GRAPH_COLUMNS).eq("project_id", solution_id).execute()
         edges = edges_res.data or []
         
         return self._transform_to_cytoscape(assets, edges)
@@ -324,15 +328,14 @@ class SupabaseGraphService(GraphService):
         plus its immediate input/output tables.
         """
         # 1. Fetch Package Assets (Components)
-        # Components are bridged to 'asset' and tagged with package_id
-        assets_res = self.client.table("asset").select("*").eq("project_id", solution_id).execute()
-        all_assets = assets_res.data or []
-        
-        package_assets = [a for a in all_assets if a.get("tags", {}).get("package_id") == package_id]
+        # Components are bridged to 'asset' and tagged with package_id (idx_asset_tags_package)
+        assets_res = self.client.table("asset").select(ASSET_GRAPH_COLUMNS)\
+            .eq("project_id", solution_id).eq("tags->>package_id", str(package_id)).execute()
+        package_assets = assets_res.data or []
         package_asset_ids = set(str(a["asset_id"]) for a in package_assets)
 
         # 2. Fetch edges where at least one end is in the package
-        edges_res = self.client.table("edge_index").select("*").eq("project_id", solution_id).execute()
+        edges_res = self.client.table("edge_index").select(EDGE_GRAPH_COLUMNS).eq("project_id", solution_id).execute()
         all_edges = edges_res.data or []
         
         relevant_edges = []
@@ -346,10 +349,18 @@ class SupabaseGraphService(GraphService):
                 if tgt not in package_asset_ids: external_node_ids.add(tgt)
 
         # 3. Add external context nodes (Tables/Files)
-        external_assets = [a for a in all_assets if str(a["asset_id"]) in external_node_ids]
+        external_assets = self._fetch_assets(external_node_ids)
         
         return self._transform_to_cytoscape(package_assets + external_assets, relevant_edges)
 
+    def _fetch_assets(self, asset_ids) -> list:
+        ids = sorted(asset_ids)
+        assets = []
+        for i in range(0, len(ids), IN_FILTER_CHUNK):
+            res = self.client.table("asset").select(ASSET_GRAPH_COLUMNS).in_("asset_id", ids[i:i + IN_FILTER_CHUNK]).execute()
+            assets.extend(res.data or [])
+        return assets
+
     def _transform_to_cytoscape(self, assets: list, edges: list):
         nodes_list = []
         for a in assets:
@@ -386,11 +397,11 @@ class SupabaseGraphService(GraphService):
 
     def get_subgraph(self, center_id: str, depth: int, limit: int):
         # (Recursive neighbors logic remains similar but uses _transform_to_cytoscape)
-        out_edges = self.client.table("edge_index").select("*").eq("from_asset_id", center_id).execute().data or []
-        in_edges = self.client.table("edge_index").select("*").eq("to_asset_id", center_id).execute().data or []
+        out_edges = self.client.table("edge_index").select(EDGE_GRAPH_COLUMNS).eq("from_asset_id", center_id).execute().data or []
+        in_edges = self.client.table("edge_index").select(EDGE_GRAPH_COLUMNS).eq("to_asset_id", center_id).execute().data or []
         all_edges = out_edges + in_edges
         node_ids = set([center_id] + [e["from_asset_id"] for e in all_edges] + [e["to_asset_id"] for e in all_edges])
-        assets = self.client.table("asset").select("*").in_("asset_id", list(node_ids)).execute().data or []
+        assets = self._fetch_assets(node_ids)
         return self._transform_to_cytoscape(assets, all_edges)
 
     def find_paths(self, from_id: str, to_id: str, max_hops: int):
@@ -0,0 +1,143 @@
+"""
+Deterministic catalog identities (UUIDv5 over natural keys).
+
+asset_id = uuid5(ASSET_NAMESPACE, "<project_id>|<asset_type>|<canonical_name>")
+edge_id  = uuid5(EDGE_NAMESPACE,  "<project_id>|<from_asset_id>|<to_asset_id>|<edge_type>")
+evidence_id = uuid5(EVIDENCE_NAMESPACE, "<project_id>|<file_path>|<content_hash>")
+
+Any writer can compute the id of an asset or edge without reading the
+catalog, so writes are blind upserts. Must match asset_natural_id() /
+edge_natural_id() in migration 27 (uuid-ossp uuid_generate_v5). Evidence
+rows written before migration 29 keep their random ids; insert_evidence
+returns the stored id for each natural key.
+AssetIdentityMap keeps them (and what was already written) for a whole job.
+"""
+import hashlib
+import json
+import threading
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+ASSET_NAMESPACE = uuid.UUID("6f1c2f0e-5b7a-4c55-9d8e-3a1f2b4c5d60")
+EDGE_NAMESPACE = uuid.UUID("0b9e4d2a-7c3f-4e81-a6d5-9f2e1c8b7a40")
+EVIDENCE_NAMESPACE = uuid.UUID("3c7a9e15-2d4b-4f60-8b1e-5a9c0d7f2e31")
+
+
+def _uuid_text(value) -> str:
+    """Postgres uuid::text form (lowercase, hyphenated); non-UUID values are used as-is"""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return str(value)
+
+
+def asset_id_for(project_id, canonical_name: str, asset_type: str) -> str:
+    return str(uuid.uuid5(ASSET_NAMESPACE, f"{_uuid_text(project_id)}|{asset_type}|{canonical_name}"))
+
+
+def edge_id_for(project_id, from_asset_id, to_asset_id, edge_type: str) -> str:
+    key = f"{_uuid_text(project_id)}|{_uuid_text(from_asset_id)}|{_uuid_text(to_asset_id)}|{edge_type}"
+    return str(uuid.uuid5(EDGE_NAMESPACE, key))
+
+
+def evidence_id_for(project_id, file_path: Optional[str], content_hash: str) -> str:
+    return str(uuid.uuid5(EVIDENCE_NAMESPACE, f"{_uuid_text(project_id)}|{file_path or ''}|{content_hash}"))
+
+
+class AssetIdentityMap:
+    """
+    Job-lifetime identity map for one project, shared by both catalog sync paths.
+
+    Warm-loaded once (keyset pages over asset and edge_index) and updated after every
+    write: (canonical_name, asset_type) -> asset_id, (from, to, edge_type) -> edge_id,
+    plus the last written state of each row, so a table referenced by hundreds of
+    files is neither looked up nor rewritten unless its content changes.
+    """
+
+    def __init__(self, project_id, page_size: int = 1000):
+        self.project_id = _uuid_text(project_id)
+        self.page_size = page_size
+        self.assets: Dict[Tuple[str, str], str] = {}
+        self.edges: Dict[Tuple[str, str, str], str] = {}
+        self._asset_state: Dict[str, str] = {}  # asset_id -> fingerprint of the last write in this job
+        self._edge_state: Dict[str, Dict[str, Any]] = {}  # edge_id -> confidence / is_hypothesis / extractor_id
+        self._lock = threading.Lock()
+        self.stats = {"asset_writes_skipped": 0, "edge_writes_skipped": 0}
+
+    def warm(self, supabase) -> "AssetIdentityMap":
+        for row in self._pages(supabase, "asset", "asset_id", "asset_id, asset_type, canonical_name"):
+            self.assets[(row["canonical_name"], row["asset_type"])] = row["asset_id"]
+        columns = "edge_id, from_asset_id, to_asset_id, edge_type, confidence, is_hypothesis, extractor_id"
+        for row in self._pages(supabase, "edge_index", "edge_id", columns):
+            self.edges[(row["from_asset_id"], row["to_asset_id"], row["edge_type"])] = row["edge_id"]
+            self._edge_state[row["edge_id"]] = self._edge_fields(row)
+        print(f"[IDENTITY] Warm-loaded {len(self.assets)} assets, {len(self.edges)} edges for {self.project_id}", flush=True)
+        return self
+
+    def _pages(self, supabase, table: str, key: str, columns: str):
+        last = None
+        while True:
+            query = supabase.table(table).select(columns).eq("project_id", self.project_id)
+            if last is not None:
+                query = query.gt(key, last)
+            rows = query.order(key).limit(self.page_size).execute().data or []
+            if not rows:
+                return
+            yield from rows
+            last = rows[-1][key]
+
+    # --- Resolution ---
+
+    def covers(self, project_id) -> bool:
+        return _uuid_text(project_id) == self.project_id
+
+    def asset_id(self, canonical_name: str, asset_type: str) -> str:
+        return self.assets.get((canonical_name, asset_type)) or asset_id_for(self.project_id, canonical_name, asset_type)
+
+    def existing_asset_id(self, canonical_name: str, asset_type: str) -> Optional[str]:
+        """Only assets known to be in the catalog (safe for foreign keys)"""
+        return self.assets.get((canonical_name, asset_type))
+
+    def edge_id(self, from_asset_id: str, to_asset_id: str, edge_type: str) -> str:
+        return self.edges.get((from_asset_id, to_asset_id, edge_type)) or \
+            edge_id_for(self.project_id, from_asset_id, to_asset_id, edge_type)
+
+    # --- Write filtering ---
+
+    @staticmethod
+    def _asset_fingerprint(row: Dict[str, Any]) -> str:
+        content = {k: row.get(k) for k in ("name_display", "system", "tags")}
+        return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _edge_fields(row: Dict[str, Any]) -> Dict[str, Any]:
+        confidence = row.get("confidence")
+        return {
+            "confidence": float(confidence) if confidence is not None else None,
+            "is_hypothesis": bool(row.get("is_hypothesis")),
+            "extractor_id": row.get("extractor_id"),
+        }
+
+    def changed_assets(self, rows: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            out = {aid: row for aid, row in rows.items() if self._asset_state.get(aid) != self._asset_fingerprint(row)}
+            self.stats["asset_writes_skipped"] += len(rows) - len(out)
+        return out
+
+    def changed_edges(self, rows: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            out = {eid: row for eid, row in rows.items() if self._edge_state.get(eid) != self._edge_fields(row)}
+            self.stats["edge_writes_skipped"] += len(rows) - len(out)
+        return out
+
+    def record_assets(self, rows: Dict[str, Dict[str, Any]]):
+        with self._lock:
+            for aid, row in rows.items():
+                self.assets[(row["canonical_name"], row["asset_type"])] = aid
+                self._asset_state[aid] = self._asset_fingerprint(row)
+
+    def record_edges(self, rows: Dict[str, Dict[str, Any]]):
+        with self._lock:
+            for eid, row in rows.items():
+                self.edges[(row["from_asset_id"], row["to_asset_id"], row["edge_type"])] = eid
+                self._edge_state[eid] = self._edge_fields(row)
@@ -1,7 +1,7 @@
 import json
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 from typing import List, Optional
@@ -11,21 +11,35 @@ from ..models.extraction import ExtractionResult
 # --- Service ---
 
 import os
+import threading
 
 class LLMService:
     def __init__(self):
-        self.llm = ChatOpenAI(
-            openai_api_key=settings.OPENAI_API_KEY,
-            openai_api_base="https://openrouter.ai/api/v1",
-            model_name=settings.OPENROUTER_MODEL,
-            temperature=0
-        )
-        # For embeddings, we usually need a direct OpenAI key or a provider that supports it
-        self.embeddings = OpenAIEmbeddings(
-            openai_api_key=settings.OPENAI_API_KEY,
-            model="text-embedding-3-small"
-        )
+        # Clients are built on first use (most callers only need the chat model)
+        self._llm = None
+        self._embeddings = None
         self.parser = JsonOutputParser(pydantic_object=ExtractionResult)
+
+    @property
+    def llm(self) -> ChatOpenAI:
+        if self._llm is None:
+            self._llm = ChatOpenAI(
+                openai_api_key=settings.OPENAI_API_KEY,
+                openai_api_base="https://openrouter.ai/api/v1",
+                model_name=settings.OPENROUTER_MODEL,
+                temperature=0
+            )
+        return self._llm
+
+    @property
+    def embeddings(self) -> OpenAIEmbeddings:
+        if self._embeddings is None:
+            # For embeddings, we usually need a direct OpenAI key or a provider that supports it
+            self._embeddings = OpenAIEmbeddings(
+                openai_api_key=settings.OPENAI_API_KEY,
+                model="text-embedding-3-small"
+            )
+        return self._embeddings
         
     def get_embeddings(self, text: str) -> List[float]:
         try:
@@ -104,42 +118,40 @@ class LLMService:
     def chat_with_graph(self, graph_context: dict, question: str) -> str:
         """
         Answers a user question based on the provided graph context.
+        Only the subgraph relevant to the question (within the token budget) is sent.
+        """
+        from .chat_retrieval import GraphContextRetriever, GraphIndex
+
+        retrieved = GraphContextRetriever.build_context(GraphIndex(graph_context), question)
+        return self.chat_with_context(retrieved.text, question)
+
+    def chat_with_context(self, context: str, question: str) -> str:
+        """
+        Answers a user question from an already rendered context (see chat_retrieval).
+        Messages are passed as objects: braces in asset names must not reach prompt templating.
         """
         system_prompt = self._load_prompt("chat_prompt.md")
         if not system_prompt:
              system_prompt = "You are a Data Architect Assistant."
-        
-        # Simplify graph for context window
-        nodes_summary = [f"{n['data']['type']}: {n['data']['label']}" for n in graph_context.get('nodes', [])]
-        edges_summary = [f"{e['source']} -> {e['label']} -> {e['target']}" for e in graph_context.get('edges', [])]
-        
-        context_str = f"""
-        NODES:
-        {json.dumps(nodes_summary, indent=2)}
-        
-        RELATIONSHIPS:
-        {json.dumps(edges_summary, indent=2)}
-        """
-        
-        user_prompt = f"""
-        CONTEXT:
-        {context_str}
-        
-        QUESTION:
-        {question}
-        """
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("user", user_prompt)
-        ])
-        
-        chain = prompt | self.llm
-        
+
+        user_prompt = f"CONTEXT:\n{context}\n\nQUESTION:\n{question}"
+
         try:
-            response = chain.invoke({})
+            response = self.llm.invoke([SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)])
             return response.content
         except Exception as e:
             print(f"Chat failed: {e}")
             return "I apologize, but I encountered an error while processing your request."
 
+
+_llm_service = None
+_llm_service_lock = threading.Lock()
+
+def get_llm_service() -> LLMService:
+    """Process-wide LLMService (the LangChain clients are thread-safe and reused)"""
+    global _llm_service
+    if _llm_service is None:
+        with _llm_service_lock:
+            if _llm_service is None:
+                _llm_service = LLMService()
+    return _llm_service
@@ -98,6 +98,7 @@ class LLMAdapter:
                 "content": content,
                 "tokens_in": tokens_in,
                 "tokens_out": tokens_out,
+                "finish_reason": completion.choices[0].finish_reason,
                 "provider": "groq"
             }
             
@@ -146,6 +147,7 @@ class LLMAdapter:
                     "content": content,
                     "tokens_in": usage.prompt_tokens if usage else 0,
                     "tokens_out": usage.completion_tokens if usage else 0,
+                    "finish_reason": completion.choices[0].finish_reason,
                     "provider": "openrouter"
                 }
                     
@@ -0,0 +1,206 @@
+"""
+Columnar (Arrow/Parquet) snapshot of the lineage catalog.
+
+One Parquet file per table (asset, edge_index, column_lineage, package_component,
+transformation_ir) with an explicit schema: enum-like columns (asset_type,
+edge_type, operation, ...) are dictionary-encoded, JSON columns are stored as
+JSON text. Rows are read with the keyset pagination of GovernanceExportService
+and written in row groups of EXPORT_PARQUET_ROW_GROUP_SIZE, so memory stays
+bounded by one row group. pyarrow is optional and imported lazily.
+"""
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+from .governance_service import GovernanceExportService
+
+# Column kinds: string | enum (dictionary-encoded) | float | int | bool | json | timestamp
+PARQUET_TABLES: Dict[str, Dict[str, Any]] = {
+    "asset": {
+        "key": "asset_id",
+        "columns": [
+            ("asset_id", "string"), ("project_id", "string"), ("parent_asset_id", "string"),
+            ("asset_type", "enum"), ("name_display", "string"), ("canonical_name", "string"),
+            ("system", "enum"), ("owner", "string"), ("tags", "json"),
+            ("created_at", "timestamp"), ("updated_at", "timestamp"),
+        ],
+    },
+    "edge_index": {
+        "key": "edge_id",
+        "columns": [
+            ("edge_id", "string"), ("project_id", "string"), ("from_asset_id", "string"),
+            ("to_asset_id", "string"), ("edge_type", "enum"), ("confidence", "float"),
+            ("extractor_id", "enum"), ("is_hypothesis", "bool"), ("created_at", "timestamp"),
+        ],
+    },
+    "column_lineage": {
+        "key": "lineage_id",
+        "columns": [
+            ("lineage_id", "string"), ("project_id", "string"), ("package_id", "string"),
+            ("ir_id", "string"), ("source_asset_id", "string"), ("source_column", "string"),
+            ("target_asset_id", "string"), ("target_column", "string"),
+            ("transformation_rule", "string"), ("confidence", "float"), ("created_at", "timestamp"),
+        ],
+    },
+    "package_component": {
+        "key": "component_id",
+        # No project_id column: scoped through the parent package
+        "scope_column": "package.project_id",
+        "embed": "package!inner(project_id)",
+        "columns": [
+            ("component_id", "string"), ("package_id", "string"), ("parent_component_id", "string"),
+            ("name", "string"), ("type", "enum"), ("logic_raw", "string"), ("config", "json"),
+            ("source_mapping", "json"), ("target_mapping", "json"), ("order_index", "int"),
+            ("created_at", "timestamp"),
+        ],
+    },
+    "transformation_ir": {
+        "key": "ir_id",
+        "columns": [
+            ("ir_id", "string"), ("project_id", "string"), ("source_component_id", "string"),
+            ("operation", "enum"), ("logic_summary", "string"), ("metadata", "json"),
+            ("confidence", "float"), ("created_at", "timestamp"),
+        ],
+    },
+}
+
+
+class ParquetUnavailableError(RuntimeError):
+    """pyarrow is not installed"""
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ParquetUnavailableError("Parquet export requires pyarrow (pip install pyarrow)") from e
+    return pa, pq
+
+
+def _coerce(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == "json":
+        return value if isinstance(value, str) else json.dumps(value, default=str)
+    if kind == "float":
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    if kind == "int":
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if kind == "bool":
+        return bool(value)
+    if kind == "timestamp":
+        if isinstance(value, datetime):
+            return value
+        try:
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return str(value)
+
+
+def rows_to_columns(rows: List[Dict[str, Any]], columns: List[Tuple[str, str]]) -> Dict[str, List[Any]]:
+    """Pivots PostgREST rows into typed column lists (missing fields become nulls)"""
+    return {name: [_coerce(kind, row.get(name)) for row in rows] for name, kind in columns}
+
+
+class ParquetExportService(GovernanceExportService):
+    def __init__(self, supabase, page_size: Optional[int] = None, row_group_size: Optional[int] = None):
+        super().__init__(supabase, page_size)
+        self.row_group_size = row_group_size or settings.EXPORT_PARQUET_ROW_GROUP_SIZE
+
+    @staticmethod
+    def arrow_schema(table: str):
+        pa, _ = _require_pyarrow()
+        types = {
+            "string": pa.string(),
+            "enum": pa.dictionary(pa.int32(), pa.string()),
+            "float": pa.float64(),
+            "int": pa.int64(),
+            "bool": pa.bool_(),
+            "json": pa.string(),
+            "timestamp": pa.timestamp("us", tz="UTC"),
+        }
+        return pa.schema([(name, types[kind]) for name, kind in PARQUET_TABLES[table]["columns"]])
+
+    def _to_arrow(self, rows: List[Dict[str, Any]], table: str, schema):
+        pa, _ = _require_pyarrow()
+        data = rows_to_columns(rows, PARQUET_TABLES[table]["columns"])
+        arrays = []
+        for field in schema:
+            values = data[field.name]
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def _iter_table_rows(self, project_id: str, table: str):
+        spec = PARQUET_TABLES[table]
+        select = ", ".join(name for name, _ in spec["columns"])
+        if spec.get("embed"):
+            select += f", {spec['embed']}"
+        return self._iter_rows(table, spec["key"], project_id, select,
+                               scope_column=spec.get("scope_column", "project_id"))
+
+    def write_table(self, project_id: str, table: str, sink) -> int:
+        """Writes one catalog table as Parquet to `sink` (path or file). Returns the row count."""
+        _, pq = _require_pyarrow()
+        schema = self.arrow_schema(table)
+        written = 0
+        with pq.ParquetWriter(sink, schema, compression=settings.EXPORT_PARQUET_COMPRESSION) as writer:
+            batch: List[Dict[str, Any]] = []
+            for row in self._iter_table_rows(project_id, table):
+                batch.append(row)
+                if len(batch) >= self.row_group_size:
+                    writer.write_table(self._to_arrow(batch, table, schema), row_group_size=self.row_group_size)
+                    written += len(batch)
+                    batch = []
+            if batch or not written:
+                # An empty project still gets a file with the schema
+                writer.write_table(self._to_arrow(batch, table, schema), row_group_size=self.row_group_size)
+                written += len(batch)
+        return written
+
+    def write_snapshot(self, project_id: str, directory: str) -> Dict[str, int]:
+        """
+        Writes <table>.parquet for every catalog table into `directory`.
+        Files are written under a temporary name and swapped in, so readers never see partial files.
+        """
+        _require_pyarrow()
+        os.makedirs(directory, exist_ok=True)
+        counts = {}
+        for table in PARQUET_TABLES:
+            target = os.path.join(directory, f"{table}.parquet")
+            partial = target + ".partial"
+            try:
+                counts[table] = self.write_table(project_id, table, partial)
+                os.replace(partial, target)
+            finally:
+                if os.path.exists(partial):
+                    os.remove(partial)
+        print(f"[PARQUET] Snapshot for {project_id}: {counts}")
+        return counts
+
+    def write_snapshot_zip(self, project_id: str, zip_path: str) -> Dict[str, int]:
+        """Snapshot as a single .zip (Parquet is already compressed, entries are stored)"""
+        tmp_dir = tempfile.mkdtemp(prefix="parquet_export_")
+        try:
+            counts = self.write_snapshot(project_id, tmp_dir)
+            with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as zf:
+                for table in PARQUET_TABLES:
+                    zf.write(os.path.join(tmp_dir, f"{table}.parquet"), arcname=f"{table}.parquet")
+            return counts
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -13,6 +13,8 @@ from ..models.planning import (
 )
 from .policy_engine import PolicyEngine
 from .estimator import Estimator
+from .triage import TriageService
+from ..config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,7 @@ class PlannerService:
     def __init__(self, supabase: Client):
         self.supabase = supabase
         self.policy_engine = PolicyEngine()
+        self.triage = TriageService()
         
     def create_plan(self, job_id: str, root_path: str, mode: JobPlanMode = JobPlanMode.STANDARD) -> str:
         """
@@ -59,6 +62,7 @@ class PlannerService:
             
             # 3. Inventory & Classify
             items = []
+            triage_candidates = []
             total_stats = {"total_files": 0, "total_cost": 0.0, "total_time": 0.0}
             
             print(f"[PLANNER] Scanning files in {root_path}...", flush=True)
@@ -115,15 +119,32 @@ class PlannerService:
                         "enabled": rec_action == RecommendedAction.PROCESS,
                         "file_hash": file_hash,
                         "order_index": 0, 
-                        "estimate": est
+                        "estimate": est,
+                        # Set on every item: chunks are bulk-inserted and PostgREST turns
+                        # keys missing from some rows into NULL rather than the column default
+                        "value_score": 0,
+                        "planning_notes": None
                     }
                     items.append(item)
                     
-                    # Stats
-                    if rec_action == RecommendedAction.PROCESS:
-                        total_stats["total_files"] += 1
-                        total_stats["total_cost"] += est["cost_usd"]
-                        total_stats["total_time"] += est["time_seconds"]
+                    # Only LLM_ONLY files go through the triage funnel
+                    if strategy == Strategy.LLM_ONLY and rec_action == RecommendedAction.PROCESS:
+                        triage_candidates.append((item, full_path))
+            
+            # 4. Triage funnel (local scorer + optional cheap-model batch)
+            if settings.TRIAGE_ENABLED and triage_candidates:
+                triage_stats = self.triage.triage_items(triage_candidates)
+                total_stats["triage"] = triage_stats
+                for item, _ in triage_candidates:
+                    if item["strategy"] == Strategy.SKIP:
+                        item["estimate"] = Estimator.estimate(item["size_bytes"], Strategy.SKIP)
+            
+            # Stats
+            for item in items:
+                if item["recommended_action"] == RecommendedAction.PROCESS:
+                    total_stats["total_files"] += 1
+                    total_stats["total_cost"] += item["estimate"]["cost_usd"]
+                    total_stats["total_time"] += item["estimate"]["time_seconds"]
             
             print(f"[PLANNER] Found {len(items)} files. Persisting plan items...", flush=True)
             # Batch Insert Items (chunks of 100)
@@ -1,15 +1,13 @@
-from supabase import create_client, Client
+from supabase import Client
 from ..config import settings
+from .supabase_client import get_supabase_client, get_service_client
 import datetime
 
 class SQLJobQueue:
     def __init__(self):
-        self.supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        self.supabase: Client = get_supabase_client()
         # Use Service Role Key for worker operations if available to bypass RLS
-        if settings.SUPABASE_SERVICE_ROLE_KEY:
-            self.admin_supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
-        else:
-            self.admin_supabase = self.supabase
+        self.admin_supabase: Client = get_service_client()
 
     def enqueue_job(self, job_id: str):
         """Add a job to the queue."""
@@ -1,63 +1,62 @@
 import logging
 import datetime
-from typing import Dict, Any
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 from supabase import Client
 # Nota: fpdf2 o reportlab deberían estar en requirements.txt
 # Para este MVP usaremos una estructura de datos que luego el endpoint convertirá o servirá.
 
-from fpdf import FPDF
 import io
 
 from .artifact_service import ArtifactService
 
 logger = logging.getLogger(__name__)
 
+REPORT_PDF = "architecture_report.pdf"
+REPORT_MD = "architecture_report.md"
+REPORT_HASH = "architecture_report.sha256"
+
+# One generation at a time per solution (background runs of consecutive jobs)
+_solution_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+def _solution_lock(solution_id: str) -> threading.Lock:
+    with _locks_guard:
+        return _solution_locks.setdefault(solution_id, threading.Lock())
+
 class ReportService:
     def __init__(self, supabase: Client):
         self.supabase = supabase
         self.artifacts = ArtifactService()
 
     async def get_solution_summary(self, solution_id: str) -> Dict[str, Any]:
-        """Fetches a structured summary for the report"""
-        # 1. Solution Info
-        sol_res = self.supabase.table("solutions").select("*").eq("id", solution_id).single().execute()
-        solution = sol_res.data
-        if not solution:
-             raise Exception(f"Solution {solution_id} not found")
+        """Fetches a structured summary for the report (independent queries run concurrently)"""
+        solution, assets, (last_job, usage), edges, packages = await asyncio.gather(
+            asyncio.to_thread(self._fetch_solution, solution_id),
+            asyncio.to_thread(self._fetch_project_rows, "asset", "asset_id, asset_type, name_display", solution_id),
+            asyncio.to_thread(self._fetch_last_job_usage, solution_id),
+            asyncio.to_thread(self._fetch_project_rows, "edge_index", "edge_type", solution_id),
+            asyncio.to_thread(self._fetch_project_rows, "package", "name, type", solution_id),
+        )
 
-        # 2. Asset count by type
-        assets_res = self.supabase.table("asset").select("asset_id, asset_type, name_display").eq("project_id", solution_id).execute()
-        assets = assets_res.data or []
-        
+        # Asset count by type
         asset_types = {}
         for a in assets:
             at = a.get("asset_type", "Unknown")
             asset_types[at] = asset_types.get(at, 0) + 1
-        
-        # 3. Last job run
-        job_res = self.supabase.table("job_run").select("*").eq("project_id", solution_id).order("created_at", desc=True).limit(1).execute()
-        last_job = job_res.data[0] if job_res.data else None
 
-        # 4. Audit statistics
-        audit_res = self.supabase.table("file_processing_log")\
-            .select("model_used, total_tokens, cost_estimate_usd")\
-            .eq("job_id", last_job["job_id"] if last_job else "")\
-            .execute()
-        
-        total_cost = sum([float(x.get("cost_estimate_usd") or 0) for x in audit_res.data])
-        total_tokens = sum([int(x.get("total_tokens") or 0) for x in audit_res.data])
-
-        # 5. Relationships (Edges)
-        edges_res = self.supabase.table("edge_index").select("edge_type").eq("project_id", solution_id).execute()
-        edges = edges_res.data or []
+        # Relationships (Edges)
         edge_types = {}
         for e in edges:
             et = e.get("edge_type", "DEPENDS_ON")
             edge_types[et] = edge_types.get(et, 0) + 1
 
-        # 6. Packages
-        pkg_res = self.supabase.table("package").select("name, type").eq("project_id", solution_id).execute()
-        packages = pkg_res.data or []
+        total_cost = sum([float(x.get("cost_estimate_usd") or 0) for x in usage])
+        total_tokens = sum([int(x.get("total_tokens") or 0) for x in usage])
 
         return {
             "solution_name": solution.get("name", "Unknown"),
@@ -77,8 +76,37 @@ class ReportService:
             "report_title": f"Nexus Discovery AI - Technical Architecture Report"
         }
 
+    def _fetch_solution(self, solution_id: str) -> Dict[str, Any]:
+        sol_res = self.supabase.table("solutions").select("*").eq("id", solution_id).single().execute()
+        if not sol_res.data:
+             raise Exception(f"Solution {solution_id} not found")
+        return sol_res.data
+
+    def _fetch_project_rows(self, table: str, columns: str, solution_id: str) -> List[Dict[str, Any]]:
+        return self.supabase.table(table).select(columns).eq("project_id", solution_id).execute().data or []
+
+    def _fetch_last_job_usage(self, solution_id: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Last job run and its audit rows (the audit query depends on the job id)"""
+        job_res = self.supabase.table("job_run").select("*").eq("project_id", solution_id).order("created_at", desc=True).limit(1).execute()
+        last_job = job_res.data[0] if job_res.data else None
+        if not last_job:
+            return None, []
+        audit_res = self.supabase.table("file_processing_log")\
+            .select("model_used, total_tokens, cost_estimate_usd")\
+            .eq("job_id", last_job["job_id"])\
+            .execute()
+        return last_job, audit_res.data or []
+
+    @staticmethod
+    def summary_hash(data: Dict[str, Any]) -> str:
+        """Content hash of the report input (the generation timestamp is excluded)"""
+        content = {k: v for k, v in data.items() if k != "generated_at"}
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
     def generate_pdf_buffer(self, data: Dict[str, Any]):
         """Generates the PDF binary using fpdf2 with a professional design"""
+        from fpdf import FPDF  # Loaded on first render (heavy import)
+
         class PDF(FPDF):
             def header(self):
                 self.set_font('Arial', 'B', 8)
@@ -259,24 +287,47 @@ class ReportService:
         
         return md
 
-    async def generate_and_save_latest_artifacts(self, solution_id: str):
+    async def generate_and_save_latest_artifacts(self, solution_id: str, force: bool = False) -> bool:
         """
         Creates both PDF and MD reports for the latest state of the solution
-        and saves them to the Artifact Sandbox.
+        and saves them to the Artifact Sandbox. Skipped when the summary hash
+        matches the one of the existing artifacts. Returns True if (re)generated.
         """
+        with _solution_lock(solution_id):
+            try:
+                print(f"[REPORTS] Generating automated artifacts for solution {solution_id}")
+                data = await self.get_solution_summary(solution_id)
+
+                content_hash = self.summary_hash(data)
+                if not force and self._artifacts_up_to_date(solution_id, content_hash):
+                    print(f"[REPORTS] Artifacts for {solution_id} unchanged (hash {content_hash[:12]}), skipping")
+                    return False
+
+                # 1. PDF (CPU-bound, keep it off the event loop)
+                pdf_bytes = await asyncio.to_thread(self.generate_pdf_buffer, data)
+                self.artifacts.save_artifact(solution_id, REPORT_PDF, pdf_bytes)
+
+                # 2. Markdown
+                md_content = self.generate_markdown_summary(data)
+                self.artifacts.save_artifact(solution_id, REPORT_MD, md_content)
+
+                # Hash last: an interrupted run is regenerated next time
+                self.artifacts.save_artifact(solution_id, REPORT_HASH, content_hash)
+
+                print(f"[REPORTS] Successfully saved artifacts for {solution_id}")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to generate automated artifacts: {e}")
+                print(f"[REPORTS] ERROR: {e}")
+                return False
+
+    def _artifacts_up_to_date(self, solution_id: str, content_hash: str) -> bool:
+        reports_dir = os.path.join(self.artifacts.base_dir, solution_id, "reports")
         try:
-            print(f"[REPORTS] Generating automated artifacts for solution {solution_id}")
-            data = await self.get_solution_summary(solution_id)
-            
-            # 1. PDF
-            pdf_bytes = self.generate_pdf_buffer(data)
-            self.artifacts.save_artifact(solution_id, "architecture_report.pdf", pdf_bytes)
-            
-            # 2. Markdown
-            md_content = self.generate_markdown_summary(data)
-            self.artifacts.save_artifact(solution_id, "architecture_report.md", md_content)
-            
-            print(f"[REPORTS] Successfully saved artifacts for {solution_id}")
-        except Exception as e:
-            logger.error(f"Failed to generate automated artifacts: {e}")
-            print(f"[REPORTS] ERROR: {e}")
+            with open(os.path.join(reports_dir, REPORT_HASH), "r", encoding="utf-8") as f:
+                previous = f.read().strip()
+        except OSError:
+            return False
+        return previous == content_hash and all(
+            os.path.exists(os.path.join(reports_dir, name)) for name in (REPORT_PDF, REPORT_MD)
+        )
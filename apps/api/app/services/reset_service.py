@@ -36,9 +36,18 @@ class NuclearResetService:
             # package_component is deleted via CASCADE from package
             self.supabase.table("package").delete().eq("project_id", solution_id).execute()
             
-            # 4. Core Graph (Edges then Assets)
+            # 4. Core Graph (Edges then Assets), then the incremental audit counters from what is left
             self.supabase.table("edge_index").delete().eq("project_id", solution_id).execute()
             self.supabase.table("asset").delete().eq("project_id", solution_id).execute()
+            try:
+                self.supabase.rpc("rebuild_audit_stats", {"p_project_id": solution_id}).execute()
+            except Exception as stats_e:
+                print(f"[NUCLEAR RESET] project_audit_stats not rebuilt: {stats_e}")
+            try:
+                # Snippets are shared by content hash: drop the ones no evidence references anymore
+                self.supabase.rpc("gc_evidence_snippets", {}).execute()
+            except Exception as gc_e:
+                print(f"[NUCLEAR RESET] evidence_snippet not collected: {gc_e}")
             
             # 5. Artifact Sandbox
             self.artifacts.delete_solution_sandbox(solution_id)
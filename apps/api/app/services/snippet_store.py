@@ -0,0 +1,149 @@
+"""
+Content-addressed, compressed store for evidence snippets (evidence_snippet, migration 30).
+
+A snippet is stored once per sha256(snippet), whatever the number of evidence
+rows, runs or edges pointing at it. Payloads are zstd-compressed when the
+optional `zstandard` package is installed and zlib-compressed otherwise
+(base64 in a TEXT column, since PostgREST has no convenient bytea transport);
+snippets that do not shrink are kept as plain text. Snippets are written by
+insert_evidence together with their evidence rows; reads are bulk (`in_` per
+chunk) and cached briefly, so a details page costs one request.
+"""
+import base64
+import hashlib
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..config import settings
+from .cache import TTLCache
+
+# Hashes per `in_` filter (keeps the request URL short)
+FETCH_CHUNK_SIZE = 200
+WRITE_CHUNK_SIZE = 500
+
+_zstd = None
+
+
+def _zstd_module():
+    """zstandard if installed (optional dependency), else None"""
+    global _zstd
+    if _zstd is None:
+        try:
+            import zstandard
+            _zstd = zstandard
+        except ImportError:
+            _zstd = False
+    return _zstd or None
+
+
+def snippet_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def encode_snippet(text: str, codec: Optional[str] = None) -> Tuple[str, str]:
+    """Returns (codec, payload) for evidence_snippet"""
+    raw = text.encode("utf-8")
+    codec = codec or settings.SNIPPET_CODEC
+    zstd = _zstd_module() if codec == "zstd" else None
+    if zstd is not None:
+        packed = zstd.ZstdCompressor(level=settings.SNIPPET_ZSTD_LEVEL).compress(raw)
+    elif codec in ("zstd", "zlib"):
+        codec = "zlib"
+        packed = zlib.compress(raw, settings.SNIPPET_ZLIB_LEVEL)
+    else:
+        return "plain", text
+    payload = base64.b64encode(packed).decode("ascii")
+    # Short snippets grow once compressed and base64-encoded
+    if len(payload) >= len(text):
+        return "plain", text
+    return codec, payload
+
+
+def decode_snippet(codec: str, payload: str) -> str:
+    if codec == "plain":
+        return payload
+    packed = base64.b64decode(payload)
+    if codec == "zlib":
+        return zlib.decompress(packed).decode("utf-8")
+    if codec == "zstd":
+        zstd = _zstd_module()
+        if zstd is None:
+            raise RuntimeError("zstd snippet found but `zstandard` is not installed (pip install zstandard)")
+        return zstd.ZstdDecompressor().decompress(packed).decode("utf-8")
+    raise ValueError(f"Unknown snippet codec: {codec}")
+
+
+class SnippetStore:
+    def __init__(self, supabase, cache: Optional[TTLCache] = None):
+        self.supabase = supabase
+        self.cache = cache if cache is not None else TTLCache(settings.SNIPPET_CACHE_TTL_SEC, max_entries=4096)
+
+    def encode_many(self, snippets: Iterable[str]) -> Tuple[Dict[str, str], List[Dict]]:
+        """
+        ({snippet: snippet_hash}, evidence_snippet rows) for each distinct snippet, without writing.
+        CatalogService sends the rows to insert_evidence with the evidence that references them
+        (migration 31), so a concurrent gc_evidence_snippets never sees them unreferenced.
+        """
+        hashes = {}
+        rows = []
+        for text in snippets:
+            if text is None or text in hashes:
+                continue
+            h = snippet_hash(text)
+            hashes[text] = h
+            codec, payload = encode_snippet(text)
+            rows.append({"snippet_hash": h, "codec": codec, "payload": payload, "raw_bytes": len(text.encode("utf-8"))})
+            self.cache.set(h, text)
+        return hashes, rows
+
+    def put_many(self, snippets: Iterable[str]) -> Dict[str, str]:
+        """
+        Stores each distinct snippet on its own; returns {snippet: snippet_hash}.
+        Always writes (the cache only serves reads): a snippet this process wrote earlier
+        may have been collected since.
+        """
+        hashes, rows = self.encode_many(snippets)
+        for i in range(0, len(rows), WRITE_CHUNK_SIZE):
+            self.supabase.table("evidence_snippet").upsert(
+                rows[i:i + WRITE_CHUNK_SIZE], on_conflict="snippet_hash", ignore_duplicates=True
+            ).execute()
+        return hashes
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, str]:
+        """{snippet_hash: snippet} for the hashes that exist; one request per FETCH_CHUNK_SIZE misses"""
+        found = {}
+        missing = []
+        for h in dict.fromkeys(h for h in hashes if h):
+            cached = self.cache.get(h)
+            if cached is not None:
+                found[h] = cached
+            else:
+                missing.append(h)
+        for i in range(0, len(missing), FETCH_CHUNK_SIZE):
+            res = self.supabase.table("evidence_snippet").select("snippet_hash, codec, payload")\
+                .in_("snippet_hash", missing[i:i + FETCH_CHUNK_SIZE]).execute()
+            for row in res.data or []:
+                text = decode_snippet(row["codec"], row["payload"])
+                found[row["snippet_hash"]] = text
+                self.cache.set(row["snippet_hash"], text)
+        return found
+
+    def attach(self, evidences: Iterable[Dict]) -> None:
+        """Fills `snippet` in evidence rows that only carry snippet_hash (bulk fetch)"""
+        evidences = [e for e in evidences if e and not e.get("snippet") and e.get("snippet_hash")]
+        if not evidences:
+            return
+        texts = self.get_many(e["snippet_hash"] for e in evidences)
+        for e in evidences:
+            e["snippet"] = texts.get(e["snippet_hash"])
+
+
+_snippet_store = None
+
+
+def get_snippet_store() -> SnippetStore:
+    global _snippet_store
+    if _snippet_store is None:
+        from .supabase_client import get_service_client
+        _snippet_store = SnippetStore(get_service_client())
+    return _snippet_store
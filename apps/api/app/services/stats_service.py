@@ -0,0 +1,134 @@
+"""
+Aggregated solution stats (GET /solutions/{id}/stats).
+
+One RPC round trip (get_solution_stats, migration 19) served through a short
+TTL cache, since the UI polls this endpoint continuously while a job runs.
+Falls back to the per-count queries if the RPC fails (not deployed yet or a
+transient error) and retries it after RPC_RETRY_SEC.
+"""
+import time
+from typing import Dict, Any, Optional
+
+from ..config import settings
+from .cache import TTLCache
+from .supabase_client import get_supabase_client
+
+# Keyset page for the legacy asset_type scan (stays under PostgREST's max-rows)
+LEGACY_PAGE_SIZE = 1000
+
+
+class SolutionStatsService:
+    def __init__(self, supabase_client=None, ttl_seconds: Optional[float] = None):
+        self._supabase = supabase_client
+        self.cache = TTLCache(ttl_seconds if ttl_seconds is not None else settings.STATS_CACHE_TTL_SEC)
+        self._rpc_retry_at = 0.0
+
+    @property
+    def supabase(self):
+        if self._supabase is None:
+            self._supabase = get_supabase_client()
+        return self._supabase
+
+    def get_stats(self, solution_id: str) -> Dict[str, Any]:
+        return self.cache.get_or_set(solution_id, lambda: self._load(solution_id))
+
+    def invalidate(self, solution_id: Optional[str] = None):
+        self.cache.invalidate(solution_id)
+
+    def _load(self, solution_id: str) -> Dict[str, Any]:
+        if time.monotonic() >= self._rpc_retry_at:
+            try:
+                res = self.supabase.rpc("get_solution_stats", {"p_project_id": solution_id}).execute()
+                if res.data is not None:
+                    return self._shape(res.data)
+            except Exception as e:
+                print(f"[STATS] get_solution_stats RPC failed, per-count queries for {settings.RPC_RETRY_SEC:g}s: {e}")
+                self._rpc_retry_at = time.monotonic() + settings.RPC_RETRY_SEC
+        return self._shape(self._load_legacy(solution_id))
+
+    @staticmethod
+    def _shape(raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Maps the RPC payload to the response the UI expects"""
+        by_type: Dict[str, int] = {}
+        for k, v in (raw.get("assets_by_type") or {}).items():
+            # "table" and "TABLE" are the same type: add up, don't overwrite
+            key = (k or "").upper()
+            by_type[key] = by_type.get(key, 0) + (v or 0)
+        audit_report = raw.get("audit_report")
+        # Live coverage from the incremental counters (updated while the job persists)
+        live_metrics = None
+        if raw.get("audit_stats"):
+            from .auditor import DiscoveryAuditor
+            live_metrics = DiscoveryAuditor.compute_metrics(DiscoveryAuditor.counters_from_stats_row(raw["audit_stats"]))
+        return {
+            "total_assets": sum(by_type.values()),
+            "total_edges": raw.get("total_edges") or 0,
+            "files": by_type.get("FILE", 0),
+            "tables": by_type.get("TABLE", 0),
+            "pipelines": by_type.get("PIPELINE", 0),
+            "assets_by_type": by_type,
+            "active_job": raw.get("active_job"),
+            "last_run": raw.get("last_run"),
+            "audit_report": audit_report,
+            "metrics": audit_report.get("metrics") if audit_report else None,
+            "live_metrics": live_metrics
+        }
+
+    def _load_legacy(self, solution_id: str) -> Dict[str, Any]:
+        sb = self.supabase
+        # Keyset pages: a single select would be truncated at max-rows on large solutions
+        by_type: Dict[str, int] = {}
+        last_id = None
+        while True:
+            query = sb.table("asset").select("asset_id, asset_type").eq("project_id", solution_id)
+            if last_id is not None:
+                query = query.gt("asset_id", last_id)
+            page = query.order("asset_id").limit(LEGACY_PAGE_SIZE).execute().data or []
+            for row in page:
+                by_type[row["asset_type"]] = by_type.get(row["asset_type"], 0) + 1
+            if len(page) < LEGACY_PAGE_SIZE:
+                break
+            last_id = page[-1]["asset_id"]
+
+        edges = sb.table("edge_index").select("edge_id", count="exact").eq("project_id", solution_id).limit(1).execute()
+
+        job_res = sb.table("job_run")\
+            .select("job_id, plan_id, status, progress_pct, error_details, created_at, current_stage")\
+            .eq("project_id", solution_id)\
+            .in_("status", ["queued", "running", "planning_ready"])\
+            .order("created_at", desc=True)\
+            .limit(1)\
+            .execute()
+
+        last_run_res = sb.table("job_run")\
+            .select("finished_at")\
+            .eq("project_id", solution_id)\
+            .eq("status", "completed")\
+            .order("finished_at", desc=True)\
+            .limit(1)\
+            .execute()
+
+        audit_res = sb.table("audit_snapshot")\
+            .select("*")\
+            .eq("project_id", solution_id)\
+            .order("created_at", desc=True)\
+            .limit(1)\
+            .execute()
+
+        return {
+            "assets_by_type": by_type,
+            "total_edges": edges.count,
+            "active_job": job_res.data[0] if job_res.data else None,
+            "last_run": last_run_res.data[0]["finished_at"] if last_run_res.data else None,
+            "audit_report": audit_res.data[0] if audit_res.data else None
+        }
+
+
+_stats_service = None
+
+def get_stats_service() -> SolutionStatsService:
+    """Singleton so the TTL cache is shared across requests"""
+    global _stats_service
+    if _stats_service is None:
+        _stats_service = SolutionStatsService()
+    return _stats_service
@@ -1,13 +1,12 @@
 import os
 import zipfile
 import shutil
-import git
-from supabase import create_client
 from ..config import settings
+from .supabase_client import get_supabase_client
 
 class StorageService:
-    def __init__(self):
-        self.supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    def __init__(self, supabase_client=None):
+        self.supabase = supabase_client or get_supabase_client()
         
     def download_and_extract(self, storage_path: str) -> str:
         """
@@ -119,6 +118,8 @@ class StorageService:
         if os.path.exists(clone_dir):
             shutil.rmtree(clone_dir)
             
+        import git  # GitPython is only needed for repository sources
+
         try:
             git.Repo.clone_from(repo_url, clone_dir)
             print("Clone successful.")
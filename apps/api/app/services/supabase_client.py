@@ -0,0 +1,86 @@
+"""
+Application-wide Supabase clients.
+
+One client per key (anon / service role) backed by a pooled keep-alive
+httpx.Client, shared by routers, the worker and pipeline services so that
+connections (and TLS sessions) are reused across requests and plan items.
+"""
+import threading
+from typing import Dict, Optional
+
+import httpx
+from supabase import create_client, Client
+
+from ..config import settings
+
+_clients: Dict[str, Client] = {}
+_http_clients: Dict[str, httpx.Client] = {}
+_lock = threading.Lock()
+
+
+def _build_http_client() -> httpx.Client:
+    try:
+        import h2  # noqa: F401 - HTTP/2 multiplexing when available
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.Client(
+        http2=http2,
+        follow_redirects=True,
+        timeout=httpx.Timeout(settings.SUPABASE_HTTP_TIMEOUT_SEC),
+        limits=httpx.Limits(
+            max_connections=settings.SUPABASE_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SUPABASE_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.SUPABASE_POOL_KEEPALIVE_SEC,
+        ),
+    )
+
+
+def _get_or_create(role: str, key: str) -> Client:
+    client = _clients.get(role)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(role)
+        if client is None:
+            http_client = _build_http_client()
+            try:
+                from supabase.lib.client_options import SyncClientOptions
+                client = create_client(settings.SUPABASE_URL, key, options=SyncClientOptions(httpx_client=http_client))
+            except (ImportError, TypeError):
+                # Older supabase-py without httpx_client support: still shared, just not tuned
+                http_client.close()
+                http_client = None
+                client = create_client(settings.SUPABASE_URL, key)
+            except Exception:
+                http_client.close()
+                raise
+            _clients[role] = client
+            if http_client is not None:
+                _http_clients[role] = http_client
+            print(f"[SUPABASE] Shared {role} client initialized")
+    return client
+
+
+def get_supabase_client() -> Client:
+    """Shared client with the anon key (API reads/writes under RLS)"""
+    return _get_or_create("anon", settings.SUPABASE_KEY)
+
+
+def get_service_client() -> Client:
+    """Shared client with the service role key (worker/admin); falls back to the anon key"""
+    if not settings.SUPABASE_SERVICE_ROLE_KEY:
+        return get_supabase_client()
+    return _get_or_create("service", settings.SUPABASE_SERVICE_ROLE_KEY)
+
+
+def close_clients():
+    """Closes pooled connections (app shutdown / worker exit)"""
+    with _lock:
+        for http_client in _http_clients.values():
+            try:
+                http_client.close()
+            except Exception:
+                pass
+        _http_clients.clear()
+        _clients.clear()
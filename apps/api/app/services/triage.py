@@ -0,0 +1,194 @@
+"""
+Triage funnel for LLM_ONLY plan items.
+
+Tier 1: local keyword/AST scorer (no network) looking for data-access signals.
+Tier 2 (optional): cheap-model batch triage for the ambiguous band.
+Only files that pass go to full extraction; the verdict is stored on the plan item.
+"""
+import ast
+import re
+import json
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Any, Tuple
+
+from ..config import settings
+from ..models.planning import Strategy, RecommendedAction
+
+# (name, pattern, weight)
+_SIGNALS: List[Tuple[str, re.Pattern, int]] = [
+    ("sql_select", re.compile(r"\bselect\b[\s\S]{1,400}?\bfrom\b", re.IGNORECASE), 3),
+    ("sql_dml", re.compile(r"\b(?:insert\s+into|update\s+\w[\w.\[\]\"]*\s+set|delete\s+from|merge\s+into|truncate\s+table)\b", re.IGNORECASE), 3),
+    ("sql_ddl", re.compile(r"\bcreate\s+(?:or\s+replace\s+)?(?:table|view|procedure|function|materialized\s+view)\b", re.IGNORECASE), 3),
+    ("sql_copy", re.compile(r"\b(?:copy\s+into|bulk\s+insert|bcp\s|sqlcmd\b|psql\b|unload\s*\()", re.IGNORECASE), 3),
+    ("connection_string", re.compile(r"(?:jdbc:|odbc:|\b(?:postgres(?:ql)?|mysql|mssql|oracle|snowflake|mongodb|redshift)(?:\+\w+)?://|data source\s*=|initial catalog\s*=|server\s*=[^;\n]+;\s*database\s*=)", re.IGNORECASE), 3),
+    ("dataframe_io", re.compile(r"\b(?:read_(?:csv|sql|sql_query|sql_table|parquet|excel|json|table)|to_(?:sql|csv|parquet|excel|json|table))\s*\(", re.IGNORECASE), 2),
+    ("spark_io", re.compile(r"\bspark\.(?:read|sql|table)\b|\.write\s*\.\s*(?:mode|format|save|saveAsTable|parquet|jdbc|insertInto)\b|\.saveAsTable\s*\(", re.IGNORECASE), 2),
+    ("db_api", re.compile(r"\b(?:cursor\.execute|\.executemany|create_engine|\.connect\s*\(|pyodbc|psycopg2?|cx_Oracle|sqlalchemy|snowflake\.connector)\b", re.IGNORECASE), 2),
+    ("object_storage", re.compile(r"\b(?:s3a?://|gs://|abfss?://|wasbs?://|boto3|blob_service|adls)\b", re.IGNORECASE), 2),
+    ("orchestration", re.compile(r"\b(?:DAG\s*\(|\w+Operator\s*\(|ref\s*\(\s*['\"]|source\s*\(\s*['\"]|@task\b|dbt\s+run)", re.IGNORECASE), 2),
+    ("file_io", re.compile(r"\bopen\s*\([^)]*['\"][rwa]b?['\"]|\bcsv\.(?:reader|writer|DictReader|DictWriter)\b"), 1),
+    ("schema_terms", re.compile(r"\b(?:schema|columns?|table_name|dataset|lineage|source_table|target_table|primary key|foreign key)\b", re.IGNORECASE), 1),
+]
+
+# Python call names that imply data access (AST tier)
+_PY_DATA_CALLS = {
+    "read_csv", "read_sql", "read_sql_query", "read_sql_table", "read_parquet", "read_excel",
+    "read_json", "to_sql", "to_csv", "to_parquet", "to_excel", "execute", "executemany",
+    "create_engine", "connect", "saveAsTable", "insertInto", "load", "save", "upload_file",
+    "download_file", "put_object", "get_object", "query",
+}
+
+@dataclass
+class TriageDecision:
+    """Verdict of the triage funnel for one file"""
+    passed: bool
+    score: int
+    tier: str  # local | llm | local_fallback
+    reason: str
+    signals: List[str] = field(default_factory=list)
+    ambiguous: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class LocalTriageScorer:
+    """Keyword + Python AST scorer. Cheap, deterministic, no network."""
+
+    def __init__(self, pass_score: Optional[int] = None):
+        self.pass_score = pass_score if pass_score is not None else settings.TRIAGE_PASS_SCORE
+
+    def score(self, path: str, content: str) -> TriageDecision:
+        signals: List[str] = []
+        total = 0
+        for name, pattern, weight in _SIGNALS:
+            if pattern.search(content):
+                signals.append(name)
+                total += weight
+
+        if path.lower().endswith(".py"):
+            ast_calls = self._python_data_calls(content)
+            if ast_calls:
+                signals.append("py_calls:" + ",".join(sorted(ast_calls)[:5]))
+                total += 2
+
+        if total >= self.pass_score:
+            return TriageDecision(True, total, "local", "Data access signals found", signals)
+        if total == 0:
+            return TriageDecision(False, 0, "local", "Triage: no data access signals (SQL, connections, read/write APIs)", signals)
+        return TriageDecision(True, total, "local", "Weak data access signals", signals, ambiguous=True)
+
+    @staticmethod
+    def _python_data_calls(content: str) -> set:
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            return set()
+        calls = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call):
+                func = node.func
+                name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+                if name in _PY_DATA_CALLS:
+                    calls.add(name)
+        return calls
+
+
+class TriageService:
+    """
+    Two-tier funnel over plan items. Mutates the item dicts: skipped files get
+    strategy/recommended_action SKIP, enabled False and the reason recorded in
+    classifier.triage and planning_notes.
+    """
+
+    def __init__(self, action_runner=None, scorer: Optional[LocalTriageScorer] = None):
+        self._action_runner = action_runner
+        self.scorer = scorer or LocalTriageScorer()
+
+    @property
+    def action_runner(self):
+        if self._action_runner is None:
+            from ..actions import ActionRunner
+            self._action_runner = ActionRunner()
+        return self._action_runner
+
+    def read_preview(self, full_path: str) -> str:
+        try:
+            with open(full_path, "rb") as f:
+                return f.read(settings.TRIAGE_PREVIEW_BYTES).decode("utf-8", errors="ignore")
+        except OSError:
+            return ""
+
+    def triage_items(self, candidates: List[Tuple[Dict[str, Any], str]]) -> Dict[str, int]:
+        """
+        candidates: (plan item dict, absolute file path) for LLM_ONLY items.
+        Returns counters {"passed", "skipped", "llm_checked"}.
+        """
+        stats = {"passed": 0, "skipped": 0, "llm_checked": 0}
+        ambiguous: List[Tuple[Dict[str, Any], str, TriageDecision]] = []
+
+        for item, full_path in candidates:
+            preview = self.read_preview(full_path)
+            decision = self.scorer.score(item["path"], preview)
+            if decision.ambiguous and settings.TRIAGE_LLM_ENABLED:
+                ambiguous.append((item, preview, decision))
+                continue
+            self._apply(item, decision, stats)
+
+        for start in range(0, len(ambiguous), settings.TRIAGE_LLM_BATCH_SIZE):
+            batch = ambiguous[start:start + settings.TRIAGE_LLM_BATCH_SIZE]
+            verdicts = self._llm_triage_batch([(item["path"], preview) for item, preview, _ in batch])
+            stats["llm_checked"] += len(batch)
+            for idx, (item, _, local) in enumerate(batch):
+                verdict = verdicts.get(f"f{idx}")
+                if verdict is None:
+                    # LLM unavailable or item missing in answer: keep the local verdict (pass)
+                    local.tier = "local_fallback"
+                    self._apply(item, local, stats)
+                    continue
+                relevant, reason = verdict
+                decision = TriageDecision(relevant, local.score, "llm", reason or local.reason, local.signals)
+                self._apply(item, decision, stats)
+
+        print(f"[TRIAGE] passed={stats['passed']} skipped={stats['skipped']} llm_checked={stats['llm_checked']}", flush=True)
+        return stats
+
+    def _apply(self, item: Dict[str, Any], decision: TriageDecision, stats: Dict[str, int]):
+        classifier = dict(item.get("classifier") or {})
+        classifier["triage"] = decision.to_dict()
+        item["classifier"] = classifier
+        item["value_score"] = decision.score
+        if decision.passed:
+            stats["passed"] += 1
+            return
+        stats["skipped"] += 1
+        item["strategy"] = Strategy.SKIP
+        item["recommended_action"] = RecommendedAction.SKIP
+        item["enabled"] = False
+        item["planning_notes"] = decision.reason
+        classifier["reason"] = decision.reason
+
+    def _llm_triage_batch(self, files: List[Tuple[str, str]]) -> Dict[str, Tuple[bool, str]]:
+        """Cheap-model triage of several files in one call. Returns key -> (relevant, reason)."""
+        payload = {
+            "files": [
+                {"key": f"f{i}", "path": path, "preview": preview[:settings.TRIAGE_LLM_PREVIEW_CHARS]}
+                for i, (path, preview) in enumerate(files)
+            ]
+        }
+        try:
+            result = self.action_runner.run_action("triage.batch", payload, {"file_path": "triage_batch"})
+            if not result.success:
+                print(f"[TRIAGE] LLM batch failed: {result.error_message}")
+                return {}
+            raw = result.data.get("content") if isinstance(result.data, dict) and "content" in result.data else json.dumps(result.data)
+            parsed = json.loads(self.action_runner._clean_json_response(raw))
+            answers = parsed.get("results", parsed) if isinstance(parsed, dict) else {}
+            verdicts = {}
+            for key, value in answers.items():
+                if isinstance(value, dict) and "relevant" in value:
+                    verdicts[key] = (bool(value["relevant"]), value.get("reason", ""))
+            return verdicts
+        except Exception as e:
+            print(f"[TRIAGE] LLM batch error: {e}")
+            return {}
@@ -1,16 +1,18 @@
 import asyncio
 import os
 from .config import settings
-from .services.graph import get_graph_service
-from .services.storage import StorageService
-from .services.llm import LLMService
-from supabase import create_client
 
 async def analyze_solution_task(job_id: str, file_path: str):
+    # Heavy clients (LangChain, Neo4j, GitPython) load here, not when the API imports this module
+    from .services.graph import get_graph_service
+    from .services.storage import StorageService
+    from .services.llm import get_llm_service
+    from .services.supabase_client import get_supabase_client
+
     print(f"Starting analysis for Job {job_id}. Source: {file_path}")
     
     # Update Job Status to RUNNING
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    supabase = get_supabase_client()
     
     solution_id = job_id 
     
@@ -20,7 +22,7 @@ async def analyze_solution_task(job_id: str, file_path: str):
         # 1. Services Init
         graph_service = get_graph_service()
         storage_service = StorageService()
-        llm_service = LLMService()
+        llm_service = get_llm_service()
         
         # 2. Prepare Source Code
         # Detect if it's a Git URL or a Storage Path
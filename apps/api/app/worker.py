@@ -16,15 +16,15 @@ if __name__ == "__main__" and __package__ is None:
 from .services.queue import SQLJobQueue
 from .pipeline import PipelineOrchestrator
 from .config import settings
-from supabase import create_client
+from .services.supabase_client import get_service_client
+from .services.events import get_event_bus
 
 async def process_job(job_queue_item):
     job_id = job_queue_item["job_id"]
     queue = SQLJobQueue()
     
-    # Supabase Client
-    key_to_use = settings.SUPABASE_SERVICE_ROLE_KEY if settings.SUPABASE_SERVICE_ROLE_KEY else settings.SUPABASE_KEY
-    supabase = create_client(settings.SUPABASE_URL, key_to_use)
+    # Supabase Client (shared pooled service-role client, reused across jobs)
+    supabase = get_service_client()
     
     print(f"[WORKER] Processing Job {job_id}", flush=True)
     
@@ -115,9 +115,14 @@ async def process_job(job_queue_item):
         
         supabase.table("solutions").update({"status": "ERROR"}).eq("id", project_id).execute()
         queue.fail_job(job_queue_item["id"], error_msg)
+        get_event_bus().publish(job_id, "failed", {"status": "failed", "error_message": error_msg})
+    finally:
+        get_event_bus().forget(job_id)
 
 async def worker_loop():
     queue = SQLJobQueue()
+    # Cancellation from the API arrives as NOTIFY when DATABASE_URL is configured
+    get_event_bus().start_listener()
     print("[WORKER] Started polling (New Pipeline Enabled)...", flush=True)
     while True:
         try:
@@ -0,0 +1,121 @@
+"""
+Deep-dive persistence benchmark (CatalogService.sync_deep_dive_result).
+
+Every .dtsx under datosprueba/ is parsed with the deterministic SSIS deep
+extractor and synced against a recording client that counts PostgREST
+requests per table (no network). Each package is synced row-at-a-time
+(chunk size 1, the old behaviour) and with the bulk chunk size; --rtt-ms
+turns the request counts into an estimated wall time.
+
+Usage (from apps/api):
+    python measure_deep_dive_sync.py
+    python measure_deep_dive_sync.py --rtt-ms 40 path/to/packages
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+
+API_DIR = os.path.abspath(os.path.dirname(__file__))
+DEFAULT_DATA_DIR = os.path.join(API_DIR, "..", "..", "datosprueba")
+sys.path.insert(0, API_DIR)
+
+
+class _Request:
+    def __init__(self, client, name, payload):
+        self.client, self.name, self.payload = client, name, payload
+
+    def execute(self):
+        self.client.requests[self.name] += 1
+        self.client.rows[self.name] += len(self.payload) if isinstance(self.payload, list) else 1
+
+        class _Response:
+            data = []
+        return _Response()
+
+
+class _Table:
+    def __init__(self, client, name):
+        self.client, self.name = client, name
+
+    def upsert(self, payload, **_):
+        return _Request(self.client, self.name, payload)
+
+
+class RecordingClient:
+    """Counts requests and rows per table / RPC"""
+
+    def __init__(self):
+        self.requests = Counter()
+        self.rows = Counter()
+
+    def table(self, name):
+        return _Table(self, name)
+
+    def rpc(self, name, params):
+        return _Request(self, f"rpc:{name}", params.get("p_assets", params.get("p_edges", params)))
+
+
+def sync_counts(result, project_id, chunk_size):
+    from app.services import catalog
+
+    client = RecordingClient()
+    previous = catalog.UPSERT_CHUNK_SIZE
+    catalog.UPSERT_CHUNK_SIZE = chunk_size
+    try:
+        start = time.perf_counter()
+        catalog.CatalogService(client).sync_deep_dive_result(result, project_id)
+        elapsed = time.perf_counter() - start
+    finally:
+        catalog.UPSERT_CHUNK_SIZE = previous
+    return client, elapsed
+
+
+def main():
+    from app.services.catalog import UPSERT_CHUNK_SIZE
+    from app.services.extractors.ssis_deep import SSISDeepExtractor
+
+    parser = argparse.ArgumentParser(description="Requests per deep-dive sync, row-at-a-time vs bulk")
+    parser.add_argument("data_dir", nargs="?", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--rtt-ms", type=float, default=25.0, help="Round trip per request for the wall-time estimate")
+    parser.add_argument("--chunk-size", type=int, default=UPSERT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.data_dir, "**", "*.dtsx"), recursive=True))
+    if not files:
+        print(f"[BENCH] No .dtsx packages under {args.data_dir}")
+        sys.exit(1)
+
+    extractor = SSISDeepExtractor()
+    project_id = str(uuid.uuid4())
+    totals = Counter()
+    for path in files:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            result = extractor.extract_deep(path, f.read())
+        if result is None:
+            print(f"[BENCH] Skipping {path}: extraction failed")
+            continue
+
+        per_row, _ = sync_counts(result, project_id, 1)
+        bulk, cpu = sync_counts(result, project_id, args.chunk_size)
+        before, after = sum(per_row.requests.values()), sum(bulk.requests.values())
+        totals.update({"before": before, "after": after})
+
+        print(f"\n=== {os.path.relpath(path, args.data_dir)}: {len(result.components)} components, "
+              f"{len(result.transformations)} transformations, {len(result.lineage)} lineage rows")
+        for name in sorted(per_row.requests):
+            print(f"  {name:<24} {per_row.rows[name]:6d} rows  {per_row.requests[name]:6d} -> {bulk.requests[name]:3d} requests")
+        print(f"  total requests {before} -> {after}  "
+              f"(~{before * args.rtt_ms / 1e3:.2f}s -> ~{after * args.rtt_ms / 1e3:.2f}s at {args.rtt_ms:g} ms RTT; "
+              f"client-side {cpu * 1e3:.1f} ms)")
+
+    if totals["before"]:
+        print(f"\n[BENCH] {len(files)} packages: {totals['before']} -> {totals['after']} requests "
+              f"({totals['before'] / max(totals['after'], 1):.0f}x fewer)")
+
+
+if __name__ == "__main__":
+    main()
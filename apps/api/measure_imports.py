@@ -1,24 +1,97 @@
-import time
-import sys
+"""
+Import-time (cold start) benchmark for the API and the worker.
+
+Each entry point is imported in a fresh interpreter with `python -X importtime`;
+the report shows the total, the heaviest top-level packages (self time summed)
+and the slowest modules (cumulative). With --check the exit code is 1 when an
+entry point exceeds its budget, so it can run in CI.
+
+Usage (from apps/api):
+    python measure_imports.py                 # app.main + app.worker
+    python measure_imports.py app.worker --top 30
+    python measure_imports.py --check
+"""
+import argparse
 import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# Cold-start budgets (seconds of module import; `uvicorn app.main:app` / `python -m app.worker`).
+# Heavy clients (LangChain/OpenAI, Neo4j, sqlglot, GitPython, fpdf, pyarrow) must load on first use.
+BUDGETS = {
+    "app.main": 1.5,
+    "app.worker": 1.0,
+}
+
+# Must not be imported at startup
+LAZY_PACKAGES = ("langchain_openai", "langchain_core", "neo4j", "sqlglot", "git", "fpdf", "pyarrow", "groq")
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+API_DIR = os.path.abspath(os.path.dirname(__file__))
+
+
+def measure(module: str):
+    """Returns [(module, self_us, cumulative_us, depth)] for a cold import of `module`"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=API_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import of {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return rows
+
+
+def report(module: str, top: int) -> float:
+    rows = measure(module)
+    total = next((cum for name, _, cum, _ in reversed(rows) if name == module), 0) / 1e6
+
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+
+    budget = BUDGETS.get(module)
+    status = "" if budget is None else (" OK" if total <= budget else " OVER BUDGET")
+    print(f"\n=== {module}: {total:.2f}s" + (f" (budget {budget:.2f}s){status}" if budget else ""))
+
+    print(f"--- Top {top} packages (self time) ---")
+    for name, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {us / 1e3:9.1f} ms  {name}")
+
+    print(f"--- Top {top} modules (cumulative) ---")
+    for name, _, cum, depth in sorted(rows, key=lambda r: -r[2])[:top]:
+        print(f"  {cum / 1e3:9.1f} ms  {'  ' * min(depth, 6)}{name}")
+
+    loaded = sorted({name.split(".")[0] for name, *_ in rows} & set(LAZY_PACKAGES))
+    if loaded:
+        print(f"[WARN] Heavy packages imported at startup: {', '.join(loaded)}")
+    return total
+
 
-print("--- MEASURING IMPORT TIMES ---")
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import time per module")
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS))
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a budget is exceeded")
+    args = parser.parse_args()
 
-def measure_import(name):
-    start = time.time()
-    try:
-        __import__(name)
-        print(f"Import {name}: {time.time() - start:.2f}s")
-    except Exception as e:
-        print(f"Import {name} FAILED: {e}")
+    over = []
+    for module in args.modules:
+        total = report(module, args.top)
+        if module in BUDGETS and total > BUDGETS[module]:
+            over.append(module)
 
-# Adding the apps/api to path
-sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+    if args.check and over:
+        print(f"\n[FAIL] Over cold-start budget: {', '.join(over)}")
+        sys.exit(1)
 
-measure_import("app.config")
-measure_import("app.services.queue")
-measure_import("app.pipeline.orchestrator")
-measure_import("app.services.planner")
-measure_import("app.worker")
 
-print("--- FINISHED ---")
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import {
     BarChart3,
     Target,
@@ -48,6 +48,10 @@ export default function SolutionDashboard({ id, solution }: SolutionDashboardPro
         setIsLogModalOpen(true);
     };
 
+    // While the job event stream is open, progress arrives over SSE and /stats is only refreshed every 15s
+    const streamingRef = useRef(false);
+    const lastFetchRef = useRef(0);
+
     // Poll for updates if job is active or solution is not yet READY
     useEffect(() => {
         let interval: NodeJS.Timeout;
@@ -55,13 +59,64 @@ export default function SolutionDashboard({ id, solution }: SolutionDashboardPro
         const hasActiveJob = stats?.active_job && ['queued', 'running', 'planning_ready'].includes(stats.active_job.status);
 
         if (isNotReady || hasActiveJob) {
-            interval = setInterval(() => fetchData(true), 3000); // Silent refresh
+            interval = setInterval(() => {
+                if (streamingRef.current && Date.now() - lastFetchRef.current < 15000) return;
+                fetchData(true); // Silent refresh
+            }, 3000);
         }
         return () => clearInterval(interval);
     }, [id]); // Use the memoized fetcher if I move it, but for now [id] is safer
 
+    // Live progress of the active job: GET /jobs/{id}/events (SSE)
+    const activeJobId = stats?.active_job && ['queued', 'running'].includes(stats.active_job.status)
+        ? stats.active_job.job_id : null;
+
+    useEffect(() => {
+        if (!activeJobId || typeof EventSource === 'undefined') return;
+        const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+        const source = new EventSource(`${apiUrl}/jobs/${activeJobId}/events`);
+        streamingRef.current = true;
+
+        const terminal = ['completed', 'failed', 'cancelled', 'planning_ready'];
+        const mergeJob = (fields: any) => {
+            if (!fields) return;
+            // Stage-only updates carry progress_pct: null; keep the last known value
+            const update = Object.fromEntries(Object.entries(fields).filter(([, v]) => v !== null && v !== undefined));
+            setStats((prev: any) => prev?.active_job?.job_id === activeJobId
+                ? { ...prev, active_job: { ...prev.active_job, ...update } }
+                : prev);
+        };
+        const onProgress = (e: MessageEvent) => mergeJob(JSON.parse(e.data)?.data);
+        const onTerminal = () => {
+            source.close();
+            streamingRef.current = false;
+            fetchData(true);
+        };
+
+        source.addEventListener('snapshot', ((e: MessageEvent) => {
+            const snapshot = JSON.parse(e.data);
+            // The server closes the stream after a finished snapshot: don't let EventSource reconnect
+            if (snapshot && terminal.concat(['error']).includes((snapshot.status || '').toLowerCase())) {
+                onTerminal();
+                return;
+            }
+            mergeJob(snapshot);
+        }) as EventListener);
+        source.addEventListener('progress', onProgress as EventListener);
+        terminal.forEach(type => source.addEventListener(type, onTerminal));
+        // Stream down (API restarting, proxy timeout): the /stats poll takes over until it reconnects
+        source.onerror = () => { streamingRef.current = false; };
+        source.onopen = () => { streamingRef.current = true; };
+
+        return () => {
+            source.close();
+            streamingRef.current = false;
+        };
+    }, [activeJobId]);
+
     const fetchData = async (silent = false) => {
         if (!silent) setLoading(true);
+        lastFetchRef.current = Date.now();
         try {
             const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
             const [statsRes, historyRes, solutionRes] = await Promise.all([
@@ -42,6 +42,8 @@ export default function CatalogPage({ params }: CatalogPageProps) {
     pageSize: 50,
   });
   const [totalCount, setTotalCount] = useState(0);
+  // Keyset cursors: cursors[i] fetches page i (page 0 has none)
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
   const [selectedAsset, setSelectedAsset] = useState<any>(null);
   const [detailsLoading, setDetailsLoading] = useState(false);
   const [details, setDetails] = useState<any>(null);
@@ -55,11 +57,16 @@ export default function CatalogPage({ params }: CatalogPageProps) {
           type: filterType,
           search: search,
           limit: pagination.pageSize,
-          offset: pagination.pageIndex * pagination.pageSize
+          cursor: cursors[pagination.pageIndex] || undefined
         }
       });
       setData(res.data.data || []);
       setTotalCount(res.data.count || 0);
+      setCursors(prev => {
+        const next = prev.slice(0, pagination.pageIndex + 1);
+        if (res.data.next_cursor) next.push(res.data.next_cursor);
+        return next;
+      });
     } catch (e) {
       console.error(e);
     } finally {
@@ -67,6 +74,12 @@ export default function CatalogPage({ params }: CatalogPageProps) {
     }
   };
 
+  // New filters start again from the first page (cursors belong to the previous filter)
+  const resetPaging = () => {
+    setCursors([null]);
+    setPagination(p => ({ ...p, pageIndex: 0 }));
+  };
+
   const fetchAvailableTypes = async () => {
     try {
       const res = await axios.get(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/solutions/${params.id}/asset-types`);
@@ -140,7 +153,8 @@ export default function CatalogPage({ params }: CatalogPageProps) {
     columns,
     getCoreRowModel: getCoreRowModel(),
     manualPagination: true,
-    pageCount: Math.ceil(totalCount / pagination.pageSize),
+    // Estimated total; next page is only reachable once its cursor is known
+    pageCount: Math.max(cursors.length, Math.ceil(totalCount / pagination.pageSize)),
     state: {
       pagination,
     },
@@ -188,7 +202,7 @@ export default function CatalogPage({ params }: CatalogPageProps) {
                 placeholder="Search assets..."
                 className="pl-10 h-10 w-[200px] lg:w-[300px] rounded-xl border border-border bg-muted/40 backdrop-blur-sm px-4 py-2 text-sm shadow-inner transition-all focus:outline-none focus:ring-2 focus:ring-primary/40 focus:bg-muted/60"
                 value={search}
-                onChange={(e) => setSearch(e.target.value)}
+                onChange={(e) => { setSearch(e.target.value); resetPaging(); }}
               />
             </div>
             <div className="relative">
@@ -196,7 +210,7 @@ export default function CatalogPage({ params }: CatalogPageProps) {
               <select
                 className="h-10 pl-10 pr-8 rounded-xl border border-border bg-muted/40 backdrop-blur-sm text-sm shadow-inner transition-all focus:outline-none focus:ring-2 focus:ring-primary/40 focus:bg-muted/60 appearance-none cursor-pointer font-medium"
                 value={filterType}
-                onChange={(e) => setFilterType(e.target.value)}
+                onChange={(e) => { setFilterType(e.target.value); resetPaging(); }}
               >
                 <option value="ALL">All Types</option>
                 {availableTypes.map(type => (
@@ -242,7 +256,7 @@ export default function CatalogPage({ params }: CatalogPageProps) {
                         </div>
                         <p className="text-muted-foreground font-black uppercase tracking-widest text-xs">No assets found</p>
                         <button
-                          onClick={() => { setSearch(''); setFilterType('ALL'); }}
+                          onClick={() => { setSearch(''); setFilterType('ALL'); resetPaging(); }}
                           className="text-[10px] font-bold text-primary hover:underline uppercase tracking-wide"
                         >
                           Reset Filters
@@ -290,7 +304,7 @@ export default function CatalogPage({ params }: CatalogPageProps) {
               <button
                 className="px-3 py-1.5 rounded-lg border border-border/50 bg-background hover:bg-muted text-[10px] font-bold uppercase tracking-wider disabled:opacity-50 transition-colors"
                 onClick={() => table.nextPage()}
-                disabled={!table.getCanNextPage()}
+                disabled={!cursors[pagination.pageIndex + 1]}
               >
                 Next
               </button>
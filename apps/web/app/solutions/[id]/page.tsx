@@ -169,6 +169,23 @@ function GraphContent({ id, solution }: { id: string, solution: any }) {
             sidePanelRef.current.scrollTo({ top: 0, behavior: 'smooth' });
         }
     }, [selectedNode?.id]);
+
+    // Heavy attributes (component config, column metadata) are not in the graph payload: load them on selection
+    useEffect(() => {
+        const nodeId = selectedNode?.id;
+        if (!nodeId || selectedNode.data?.tags?.original_config) return;
+        let cancelled = false;
+        axios.get(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/assets/${nodeId}/detail`)
+            .then(res => {
+                const detail = res.data?.detail;
+                if (cancelled || !detail || Object.keys(detail).length === 0) return;
+                setSelectedNode((prev: any) => prev?.id === nodeId
+                    ? { ...prev, data: { ...prev.data, tags: { ...(prev.data.tags || {}), ...detail } } }
+                    : prev);
+            })
+            .catch(() => { });
+        return () => { cancelled = true; };
+    }, [selectedNode?.id]);
     const [focusNodeId, setFocusNodeId] = useState<string | null>(null);
     const [isChatOpen, setIsChatOpen] = useState(false);
     const [nodeTypesFilter, setNodeTypesFilter] = useState<Record<string, boolean>>({
@@ -0,0 +1,9 @@
+-- Migration 18: Prompt compaction metrics in the file audit log
+-- SSIS/DSX inputs are compacted (minified structure, no designer/GUID noise,
+-- aliased column paths) before being sent to the LLM.
+
+ALTER TABLE file_processing_log ADD COLUMN IF NOT EXISTS prompt_tokens_original INTEGER;
+ALTER TABLE file_processing_log ADD COLUMN IF NOT EXISTS prompt_tokens_saved INTEGER;
+
+COMMENT ON COLUMN file_processing_log.prompt_tokens_original IS 'Estimated prompt tokens before compaction (structure summary + raw content).';
+COMMENT ON COLUMN file_processing_log.prompt_tokens_saved IS 'Estimated prompt tokens removed by the compaction stage.';
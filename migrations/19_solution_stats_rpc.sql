@@ -0,0 +1,46 @@
+-- Single round-trip stats for GET /solutions/{id}/stats
+-- Replaces 5 count queries + active job + last run + latest audit (UI polls this while a job runs)
+
+CREATE INDEX IF NOT EXISTS idx_asset_project_type ON asset(project_id, asset_type);
+CREATE INDEX IF NOT EXISTS idx_edge_index_project ON edge_index(project_id);
+CREATE INDEX IF NOT EXISTS idx_job_run_project_status ON job_run(project_id, status, created_at DESC);
+
+CREATE OR REPLACE FUNCTION get_solution_stats(p_project_id UUID)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'assets_by_type', COALESCE((
+            SELECT jsonb_object_agg(asset_type, cnt)
+            FROM (
+                SELECT asset_type, COUNT(*) AS cnt
+                FROM asset
+                WHERE project_id = p_project_id
+                GROUP BY asset_type
+            ) t
+        ), '{}'::jsonb),
+        'total_edges', (SELECT COUNT(*) FROM edge_index WHERE project_id = p_project_id),
+        'active_job', (
+            SELECT to_jsonb(j) FROM (
+                SELECT job_id, plan_id, status, progress_pct, error_details, created_at, current_stage
+                FROM job_run
+                WHERE project_id = p_project_id
+                  AND status IN ('queued', 'running', 'planning_ready')
+                ORDER BY created_at DESC
+                LIMIT 1
+            ) j
+        ),
+        'last_run', (
+            SELECT finished_at FROM job_run
+            WHERE project_id = p_project_id AND status = 'completed'
+            ORDER BY finished_at DESC NULLS LAST
+            LIMIT 1
+        ),
+        'audit_report', (
+            SELECT to_jsonb(a) FROM (
+                SELECT * FROM audit_snapshot
+                WHERE project_id = p_project_id
+                ORDER BY created_at DESC
+                LIMIT 1
+            ) a
+        )
+    );
+$$ LANGUAGE sql STABLE;
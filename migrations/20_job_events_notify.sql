@@ -0,0 +1,10 @@
+-- Push-based job events (progress / status / cancellation)
+-- The API and the worker publish through this RPC; processes with a direct
+-- connection (DATABASE_URL) LISTEN on the channel and fan events out over SSE.
+
+CREATE OR REPLACE FUNCTION notify_job_event(p_channel TEXT, p_payload JSONB)
+RETURNS VOID AS $$
+BEGIN
+    PERFORM pg_notify(p_channel, p_payload::text);
+END;
+$$ LANGUAGE plpgsql;
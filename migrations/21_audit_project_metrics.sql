@@ -0,0 +1,56 @@
+-- Audit metrics computed in the database (DiscoveryAuditor.run_audit / analyze_complexity)
+-- Replaces downloading every asset, edge, column_lineage and package row into the worker.
+
+CREATE INDEX IF NOT EXISTS idx_col_lineage_source_asset ON column_lineage(source_asset_id);
+CREATE INDEX IF NOT EXISTS idx_col_lineage_target_asset ON column_lineage(target_asset_id);
+CREATE INDEX IF NOT EXISTS idx_package_project ON package(project_id);
+
+CREATE OR REPLACE FUNCTION audit_project_metrics(p_project_id UUID, p_orphan_limit INT DEFAULT 10)
+RETURNS JSONB AS $$
+WITH functional AS (
+    SELECT a.asset_id, a.name_display, a.asset_type,
+           (
+               EXISTS (SELECT 1 FROM edge_index e WHERE e.project_id = p_project_id AND (e.from_asset_id = a.asset_id OR e.to_asset_id = a.asset_id))
+               OR EXISTS (SELECT 1 FROM column_lineage l WHERE l.project_id = p_project_id AND (l.source_asset_id = a.asset_id OR l.target_asset_id = a.asset_id))
+           ) AS connected
+    FROM asset a
+    WHERE a.project_id = p_project_id
+      AND UPPER(a.asset_type) IN ('TABLE', 'VIEW', 'PIPELINE', 'SCRIPT', 'PACKAGE', 'STORED_PROCEDURE')
+),
+edge_stats AS (
+    SELECT COUNT(*) AS edge_count,
+           COALESCE(SUM(COALESCE(confidence, 1.0)), 0) AS conf_sum,
+           COUNT(*) FILTER (WHERE is_hypothesis) AS hypothesis_count,
+           COUNT(*) FILTER (WHERE COALESCE(confidence, 1.0) < 0.5) AS low_conf_count
+    FROM edge_index
+    WHERE project_id = p_project_id
+),
+lineage_stats AS (
+    SELECT COUNT(*) AS lineage_count,
+           COALESCE(SUM(COALESCE(confidence, 1.0)), 0) AS conf_sum
+    FROM column_lineage
+    WHERE project_id = p_project_id
+)
+SELECT jsonb_build_object(
+    'total_assets', (SELECT COUNT(*) FROM asset WHERE project_id = p_project_id),
+    'package_count', (SELECT COUNT(*) FROM package WHERE project_id = p_project_id),
+    'edge_count', e.edge_count,
+    'lineage_count', l.lineage_count,
+    'confidence_sum', e.conf_sum + l.conf_sum,
+    'hypothesis_count', e.hypothesis_count,
+    'low_confidence_count', e.low_conf_count,
+    'functional_count', (SELECT COUNT(*) FROM functional),
+    'documented_count', (SELECT COUNT(*) FROM functional WHERE connected),
+    'orphan_count', (SELECT COUNT(*) FROM functional WHERE NOT connected),
+    'orphans', COALESCE((
+        SELECT jsonb_agg(jsonb_build_object('name_display', o.name_display, 'asset_type', o.asset_type))
+        FROM (
+            SELECT name_display, asset_type FROM functional
+            WHERE NOT connected
+            ORDER BY name_display
+            LIMIT p_orphan_limit
+        ) o
+    ), '[]'::jsonb)
+)
+FROM edge_stats e, lineage_stats l;
+$$ LANGUAGE sql STABLE;
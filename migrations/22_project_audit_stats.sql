@@ -0,0 +1,197 @@
+-- Incremental audit accumulators, maintained by CatalogService while it persists
+-- (bump_audit_stats) so run_audit / live coverage read one row instead of rescanning.
+
+CREATE TABLE IF NOT EXISTS project_audit_stats (
+    project_id UUID PRIMARY KEY REFERENCES solutions(id) ON DELETE CASCADE,
+    asset_count BIGINT NOT NULL DEFAULT 0,
+    functional_count BIGINT NOT NULL DEFAULT 0,
+    documented_count BIGINT NOT NULL DEFAULT 0, -- functional assets with at least one relationship
+    package_count BIGINT NOT NULL DEFAULT 0,
+    edge_count BIGINT NOT NULL DEFAULT 0,
+    lineage_count BIGINT NOT NULL DEFAULT 0,
+    confidence_sum NUMERIC NOT NULL DEFAULT 0,
+    hypothesis_count BIGINT NOT NULL DEFAULT 0,
+    low_confidence_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Connected-asset set (size feeds documented_count; anti-join gives the orphans)
+CREATE TABLE IF NOT EXISTS project_connected_asset (
+    project_id UUID NOT NULL,
+    asset_id UUID NOT NULL REFERENCES asset(asset_id) ON DELETE CASCADE,
+    PRIMARY KEY (project_id, asset_id)
+);
+
+CREATE OR REPLACE FUNCTION is_functional_asset_type(p_type TEXT)
+RETURNS BOOLEAN AS $$
+    SELECT UPPER(p_type) IN ('TABLE', 'VIEW', 'PIPELINE', 'SCRIPT', 'PACKAGE', 'STORED_PROCEDURE');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- p_delta: {"asset_count": n, "functional_count": n, "package_count": n, "edge_count": n, "lineage_count": n,
+--           "confidence_sum": x, "hypothesis_count": n, "low_confidence_count": n}
+CREATE OR REPLACE FUNCTION bump_audit_stats(p_project_id UUID, p_delta JSONB, p_connected_assets UUID[] DEFAULT '{}')
+RETURNS VOID AS $$
+DECLARE
+    v_newly_documented BIGINT := 0;
+BEGIN
+    WITH inserted AS (
+        INSERT INTO project_connected_asset (project_id, asset_id)
+        SELECT DISTINCT p_project_id, a FROM unnest(p_connected_assets) AS a
+        WHERE EXISTS (SELECT 1 FROM asset WHERE asset_id = a)
+        ON CONFLICT DO NOTHING
+        RETURNING asset_id
+    )
+    SELECT COUNT(*) INTO v_newly_documented
+    FROM inserted i JOIN asset s ON s.asset_id = i.asset_id
+    WHERE is_functional_asset_type(s.asset_type);
+
+    INSERT INTO project_audit_stats AS st (
+        project_id, asset_count, functional_count, documented_count, package_count, edge_count,
+        lineage_count, confidence_sum, hypothesis_count, low_confidence_count, updated_at
+    ) VALUES (
+        p_project_id,
+        COALESCE((p_delta->>'asset_count')::BIGINT, 0),
+        COALESCE((p_delta->>'functional_count')::BIGINT, 0),
+        v_newly_documented,
+        COALESCE((p_delta->>'package_count')::BIGINT, 0),
+        COALESCE((p_delta->>'edge_count')::BIGINT, 0),
+        COALESCE((p_delta->>'lineage_count')::BIGINT, 0),
+        COALESCE((p_delta->>'confidence_sum')::NUMERIC, 0),
+        COALESCE((p_delta->>'hypothesis_count')::BIGINT, 0),
+        COALESCE((p_delta->>'low_confidence_count')::BIGINT, 0),
+        NOW()
+    )
+    ON CONFLICT (project_id) DO UPDATE SET
+        asset_count = st.asset_count + EXCLUDED.asset_count,
+        functional_count = st.functional_count + EXCLUDED.functional_count,
+        documented_count = st.documented_count + EXCLUDED.documented_count,
+        package_count = st.package_count + EXCLUDED.package_count,
+        edge_count = st.edge_count + EXCLUDED.edge_count,
+        lineage_count = st.lineage_count + EXCLUDED.lineage_count,
+        confidence_sum = st.confidence_sum + EXCLUDED.confidence_sum,
+        hypothesis_count = st.hypothesis_count + EXCLUDED.hypothesis_count,
+        low_confidence_count = st.low_confidence_count + EXCLUDED.low_confidence_count,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Seeds / repairs the accumulators from the base tables (projects persisted before this migration)
+CREATE OR REPLACE FUNCTION rebuild_audit_stats(p_project_id UUID)
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM project_connected_asset WHERE project_id = p_project_id;
+    INSERT INTO project_connected_asset (project_id, asset_id)
+    SELECT p_project_id, x.asset_id FROM (
+        SELECT from_asset_id AS asset_id FROM edge_index WHERE project_id = p_project_id
+        UNION SELECT to_asset_id FROM edge_index WHERE project_id = p_project_id
+        UNION SELECT source_asset_id FROM column_lineage WHERE project_id = p_project_id AND source_asset_id IS NOT NULL
+        UNION SELECT target_asset_id FROM column_lineage WHERE project_id = p_project_id AND target_asset_id IS NOT NULL
+    ) x
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO project_audit_stats AS st (
+        project_id, asset_count, functional_count, documented_count, package_count, edge_count,
+        lineage_count, confidence_sum, hypothesis_count, low_confidence_count, updated_at
+    )
+    SELECT
+        p_project_id,
+        (SELECT COUNT(*) FROM asset WHERE project_id = p_project_id),
+        (SELECT COUNT(*) FROM asset WHERE project_id = p_project_id AND is_functional_asset_type(asset_type)),
+        (SELECT COUNT(*) FROM project_connected_asset c JOIN asset a ON a.asset_id = c.asset_id
+          WHERE c.project_id = p_project_id AND is_functional_asset_type(a.asset_type)),
+        (SELECT COUNT(*) FROM package WHERE project_id = p_project_id),
+        (SELECT COUNT(*) FROM edge_index WHERE project_id = p_project_id),
+        (SELECT COUNT(*) FROM column_lineage WHERE project_id = p_project_id),
+        (SELECT COALESCE(SUM(COALESCE(confidence, 1.0)), 0) FROM edge_index WHERE project_id = p_project_id)
+          + (SELECT COALESCE(SUM(COALESCE(confidence, 1.0)), 0) FROM column_lineage WHERE project_id = p_project_id),
+        (SELECT COUNT(*) FROM edge_index WHERE project_id = p_project_id AND is_hypothesis),
+        (SELECT COUNT(*) FROM edge_index WHERE project_id = p_project_id AND COALESCE(confidence, 1.0) < 0.5),
+        NOW()
+    ON CONFLICT (project_id) DO UPDATE SET
+        asset_count = EXCLUDED.asset_count,
+        functional_count = EXCLUDED.functional_count,
+        documented_count = EXCLUDED.documented_count,
+        package_count = EXCLUDED.package_count,
+        edge_count = EXCLUDED.edge_count,
+        lineage_count = EXCLUDED.lineage_count,
+        confidence_sum = EXCLUDED.confidence_sum,
+        hypothesis_count = EXCLUDED.hypothesis_count,
+        low_confidence_count = EXCLUDED.low_confidence_count,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- O(1) counters + top-N orphans (anti-join on the connected set). NULL when the project has no stats row yet.
+CREATE OR REPLACE FUNCTION get_audit_stats(p_project_id UUID, p_orphan_limit INT DEFAULT 10)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'total_assets', st.asset_count,
+        'package_count', st.package_count,
+        'edge_count', st.edge_count,
+        'lineage_count', st.lineage_count,
+        'confidence_sum', st.confidence_sum,
+        'hypothesis_count', st.hypothesis_count,
+        'low_confidence_count', st.low_confidence_count,
+        'functional_count', st.functional_count,
+        'documented_count', st.documented_count,
+        'orphan_count', GREATEST(st.functional_count - st.documented_count, 0),
+        'orphans', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object('name_display', o.name_display, 'asset_type', o.asset_type))
+            FROM (
+                SELECT a.name_display, a.asset_type FROM asset a
+                WHERE a.project_id = p_project_id
+                  AND is_functional_asset_type(a.asset_type)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM project_connected_asset c
+                      WHERE c.project_id = p_project_id AND c.asset_id = a.asset_id
+                  )
+                ORDER BY a.name_display
+                LIMIT p_orphan_limit
+            ) o
+        ), '[]'::jsonb)
+    )
+    FROM project_audit_stats st
+    WHERE st.project_id = p_project_id;
+$$ LANGUAGE sql STABLE;
+
+-- Live coverage on the stats endpoint
+CREATE OR REPLACE FUNCTION get_solution_stats(p_project_id UUID)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'assets_by_type', COALESCE((
+            SELECT jsonb_object_agg(asset_type, cnt)
+            FROM (
+                SELECT asset_type, COUNT(*) AS cnt
+                FROM asset
+                WHERE project_id = p_project_id
+                GROUP BY asset_type
+            ) t
+        ), '{}'::jsonb),
+        'total_edges', (SELECT COUNT(*) FROM edge_index WHERE project_id = p_project_id),
+        'active_job', (
+            SELECT to_jsonb(j) FROM (
+                SELECT job_id, plan_id, status, progress_pct, error_details, created_at, current_stage
+                FROM job_run
+                WHERE project_id = p_project_id
+                  AND status IN ('queued', 'running', 'planning_ready')
+                ORDER BY created_at DESC
+                LIMIT 1
+            ) j
+        ),
+        'last_run', (
+            SELECT finished_at FROM job_run
+            WHERE project_id = p_project_id AND status = 'completed'
+            ORDER BY finished_at DESC NULLS LAST
+            LIMIT 1
+        ),
+        'audit_report', (
+            SELECT to_jsonb(a) FROM (
+                SELECT * FROM audit_snapshot
+                WHERE project_id = p_project_id
+                ORDER BY created_at DESC
+                LIMIT 1
+            ) a
+        ),
+        'audit_stats', (SELECT to_jsonb(s) FROM project_audit_stats s WHERE s.project_id = p_project_id)
+    );
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,8 @@
+-- Keyset pagination for governance exports (GovernanceExportService)
+-- Pages are fetched as: WHERE project_id = $1 AND <pk> > $last ORDER BY <pk> LIMIT n,
+-- so each table needs (project_id, pk) to seek straight to the next page.
+
+CREATE INDEX IF NOT EXISTS idx_asset_project_keyset ON asset(project_id, asset_id);
+CREATE INDEX IF NOT EXISTS idx_edge_index_project_keyset ON edge_index(project_id, edge_id);
+CREATE INDEX IF NOT EXISTS idx_package_project_keyset ON package(project_id, package_id);
+CREATE INDEX IF NOT EXISTS idx_col_lineage_project_keyset ON column_lineage(project_id, lineage_id);
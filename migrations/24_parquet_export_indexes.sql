@@ -0,0 +1,5 @@
+-- Keyset pagination for the Parquet lineage snapshot (ParquetExportService)
+-- asset, edge_index and column_lineage are covered by migration 23.
+
+CREATE INDEX IF NOT EXISTS idx_transformation_ir_project_keyset ON transformation_ir(project_id, ir_id);
+CREATE INDEX IF NOT EXISTS idx_package_component_package ON package_component(package_id);
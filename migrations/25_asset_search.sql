@@ -0,0 +1,96 @@
+-- Indexed asset browsing for GET /solutions/{id}/assets and /asset-types
+-- Replaces ILIKE '%x%' + OFFSET + count=exact (full scan per keystroke) and the
+-- download of every asset row to compute distinct types.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Substring search (ILIKE '%x%') served by trigram indexes
+CREATE INDEX IF NOT EXISTS idx_asset_name_trgm ON asset USING GIN (name_display gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_asset_canonical_trgm ON asset USING GIN (canonical_name gin_trgm_ops);
+
+-- Keyset order (name_display, asset_id), with and without the type filter
+CREATE INDEX IF NOT EXISTS idx_asset_project_name_keyset ON asset(project_id, name_display, asset_id);
+CREATE INDEX IF NOT EXISTS idx_asset_project_ltype_name_keyset ON asset(project_id, lower(asset_type), name_display, asset_id);
+
+-- Escapes LIKE wildcards in user input
+CREATE OR REPLACE FUNCTION like_escape(p_text TEXT)
+RETURNS TEXT AS $$
+    SELECT replace(replace(replace(p_text, '\', '\\'), '%', '\%'), '_', '\_');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- One page of assets after the (p_after_name, p_after_id) cursor
+CREATE OR REPLACE FUNCTION search_assets(
+    p_project_id UUID,
+    p_search TEXT DEFAULT NULL,
+    p_type TEXT DEFAULT NULL,
+    p_after_name TEXT DEFAULT NULL,
+    p_after_id UUID DEFAULT NULL,
+    p_limit INT DEFAULT 50
+)
+RETURNS SETOF asset AS $$
+    SELECT a.*
+    FROM asset a
+    WHERE a.project_id = p_project_id
+      AND (p_type IS NULL OR lower(a.asset_type) = lower(p_type))
+      AND (
+          p_search IS NULL
+          OR a.name_display ILIKE '%' || like_escape(p_search) || '%'
+          OR a.canonical_name ILIKE '%' || like_escape(p_search) || '%'
+      )
+      AND (p_after_name IS NULL OR (a.name_display, a.asset_id) > (p_after_name, p_after_id))
+    ORDER BY a.name_display, a.asset_id
+    LIMIT LEAST(GREATEST(p_limit, 1), 500);
+$$ LANGUAGE sql STABLE;
+
+-- Planner estimate of the matching rows (no scan). Without filters, the exact
+-- incremental total from project_audit_stats (migration 22) is used when present.
+CREATE OR REPLACE FUNCTION estimate_asset_count(
+    p_project_id UUID,
+    p_search TEXT DEFAULT NULL,
+    p_type TEXT DEFAULT NULL
+)
+RETURNS BIGINT AS $$
+DECLARE
+    v_total BIGINT;
+    v_plan JSONB;
+    v_sql TEXT;
+BEGIN
+    IF p_search IS NULL AND p_type IS NULL THEN
+        SELECT asset_count INTO v_total FROM project_audit_stats WHERE project_id = p_project_id;
+        IF v_total IS NOT NULL THEN
+            RETURN v_total;
+        END IF;
+    END IF;
+
+    v_sql := format('SELECT 1 FROM asset a WHERE a.project_id = %L', p_project_id);
+    IF p_type IS NOT NULL THEN
+        v_sql := v_sql || format(' AND lower(a.asset_type) = lower(%L)', p_type);
+    END IF;
+    IF p_search IS NOT NULL THEN
+        v_sql := v_sql || format(
+            ' AND (a.name_display ILIKE %1$L OR a.canonical_name ILIKE %1$L)',
+            '%' || like_escape(p_search) || '%'
+        );
+    END IF;
+
+    EXECUTE 'EXPLAIN (FORMAT JSON) ' || v_sql INTO v_plan;
+    RETURN (v_plan -> 0 -> 'Plan' ->> 'Plan Rows')::BIGINT;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Distinct asset types via a loose index scan on idx_asset_project_type (one probe per type)
+CREATE OR REPLACE FUNCTION get_asset_types(p_project_id UUID)
+RETURNS TABLE(asset_type TEXT) AS $$
+    WITH RECURSIVE t AS (
+        (SELECT a.asset_type FROM asset a WHERE a.project_id = p_project_id ORDER BY a.asset_type LIMIT 1)
+        UNION ALL
+        SELECT (
+            SELECT a.asset_type FROM asset a
+            WHERE a.project_id = p_project_id AND a.asset_type > t.asset_type
+            ORDER BY a.asset_type LIMIT 1
+        )
+        FROM t
+        WHERE t.asset_type IS NOT NULL
+    )
+    SELECT t.asset_type FROM t WHERE t.asset_type IS NOT NULL;
+$$ LANGUAGE sql STABLE;
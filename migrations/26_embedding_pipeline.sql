@@ -0,0 +1,43 @@
+-- Embedding pipeline for code_embeddings (migration 13)
+-- Evidence snippets and asset descriptions are embedded in batches after each job;
+-- content_hash lets re-runs skip text that already has a vector for the same model.
+
+ALTER TABLE code_embeddings ADD COLUMN IF NOT EXISTS asset_id UUID REFERENCES asset(asset_id) ON DELETE CASCADE;
+ALTER TABLE code_embeddings ADD COLUMN IF NOT EXISTS source_kind TEXT; -- evidence | asset
+ALTER TABLE code_embeddings ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE code_embeddings ADD COLUMN IF NOT EXISTS model TEXT;
+
+-- Dedupe: one vector per (project, model, text)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_code_embeddings_hash
+    ON code_embeddings(project_id, model, content_hash);
+
+-- Approximate nearest neighbour search (cosine). Requires pgvector >= 0.5.
+CREATE INDEX IF NOT EXISTS idx_code_embeddings_hnsw
+    ON code_embeddings USING hnsw (embedding vector_cosine_ops);
+
+-- Top-k most similar snippets/assets of a project
+-- ef_search is raised so the project filter applied after the ANN scan still fills p_match_count
+CREATE OR REPLACE FUNCTION match_code_embeddings(
+    p_project_id UUID,
+    p_query vector(1536),
+    p_match_count INT DEFAULT 10,
+    p_min_similarity FLOAT DEFAULT 0
+)
+RETURNS TABLE(
+    id UUID,
+    source_kind TEXT,
+    evidence_id UUID,
+    asset_id UUID,
+    file_path TEXT,
+    snippet TEXT,
+    similarity FLOAT
+) AS $$
+    SELECT e.id, e.source_kind, e.evidence_id, e.asset_id, e.file_path, e.snippet,
+           1 - (e.embedding <=> p_query) AS similarity
+    FROM code_embeddings e
+    WHERE e.project_id = p_project_id
+      AND 1 - (e.embedding <=> p_query) >= p_min_similarity
+    ORDER BY e.embedding <=> p_query
+    LIMIT LEAST(GREATEST(p_match_count, 1), 100);
+$$ LANGUAGE sql STABLE
+SET hnsw.ef_search = 200;
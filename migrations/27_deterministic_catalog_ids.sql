@@ -0,0 +1,131 @@
+-- Deterministic asset / edge identities (UUIDv5 over natural keys)
+-- asset_id = uuid5(ns, project_id|asset_type|canonical_name), edge_id = uuid5(ns, project_id|from|to|edge_type)
+-- (same derivation as app/services/identity.py). Writers compute ids locally and upsert blindly
+-- instead of SELECT-then-INSERT; this migration re-keys existing rows and merges duplicates.
+
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+
+CREATE OR REPLACE FUNCTION asset_natural_id(p_project_id UUID, p_canonical_name TEXT, p_asset_type TEXT)
+RETURNS UUID AS $$
+    SELECT uuid_generate_v5('6f1c2f0e-5b7a-4c55-9d8e-3a1f2b4c5d60'::uuid,
+                            p_project_id::text || '|' || p_asset_type || '|' || p_canonical_name);
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION edge_natural_id(p_project_id UUID, p_from UUID, p_to UUID, p_edge_type TEXT)
+RETURNS UUID AS $$
+    SELECT uuid_generate_v5('0b9e4d2a-7c3f-4e81-a6d5-9f2e1c8b7a40'::uuid,
+                            p_project_id::text || '|' || p_from::text || '|' || p_to::text || '|' || p_edge_type);
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Re-key existing data (one transaction). Duplicates of a natural key collapse into one row:
+-- the most recently updated asset / the most confident edge survives.
+DO $$
+BEGIN
+    UPDATE asset SET canonical_name = name_display WHERE canonical_name IS NULL;
+
+    -- 1. Assets
+    DROP TABLE IF EXISTS asset_rekey;
+    CREATE TEMP TABLE asset_rekey ON COMMIT DROP AS
+    SELECT asset_id AS old_id, asset_natural_id(project_id, canonical_name, asset_type) AS new_id
+    FROM asset;
+    DELETE FROM asset_rekey WHERE old_id = new_id;
+    CREATE INDEX ON asset_rekey(old_id);
+
+    INSERT INTO asset (asset_id, project_id, asset_type, name_display, canonical_name, system, tags, owner,
+                       parent_asset_id, created_at, updated_at)
+    SELECT DISTINCT ON (m.new_id)
+           m.new_id, a.project_id, a.asset_type, a.name_display, a.canonical_name, a.system, a.tags, a.owner,
+           a.parent_asset_id, a.created_at, a.updated_at
+    FROM asset_rekey m JOIN asset a ON a.asset_id = m.old_id
+    ORDER BY m.new_id, a.updated_at DESC NULLS LAST
+    ON CONFLICT (asset_id) DO NOTHING;
+
+    UPDATE asset_version t SET asset_id = m.new_id FROM asset_rekey m WHERE t.asset_id = m.old_id;
+    UPDATE edge_index t SET from_asset_id = m.new_id FROM asset_rekey m WHERE t.from_asset_id = m.old_id;
+    UPDATE edge_index t SET to_asset_id = m.new_id FROM asset_rekey m WHERE t.to_asset_id = m.old_id;
+    UPDATE asset t SET parent_asset_id = m.new_id FROM asset_rekey m WHERE t.parent_asset_id = m.old_id;
+    UPDATE asset t SET tags = jsonb_set(t.tags, '{parent_asset_id}', to_jsonb(m.new_id::text))
+        FROM asset_rekey m WHERE t.tags->>'parent_asset_id' = m.old_id::text;
+    UPDATE package t SET asset_id = m.new_id FROM asset_rekey m WHERE t.asset_id = m.old_id;
+    UPDATE column_lineage t SET source_asset_id = m.new_id FROM asset_rekey m WHERE t.source_asset_id = m.old_id;
+    UPDATE column_lineage t SET target_asset_id = m.new_id FROM asset_rekey m WHERE t.target_asset_id = m.old_id;
+    UPDATE code_embeddings t SET asset_id = m.new_id FROM asset_rekey m WHERE t.asset_id = m.old_id;
+    DELETE FROM project_connected_asset c USING asset_rekey m WHERE c.asset_id = m.old_id; -- rebuilt below
+    DELETE FROM asset a USING asset_rekey m WHERE a.asset_id = m.old_id;
+
+    -- 2. Edges (after the asset re-key: the natural key includes the new asset ids)
+    DROP TABLE IF EXISTS edge_rekey;
+    CREATE TEMP TABLE edge_rekey ON COMMIT DROP AS
+    SELECT edge_id AS old_id, edge_natural_id(project_id, from_asset_id, to_asset_id, edge_type) AS new_id
+    FROM edge_index;
+    DELETE FROM edge_rekey WHERE old_id = new_id;
+    CREATE INDEX ON edge_rekey(old_id);
+
+    INSERT INTO edge_index (edge_id, project_id, from_asset_id, to_asset_id, edge_type, confidence,
+                            extractor_id, is_hypothesis, created_at)
+    SELECT DISTINCT ON (m.new_id)
+           m.new_id, e.project_id, e.from_asset_id, e.to_asset_id, e.edge_type, e.confidence,
+           e.extractor_id, e.is_hypothesis, e.created_at
+    FROM edge_rekey m JOIN edge_index e ON e.edge_id = m.old_id
+    ORDER BY m.new_id, e.confidence DESC NULLS LAST, e.created_at
+    ON CONFLICT (edge_id) DO NOTHING;
+
+    INSERT INTO edge_evidence (edge_id, evidence_id)
+    SELECT m.new_id, ee.evidence_id FROM edge_evidence ee JOIN edge_rekey m ON m.old_id = ee.edge_id
+    ON CONFLICT DO NOTHING;
+    DELETE FROM edge_index e USING edge_rekey m WHERE e.edge_id = m.old_id; -- cascades old edge_evidence
+
+    -- 3. Audit accumulators (duplicates were counted before the merge)
+    PERFORM rebuild_audit_stats(p.project_id) FROM project_audit_stats p;
+END;
+$$;
+
+-- Backing constraints for the natural keys
+ALTER TABLE asset ALTER COLUMN canonical_name SET NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_asset_natural_key ON asset(project_id, asset_type, canonical_name);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_edge_natural_key ON edge_index(project_id, from_asset_id, to_asset_id, edge_type);
+
+-- Blind batch upserts. `inserted` (xmax = 0) lets CatalogService keep the audit delta exact
+-- without reading first; edges also return the values they replaced.
+CREATE OR REPLACE FUNCTION upsert_assets(p_assets JSONB)
+RETURNS TABLE(asset_id UUID, asset_type TEXT, inserted BOOLEAN) AS $$
+    INSERT INTO asset AS a (asset_id, project_id, asset_type, name_display, canonical_name, system, tags,
+                            created_at, updated_at)
+    SELECT x.asset_id, x.project_id, x.asset_type, x.name_display, x.canonical_name, x.system, x.tags, NOW(), NOW()
+    FROM jsonb_to_recordset(p_assets) AS x(
+        asset_id UUID, project_id UUID, asset_type TEXT, name_display TEXT, canonical_name TEXT, system TEXT, tags JSONB
+    )
+    ON CONFLICT (asset_id) DO UPDATE SET
+        system = EXCLUDED.system,
+        tags = EXCLUDED.tags,
+        updated_at = NOW()
+    RETURNING a.asset_id, a.asset_type, (a.xmax = 0);
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION upsert_edges(p_edges JSONB)
+RETURNS TABLE(edge_id UUID, inserted BOOLEAN, old_confidence NUMERIC, old_is_hypothesis BOOLEAN) AS $$
+    WITH input AS (
+        SELECT * FROM jsonb_to_recordset(p_edges) AS x(
+            edge_id UUID, project_id UUID, from_asset_id UUID, to_asset_id UUID, edge_type TEXT,
+            confidence NUMERIC, extractor_id TEXT, is_hypothesis BOOLEAN
+        )
+    ),
+    previous AS (
+        SELECT e.edge_id, e.confidence, e.is_hypothesis
+        FROM edge_index e JOIN input i ON i.edge_id = e.edge_id
+    ),
+    written AS (
+        INSERT INTO edge_index AS e (edge_id, project_id, from_asset_id, to_asset_id, edge_type, confidence,
+                                     extractor_id, is_hypothesis)
+        SELECT edge_id, project_id, from_asset_id, to_asset_id, edge_type, confidence, extractor_id,
+               COALESCE(is_hypothesis, FALSE)
+        FROM input
+        ON CONFLICT (edge_id) DO UPDATE SET
+            confidence = EXCLUDED.confidence,
+            is_hypothesis = EXCLUDED.is_hypothesis,
+            extractor_id = EXCLUDED.extractor_id
+        RETURNING e.edge_id, (e.xmax = 0) AS inserted
+    )
+    SELECT w.edge_id, w.inserted, p.confidence, p.is_hypothesis
+    FROM written w LEFT JOIN previous p ON p.edge_id = w.edge_id;
+$$ LANGUAGE sql;
@@ -0,0 +1,29 @@
+-- Heavy asset attributes (deep-dive component config, column metadata) live in asset_detail,
+-- fetched by asset_id only when a single asset is opened. asset.tags keeps the small keys
+-- used by graph, audit, export and search queries.
+
+CREATE TABLE IF NOT EXISTS asset_detail (
+    asset_id UUID PRIMARY KEY REFERENCES asset(asset_id) ON DELETE CASCADE,
+    project_id UUID NOT NULL,
+    detail JSONB NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_asset_detail_project ON asset_detail(project_id);
+
+-- Move existing heavy keys out of asset.tags (same keys as catalog.HEAVY_TAG_KEYS)
+INSERT INTO asset_detail (asset_id, project_id, detail)
+SELECT a.asset_id, a.project_id,
+       jsonb_strip_nulls(jsonb_build_object(
+           'original_config', a.tags->'original_config',
+           'columns_metadata', a.tags->'columns_metadata'
+       ))
+FROM asset a
+WHERE a.tags ?| ARRAY['original_config', 'columns_metadata']
+ON CONFLICT (asset_id) DO UPDATE SET detail = asset_detail.detail || EXCLUDED.detail, updated_at = NOW();
+
+UPDATE asset SET tags = tags - 'original_config' - 'columns_metadata'
+WHERE tags ?| ARRAY['original_config', 'columns_metadata'];
+
+-- Component lookup for the PACKAGE perspective (tags->>'package_id' filter)
+CREATE INDEX IF NOT EXISTS idx_asset_tags_package ON asset(project_id, (tags->>'package_id'));
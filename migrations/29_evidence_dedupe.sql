@@ -0,0 +1,68 @@
+-- Evidence deduplication: every evidence carries a deterministic content hash
+-- (models.extraction.evidence_hash) and (project_id, file_path, hash) is unique,
+-- so re-running a job no longer appends a fresh copy of every snippet.
+
+-- Same formula as evidence_hash(): sha256 of the locator fields and the snippet joined with \x1f
+CREATE OR REPLACE FUNCTION evidence_content_hash(p_locator JSONB, p_snippet TEXT)
+RETURNS TEXT AS $$
+    SELECT encode(sha256(convert_to(
+        COALESCE(p_locator->>'file', '') || chr(31) ||
+        COALESCE(p_locator->>'line_start', '') || chr(31) ||
+        COALESCE(p_locator->>'line_end', '') || chr(31) ||
+        COALESCE(p_locator->>'xpath', '') || chr(31) ||
+        COALESCE(p_locator->>'byte_start', '') || chr(31) ||
+        COALESCE(p_locator->>'byte_end', '') || chr(31) ||
+        COALESCE(p_snippet, ''),
+        'UTF8')), 'hex');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Backfill and merge what previous runs accumulated (one transaction)
+DO $$
+BEGIN
+    -- Extractors never set a hash; LLM output had placeholders ("sha256_del_snippet")
+    UPDATE evidence SET hash = evidence_content_hash(locator, snippet)
+    WHERE hash IS NULL OR hash !~ '^[0-9a-f]{64}$';
+
+    DROP TABLE IF EXISTS evidence_dupes;
+    CREATE TEMP TABLE evidence_dupes ON COMMIT DROP AS
+    SELECT evidence_id AS old_id,
+           first_value(evidence_id) OVER (PARTITION BY project_id, file_path, hash
+                                          ORDER BY created_at, evidence_id) AS keep_id
+    FROM evidence;
+    DELETE FROM evidence_dupes WHERE old_id = keep_id;
+    CREATE INDEX ON evidence_dupes(old_id);
+
+    INSERT INTO edge_evidence (edge_id, evidence_id)
+    SELECT ee.edge_id, d.keep_id FROM edge_evidence ee JOIN evidence_dupes d ON d.old_id = ee.evidence_id
+    ON CONFLICT DO NOTHING;
+    UPDATE code_embeddings t SET evidence_id = d.keep_id FROM evidence_dupes d WHERE t.evidence_id = d.old_id;
+    DELETE FROM evidence e USING evidence_dupes d WHERE e.evidence_id = d.old_id; -- cascades old edge_evidence
+END;
+$$;
+
+ALTER TABLE evidence ALTER COLUMN hash SET NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_evidence_content ON evidence(project_id, file_path, hash) NULLS NOT DISTINCT;
+
+-- Bulk write: ON CONFLICT DO NOTHING, then the stored id of every input key. Rows inserted
+-- here come from RETURNING (the outer query's snapshot does not see them); keys that already
+-- existed (possibly under an older random id) come from the table.
+CREATE OR REPLACE FUNCTION insert_evidence(p_evidence JSONB)
+RETURNS TABLE(evidence_id UUID, hash TEXT, inserted BOOLEAN) AS $$
+    WITH input AS (
+        SELECT * FROM jsonb_to_recordset(p_evidence) AS x(
+            evidence_id UUID, project_id UUID, artifact_id UUID, file_path TEXT, kind TEXT,
+            locator JSONB, snippet TEXT, hash TEXT
+        )
+    ),
+    written AS (
+        INSERT INTO evidence (evidence_id, project_id, artifact_id, file_path, kind, locator, snippet, hash)
+        SELECT evidence_id, project_id, artifact_id, file_path, kind, locator, snippet, hash FROM input
+        ON CONFLICT DO NOTHING
+        RETURNING evidence.evidence_id, evidence.hash
+    )
+    SELECT w.evidence_id, w.hash, TRUE FROM written w
+    UNION ALL
+    SELECT e.evidence_id, e.hash, FALSE
+    FROM input i
+    JOIN evidence e ON e.project_id = i.project_id AND e.file_path IS NOT DISTINCT FROM i.file_path AND e.hash = i.hash;
+$$ LANGUAGE sql;
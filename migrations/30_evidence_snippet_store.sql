@@ -0,0 +1,63 @@
+-- Out-of-row evidence snippets: each distinct snippet is stored once, compressed, keyed by
+-- sha256(snippet) (app/services/snippet_store.py). evidence keeps the locator, its content
+-- hash and snippet_hash; readers fetch snippets in bulk only when they show them.
+-- codec: zstd | zlib (base64 payload) | plain (payload is the text itself, migrated rows)
+
+CREATE TABLE IF NOT EXISTS evidence_snippet (
+    snippet_hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    raw_bytes INT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE evidence ADD COLUMN IF NOT EXISTS snippet_hash TEXT;
+CREATE INDEX IF NOT EXISTS idx_evidence_snippet_hash ON evidence(snippet_hash);
+
+-- Move existing inline snippets (as plain: compression happens in the app)
+DO $$
+BEGIN
+    UPDATE evidence SET snippet_hash = encode(sha256(convert_to(snippet, 'UTF8')), 'hex')
+    WHERE snippet IS NOT NULL AND snippet_hash IS NULL;
+
+    INSERT INTO evidence_snippet (snippet_hash, codec, payload, raw_bytes)
+    SELECT DISTINCT ON (snippet_hash) snippet_hash, 'plain', snippet, octet_length(snippet)
+    FROM evidence WHERE snippet IS NOT NULL
+    ON CONFLICT (snippet_hash) DO NOTHING;
+
+    UPDATE evidence SET snippet = NULL WHERE snippet IS NOT NULL;
+END;
+$$;
+
+-- insert_evidence (migration 29) with snippet_hash instead of the inline snippet
+CREATE OR REPLACE FUNCTION insert_evidence(p_evidence JSONB)
+RETURNS TABLE(evidence_id UUID, hash TEXT, inserted BOOLEAN) AS $$
+    WITH input AS (
+        SELECT * FROM jsonb_to_recordset(p_evidence) AS x(
+            evidence_id UUID, project_id UUID, artifact_id UUID, file_path TEXT, kind TEXT,
+            locator JSONB, snippet_hash TEXT, hash TEXT
+        )
+    ),
+    written AS (
+        INSERT INTO evidence (evidence_id, project_id, artifact_id, file_path, kind, locator, snippet_hash, hash)
+        SELECT evidence_id, project_id, artifact_id, file_path, kind, locator, snippet_hash, hash FROM input
+        ON CONFLICT DO NOTHING
+        RETURNING evidence.evidence_id, evidence.hash
+    )
+    SELECT w.evidence_id, w.hash, TRUE FROM written w
+    UNION ALL
+    SELECT e.evidence_id, e.hash, FALSE
+    FROM input i
+    JOIN evidence e ON e.project_id = i.project_id AND e.file_path IS NOT DISTINCT FROM i.file_path AND e.hash = i.hash;
+$$ LANGUAGE sql;
+
+-- Snippets shared across projects are kept while any evidence references them
+CREATE OR REPLACE FUNCTION gc_evidence_snippets()
+RETURNS BIGINT AS $$
+    WITH deleted AS (
+        DELETE FROM evidence_snippet s
+        WHERE NOT EXISTS (SELECT 1 FROM evidence e WHERE e.snippet_hash = s.snippet_hash)
+        RETURNING 1
+    )
+    SELECT count(*) FROM deleted;
+$$ LANGUAGE sql;
@@ -0,0 +1,86 @@
+-- Snippet store follow-up (migration 30):
+-- 1. Snippets are written by insert_evidence in the same transaction as the evidence rows that
+--    reference them, so no snippet is ever visible unreferenced because of a job in progress.
+-- 2. gc_evidence_snippets only collects snippets older than a grace period. A rewrite of an
+--    old snippet refreshes created_at (row lock), so a concurrent GC re-checks it and skips it.
+-- 3. code_embeddings keeps snippet_hash instead of an inline copy of evidence snippets.
+
+DROP FUNCTION IF EXISTS insert_evidence(JSONB);
+CREATE OR REPLACE FUNCTION insert_evidence(p_evidence JSONB, p_snippets JSONB DEFAULT '[]'::jsonb)
+RETURNS TABLE(evidence_id UUID, hash TEXT, inserted BOOLEAN) AS $$
+    WITH snippets AS (
+        INSERT INTO evidence_snippet AS s (snippet_hash, codec, payload, raw_bytes)
+        SELECT DISTINCT ON (snippet_hash) snippet_hash, codec, payload, raw_bytes
+        FROM jsonb_to_recordset(p_snippets) AS x(snippet_hash TEXT, codec TEXT, payload TEXT, raw_bytes INT)
+        ON CONFLICT (snippet_hash) DO UPDATE SET created_at = NOW()
+        WHERE s.created_at < NOW() - INTERVAL '10 minutes' -- well inside the GC grace period
+        RETURNING 1
+    ),
+    input AS (
+        SELECT * FROM jsonb_to_recordset(p_evidence) AS x(
+            evidence_id UUID, project_id UUID, artifact_id UUID, file_path TEXT, kind TEXT,
+            locator JSONB, snippet_hash TEXT, hash TEXT
+        )
+    ),
+    written AS (
+        INSERT INTO evidence (evidence_id, project_id, artifact_id, file_path, kind, locator, snippet_hash, hash)
+        SELECT evidence_id, project_id, artifact_id, file_path, kind, locator, snippet_hash, hash FROM input
+        ON CONFLICT DO NOTHING
+        RETURNING evidence.evidence_id, evidence.hash
+    )
+    SELECT w.evidence_id, w.hash, TRUE FROM written w
+    UNION ALL
+    SELECT e.evidence_id, e.hash, FALSE
+    FROM input i
+    JOIN evidence e ON e.project_id = i.project_id AND e.file_path IS NOT DISTINCT FROM i.file_path AND e.hash = i.hash;
+$$ LANGUAGE sql;
+
+-- Embeddings of evidence point at the shared snippet (asset descriptions stay inline: they are
+-- short and not in the snippet store)
+ALTER TABLE code_embeddings ADD COLUMN IF NOT EXISTS snippet_hash TEXT;
+CREATE INDEX IF NOT EXISTS idx_code_embeddings_snippet_hash ON code_embeddings(snippet_hash);
+
+UPDATE code_embeddings c SET snippet_hash = e.snippet_hash, snippet = NULL
+FROM evidence e
+WHERE c.evidence_id = e.evidence_id AND e.snippet_hash IS NOT NULL AND c.snippet_hash IS NULL;
+
+DROP FUNCTION IF EXISTS gc_evidence_snippets();
+CREATE OR REPLACE FUNCTION gc_evidence_snippets(p_grace INTERVAL DEFAULT INTERVAL '1 hour')
+RETURNS BIGINT AS $$
+    WITH deleted AS (
+        DELETE FROM evidence_snippet s
+        WHERE s.created_at < NOW() - p_grace
+          AND NOT EXISTS (SELECT 1 FROM evidence e WHERE e.snippet_hash = s.snippet_hash)
+          AND NOT EXISTS (SELECT 1 FROM code_embeddings c WHERE c.snippet_hash = s.snippet_hash)
+        RETURNING 1
+    )
+    SELECT count(*) FROM deleted;
+$$ LANGUAGE sql;
+
+-- match_code_embeddings (migration 26) also returns snippet_hash; callers resolve it in bulk
+DROP FUNCTION IF EXISTS match_code_embeddings(UUID, vector, INT, FLOAT);
+CREATE OR REPLACE FUNCTION match_code_embeddings(
+    p_project_id UUID,
+    p_query vector(1536),
+    p_match_count INT DEFAULT 10,
+    p_min_similarity FLOAT DEFAULT 0
+)
+RETURNS TABLE(
+    id UUID,
+    source_kind TEXT,
+    evidence_id UUID,
+    asset_id UUID,
+    file_path TEXT,
+    snippet TEXT,
+    snippet_hash TEXT,
+    similarity FLOAT
+) AS $$
+    SELECT e.id, e.source_kind, e.evidence_id, e.asset_id, e.file_path, e.snippet, e.snippet_hash,
+           1 - (e.embedding <=> p_query) AS similarity
+    FROM code_embeddings e
+    WHERE e.project_id = p_project_id
+      AND 1 - (e.embedding <=> p_query) >= p_min_similarity
+    ORDER BY e.embedding <=> p_query
+    LIMIT LEAST(GREATEST(p_match_count, 1), 100);
+$$ LANGUAGE sql STABLE
+SET hnsw.ef_search = 200;
@@ -0,0 +1,160 @@
+"""
+Shared fakes for the catalog tests: an in-memory Supabase client and builders
+for the extraction / deep-dive results that CatalogService syncs.
+"""
+import sys
+import os
+import uuid
+from datetime import datetime
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+from app.models.extraction import ExtractionResult, ExtractedNode, ExtractedEdge
+from app.models.deep_dive import DeepDiveResult, Package, PackageComponent, TransformationIR, ColumnLineage
+
+PROJECT = "7d444840-9dc0-11d1-b245-5ffdce74fad2"
+
+# Primary keys used to merge upserted rows
+TABLE_KEYS = {
+    "evidence": ("project_id", "file_path", "hash"),
+    "evidence_snippet": ("snippet_hash",),
+    "edge_evidence": ("edge_id", "evidence_id"),
+}
+
+
+class FakeSupabase:
+    """
+    MagicMock client (`.client`) backed by `tables` ({name: rows}).
+
+    Reads honour gt/in_/limit (keyset pages, bulk fetches); eq and order are ignored.
+    Upserts merge on TABLE_KEYS and are recorded in `writes` as (table, rows).
+    RPCs are recorded in `calls` as (name, params) and in `writes` as ("rpc:<name>", params);
+    `rpc_results` ({name: params -> data}) overrides the default catalog RPCs below.
+    """
+
+    def __init__(self, tables=None, rpc_results=None):
+        self.tables = {name: list(rows) for name, rows in (tables or {}).items()}
+        self.rpc_results = rpc_results or {}
+        self.writes = []
+        self.calls = []
+        self.reads = []  # (table, values) for every in_ filter
+        self.client = MagicMock()
+        self.client.table.side_effect = self._table
+        self.client.rpc.side_effect = self._rpc
+
+    def rows(self, name):
+        return self.tables.setdefault(name, [])
+
+    def upsert_rows(self, name, rows, ignore_duplicates=False):
+        """Merges rows on the table key; returns the rows that were new"""
+        key_columns = TABLE_KEYS.get(name)
+        stored = self.rows(name)
+        index = {tuple(r.get(c) for c in key_columns): i for i, r in enumerate(stored)} if key_columns else {}
+        new = []
+        for row in rows:
+            key = tuple(row.get(c) for c in key_columns) if key_columns else None
+            if key is not None and key in index:
+                if not ignore_duplicates:
+                    stored[index[key]] = row
+                continue
+            if key is not None:
+                index[key] = len(stored)
+            stored.append(row)
+            new.append(row)
+        return new
+
+    def _table(self, name):
+        query = MagicMock()
+        state = {"filters": [], "limit": None}
+        for method in ("select", "eq", "order"):
+            getattr(query, method).return_value = query
+
+        def gt(key, value):
+            state["filters"].append(lambda r: r[key] > value)
+            return query
+
+        def in_(key, values):
+            values = list(values)
+            self.reads.append((name, values))
+            state["filters"].append(lambda r: r.get(key) in values)
+            return query
+
+        def upsert(rows, **kwargs):
+            self.writes.append((name, rows))
+            self.upsert_rows(name, rows if isinstance(rows, list) else [rows], kwargs.get("ignore_duplicates", False))
+            return query
+
+        def execute():
+            rows = [r for r in self.tables.get(name, []) if all(f(r) for f in state["filters"])]
+            return MagicMock(data=rows[:state["limit"]])
+
+        query.gt.side_effect = gt
+        query.in_.side_effect = in_
+        query.limit.side_effect = lambda n: state.update(limit=n) or query
+        query.upsert.side_effect = upsert
+        query.execute.side_effect = execute
+        return query
+
+    def _rpc(self, name, params):
+        self.calls.append((name, params))
+        self.writes.append((f"rpc:{name}", params))
+        handler = self.rpc_results.get(name) or getattr(self, f"_rpc_{name}", None)
+        call = MagicMock()
+        call.execute.return_value = MagicMock(data=handler(params) if handler else [])
+        return call
+
+    # Default RPCs: everything is new, evidence is unique per (project, file, hash)
+
+    def _rpc_upsert_assets(self, params):
+        return [{"asset_id": r["asset_id"], "asset_type": r["asset_type"], "inserted": True} for r in params["p_assets"]]
+
+    def _rpc_upsert_edges(self, params):
+        return [{"edge_id": r["edge_id"], "inserted": True} for r in params["p_edges"]]
+
+    def _rpc_insert_evidence(self, params):
+        self.upsert_rows("evidence_snippet", params.get("p_snippets") or [], ignore_duplicates=True)
+        new = {id(r) for r in self.upsert_rows("evidence", params["p_evidence"], ignore_duplicates=True)}
+        stored = {tuple(r.get(c) for c in TABLE_KEYS["evidence"]): r for r in self.rows("evidence")}
+        return [{"evidence_id": stored[tuple(r.get(c) for c in TABLE_KEYS["evidence"])]["evidence_id"],
+                 "hash": r["hash"], "inserted": id(r) in new} for r in params["p_evidence"]]
+
+
+def extraction_result(confidences=(0.9,), system="SQLSRV"):
+    """
+    load.sql: stg.Orders WRITES_TO dbo.Orders, one edge per confidence. Every edge
+    after the first targets another dbo.Orders node (same asset, new local node_id).
+    """
+    nodes = [
+        ExtractedNode(node_id="n1", node_type="TABLE", name="dbo.Orders", system=system),
+        ExtractedNode(node_id="n2", node_type="TABLE", name="stg.Orders", system=system),
+    ]
+    edges = []
+    for i, confidence in enumerate(confidences):
+        target = "n1"
+        if i:
+            target = f"n{len(nodes) + 1}"
+            nodes.append(ExtractedNode(node_id=target, node_type="TABLE", name="dbo.Orders", system=system))
+        edges.append(ExtractedEdge(edge_id=f"e{i + 1}", from_node_id="n2", to_node_id=target, edge_type="WRITES_TO",
+                                   confidence=confidence, rationale="INSERT"))
+    return ExtractionResult(meta={"source_file": "load.sql", "extractor_id": "sqlglot"},
+                            nodes=nodes, edges=edges, evidences=[])
+
+
+def deep_dive_result(n_components=5, component_type="TRANSFORM", config=None):
+    """LoadSales SSIS package: a chain of components C0..Cn, one DERIVE IR each, lineage between neighbours"""
+    now = datetime.utcnow()
+    package_id = uuid.uuid4()
+    package = Package(package_id=package_id, project_id=PROJECT, name="LoadSales", type="SSIS",
+                      source_system="SSIS", created_at=now, updated_at=now)
+    components = [PackageComponent(component_id=uuid.uuid4(), package_id=package_id, name=f"C{i}",
+                                   type=component_type, config=config or {}, created_at=now)
+                  for i in range(n_components)]
+    transformations = [TransformationIR(ir_id=uuid.uuid4(), project_id=PROJECT, source_component_id=c.component_id,
+                                        operation="DERIVE", created_at=now) for c in components]
+    lineage = [ColumnLineage(lineage_id=uuid.uuid4(), project_id=PROJECT, package_id=package_id,
+                             source_asset_id=a.component_id, target_asset_id=b.component_id,
+                             source_column="*", target_column="*", confidence=1.0, created_at=now)
+               for a, b in zip(components, components[1:])]
+    return DeepDiveResult(package=package, components=components, transformations=transformations, lineage=lineage)
@@ -0,0 +1,132 @@
+import sys
+import os
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.actions import ActionRunner, ActionResult
+from app.router import ModelConfig
+
+class TestActionBatch(unittest.TestCase):
+    def setUp(self):
+        self.runner = ActionRunner.__new__(ActionRunner)
+        self.runner.router = MagicMock()
+        self.runner.router.get_action_config.return_value = MagicMock(
+            primary=ModelConfig(provider="openai", model="gpt-4o-mini", prompt_file="prompts/extract_python.md",
+                                temperature=0.0, max_tokens=2000)
+        )
+        self.runner.llm_service = MagicMock()
+        self.runner.prompt_service = MagicMock()
+        self.runner.prompt_service.get_composed_prompt.return_value = "Extract lineage."
+        self.runner.logger = MagicMock()
+        self.runner.cost_estimates = {}
+
+    def _items(self, n):
+        return [{"key": f"k{i}", "input_data": {"content": f"df{i} = read_csv('f{i}.csv')"},
+                 "context": {"file_path": f"f{i}.py"}} for i in range(n)]
+
+    def test_batch_response_is_split_per_item(self):
+        payload = {f"k{i}": {"nodes": [{"node_id": f"n{i}", "name": f"f{i}", "node_type": "file"}], "edges": []} for i in range(3)}
+        self.runner.llm_service.call_model.return_value = {
+            "success": True, "content": json.dumps(payload), "tokens_in": 300, "tokens_out": 90
+        }
+
+        results = self.runner.run_action_batch("extract.python", self._items(3), {"k0": "log0"})
+
+        self.runner.llm_service.call_model.assert_called_once()
+        user_msg = self.runner.llm_service.call_model.call_args.kwargs["messages"][1]["content"]
+        self.assertIn("=== FILE k1: f1.py ===", user_msg)
+        self.assertEqual(set(results), {"k0", "k1", "k2"})
+        self.assertTrue(all(r.success for r in results.values()))
+        self.assertEqual(results["k2"].data["nodes"][0]["node_id"], "n2")
+        self.assertEqual(sum(r.tokens_in for r in results.values()), 300)
+        self.runner.logger.update_tokens_and_cost.assert_called_once()
+
+    def test_missing_items_are_retried_individually(self):
+        payload = {"k0": {"nodes": [], "edges": []}}
+        self.runner.llm_service.call_model.return_value = {"success": True, "content": json.dumps(payload)}
+        self.runner.run_action = MagicMock(return_value=ActionResult(success=True, data={"nodes": [], "edges": []}))
+
+        results = self.runner.run_action_batch("extract.python", self._items(2))
+
+        self.runner.run_action.assert_called_once()
+        self.assertEqual(self.runner.run_action.call_args[0][1]["content"], "df1 = read_csv('f1.csv')")
+        self.assertTrue(results["k0"].success)
+        self.assertTrue(results["k1"].success)
+
+    def test_batches_respect_item_limit(self):
+        self.runner.llm_service.call_model.return_value = {"success": False, "error": "boom"}
+        self.runner.run_action = MagicMock(return_value=ActionResult(success=False, error_message="boom"))
+
+        with patch("app.actions.settings.LLM_BATCH_MAX_ITEMS", 2):
+            results = self.runner.run_action_batch("extract.python", self._items(4))
+
+        self.assertEqual(self.runner.llm_service.call_model.call_count, 2)
+        self.assertEqual(self.runner.run_action.call_count, 4)
+        self.assertFalse(any(r.success for r in results.values()))
+
+    def test_stops_between_batches_when_cancelled(self):
+        payload = {f"k{i}": {"nodes": [], "edges": []} for i in range(6)}
+        self.runner.llm_service.call_model.return_value = {"success": True, "content": json.dumps(payload)}
+        self.runner.run_action = MagicMock()
+        stop = MagicMock(side_effect=[False, True])
+
+        with patch("app.actions.settings.LLM_BATCH_MAX_ITEMS", 2):
+            results = self.runner.run_action_batch("extract.python", self._items(6), should_stop=stop)
+
+        # First request ran, the cancel was seen before the second one
+        self.assertEqual(self.runner.llm_service.call_model.call_count, 1)
+        self.assertEqual(set(results), {"k0", "k1"})
+        self.runner.run_action.assert_not_called()
+
+    def test_batches_budget_output_tokens(self):
+        self.runner.llm_service.call_model.return_value = {"success": False, "error": "boom"}
+        self.runner.run_action = MagicMock(return_value=ActionResult(success=False, error_message="boom"))
+
+        # max_tokens=2000 leaves room for 2 files at 1000 output tokens each
+        with patch("app.actions.settings.LLM_BATCH_OUTPUT_TOKENS_PER_ITEM", 1000):
+            self.runner.run_action_batch("extract.python", self._items(4))
+
+        self.assertEqual(self.runner.llm_service.call_model.call_count, 2)
+        for call in self.runner.llm_service.call_model.call_args_list:
+            self.assertEqual(call.kwargs["messages"][1]["content"].count("=== FILE"), 2)
+
+    def test_truncated_batch_is_split_in_half(self):
+        def answer(**kwargs):
+            keys = [line.split(":")[0][len("=== FILE "):] for line in kwargs["messages"][1]["content"].splitlines()
+                    if line.startswith("=== FILE")]
+            if len(keys) > 2:
+                return {"success": True, "content": '{"k0": {"nodes": [', "tokens_out": 2000, "finish_reason": "length"}
+            return {"success": True, "content": json.dumps({k: {"nodes": [], "edges": []} for k in keys}),
+                    "finish_reason": "stop"}
+        self.runner.llm_service.call_model.side_effect = answer
+        self.runner.run_action = MagicMock()
+
+        with patch("app.actions.settings.LLM_BATCH_OUTPUT_TOKENS_PER_ITEM", 100):
+            results = self.runner.run_action_batch("extract.python", self._items(4))
+
+        # 4 -> truncated -> 2 + 2, nothing falls back to single-item calls
+        self.assertEqual(self.runner.llm_service.call_model.call_count, 3)
+        self.runner.run_action.assert_not_called()
+        self.assertEqual(set(results), {"k0", "k1", "k2", "k3"})
+
+    def test_cut_off_json_counts_as_truncated(self):
+        self.runner.llm_service.call_model.return_value = {"success": True, "content": '{"k0": {"nodes": [', "tokens_out": 2000}
+        self.runner.run_action = MagicMock(return_value=ActionResult(success=True, data={"nodes": [], "edges": []}))
+
+        with patch("app.actions.settings.LLM_BATCH_OUTPUT_TOKENS_PER_ITEM", 100):
+            results = self.runner.run_action_batch("extract.python", self._items(3))
+
+        # 3 -> 1 + 2 -> the pair is split again; single items run on their own
+        self.assertEqual(self.runner.llm_service.call_model.call_count, 2)
+        self.assertEqual(self.runner.run_action.call_count, 3)
+        self.assertTrue(all(r.success for r in results.values()))
+
+if __name__ == "__main__":
+    unittest.main()
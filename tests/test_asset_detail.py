@@ -0,0 +1,62 @@
+import sys
+import os
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.catalog import CatalogService, split_heavy_tags
+from app.services.graph import ASSET_GRAPH_COLUMNS, SupabaseGraphService
+from catalog_fakes import PROJECT, FakeSupabase, deep_dive_result
+
+CONFIG = {"SqlCommand": "SELECT * FROM dbo.Orders",
+          "columns_metadata": [{"name": f"col{i}", "dataType": "wstr", "length": 50} for i in range(200)]}
+
+class TestAssetDetail(unittest.TestCase):
+    def test_split_heavy_tags(self):
+        slim, detail = split_heavy_tags({"package_id": "p", "original_config": {"a": 1}, "columns_metadata": []})
+        self.assertEqual(slim, {"package_id": "p"})
+        self.assertEqual(detail, {"original_config": {"a": 1}})
+        self.assertEqual(split_heavy_tags(None), ({}, {}))
+
+    def test_component_config_goes_to_asset_detail(self):
+        fake = FakeSupabase()
+        CatalogService(fake.client).sync_deep_dive_result(deep_dive_result(1, "SOURCE", CONFIG), PROJECT)
+
+        assets = next(params["p_assets"] for name, params in fake.calls if name == "upsert_assets")
+        self.assertNotIn("original_config", assets[0]["tags"])
+        self.assertIn("package_id", assets[0]["tags"])
+
+        detail_rows = [rows for name, rows in fake.writes if name == "asset_detail"]
+        self.assertTrue(detail_rows)
+        self.assertEqual(detail_rows[0][0]["asset_id"], assets[0]["asset_id"])
+        config = detail_rows[0][0]["detail"]["original_config"]
+        self.assertEqual(len(config["columns_metadata"]), 200)
+
+        # The graph-facing row is an order of magnitude smaller than the detail blob
+        self.assertGreater(len(json.dumps(detail_rows[0][0]["detail"])), 10 * len(json.dumps(assets[0]["tags"])))
+
+    def test_graph_queries_use_slim_projection(self):
+        client = MagicMock()
+        query = client.table.return_value
+        for method in ("select", "eq", "in_"):
+            getattr(query, method).return_value = query
+        query.execute.return_value = MagicMock(data=[])
+        with patch("app.services.supabase_client.get_service_client", return_value=client):
+            service = SupabaseGraphService()
+
+        service.get_graph_data(PROJECT)
+        service.get_graph_data(PROJECT, mode="PACKAGE", package_id="pkg-1")
+
+        selected = [c.args[0] for c in query.select.call_args_list]
+        self.assertNotIn("*", selected)
+        self.assertIn(ASSET_GRAPH_COLUMNS, selected)
+        query.eq.assert_any_call("tags->>package_id", "pkg-1")
+
+if __name__ == "__main__":
+    unittest.main()
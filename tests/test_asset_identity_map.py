@@ -0,0 +1,87 @@
+import sys
+import os
+import unittest
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.catalog import CatalogService
+from app.services.identity import AssetIdentityMap, asset_id_for, edge_id_for
+from catalog_fakes import PROJECT, FakeSupabase, extraction_result
+
+ORDERS = asset_id_for(PROJECT, "dbo.Orders", "TABLE")
+STAGE = asset_id_for(PROJECT, "stg.Orders", "TABLE")
+
+class TestAssetIdentityMap(unittest.TestCase):
+    def test_warm_load_pages_through_catalog(self):
+        legacy = "00000000-0000-0000-0000-000000000001"
+        assets = [{"asset_id": f"00000000-0000-0000-0000-00000000000{i}", "asset_type": "TABLE",
+                   "canonical_name": f"t{i}"} for i in range(1, 6)]
+        assets[0]["canonical_name"] = "dbo.Orders"
+        fake = FakeSupabase({"asset": assets, "edge_index": []})
+
+        identity = AssetIdentityMap(PROJECT.upper(), page_size=2).warm(fake.client)
+
+        self.assertEqual(len(identity.assets), 5)
+        self.assertTrue(identity.covers(PROJECT))
+        # The stored id wins over the computed one
+        self.assertEqual(identity.asset_id("dbo.Orders", "TABLE"), legacy)
+        self.assertEqual(identity.existing_asset_id("dbo.Orders", "TABLE"), legacy)
+        self.assertIsNone(identity.existing_asset_id("dbo.Missing", "TABLE"))
+        self.assertEqual(identity.asset_id("dbo.Missing", "TABLE"), asset_id_for(PROJECT, "dbo.Missing", "TABLE"))
+
+    def test_repeated_references_skip_reads_and_writes(self):
+        edge_id = edge_id_for(PROJECT, STAGE, ORDERS, "WRITES_TO")
+        fake = FakeSupabase({"asset": [], "edge_index": []})
+        catalog = CatalogService(fake.client)
+        catalog.begin_job(PROJECT)
+        warm_reads = fake.client.table.call_count
+
+        catalog.sync_extraction_result(extraction_result(), PROJECT)
+        catalog.sync_extraction_result(extraction_result(), PROJECT)
+
+        self.assertEqual(fake.client.table.call_count, warm_reads)
+        names = [name for name, _ in fake.calls]
+        self.assertEqual(names, ["upsert_assets", "upsert_edges", "bump_audit_stats"])
+        self.assertEqual(catalog.identity.stats, {"asset_writes_skipped": 2, "edge_writes_skipped": 1})
+        self.assertEqual(catalog.identity.existing_asset_id("dbo.Orders", "TABLE"), ORDERS)
+        self.assertEqual(catalog.identity.edge_id(STAGE, ORDERS, "WRITES_TO"), edge_id)
+
+        # Changed content is still written
+        fake.calls.clear()
+        catalog.sync_extraction_result(extraction_result((0.5,)), PROJECT)
+        self.assertEqual([name for name, _ in fake.calls], ["upsert_edges", "bump_audit_stats"])
+
+        catalog.end_job()
+        self.assertIsNone(catalog.identity)
+
+    def test_warm_loaded_edges_are_not_rewritten(self):
+        edge_id = edge_id_for(PROJECT, STAGE, ORDERS, "WRITES_TO")
+        fake = FakeSupabase({
+            "asset": [],
+            "edge_index": [{"edge_id": edge_id, "from_asset_id": STAGE, "to_asset_id": ORDERS, "edge_type": "WRITES_TO",
+                            "confidence": 0.9, "is_hypothesis": False, "extractor_id": "sqlglot"}],
+        })
+        catalog = CatalogService(fake.client)
+        catalog.begin_job(PROJECT)
+        catalog.sync_extraction_result(extraction_result(), PROJECT)
+
+        self.assertNotIn("upsert_edges", [name for name, _ in fake.calls])
+
+    def test_other_projects_bypass_the_map(self):
+        fake = FakeSupabase({"asset": [], "edge_index": []})
+        catalog = CatalogService(fake.client)
+        catalog.begin_job(PROJECT)
+        other = "11111111-2222-3333-4444-555555555555"
+
+        catalog.sync_extraction_result(extraction_result(), other)
+        catalog.sync_extraction_result(extraction_result(), other)
+
+        self.assertEqual([name for name, _ in fake.calls].count("upsert_assets"), 2)
+        self.assertEqual(catalog.identity.stats["asset_writes_skipped"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
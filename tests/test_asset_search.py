@@ -0,0 +1,104 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.asset_search import AssetSearchService, encode_cursor, decode_cursor
+
+def _rows(n, start=0):
+    return [{"asset_id": f"00000000-0000-0000-0000-{i:012d}", "name_display": f"table_{i:03d}", "asset_type": "TABLE"}
+            for i in range(start, start + n)]
+
+class TestAssetSearch(unittest.TestCase):
+    def setUp(self):
+        self.supabase = MagicMock()
+        self.rpc_results = {}
+        self.supabase.rpc.side_effect = lambda name, params: MagicMock(
+            execute=MagicMock(return_value=MagicMock(data=self.rpc_results[name](params)))
+        )
+        self.service = AssetSearchService(self.supabase, ttl_seconds=60)
+
+    def test_cursor_roundtrip(self):
+        cursor = encode_cursor("dbo.Orders, \"quoted\"", "abc")
+        self.assertEqual(decode_cursor(cursor), ("dbo.Orders, \"quoted\"", "abc"))
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_search_uses_keyset_rpc_and_estimate(self):
+        self.rpc_results = {"search_assets": lambda p: _rows(2), "estimate_asset_count": lambda p: 120000}
+
+        page = self.service.search("sol-1", type="ALL", search="  ord ", limit=2)
+
+        params = self.supabase.rpc.call_args_list[0][0][1]
+        self.assertEqual(self.supabase.rpc.call_args_list[0][0][0], "search_assets")
+        self.assertEqual(params["p_search"], "ord")
+        self.assertIsNone(params["p_type"])
+        self.assertIsNone(params["p_after_name"])
+        self.assertEqual(page["count"], 120000)
+        self.assertTrue(page["count_estimated"])
+        self.assertEqual(decode_cursor(page["next_cursor"]), ("table_001", "00000000-0000-0000-0000-000000000001"))
+
+        # Next page passes the cursor; count comes from the cache
+        self.rpc_results["search_assets"] = lambda p: _rows(1, start=2)
+        page2 = self.service.search("sol-1", search="ord", limit=2, cursor=page["next_cursor"])
+        params = self.supabase.rpc.call_args_list[-1][0][1]
+        self.assertEqual(params["p_after_name"], "table_001")
+        self.assertIsNone(page2["next_cursor"])
+        self.assertEqual([c[0][0] for c in self.supabase.rpc.call_args_list].count("estimate_asset_count"), 1)
+
+    def test_falls_back_to_postgrest_without_rpc(self):
+        def missing(p):
+            raise Exception("function search_assets does not exist")
+        self.rpc_results = {"search_assets": missing}
+        query = self.supabase.table.return_value.select.return_value
+        for method in ("eq", "ilike", "or_", "order", "limit", "range"):
+            getattr(query, method).return_value = query
+        query.execute.return_value = MagicMock(data=_rows(1), count=1)
+
+        page = self.service.search("sol-1", type="table", limit=5)
+
+        self.supabase.table.return_value.select.assert_called_with("*", count="estimated")
+        query.ilike.assert_called_with("asset_type", "table")
+        query.range.assert_called_with(0, 4)
+        self.assertEqual(page["count"], 1)
+        self.assertIsNone(page["next_cursor"])
+
+    def test_failed_rpc_is_retried_after_backoff(self):
+        calls = []
+
+        def flaky(p):
+            calls.append(p)
+            if len(calls) == 1:
+                raise Exception("canceling statement due to statement timeout")
+            return _rows(1)
+        self.rpc_results = {"search_assets": flaky, "estimate_asset_count": lambda p: 1}
+        query = self.supabase.table.return_value.select.return_value
+        for method in ("eq", "ilike", "or_", "order", "limit", "range"):
+            getattr(query, method).return_value = query
+        query.execute.return_value = MagicMock(data=_rows(1), count=1)
+
+        self.service.search("sol-1", search="x")  # RPC fails -> PostgREST
+        self.service.search("sol-1", search="x")  # within the back-off -> PostgREST
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(query.execute.call_count, 2)
+
+        self.service._rpc_retry_at -= 3600  # back-off elapsed
+        self.service.search("sol-1", search="x")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(query.execute.call_count, 2)
+
+    def test_asset_types_from_rpc(self):
+        self.rpc_results = {"get_asset_types": lambda p: [{"asset_type": "VIEW"}, {"asset_type": "TABLE"}]}
+        self.assertEqual(self.service.asset_types("sol-1"), ["TABLE", "VIEW"])
+        self.service.asset_types("sol-1")
+        self.assertEqual(self.supabase.rpc.call_count, 1)
+        self.supabase.table.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.auditor import DiscoveryAuditor
+from app.services.catalog import AuditStatsDelta, CatalogService
+
+def table_rows(rows_by_table):
+    """Mock supabase.table(name).select(...).eq(...).execute().data"""
+    def table(name):
+        t = MagicMock()
+        t.select.return_value.eq.return_value.execute.return_value = MagicMock(data=rows_by_table.get(name, []))
+        return t
+    return table
+
+class TestAuditMetrics(unittest.TestCase):
+    def test_report_from_rpc(self):
+        supabase = MagicMock()
+        supabase.rpc.return_value.execute.return_value = MagicMock(data={
+            "total_assets": 4, "package_count": 0, "edge_count": 2, "lineage_count": 2,
+            "confidence_sum": "3.0", "hypothesis_count": 1, "low_confidence_count": 1,
+            "functional_count": 3, "documented_count": 2, "orphan_count": 1,
+            "orphans": [{"name_display": "dbo.lonely", "asset_type": "TABLE"}],
+        })
+        report = DiscoveryAuditor(supabase).run_audit("p1")
+
+        supabase.table.assert_not_called()
+        self.assertEqual(report["metrics"]["total_relationships"], 4)
+        self.assertEqual(report["metrics"]["avg_confidence"], 0.75)
+        self.assertEqual(report["metrics"]["hypothesis_ratio"], 50.0)
+        self.assertEqual(report["metrics"]["coverage_score"], 66.67)
+        self.assertEqual([g["type"] for g in report["gaps"]], ["ORPHAN_ASSET", "LOW_CONFIDENCE_CLUSTER"])
+
+    def test_client_side_fallback_matches(self):
+        supabase = MagicMock()
+        supabase.rpc.side_effect = Exception("function audit_project_metrics does not exist")
+        supabase.table.side_effect = table_rows({
+            "asset": [
+                {"asset_id": "a", "asset_type": "table", "name_display": "a"},
+                {"asset_id": "b", "asset_type": "TABLE", "name_display": "b"},
+                {"asset_id": "c", "asset_type": "VIEW", "name_display": "c"},
+                {"asset_id": "f", "asset_type": "FILE", "name_display": "f"},
+            ],
+            "edge_index": [
+                {"from_asset_id": "a", "to_asset_id": "f", "confidence": 0.4, "is_hypothesis": True},
+                {"from_asset_id": "f", "to_asset_id": "a", "confidence": None, "is_hypothesis": False},
+            ],
+            "column_lineage": [{"source_asset_id": "b", "target_asset_id": None, "confidence": 1.0}],
+        })
+        auditor = DiscoveryAuditor(supabase)
+        m = auditor.get_project_metrics("p1")
+
+        self.assertEqual(m["documented_count"], 2)
+        self.assertEqual(m["orphans"], [{"name_display": "c", "asset_type": "VIEW"}])
+        self.assertEqual(m["low_confidence_count"], 1)
+        self.assertAlmostEqual(m["confidence_sum"], 2.4)
+        self.assertEqual(auditor.analyze_complexity("p1")["density"], 0.5)
+
+class TestIncrementalAuditStats(unittest.TestCase):
+    def test_delta_tracks_inserts_and_updates(self):
+        delta = AuditStatsDelta()
+        delta.asset_added("table")
+        delta.asset_added("COMPONENT_SOURCE")
+        delta.edge_added("a", "b", 0.4, True)
+        delta.edge_updated({"confidence": 0.4, "is_hypothesis": True}, 0.9, False)
+        delta.lineage_added("a", None, None)
+
+        self.assertEqual(delta.counters["asset_count"], 2)
+        self.assertEqual(delta.counters["functional_count"], 1)
+        self.assertEqual(delta.counters["edge_count"], 1)
+        self.assertEqual(delta.counters["hypothesis_count"], 0)
+        self.assertEqual(delta.counters["low_confidence_count"], 0)
+        self.assertAlmostEqual(delta.counters["confidence_sum"], 1.9)
+        self.assertEqual(delta.connected, {"a", "b"})
+
+    def test_flush_is_one_rpc_and_skips_empty(self):
+        supabase = MagicMock()
+        catalog = CatalogService(supabase)
+        catalog._flush_audit_stats("p1", AuditStatsDelta())
+        supabase.rpc.assert_not_called()
+
+        delta = AuditStatsDelta()
+        delta.edge_added("b", "a", 1.0, False)
+        catalog._flush_audit_stats("p1", delta)
+        name, params = supabase.rpc.call_args[0]
+        self.assertEqual(name, "bump_audit_stats")
+        self.assertEqual(params["p_connected_assets"], ["a", "b"])
+
+    def test_live_metrics_from_stats_row(self):
+        row = {"asset_count": 10, "functional_count": 4, "documented_count": 3, "package_count": 0,
+               "edge_count": 5, "lineage_count": 0, "confidence_sum": "4.5", "hypothesis_count": 0}
+        metrics = DiscoveryAuditor.compute_metrics(DiscoveryAuditor.counters_from_stats_row(row))
+        self.assertEqual(metrics["coverage_score"], 75.0)
+        self.assertEqual(metrics["avg_confidence"], 0.9)
+
+if __name__ == "__main__":
+    unittest.main()
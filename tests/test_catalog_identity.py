@@ -0,0 +1,65 @@
+import sys
+import os
+import uuid
+import unittest
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.catalog import CatalogService
+from app.services.identity import ASSET_NAMESPACE, asset_id_for, edge_id_for
+from catalog_fakes import PROJECT, FakeSupabase, extraction_result
+
+class TestCatalogIdentity(unittest.TestCase):
+    def test_ids_are_deterministic_uuid5(self):
+        a = asset_id_for(PROJECT, "dbo.Orders", "TABLE")
+        self.assertEqual(a, asset_id_for(PROJECT.upper(), "dbo.Orders", "TABLE"))
+        self.assertEqual(a, str(uuid.uuid5(ASSET_NAMESPACE, f"{PROJECT}|TABLE|dbo.Orders")))
+        self.assertEqual(uuid.UUID(a).version, 5)
+        self.assertNotEqual(a, asset_id_for(PROJECT, "dbo.Orders", "VIEW"))
+        self.assertEqual(edge_id_for(PROJECT, a, a, "X"), edge_id_for(PROJECT, a.upper(), a, "X"))
+
+    def test_sync_is_blind_batched_upsert(self):
+        fake = FakeSupabase()
+        node_map = CatalogService(fake.client).sync_extraction_result(extraction_result((0.9, 0.4)), PROJECT)
+        calls = fake.calls
+
+        # No reads: asset/edge ids are computed locally
+        fake.client.table.assert_not_called()
+        self.assertEqual(node_map["n1"], node_map["n3"])
+        self.assertEqual(node_map["n1"], asset_id_for(PROJECT, "dbo.Orders", "TABLE"))
+
+        names = [name for name, _ in calls]
+        self.assertEqual(names, ["upsert_assets", "upsert_edges", "bump_audit_stats"])
+        self.assertEqual(len(calls[0][1]["p_assets"]), 2)
+        edges = calls[1][1]["p_edges"]
+        self.assertEqual(len(edges), 1) # same (from, to, type): last one wins
+        self.assertEqual(edges[0]["confidence"], 0.4)
+
+        delta = calls[2][1]["p_delta"]
+        self.assertEqual(delta["asset_count"], 2)
+        self.assertEqual(delta["edge_count"], 1)
+        self.assertEqual(delta["low_confidence_count"], 1)
+
+    def test_rerun_updates_without_counting_again(self):
+        fake = FakeSupabase(rpc_results={
+            "upsert_assets": lambda p: [{"asset_id": r["asset_id"], "asset_type": r["asset_type"], "inserted": False}
+                                        for r in p["p_assets"]],
+            "upsert_edges": lambda p: [{"edge_id": r["edge_id"], "inserted": False,
+                                        "old_confidence": 0.9, "old_is_hypothesis": False} for r in p["p_edges"]],
+        })
+        CatalogService(fake.client).sync_extraction_result(extraction_result((0.9, 0.4)), PROJECT)
+        calls = fake.calls
+
+        delta = calls[-1][1]["p_delta"]
+        self.assertEqual(calls[-1][0], "bump_audit_stats")
+        self.assertEqual(delta["asset_count"], 0)
+        self.assertEqual(delta["edge_count"], 0)
+        self.assertAlmostEqual(delta["confidence_sum"], -0.5)
+        self.assertEqual(delta["low_confidence_count"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
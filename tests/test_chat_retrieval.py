@@ -0,0 +1,93 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.chat_retrieval import GraphContextRetriever, GraphIndex, tokenize
+
+def _node(node_id, label, type="table", **data):
+    return {"id": node_id, "data": {"label": label, "type": type, "system": "SQLSRV", **data}}
+
+def _edge(source, target, label="READS_FROM"):
+    return {"id": f"{source}-{target}", "source": source, "target": target, "label": label}
+
+GRAPH = {
+    "nodes": [
+        _node("orders", "dbo.SalesOrders", columns=[{"name": "order_id"}, {"name": "customer_id"}]),
+        _node("load", "LoadSalesOrders", type="process"),
+        _node("staging", "stg_orders_raw"),
+        _node("hr", "dbo.Employees", tags={"domain": "payroll"}),
+        _node("hr_load", "LoadEmployees", type="process"),
+    ],
+    "edges": [
+        _edge("load", "orders", "WRITES_TO"),
+        _edge("load", "staging"),
+        _edge("hr_load", "hr", "WRITES_TO"),
+    ],
+}
+
+class TestChatRetrieval(unittest.TestCase):
+    def test_tokenize_splits_identifiers(self):
+        terms = tokenize("Where is dbo.SalesOrders loaded?")
+        self.assertIn("salesorders", terms)
+        self.assertIn("sales", terms)
+        self.assertIn("orders", terms)
+        self.assertNotIn("where", terms)
+
+    def test_search_ranks_name_matches_first(self):
+        index = GraphIndex(GRAPH)
+        hits = [node_id for node_id, _ in index.search("SalesOrders", top_k=3)]
+        self.assertEqual(hits[0], "orders")
+        self.assertNotIn("hr", hits)
+
+    def test_tags_and_columns_are_searchable(self):
+        index = GraphIndex(GRAPH)
+        self.assertEqual(index.search("payroll", top_k=1)[0][0], "hr")
+        self.assertEqual(index.search("customer_id", top_k=1)[0][0], "orders")
+
+    def test_context_expands_neighborhood_only(self):
+        ctx = GraphContextRetriever.build_context(GraphIndex(GRAPH), "What feeds SalesOrders?")
+
+        self.assertIn("orders", ctx.seed_ids)
+        self.assertIn("load", ctx.node_ids)      # 1 hop
+        self.assertIn("staging", ctx.node_ids)   # 2 hops
+        self.assertNotIn("hr", ctx.node_ids)     # disconnected, no keyword match
+        self.assertIn("LoadSalesOrders -[WRITES_TO]-> dbo.SalesOrders", ctx.text)
+        self.assertEqual(ctx.total_nodes, 5)
+
+    def test_token_budget_is_respected(self):
+        big = {
+            "nodes": [_node(f"n{i}", f"orders_table_{i}", summary="x " * 200) for i in range(200)],
+            "edges": [_edge(f"n{i}", f"n{i + 1}") for i in range(199)],
+        }
+        ctx = GraphContextRetriever.build_context(GraphIndex(big), "orders", max_tokens=500)
+
+        self.assertLessEqual(ctx.tokens, 500)
+        self.assertLess(len(ctx.node_ids), 200)
+        self.assertGreater(len(ctx.node_ids), 0)
+
+    def test_no_match_falls_back_to_hubs(self):
+        ctx = GraphContextRetriever.build_context(GraphIndex(GRAPH), "give me an overview")
+        self.assertIn("load", ctx.seed_ids)
+
+    def test_index_is_cached_per_solution(self):
+        graph_service = MagicMock()
+        graph_service.get_graph_data.return_value = GRAPH
+        retriever = GraphContextRetriever(graph_service, ttl_seconds=60)
+
+        retriever.retrieve("s1", "orders")
+        retriever.retrieve("s1", "employees")
+        self.assertEqual(graph_service.get_graph_data.call_count, 1)
+
+        retriever.invalidate("s1")
+        retriever.retrieve("s1", "orders")
+        self.assertEqual(graph_service.get_graph_data.call_count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import sys
+import os
+import unittest
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.chunking import ContentChunker, estimate_tokens, merge_extraction_results
+
+class TestContentChunker(unittest.TestCase):
+    def test_small_content_is_single_chunk(self):
+        self.assertEqual(ContentChunker.split("SELECT 1;", "a.sql", 1000), ["SELECT 1;"])
+
+    def test_sql_splits_on_statements(self):
+        statements = [f"INSERT INTO dbo.target_{i} SELECT * FROM dbo.source_{i};\n" for i in range(200)]
+        content = "".join(statements)
+        chunks = ContentChunker.split(content, "load.sql", 300)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks).strip(), content.strip())
+        for chunk in chunks:
+            self.assertTrue(chunk.rstrip().endswith(";"))
+            self.assertLessEqual(estimate_tokens(chunk), 300)
+
+    def test_sql_ignores_semicolons_in_strings_and_go_batches(self):
+        content = "SELECT 'a;b' AS x;\nGO\n-- comment; here\nSELECT 2;"
+        statements = ContentChunker.split_sql_statements(content)
+        self.assertEqual(len(statements), 2)
+        self.assertIn("'a;b'", statements[0])
+
+    def test_ssis_splits_on_executables(self):
+        executable = '<DTS:Executable DTS:ObjectName="Task{i}">' + "<x/>" * 200 + "</DTS:Executable>\n"
+        content = "<DTS:Executables>\n" + "".join(executable.format(i=i) for i in range(20)) + "</DTS:Executables>"
+        chunks = ContentChunker.split(content, "pkg.dtsx", 1000)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), content)
+        for chunk in chunks[1:]:
+            self.assertTrue(chunk.startswith("<DTS:Executable "))
+
+    def test_merge_deduplicates(self):
+        part_a = {
+            "nodes": [{"node_id": "t1", "name": "t1", "node_type": "table", "system": None}],
+            "edges": [{"from_node_id": "t1", "to_node_id": "t2", "edge_type": "READS_FROM"}],
+            "evidences": [{"evidence_id": "e1", "snippet": "x"}],
+            "assumptions": ["a"],
+        }
+        part_b = {
+            "nodes": [{"node_id": "t1", "name": "t1", "node_type": "table", "system": "sql"},
+                      {"node_id": "t2", "name": "t2", "node_type": "table"}],
+            "edges": [{"from_node_id": "t1", "to_node_id": "t2", "edge_type": "reads_from"}],
+            "evidences": [{"evidence_id": "e1", "snippet": "x"}],
+            "assumptions": ["a", {"k": 1}],
+        }
+        merged = merge_extraction_results([part_a, part_b])
+
+        self.assertEqual([n["node_id"] for n in merged["nodes"]], ["c0_t1", "c1_t2"])
+        self.assertEqual(merged["nodes"][0]["system"], "sql")
+        self.assertEqual(len(merged["edges"]), 2)  # chunk 0 never defined its t2
+        self.assertEqual(merged["edges"][1]["from_node_id"], "c0_t1")
+        self.assertEqual(len(merged["evidences"]), 1)
+        self.assertEqual(merged["assumptions"], ["a", {"k": 1}])
+
+    def test_merge_keeps_chunk_local_node_ids_apart(self):
+        # Both chunks call their first node "n1", but they are different tables
+        part_a = {
+            "nodes": [{"node_id": "n1", "name": "dbo.Orders", "node_type": "table"},
+                      {"node_id": "n2", "name": "stg.Orders", "node_type": "table"}],
+            "edges": [{"from_node_id": "n2", "to_node_id": "n1", "edge_type": "WRITES_TO"}],
+        }
+        part_b = {
+            "nodes": [{"node_id": "n1", "name": "dbo.Customers", "node_type": "table"},
+                      {"node_id": "n2", "name": "DBO.ORDERS", "node_type": "TABLE"}],
+            "edges": [{"from_node_id": "n2", "to_node_id": "n1", "edge_type": "READS_FROM"}],
+        }
+        merged = merge_extraction_results([part_a, part_b])
+
+        names = {n["node_id"]: n["name"] for n in merged["nodes"]}
+        self.assertEqual(names, {"c0_n1": "dbo.Orders", "c0_n2": "stg.Orders", "c1_n1": "dbo.Customers"})
+        edges = [(names[e["from_node_id"]], names[e["to_node_id"]]) for e in merged["edges"]]
+        self.assertEqual(edges, [("stg.Orders", "dbo.Orders"), ("dbo.Orders", "dbo.Customers")])
+        # A single part keeps its ids
+        self.assertEqual(merge_extraction_results([part_a])["nodes"][0]["node_id"], "n1")
+
+    def test_merge_keeps_evidence_refs_per_chunk(self):
+        # Both chunks call their first evidence "ev1"
+        nodes = [{"node_id": "t1", "name": "t1", "node_type": "table"}, {"node_id": "t2", "name": "t2", "node_type": "table"}]
+        part_a = {
+            "nodes": nodes,
+            "edges": [{"from_node_id": "t1", "to_node_id": "t2", "edge_type": "READS_FROM", "evidence_refs": ["ev1"]}],
+            "evidences": [{"evidence_id": "ev1", "locator": {"file": "f.sql", "line_start": 3}, "snippet": "FROM t1"}],
+        }
+        part_b = {
+            "nodes": nodes + [{"node_id": "t3", "name": "t3", "node_type": "table"}],
+            "edges": [{"from_node_id": "t2", "to_node_id": "t3", "edge_type": "WRITES_TO", "evidence_refs": ["ev1"]},
+                      {"from_node_id": "t1", "to_node_id": "t2", "edge_type": "READS_FROM", "evidence_refs": ["ev2"]}],
+            "evidences": [{"evidence_id": "ev1", "locator": {"file": "f.sql", "line_start": 90}, "snippet": "INTO t3"},
+                          {"evidence_id": "ev2", "locator": {"file": "f.sql", "line_start": 3}, "snippet": "FROM t1"}],
+        }
+        merged = merge_extraction_results([part_a, part_b])
+
+        evidences = {ev["evidence_id"]: ev["snippet"] for ev in merged["evidences"]}
+        self.assertEqual(evidences, {"c0_ev1": "FROM t1", "c1_ev1": "INTO t3"})
+        refs = {(e["from_node_id"], e["to_node_id"]): e["evidence_refs"] for e in merged["edges"]}
+        self.assertEqual(refs[("c0_t2", "c1_t3")], ["c1_ev1"])
+        # Duplicate edge and duplicate evidence collapse onto the first copy
+        self.assertEqual(refs[("c0_t1", "c0_t2")], ["c0_ev1"])
+        self.assertEqual(part_a["edges"][0]["evidence_refs"], ["ev1"])
+
+    def test_token_estimate_uses_model_encoding(self):
+        from app.services import chunking
+        self.assertEqual(chunking._encoding_name("openai/gpt-4o-mini"), "o200k_base")
+        self.assertEqual(chunking._encoding_name("llama-3.3-70b-versatile"), chunking.DEFAULT_ENCODING)
+        self.assertEqual(chunking._encoding_name(None), chunking.DEFAULT_ENCODING)
+
+if __name__ == "__main__":
+    unittest.main()
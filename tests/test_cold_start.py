@@ -0,0 +1,27 @@
+import sys
+import os
+import subprocess
+import unittest
+from dotenv import load_dotenv
+
+load_dotenv()
+
+API_DIR = os.path.join(os.getcwd(), "apps", "api")
+HEAVY = ("langchain_openai", "langchain_core", "neo4j", "sqlglot", "git", "fpdf", "pyarrow")
+
+def _loaded_heavy_packages(module):
+    code = f"import sys, {module}; print(','.join(p for p in {HEAVY!r} if p in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=API_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise AssertionError(proc.stderr[-2000:])
+    return [p for p in proc.stdout.strip().split(",") if p]
+
+class TestColdStart(unittest.TestCase):
+    def test_api_does_not_import_heavy_clients(self):
+        self.assertEqual(_loaded_heavy_packages("app.main"), [])
+
+    def test_worker_does_not_import_heavy_clients(self):
+        self.assertEqual(_loaded_heavy_packages("app.worker"), [])
+
+if __name__ == "__main__":
+    unittest.main()
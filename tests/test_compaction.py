@@ -0,0 +1,80 @@
+import sys
+import os
+import json
+import unittest
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.compaction import compact_ssis_xml, compact_dsx, compact_structure, compaction_stats
+
+SSIS_SAMPLE = """<?xml version="1.0"?>
+<DTS:Executable xmlns:DTS="www.microsoft.com/SqlServer/Dts"
+  DTS:DTSID="{2E4C234C-7B78-415E-BC3C-154F36BF1D60}"
+  DTS:CreatorComputerName="HOST"
+  DTS:ObjectName="Package">
+  <!-- designer comment -->
+  <DTS:Executables>
+    <DTS:Executable DTS:ObjectName="Load" DTS:refId="Package\\Load">
+      <outputColumn refId="Package\\Load\\Src.Outputs[OLE DB Source Output].Columns[A]" lineageId="Package\\Load\\Src.Outputs[OLE DB Source Output].Columns[A]" name="A" />
+      <output name="Error" isErrorOut="true"><outputColumn name="ErrorCode" /></output>
+    </DTS:Executable>
+  </DTS:Executables>
+  <DTS:DesignTimeProperties><![CDATA[<Objects><Layout Size="10,10" /></Objects>]]></DTS:DesignTimeProperties>
+</DTS:Executable>"""
+
+class TestCompaction(unittest.TestCase):
+    def test_ssis_noise_is_removed_and_paths_aliased(self):
+        compacted, legend = compact_ssis_xml(SSIS_SAMPLE)
+
+        self.assertNotIn("DTSID", compacted)
+        self.assertNotIn("CreatorComputerName", compacted)
+        self.assertNotIn("DesignTimeProperties", compacted)
+        self.assertNotIn("designer comment", compacted)
+        self.assertNotIn("ErrorCode", compacted)
+        self.assertIn('DTS:ObjectName="Load"', compacted)
+        self.assertEqual(legend, {"@P1": "Package\\Load\\Src.Outputs[OLE DB Source Output]"})
+        self.assertIn('lineageId="@P1.Columns[A]"', compacted)
+
+    def test_ssis_keeps_declaration_and_sql_text(self):
+        xml = ('<?xml version="1.0"?>\n<component version="7" name="Src">\n'
+               '  <property name="SqlCommand">SELECT a\n-- legacy filter\nFROM dbo.Orders</property>\n'
+               '  <property name="SqlCommandVariable" expression="@[User::Where] &gt; 0\n-- note\nAND x"/>\n</component>')
+        compacted, _ = compact_ssis_xml(xml)
+
+        self.assertTrue(compacted.startswith('<?xml version="1.0"?>'))
+        self.assertIn('<component name="Src">', compacted)
+        self.assertIn("SELECT a\n-- legacy filter\nFROM dbo.Orders", compacted)
+        self.assertIn('expression="@[User::Where] &gt; 0\n-- note\nAND x"', compacted)
+
+    def test_dsx_layout_is_removed(self):
+        dsx = 'BEGIN DSJOB\n   Identifier "Job1"\n   StageXPos "10"\n   StageYPos "20"\n   OrchestrateCode =+=+=+=\nbinary\n=+=+=+=\n   TableName "dbo.t"\nEND DSJOB'
+        compacted = compact_dsx(dsx)
+        self.assertEqual(compacted, 'BEGIN DSJOB\nIdentifier "Job1"\nTableName "dbo.t"\nEND DSJOB')
+
+    def test_structure_repeated_columns_become_references(self):
+        cols = ["id", "name", "amount"]
+        structure = {
+            "name": "pkg",
+            "description": "",
+            "control_flow": [
+                {"name": "a", "outputs": [{"name": "o", "columns": cols}]},
+                {"name": "b", "outputs": [{"name": "o", "columns": list(cols)}]},
+            ],
+        }
+        data = json.loads(compact_structure(structure))
+
+        self.assertNotIn("description", data)
+        self.assertEqual(data["column_sets"], {"C1": cols})
+        self.assertEqual(data["control_flow"][1]["outputs"][0]["columns"], {"$ref": "C1"})
+
+    def test_stats(self):
+        stats = compaction_stats(SSIS_SAMPLE, compact_ssis_xml(SSIS_SAMPLE)[0])
+        self.assertGreater(stats["tokens_saved"], 0)
+        self.assertEqual(stats["original_tokens"] - stats["compacted_tokens"], stats["tokens_saved"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import sys
+import os
+import unittest
+from unittest.mock import patch
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.catalog import CatalogService
+from app.services.identity import asset_id_for
+from catalog_fakes import PROJECT, FakeSupabase, deep_dive_result
+
+class TestDeepDiveBulkSync(unittest.TestCase):
+    def test_each_table_is_written_in_chunks(self):
+        fake = FakeSupabase()
+        with patch("app.services.catalog.UPSERT_CHUNK_SIZE", 2):
+            CatalogService(fake.client).sync_deep_dive_result(deep_dive_result(5), PROJECT)
+        writes = fake.writes
+
+        sizes = {}
+        for name, rows in writes:
+            if isinstance(rows, list):
+                sizes.setdefault(name, []).append(len(rows))
+        self.assertEqual(sizes["package_component"], [2, 2, 1])
+        self.assertEqual(sizes["transformation_ir"], [2, 2, 1])
+        self.assertEqual(sizes["column_lineage"], [2, 2])
+
+        # FK order: components before IR before lineage
+        order = [name for name, _ in writes]
+        self.assertLess(order.index("package_component"), order.index("transformation_ir"))
+        self.assertLess(order.index("transformation_ir"), order.index("column_lineage"))
+        self.assertEqual(order[0], "package")
+        self.assertEqual(order[-1], "rpc:bump_audit_stats")
+
+    def test_lineage_references_bridged_assets(self):
+        fake = FakeSupabase()
+        CatalogService(fake.client).sync_deep_dive_result(deep_dive_result(3), PROJECT)
+        writes = fake.writes
+
+        lineage = [row for name, rows in writes if name == "column_lineage" for row in rows]
+        first = asset_id_for(PROJECT, "LoadSales:C0", "COMPONENT_TRANSFORM")
+        second = asset_id_for(PROJECT, "LoadSales:C1", "COMPONENT_TRANSFORM")
+        self.assertEqual((lineage[0]["source_asset_id"], lineage[0]["target_asset_id"]), (first, second))
+
+        edges = next(params["p_edges"] for name, params in writes if name == "rpc:upsert_edges")
+        self.assertEqual(len(edges), 2)
+        self.assertEqual(edges[0]["from_asset_id"], first)
+
+if __name__ == "__main__":
+    unittest.main()
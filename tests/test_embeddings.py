@@ -0,0 +1,111 @@
+import sys
+import os
+import math
+import unittest
+from unittest.mock import MagicMock
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.embeddings import EmbeddingPipeline, HashEmbedder, content_hash
+
+EVIDENCE = [
+    {"evidence_id": "e1", "file_path": "a.sql", "snippet": "INSERT INTO dbo.Orders SELECT * FROM stg.Orders"},
+    {"evidence_id": "e2", "file_path": "b.sql", "snippet": "INSERT INTO dbo.Orders SELECT * FROM stg.Orders"},
+    {"evidence_id": "e3", "file_path": "c.sql", "snippet": "   "},
+]
+ASSETS = [
+    {"asset_id": "a1", "asset_type": "table", "name_display": "dbo.Orders", "system": "SQLSRV",
+     "tags": {"description": "Sales orders"}},
+]
+
+def _supabase(existing_hashes=(), evidence=EVIDENCE):
+    """Mock client: keyset pages for evidence/asset, `existing_hashes` already in code_embeddings"""
+    supabase = MagicMock()
+    tables = {}
+
+    def table(name):
+        if name not in tables:
+            t = MagicMock()
+            query = t.select.return_value
+            for method in ("eq", "gt", "order", "limit", "in_"):
+                getattr(query, method).return_value = query
+            if name == "evidence":
+                query.execute.side_effect = [MagicMock(data=evidence), MagicMock(data=[])]
+            elif name == "asset":
+                query.execute.side_effect = [MagicMock(data=ASSETS), MagicMock(data=[])]
+            else:
+                query.execute.return_value = MagicMock(data=[{"content_hash": h} for h in existing_hashes])
+            tables[name] = t
+        return tables[name]
+
+    supabase.table.side_effect = table
+    return supabase, tables
+
+class TestEmbeddings(unittest.TestCase):
+    def test_hash_embedder_is_deterministic_and_normalized(self):
+        embedder = HashEmbedder(dim=64)
+        a = embedder.embed_query("dbo.Orders sales")
+        self.assertEqual(a, embedder.embed_query("dbo.Orders sales"))
+        self.assertEqual(len(a), 64)
+        self.assertAlmostEqual(math.sqrt(sum(v * v for v in a)), 1.0)
+
+    def test_batches_dedupe_and_bulk_insert(self):
+        supabase, tables = _supabase()
+        embedder = HashEmbedder(dim=16)
+        embedder.embed_documents = MagicMock(side_effect=lambda texts: [[1.0] * 16 for _ in texts])
+
+        stats = EmbeddingPipeline(supabase, embedder, batch_size=100).embed_project("p1")
+
+        # Empty snippet skipped, duplicate snippet embedded once, one request for the batch
+        self.assertEqual(stats["items"], 3)
+        self.assertEqual(stats["embedded"], 2)
+        self.assertEqual(embedder.embed_documents.call_count, 1)
+        rows = tables["code_embeddings"].upsert.call_args[0][0]
+        self.assertEqual({r["source_kind"] for r in rows}, {"evidence", "asset"})
+        self.assertIn("Sales orders", [r for r in rows if r["source_kind"] == "asset"][0]["snippet"])
+        self.assertEqual(tables["code_embeddings"].upsert.call_args[1]["on_conflict"], "project_id,model,content_hash")
+
+    def test_already_embedded_hashes_are_skipped(self):
+        existing = [content_hash(EVIDENCE[0]["snippet"]),
+                    content_hash(EmbeddingPipeline.asset_text(ASSETS[0]))]
+        supabase, tables = _supabase(existing)
+        embedder = HashEmbedder(dim=16)
+        embedder.embed_documents = MagicMock()
+
+        stats = EmbeddingPipeline(supabase, embedder).embed_project("p1")
+
+        self.assertEqual(stats["embedded"], 0)
+        self.assertEqual(stats["cached"], 3)
+        embedder.embed_documents.assert_not_called()
+        tables["code_embeddings"].upsert.assert_not_called()
+
+    def test_evidence_embeddings_keep_only_the_snippet_hash(self):
+        evidence = [dict(EVIDENCE[0], snippet_hash="h1")]
+        supabase, tables = _supabase(evidence=evidence)
+        embedder = HashEmbedder(dim=16)
+
+        EmbeddingPipeline(supabase, embedder).embed_project("p1")
+
+        rows = tables["code_embeddings"].upsert.call_args[0][0]
+        by_kind = {r["source_kind"]: r for r in rows}
+        self.assertEqual((by_kind["evidence"]["snippet"], by_kind["evidence"]["snippet_hash"]), (None, "h1"))
+        self.assertIn("Sales orders", by_kind["asset"]["snippet"])
+
+    def test_search_calls_match_rpc(self):
+        supabase = MagicMock()
+        supabase.rpc.return_value.execute.return_value = MagicMock(data=[{"id": "x", "similarity": 0.9}])
+
+        results = EmbeddingPipeline(supabase, HashEmbedder(dim=8)).search("p1", "orders", limit=5)
+
+        self.assertEqual(results[0]["id"], "x")
+        name, params = supabase.rpc.call_args[0]
+        self.assertEqual(name, "match_code_embeddings")
+        self.assertEqual(params["p_match_count"], 5)
+        self.assertEqual(len(params["p_query"]), 8)
+
+if __name__ == "__main__":
+    unittest.main()
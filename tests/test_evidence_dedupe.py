@@ -0,0 +1,61 @@
+import sys
+import os
+import unittest
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.models.extraction import Evidence, Locator, evidence_hash
+from app.services.catalog import CatalogService
+from app.services.extractors.regex import RegexExtractor
+
+from catalog_fakes import PROJECT, FakeSupabase
+
+SCRIPT = "import os\nimport pandas as pd\nfrom app.services import catalog\n"
+
+class TestEvidenceDedupe(unittest.TestCase):
+    def test_hash_is_derived_from_content(self):
+        locator = Locator(file="load.sql", line_start=3, line_end=4)
+        ev = Evidence(evidence_id="e1", kind="code", locator=locator, snippet="INSERT INTO t", hash="sha256_del_snippet")
+        self.assertEqual(ev.hash, evidence_hash(locator, "INSERT INTO t"))
+        self.assertEqual(len(ev.hash), 64)
+        self.assertEqual(ev.hash, Evidence(evidence_id="other", kind="code", locator=locator, snippet="INSERT INTO t").hash)
+        moved = Locator(file="load.sql", line_start=5, line_end=6)
+        self.assertNotEqual(ev.hash, evidence_hash(moved, "INSERT INTO t"))
+
+    def test_extractor_evidence_is_hashed(self):
+        result = RegexExtractor().extract("etl/job.py", SCRIPT)
+        self.assertTrue(result.evidences)
+        self.assertTrue(all(ev.hash for ev in result.evidences))
+
+    def test_rerun_leaves_evidence_table_unchanged(self):
+        fake = FakeSupabase()
+        sizes = []
+        for _ in range(3):
+            # Fresh extraction each run: new local ids, same content
+            result = RegexExtractor().extract("etl/job.py", SCRIPT)
+            result.meta["source_file"] = "etl/job.py"
+            CatalogService(fake.client).sync_extraction_result(result, PROJECT)
+            sizes.append((len(fake.rows("evidence")), len(fake.rows("edge_evidence"))))
+
+        self.assertEqual(sizes[0], sizes[-1])
+        self.assertEqual(sizes[0][0], len(result.evidences))
+
+    def test_existing_rows_keep_their_id(self):
+        fake = FakeSupabase()
+        result = RegexExtractor().extract("etl/job.py", SCRIPT)
+        result.meta["source_file"] = "etl/job.py"
+        legacy = "00000000-0000-0000-0000-0000000000aa"
+        ev = result.evidences[0]
+        fake.rows("evidence").append({"evidence_id": legacy, "project_id": PROJECT, "file_path": "etl/job.py", "hash": ev.hash})
+
+        CatalogService(fake.client).sync_extraction_result(result, PROJECT)
+
+        linked = {row["evidence_id"] for row in fake.rows("edge_evidence")}
+        self.assertIn(legacy, linked)
+
+if __name__ == "__main__":
+    unittest.main()
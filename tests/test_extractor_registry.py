@@ -0,0 +1,61 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.extractors import registry as registry_module
+from app.services.extractors.registry import ExtractorRegistry, get_extractor_registry, register_extractor
+from app.services.llm import LLMService, get_llm_service
+
+class TestExtractorRegistry(unittest.TestCase):
+    def test_extractors_are_built_lazily_and_reused(self):
+        factory = MagicMock(side_effect=lambda: MagicMock(name="sql_extractor"))
+        with patch.dict(registry_module._FACTORIES, {"sql": factory}):
+            registry = ExtractorRegistry()
+            factory.assert_not_called()
+
+            first = registry.get_extractor("a/b/Load.SQL")
+            second = registry.get_extractor("c.sql")
+
+            self.assertIs(first, second)
+            factory.assert_called_once()
+
+    def test_llm_extractor_not_built_for_sql_files(self):
+        with patch.dict(registry_module._FACTORIES, {"llm": MagicMock()}) as factories:
+            ExtractorRegistry().get_extractor("x.sql")
+            factories["llm"].assert_not_called()
+
+    def test_unknown_extensions_use_default(self):
+        llm = MagicMock()
+        with patch.dict(registry_module._FACTORIES, {"llm": lambda: llm}):
+            self.assertIs(ExtractorRegistry().get_extractor("script.py"), llm)
+
+    def test_register_plugin_by_extension(self):
+        plugin = MagicMock()
+        with patch.dict(registry_module._FACTORIES), patch.dict(registry_module._EXTENSIONS):
+            register_extractor("dbt", lambda: plugin, ["json", ".YML"])
+            registry = ExtractorRegistry()
+            self.assertIs(registry.get_extractor("manifest.json"), plugin)
+            self.assertIs(registry.get_extractor("schema.yml"), plugin)
+
+    def test_singletons(self):
+        self.assertIs(get_extractor_registry(), get_extractor_registry())
+        self.assertIs(get_llm_service(), get_llm_service())
+
+    def test_llm_service_clients_are_lazy(self):
+        with patch("app.services.llm.ChatOpenAI") as chat, patch("app.services.llm.OpenAIEmbeddings") as emb:
+            service = LLMService()
+            chat.assert_not_called()
+            service.llm
+            service.llm
+            chat.assert_called_once()
+            emb.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import sys
+import os
+import csv
+import io
+import json
+import gzip
+import unittest
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.governance_service import GovernanceExportService, gzip_stream
+
+class FakeQuery:
+    """Minimal PostgREST builder over in-memory rows (eq / is_ / gt / order / limit)"""
+    def __init__(self, db, table):
+        self.db, self.table = db, table
+        self.filters, self.order_key, self.row_limit = [], None, None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda r: r.get(column) == value)
+        return self
+
+    def is_(self, column, value):
+        self.filters.append(lambda r: r.get(column) is None)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda r: r[column] > value)
+        return self
+
+    def order(self, column):
+        self.order_key = column
+        return self
+
+    def limit(self, n):
+        self.row_limit = n
+        return self
+
+    def execute(self):
+        self.db.calls.append(self.table)
+        rows = [r for r in self.db.tables.get(self.table, []) if all(f(r) for f in self.filters)]
+        rows.sort(key=lambda r: r[self.order_key])
+        result = type("Result", (), {})()
+        result.data = rows[:self.row_limit]
+        return result
+
+class FakeSupabase:
+    def __init__(self, tables):
+        self.tables = tables
+        self.calls = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+def _asset(i, system="SQLSRV", asset_type="table", project="p1"):
+    return {"asset_id": f"a{i:03d}", "project_id": project, "asset_type": asset_type, "system": system,
+            "name_display": f"T{i}", "canonical_name": f"db.T{i}"}
+
+class TestGovernanceExport(unittest.TestCase):
+    def setUp(self):
+        assets = [_asset(i) for i in range(7)] + [_asset(7, system=None), _asset(8, asset_type="view"),
+                                                   _asset(9, project="other")]
+        self.db = FakeSupabase({
+            "asset": assets,
+            "edge_index": [{"edge_id": f"e{i}", "project_id": "p1"} for i in range(3)],
+            "package": [],
+            "column_lineage": [{"lineage_id": f"l{i}", "project_id": "p1", "source_column": "a", "target_column": "b",
+                                "transformation_rule": "copy", "source_asset": {"name_display": "S"}, "target_asset": None}
+                               for i in range(4)],
+        })
+        self.service = GovernanceExportService(self.db, page_size=3)
+
+    def test_purview_pages_through_all_assets(self):
+        chunks = list(self.service.iter_purview_csv("p1"))
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+
+        self.assertEqual(len(rows), 9)
+        self.assertEqual(rows[0]["Qualified Name"], "db.T0")
+        # header + 3 pages; 4 keyset queries (the last one returns nothing)
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(self.db.calls.count("asset"), 4)
+
+    def test_unity_catalog_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.service.export_for_unity_catalog("p1"))))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["Source Table"], "S")
+        self.assertEqual(rows[0]["Target Table"], "Unknown")
+        self.assertEqual(rows[0]["Transformation"], "copy")
+
+    def test_dbt_groups_tables_by_system(self):
+        yml = self.service.export_for_dbt("p1")
+        self.assertTrue(yml.startswith("version: 2\nsources:"))
+        self.assertIn("  - name: SQLSRV\n    tables:", yml)
+        self.assertIn("  - name: external_source\n    tables:\n      - name: T7", yml)
+        self.assertNotIn("T8", yml)
+        self.assertEqual(yml.count("      - name: "), 8)
+
+    def test_dbt_without_tables(self):
+        self.assertEqual(self.service.export_for_dbt("missing"), "version: 2\nsources: []")
+
+    def test_raw_json_is_valid(self):
+        data = json.loads(self.service.export_raw_json("p1"))
+        self.assertEqual(len(data["assets"]), 9)
+        self.assertEqual(len(data["edges"]), 3)
+        self.assertEqual(data["packages"], [])
+        self.assertEqual(len(data["lineage"]), 4)
+
+    def test_gzip_stream_roundtrip(self):
+        text = self.service.export_raw_json("p1")
+        compressed = b"".join(gzip_stream(self.service.iter_raw_json("p1")))
+        self.assertEqual(gzip.decompress(compressed).decode("utf-8"), text)
+
+if __name__ == "__main__":
+    unittest.main()
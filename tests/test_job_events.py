@@ -0,0 +1,138 @@
+import sys
+import os
+import json
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.events import JobEventBus, snapshot_event
+
+class _StopListener(BaseException):
+    """Escapes the listener's reconnect loop (it only catches Exception)"""
+
+class TestJobEventBus(unittest.TestCase):
+    def setUp(self):
+        self.supabase = MagicMock()
+        self.bus = JobEventBus(self.supabase)
+
+    def test_publish_reaches_subscribers_and_notifies(self):
+        received = []
+        unsubscribe = self.bus.subscribe("job-1", received.append)
+
+        self.bus.publish("job-1", "progress", {"progress_pct": 10})
+        self.bus.publish("job-2", "progress", {"progress_pct": 50})
+        unsubscribe()
+        self.bus.publish("job-1", "progress", {"progress_pct": 20})
+
+        self.assertEqual([e["data"]["progress_pct"] for e in received], [10])
+        self.assertEqual(self.supabase.rpc.call_args[0][0], "notify_job_event")
+
+    def _notified(self):
+        return [c.args[1]["p_payload"]["type"] for c in self.supabase.rpc.call_args_list]
+
+    def test_progress_notifies_are_coalesced(self):
+        with patch("app.services.events.time.monotonic", side_effect=[100.0, 100.5, 101.0, 103.0, 103.2]):
+            for pct in (10, 20, 30, 40):
+                self.bus.publish("job-1", "progress", {"progress_pct": pct})
+            self.bus.publish("job-1", "completed")
+
+        self.assertEqual(self._notified(), ["progress", "progress", "completed"])
+        sent = [c.args[1]["p_payload"]["data"].get("progress_pct") for c in self.supabase.rpc.call_args_list]
+        self.assertEqual(sent[:2], [10, 40])
+
+    def test_failed_notify_is_retried_later(self):
+        self.supabase.rpc.return_value.execute.side_effect = [Exception("PGRST202"), MagicMock()]
+        with patch("app.services.events.time.monotonic", side_effect=[0.0, 30.0, 61.0]):
+            self.bus.publish("job-1", "failed")
+            self.bus.publish("job-1", "failed")  # within the back-off: skipped
+            self.bus.publish("job-1", "failed")
+
+        self.assertEqual(self.supabase.rpc.call_count, 2)
+
+    def test_cancellation_from_notification(self):
+        remote = {"job_id": "job-1", "type": "cancelled", "data": {}, "origin": "other-process"}
+        self.bus.handle_notification(json.dumps(remote))
+        self.assertTrue(self.bus.is_cancelled("job-1"))
+
+        self.bus.forget("job-1")
+        self.assertFalse(self.bus.is_cancelled("job-1"))
+
+    def test_own_notifications_are_ignored(self):
+        received = []
+        self.bus.subscribe("job-1", received.append)
+        event = self.bus.publish("job-1", "progress", broadcast=False)
+        self.bus.handle_notification(json.dumps(event))
+        self.assertEqual(len(received), 1)
+
+    def test_listening_only_after_listen_succeeds(self):
+        psycopg = MagicMock()
+        conn = psycopg.connect.return_value.__enter__.return_value
+        seen = []
+
+        def notifies():
+            seen.append(self.bus.listening)
+            raise _StopListener()
+            yield
+
+        conn.notifies.side_effect = notifies
+        psycopg.connect.side_effect = [OSError("connection refused"), psycopg.connect.return_value]
+        with patch.dict(sys.modules, {"psycopg": psycopg}), patch("app.services.events.time.sleep") as sleep:
+            sleep.side_effect = lambda _: seen.append(self.bus.listening)
+            with self.assertRaises(_StopListener):
+                self.bus._listen_loop()
+
+        # Down connection: not listening; after LISTEN: listening
+        self.assertEqual(seen, [False, True])
+        conn.execute.assert_called_once()
+
+    def test_stream_ends_on_terminal_event(self):
+        async def run():
+            stream = self.bus.stream("job-1", heartbeat_sec=0.05)
+            loop = asyncio.get_running_loop()
+            loop.run_in_executor(None, lambda: (self.bus.publish("job-1", "progress", broadcast=False),
+                                                self.bus.publish("job-1", "completed", broadcast=False)))
+            events = [e async for e in stream if e is not None]
+            stream.close()
+            return events
+
+        events = asyncio.run(run())
+        self.assertEqual([e["type"] for e in events], ["progress", "completed"])
+
+    def test_sse_polls_job_run_without_listen_bridge(self):
+        from app import main
+        rows = iter([
+            {"job_id": "job-1", "status": "running", "progress_pct": 10},
+            {"job_id": "job-1", "status": "running", "progress_pct": 10},  # unchanged: keep-alive
+            {"job_id": "job-1", "status": "running", "progress_pct": 40},
+            {"job_id": "job-1", "status": "completed", "progress_pct": 100},
+        ])
+        client = MagicMock()
+        client.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.side_effect = \
+            lambda: MagicMock(data=[next(rows)])
+
+        async def run():
+            response = await main.stream_job_events("job-1")
+            return [chunk async for chunk in response.body_iterator]
+
+        with patch("app.services.supabase_client.get_supabase_client", return_value=client), \
+                patch("app.services.events.get_event_bus", return_value=self.bus), \
+                patch("app.config.settings.JOB_EVENTS_POLL_SEC", 0.01):
+            chunks = asyncio.run(run())
+
+        kinds = [c.split("\n")[0] for c in chunks]
+        self.assertEqual(kinds, ["event: snapshot", ": keep-alive", "event: progress", "event: completed"])
+        self.assertIn('"progress_pct": 40', chunks[2])
+
+    def test_snapshot_event_types(self):
+        self.assertEqual(snapshot_event("j", {"status": "running"})["type"], "progress")
+        self.assertEqual(snapshot_event("j", {"status": "error"})["type"], "failed")
+        self.assertEqual(snapshot_event("j", {"status": "cancelled"})["type"], "cancelled")
+
+if __name__ == "__main__":
+    unittest.main()
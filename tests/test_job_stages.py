@@ -0,0 +1,85 @@
+import sys
+import os
+import time
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.pipeline.stages import Stage, StageGraph, JobStageRecorder
+
+class TestStageGraph(unittest.TestCase):
+    def test_independent_stages_run_concurrently(self):
+        graph = StageGraph([
+            Stage("a", lambda: time.sleep(0.3)),
+            Stage("b", lambda: time.sleep(0.3)),
+            Stage("c", lambda: time.sleep(0.3)),
+        ])
+        start = time.perf_counter()
+        results = graph.run()
+
+        self.assertLess(time.perf_counter() - start, 0.8)
+        self.assertTrue(all(r.status == "completed" for r in results.values()))
+        self.assertTrue(all(r.duration_ms >= 250 for r in results.values()))
+
+    def test_dependencies_run_in_order(self):
+        order = []
+        graph = StageGraph([
+            Stage("report", lambda: order.append("report"), depends_on=("audit", "reasoning")),
+            Stage("audit", lambda: (time.sleep(0.1), order.append("audit"))),
+            Stage("reasoning", lambda: order.append("reasoning")),
+        ])
+        graph.run()
+        self.assertEqual(order[-1], "report")
+        self.assertEqual(set(order), {"audit", "reasoning", "report"})
+
+    def test_coroutines_and_metrics(self):
+        async def synthesize():
+            await asyncio.sleep(0)
+            return {"conclusions": 3, "details": ["x"]}
+
+        results = StageGraph([Stage("reasoning", synthesize)]).run()
+        self.assertEqual(results["reasoning"].result, {"conclusions": 3, "details": ["x"]})
+        self.assertEqual(results["reasoning"].metrics, {"conclusions": 3})
+
+        # A plain callable returning a coroutine (lambda around an async method)
+        results = StageGraph([Stage("reports", lambda: synthesize())]).run()
+        self.assertEqual(results["reports"].status, "completed")
+
+    def test_failure_skips_dependents_and_is_recorded(self):
+        supabase = MagicMock()
+
+        def boom():
+            raise RuntimeError("LLM down")
+
+        graph = StageGraph([
+            Stage("audit", boom),
+            Stage("reports", lambda: None, depends_on=("audit",)),
+            Stage("snapshot", lambda: {"asset": 10}),
+        ], recorder=JobStageRecorder(supabase, "job-1"))
+        results = graph.run()
+
+        self.assertEqual(results["audit"].status, "failed")
+        self.assertEqual(results["reports"].status, "skipped")
+        self.assertEqual(results["snapshot"].status, "completed")
+
+        rows = {c[0][0]["stage_name"]: c[0][0] for c in supabase.table.return_value.insert.call_args_list}
+        supabase.table.assert_called_with("job_stage_run")
+        self.assertEqual(rows["audit"]["error"], {"message": "LLM down"})
+        self.assertEqual(rows["snapshot"]["metrics"], {"asset": 10})
+        self.assertEqual(rows["reports"]["status"], "skipped")
+        self.assertEqual(rows["snapshot"]["job_id"], "job-1")
+
+    def test_invalid_graphs_are_rejected(self):
+        with self.assertRaises(ValueError):
+            StageGraph([Stage("a", lambda: None, depends_on=("missing",))])
+        with self.assertRaises(ValueError):
+            StageGraph([Stage("a", lambda: None, depends_on=("b",)), Stage("b", lambda: None, depends_on=("a",))])
+
+if __name__ == "__main__":
+    unittest.main()
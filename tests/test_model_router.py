@@ -0,0 +1,65 @@
+import sys
+import os
+import tempfile
+import unittest
+import yaml
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.router import ModelRouter
+
+class TestModelRouterHotReload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        os.makedirs(os.path.join(self.root, "routings"))
+        os.makedirs(os.path.join(self.root, "providers"))
+        self._write("providers/openrouter.yml", {"name": "openrouter"})
+        self._write("routings/a.yml", {"actions": {"extract.schema": {"model": "model-a"}}})
+        self._write("routings/b.yml", {"actions": {"extract.schema": {"model": "model-b"}}})
+        self._write("active.yml", {"active": {"provider": "providers/openrouter.yml", "routing": "routings/a.yml"}})
+
+        self.router = ModelRouter(config_root=self.root)
+        self.router.reload_interval = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, rel_path, data, bump=0):
+        path = os.path.join(self.root, rel_path)
+        with open(path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(data, f)
+        if bump:
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump))
+
+    def test_action_config_is_memoized(self):
+        first = self.router.get_action_config("extract.schema")
+        second = self.router.get_action_config("extract.schema")
+        self.assertIs(first, second)
+        self.assertEqual(first.primary.model, "model-a")
+
+    def test_routing_edit_is_hot_reloaded(self):
+        self.assertEqual(self.router.get_action_config("extract.schema").primary.model, "model-a")
+        self._write("routings/a.yml", {"actions": {"extract.schema": {"model": "model-a2"}}}, bump=10**9)
+        self.assertEqual(self.router.get_action_config("extract.schema").primary.model, "model-a2")
+
+    def test_activation_is_hot_reloaded(self):
+        self.assertEqual(self.router.get_action_config("extract.schema").primary.model, "model-a")
+        self.router.config_manager.activate_config("providers/openrouter.yml", "routings/b.yml")
+        st = os.stat(self.router.config_manager.active_path)
+        os.utime(self.router.config_manager.active_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertEqual(self.router.get_action_config("extract.schema").primary.model, "model-b")
+
+    def test_no_reload_within_interval(self):
+        self.router.reload_interval = 3600
+        self.router._last_check = float("inf")
+        self._write("routings/a.yml", {"actions": {"extract.schema": {"model": "model-a2"}}}, bump=10**9)
+        self.assertEqual(self.router.get_action_config("extract.schema").primary.model, "model-a")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import sys
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.parquet_export import (
+    ParquetExportService, ParquetUnavailableError, PARQUET_TABLES, rows_to_columns
+)
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+def _supabase(pages):
+    """Mock client whose keyset queries return `pages` in order (then empty)"""
+    supabase = MagicMock()
+    query = supabase.table.return_value.select.return_value
+    for method in ("eq", "is_", "gt", "order", "limit"):
+        getattr(query, method).return_value = query
+    query.execute.side_effect = [MagicMock(data=page) for page in pages] + [MagicMock(data=[])] * 10
+    return supabase
+
+ASSETS = [
+    {"asset_id": "a1", "project_id": "p1", "asset_type": "table", "name_display": "orders",
+     "system": "SQLSRV", "tags": {"pii": True}, "created_at": "2025-01-02T03:04:05+00:00"},
+    {"asset_id": "a2", "project_id": "p1", "asset_type": "table", "name_display": "customers",
+     "system": None, "tags": None, "created_at": None},
+]
+
+class TestParquetExport(unittest.TestCase):
+    def test_rows_to_columns_coerces_types(self):
+        columns = rows_to_columns(ASSETS, PARQUET_TABLES["asset"]["columns"])
+
+        self.assertEqual(columns["asset_type"], ["table", "table"])
+        self.assertEqual(columns["tags"], ['{"pii": true}', None])
+        self.assertEqual(columns["parent_asset_id"], [None, None])
+        self.assertEqual(columns["created_at"][0], datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+
+    def test_package_component_is_scoped_through_package(self):
+        supabase = _supabase([[]])
+        service = ParquetExportService(supabase)
+
+        list(service._iter_table_rows("p1", "package_component"))
+
+        select = supabase.table.return_value.select
+        self.assertIn("package!inner(project_id)", select.call_args[0][0])
+        select.return_value.eq.assert_any_call("package.project_id", "p1")
+
+    def test_missing_pyarrow_is_reported(self):
+        with patch.dict(sys.modules, {"pyarrow": None, "pyarrow.parquet": None}):
+            with self.assertRaises(ParquetUnavailableError):
+                ParquetExportService(MagicMock()).write_table("p1", "asset", "unused.parquet")
+
+    @unittest.skipIf(pq is None, "pyarrow not installed")
+    def test_write_table_in_row_groups(self):
+        service = ParquetExportService(_supabase([ASSETS[:1], ASSETS[1:]]), page_size=1, row_group_size=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "asset.parquet")
+            self.assertEqual(service.write_table("p1", "asset", path), 2)
+
+            parquet = pq.ParquetFile(path)
+            self.assertEqual(parquet.metadata.num_row_groups, 2)
+            table = parquet.read()
+            self.assertEqual(str(table.schema.field("asset_type").type), "dictionary<values=string, indices=int32, ordered=0>")
+            self.assertEqual(table.column("name_display").to_pylist(), ["orders", "customers"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import os
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.artifact_service import ArtifactService
+from app.services.report_service import ReportService, REPORT_HASH
+
+TABLES = {
+    "asset": [{"asset_id": "a1", "asset_type": "table", "name_display": "orders"},
+              {"asset_id": "a2", "asset_type": "view", "name_display": "v_orders"}],
+    "edge_index": [{"edge_type": "READS_FROM"}],
+    "package": [{"name": "load_orders", "type": "SSIS"}],
+    "job_run": [{"job_id": "j1", "status": "completed"}],
+    "file_processing_log": [{"total_tokens": 100, "cost_estimate_usd": 0.5}],
+}
+
+def _supabase():
+    supabase = MagicMock()
+
+    def table(name):
+        query = MagicMock()
+        for method in ("select", "eq", "order", "limit"):
+            getattr(query, method).return_value = query
+        query.execute.return_value = MagicMock(data=TABLES.get(name, []))
+        query.single.return_value.execute.return_value = MagicMock(data={"name": "Demo", "status": "READY"})
+        return query
+
+    supabase.table.side_effect = table
+    return supabase
+
+class TestReportService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.service = ReportService(_supabase())
+        self.service.artifacts = ArtifactService(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_summary_aggregates_concurrent_queries(self):
+        data = asyncio.run(self.service.get_solution_summary("sol-1"))
+
+        self.assertEqual(data["solution_name"], "Demo")
+        self.assertEqual(data["asset_count"], 2)
+        self.assertEqual(data["asset_types"], {"table": 1, "view": 1})
+        self.assertEqual(data["edge_types"], {"READS_FROM": 1})
+        self.assertEqual(data["last_job"], {"status": "completed", "cost_usd": 0.5, "tokens": 100})
+
+    def test_hash_ignores_generation_time(self):
+        data = asyncio.run(self.service.get_solution_summary("sol-1"))
+        later = dict(data, generated_at="2099-01-01 00:00:00")
+        self.assertEqual(ReportService.summary_hash(data), ReportService.summary_hash(later))
+        self.assertNotEqual(ReportService.summary_hash(data), ReportService.summary_hash(dict(data, asset_count=3)))
+
+    def test_unchanged_summary_skips_rendering(self):
+        with patch.object(self.service, "generate_pdf_buffer", return_value=b"%PDF") as render:
+            self.assertTrue(asyncio.run(self.service.generate_and_save_latest_artifacts("sol-1")))
+            self.assertFalse(asyncio.run(self.service.generate_and_save_latest_artifacts("sol-1")))
+            self.assertEqual(render.call_count, 1)
+
+            # Forced or missing artifacts regenerate
+            self.assertTrue(asyncio.run(self.service.generate_and_save_latest_artifacts("sol-1", force=True)))
+            self.assertEqual(render.call_count, 2)
+
+        hash_path = os.path.join(self.tmp.name, "sol-1", "reports", REPORT_HASH)
+        self.assertTrue(os.path.exists(hash_path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import sys
+import os
+import unittest
+from unittest.mock import patch
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.models.extraction import ExtractionResult, Evidence, Locator
+from app.services.catalog import CatalogService
+from app.services.snippet_store import SnippetStore, decode_snippet, encode_snippet, snippet_hash
+
+from catalog_fakes import PROJECT, FakeSupabase
+
+SQL = "INSERT INTO dw.FactSales (OrderID, Amount)\nSELECT o.OrderID, o.Amount FROM stg.Orders o WHERE o.Amount > 0;\n" * 20
+
+class TestSnippetStore(unittest.TestCase):
+    def test_codecs_round_trip(self):
+        for codec in ("zstd", "zlib"):
+            stored_codec, payload = encode_snippet(SQL, codec)
+            self.assertEqual(stored_codec, codec)
+            self.assertLess(len(payload), len(SQL) / 5)
+            self.assertEqual(decode_snippet(stored_codec, payload), SQL)
+        # Too short to benefit: kept as text
+        self.assertEqual(encode_snippet("SELECT 1"), ("plain", "SELECT 1"))
+
+    def test_zlib_fallback_without_zstandard(self):
+        with patch("app.services.snippet_store._zstd_module", return_value=None):
+            codec, payload = encode_snippet(SQL, "zstd")
+        self.assertEqual(codec, "zlib")
+        self.assertEqual(decode_snippet(codec, payload), SQL)
+
+    def test_each_snippet_is_stored_once(self):
+        fake = FakeSupabase()
+        store = SnippetStore(fake.client)
+        hashes = store.put_many([SQL, SQL, "SELECT 1"])
+
+        writes = [rows for name, rows in fake.writes if name == "evidence_snippet"]
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(len(writes[0]), 2)
+        self.assertEqual(hashes[SQL], snippet_hash(SQL))
+        self.assertEqual({r["snippet_hash"] for r in fake.rows("evidence_snippet")}, {snippet_hash(SQL), snippet_hash("SELECT 1")})
+
+        # The read cache never skips a write: the row may have been collected meanwhile
+        fake.rows("evidence_snippet").clear()
+        store.put_many([SQL])
+        self.assertEqual([r["snippet_hash"] for r in fake.rows("evidence_snippet")], [snippet_hash(SQL)])
+
+    def test_attach_fetches_in_bulk(self):
+        fake = FakeSupabase()
+        SnippetStore(fake.client).put_many([SQL, "SELECT 1"])
+
+        reader = SnippetStore(fake.client)  # cold cache, e.g. another API worker
+        evidences = [{"snippet_hash": snippet_hash(SQL)}, {"snippet_hash": snippet_hash("SELECT 1")},
+                     {"snippet_hash": snippet_hash(SQL)}, {"snippet": "inline"}]
+        reader.attach(evidences)
+
+        self.assertEqual(len(fake.reads), 1)
+        self.assertEqual([e["snippet"] for e in evidences], [SQL, "SELECT 1", SQL, "inline"])
+
+    def test_snippets_travel_with_their_evidence(self):
+        fake = FakeSupabase()
+        evidences = [Evidence(evidence_id=f"ev{i}", kind="code", locator=Locator(file="load.sql", line_start=i),
+                              snippet=SQL) for i in range(3)]
+        result = ExtractionResult(meta={"source_file": "load.sql"}, nodes=[], edges=[], evidences=evidences)
+        CatalogService(fake.client).sync_extraction_result(result, PROJECT)
+
+        params = next(params for name, params in fake.calls if name == "insert_evidence")
+        self.assertEqual(len(params["p_evidence"]), 3)
+        self.assertTrue(all("snippet" not in r and r["snippet_hash"] == snippet_hash(SQL) for r in params["p_evidence"]))
+        # One compressed row, written in the same RPC (never on its own before the evidence)
+        self.assertEqual([r["snippet_hash"] for r in params["p_snippets"]], [snippet_hash(SQL)])
+        self.assertEqual(decode_snippet(params["p_snippets"][0]["codec"], params["p_snippets"][0]["payload"]), SQL)
+        self.assertNotIn("evidence_snippet", [name for name, _ in fake.writes])
+        self.assertEqual([r["snippet_hash"] for r in fake.rows("evidence_snippet")], [snippet_hash(SQL)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services.cache import TTLCache
+from app.services.stats_service import SolutionStatsService
+
+class TestSolutionStats(unittest.TestCase):
+    def setUp(self):
+        self.supabase = MagicMock()
+        self.supabase.rpc.return_value.execute.return_value = MagicMock(data={
+            "assets_by_type": {"FILE": 3, "TABLE": 5, "column": 2, "table": 4},
+            "total_edges": 7,
+            "active_job": {"job_id": "j1", "status": "running", "plan_id": None},
+            "last_run": None,
+            "audit_report": {"metrics": {"coverage_score": 0.8}},
+        })
+        self.service = SolutionStatsService(self.supabase, ttl_seconds=60)
+
+    def test_rpc_payload_is_shaped(self):
+        stats = self.service.get_stats("sol-1")
+
+        self.supabase.rpc.assert_called_once_with("get_solution_stats", {"p_project_id": "sol-1"})
+        self.assertEqual(stats["total_assets"], 14)
+        self.assertEqual(stats["files"], 3)
+        # "TABLE" and "table" add up
+        self.assertEqual(stats["tables"], 9)
+        self.assertEqual(stats["pipelines"], 0)
+        self.assertEqual(stats["assets_by_type"]["COLUMN"], 2)
+        self.assertEqual(stats["metrics"], {"coverage_score": 0.8})
+
+    def test_repeated_polls_hit_cache(self):
+        self.service.get_stats("sol-1")
+        self.service.get_stats("sol-1")
+        self.assertEqual(self.supabase.rpc.call_count, 1)
+
+        self.service.invalidate("sol-1")
+        self.service.get_stats("sol-1")
+        self.assertEqual(self.supabase.rpc.call_count, 2)
+
+    def test_failed_rpc_is_retried_after_backoff(self):
+        self.service.cache = TTLCache(ttl_seconds=0)
+        self.service._load_legacy = MagicMock(return_value={"assets_by_type": {}, "total_edges": 0})
+        ok = self.supabase.rpc.return_value.execute.return_value
+        self.supabase.rpc.return_value.execute.side_effect = [Exception("timeout"), ok]
+
+        self.service.get_stats("sol-1")  # RPC fails -> legacy
+        self.service.get_stats("sol-1")  # within the back-off -> legacy
+        self.service._rpc_retry_at -= 3600  # back-off elapsed
+        stats = self.service.get_stats("sol-1")
+
+        self.assertEqual(self.supabase.rpc.call_count, 2)
+        self.assertEqual(self.service._load_legacy.call_count, 2)
+        self.assertEqual(stats["total_edges"], 7)
+
+    def test_legacy_counts_page_past_max_rows(self):
+        rows = [{"asset_id": f"{i:05d}", "asset_type": "TABLE" if i % 2 else "FILE"} for i in range(2500)]
+        query = MagicMock()
+        state = {}
+        query.select.return_value = query
+        query.eq.return_value = query
+        query.order.return_value = query
+        query.gt.side_effect = lambda col, value: state.update(gt=value) or query
+        query.limit.side_effect = lambda n: state.update(limit=n) or query
+
+        def execute():
+            after = state.pop("gt", "")
+            page = [r for r in rows if r["asset_id"] > after][:state["limit"]]
+            return MagicMock(data=page, count=0)
+
+        query.execute.side_effect = execute
+        other = MagicMock()
+        other.execute.return_value = MagicMock(data=[], count=0)
+        for name in ("select", "eq", "order", "in_", "limit"):
+            getattr(other, name).return_value = other
+        self.supabase.table.side_effect = lambda name: query if name == "asset" else other
+
+        stats = self.service._load_legacy("sol-1")
+        self.assertEqual(stats["assets_by_type"], {"FILE": 1250, "TABLE": 1250})
+
+    def test_cache_expires(self):
+        cache = TTLCache(ttl_seconds=0)
+        cache.set("k", 1)
+        self.assertIsNone(cache.get("k"))
+
+if __name__ == "__main__":
+    unittest.main()
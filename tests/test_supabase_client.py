@@ -0,0 +1,43 @@
+import sys
+import os
+import unittest
+from unittest.mock import patch
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.services import supabase_client
+
+class TestSharedSupabaseClient(unittest.TestCase):
+    def setUp(self):
+        supabase_client.close_clients()
+        self.patches = [
+            patch.object(supabase_client.settings, "SUPABASE_URL", "https://example.supabase.co"),
+            patch.object(supabase_client.settings, "SUPABASE_KEY", "anon-key"),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        supabase_client.close_clients()
+        for p in self.patches:
+            p.stop()
+
+    def test_client_is_shared(self):
+        first = supabase_client.get_supabase_client()
+        self.assertIs(first, supabase_client.get_supabase_client())
+        self.assertIn("anon", supabase_client._http_clients)
+
+    def test_service_client_falls_back_to_anon(self):
+        with patch.object(supabase_client.settings, "SUPABASE_SERVICE_ROLE_KEY", ""):
+            self.assertIs(supabase_client.get_service_client(), supabase_client.get_supabase_client())
+
+        with patch.object(supabase_client.settings, "SUPABASE_SERVICE_ROLE_KEY", "service-key"):
+            service = supabase_client.get_service_client()
+        self.assertIsNot(service, supabase_client.get_supabase_client())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.join(os.getcwd(), "apps", "api"))
+
+load_dotenv()
+
+from app.actions import ActionResult
+from app.models.planning import Strategy, RecommendedAction
+from app.services.triage import LocalTriageScorer, TriageService
+from app.services.planner import PlannerService
+
+class TestTriage(unittest.TestCase):
+    def setUp(self):
+        self.scorer = LocalTriageScorer(pass_score=2)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _item(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        item = {"path": name, "size_bytes": len(content), "classifier": {"reason": "Passes policy checks"},
+                "strategy": Strategy.LLM_ONLY, "recommended_action": RecommendedAction.PROCESS, "enabled": True}
+        return item, path
+
+    def test_scorer_detects_data_access(self):
+        py = "import pandas as pd\ndf = pd.read_csv('in.csv')\ndf.to_sql('orders', engine)\n"
+        decision = self.scorer.score("etl.py", py)
+        self.assertTrue(decision.passed)
+        self.assertFalse(decision.ambiguous)
+        self.assertIn("dataframe_io", decision.signals)
+
+    def test_scorer_skips_files_without_signals(self):
+        decision = self.scorer.score("build.sh", "#!/bin/bash\ndocker build -t app .\n")
+        self.assertFalse(decision.passed)
+        self.assertEqual(decision.score, 0)
+
+    def test_triage_items_records_skip_reason(self):
+        keep = self._item("load.py", "cursor.execute('INSERT INTO t SELECT * FROM s')")
+        skip = self._item("notes.md", "Remember to update the changelog.")
+        service = TriageService(action_runner=MagicMock())
+
+        stats = service.triage_items([keep, skip])
+
+        self.assertEqual(stats["passed"], 1)
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(keep[0]["strategy"], Strategy.LLM_ONLY)
+        self.assertEqual(skip[0]["strategy"], Strategy.SKIP)
+        self.assertFalse(skip[0]["enabled"])
+        self.assertIn("no data access", skip[0]["planning_notes"])
+        self.assertEqual(skip[0]["classifier"]["triage"]["tier"], "local")
+
+    def test_ambiguous_files_use_llm_batch(self):
+        weak_a = self._item("a.md", "This dataset has many columns.")
+        weak_b = self._item("b.md", "The schema is documented elsewhere.")
+        runner = MagicMock()
+        runner.run_action.return_value = ActionResult(success=True, data={"content": json.dumps({"results": {
+            "f0": {"relevant": True, "reason": "Data contract"},
+            "f1": {"relevant": False, "reason": "No data logic"},
+        }})})
+        runner._clean_json_response.side_effect = lambda text: text
+        service = TriageService(action_runner=runner)
+
+        with patch("app.services.triage.settings.TRIAGE_LLM_ENABLED", True):
+            stats = service.triage_items([weak_a, weak_b])
+
+        runner.run_action.assert_called_once()
+        self.assertEqual(runner.run_action.call_args[0][0], "triage.batch")
+        self.assertEqual(stats["llm_checked"], 2)
+        self.assertTrue(weak_a[0]["enabled"])
+        self.assertFalse(weak_b[0]["enabled"])
+        self.assertEqual(weak_b[0]["classifier"]["triage"]["tier"], "llm")
+
+    def test_plan_items_share_one_key_set(self):
+        self._item("load.py", "import pandas as pd\ndf = pd.read_csv('in.csv')\n")
+        self._item("notes.py", "print('hello')\n")
+        self._item("orders.sql", "SELECT * FROM dbo.Orders")
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(data=[])
+        planner = PlannerService(supabase)
+        planner.triage = TriageService(scorer=self.scorer)
+
+        with patch("app.services.triage.settings.TRIAGE_LLM_ENABLED", False):
+            planner.create_plan("job-1", self.tmp.name)
+
+        inserted = [c[0][0] for c in supabase.table.return_value.insert.call_args_list if isinstance(c[0][0], list)]
+        rows = [row for chunk in inserted for row in chunk]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(len({frozenset(row) for row in rows}), 1)
+        self.assertEqual({row["path"]: row["value_score"] for row in rows}["orders.sql"], 0)
+
+if __name__ == "__main__":
+    unittest.main()